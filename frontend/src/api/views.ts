@@ -49,9 +49,10 @@ export function useInfiniteViewData({
 }: InfiniteViewDataParams) {
   return useInfiniteQuery({
     queryKey: ['view-data', viewId, sort, sortDirection, search, quickFilters, searchFilters],
-    queryFn: ({ pageParam = 1 }) => {
+    queryFn: ({ pageParam = '' }) => {
       const params = new URLSearchParams()
-      params.set('page', String(pageParam))
+      // Keyset paging: '' requests the first page (and the total count)
+      params.set('cursor', pageParam)
       if (sort) params.set('sort', sort)
       if (sortDirection) params.set('sort_direction', sortDirection)
       if (search) params.set('search', search)
@@ -61,9 +62,8 @@ export function useInfiniteViewData({
       }
       return get<ViewDataResponse>(`/views/${viewId}/data?${params.toString()}`)
     },
-    initialPageParam: 1,
-    getNextPageParam: (lastPage) =>
-      lastPage.has_more ? lastPage.page + 1 : undefined,
+    initialPageParam: '',
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
     enabled: !!viewId,
     staleTime: 15 * 1000,
   })
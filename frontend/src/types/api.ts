@@ -62,9 +62,13 @@ export interface View {
 
 export interface ViewDataResponse {
   rows: Record<string, unknown>[]
-  total: number
-  page: number
+  /** null on keyset pages after the first unless a count was requested */
+  total: number | null
+  /** offset paging only */
+  page?: number
   per_page: number
+  /** keyset paging only; null on the last page */
+  next_cursor?: string | null
   has_more: boolean
 }
 
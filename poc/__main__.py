@@ -54,14 +54,14 @@ def cmd_run(args: argparse.Namespace) -> None:
     from .auth import get_credentials_for_account
     from .gmail_client import get_user_email
     from .rate_limiter import RateLimiter
+    from .summarizer import summarization_enabled
     from .sync import (
         get_all_accounts,
-        incremental_sync,
-        initial_sync,
         load_conversations_for_display,
         process_conversations,
         sync_contacts,
     )
+    from .sync_scheduler import SyncJob, sync_accounts
 
     log = logging.getLogger(__name__)
 
@@ -81,9 +81,10 @@ def cmd_run(args: argparse.Namespace) -> None:
 
     console.print(f"\n[bold]Found {len(accounts)} account(s).[/bold]")
 
-    gmail_limiter = RateLimiter(rate=config.GMAIL_RATE_LIMIT)
     claude_limiter = RateLimiter(rate=config.CLAUDE_RATE_LIMIT)
     all_account_ids: list[str] = []
+    jobs: list[SyncJob] = []
+    user_emails: dict[str, str] = {}
 
     for account in accounts:
         account_id = account["id"]
@@ -101,7 +102,9 @@ def cmd_run(args: argparse.Namespace) -> None:
             console.print(f"[yellow]  Authentication failed ({exc}), skipping.[/yellow]")
             continue
 
-        user_email = get_user_email(creds)
+        user_emails[account_id] = get_user_email(creds)
+        # Gmail quota is per mailbox, so each account gets its own limiter
+        gmail_limiter = RateLimiter(rate=config.GMAIL_RATE_LIMIT)
 
         # Sync contacts
         try:
@@ -111,46 +114,56 @@ def cmd_run(args: argparse.Namespace) -> None:
             log.warning("Contact sync failed for %s: %s", email_addr, exc)
             console.print(f"[yellow]  Contact sync failed ({exc}), continuing.[/yellow]")
 
-        # Sync emails (initial or incremental)
+        if not account["initial_sync_done"]:
+            query = account["backfill_query"] or config.GMAIL_QUERY
+            console.print(f"  Initial sync queued (query: [cyan]{query}[/cyan]).")
+        jobs.append(SyncJob(account=account, creds=creds, rate_limiter=gmail_limiter))
+
+    # Sync emails for all accounts concurrently (initial or incremental)
+    if jobs:
+        console.print(f"\n[bold]Syncing email for {len(jobs)} account(s)...[/bold]")
+    results = sync_accounts(jobs)
+
+    for job in jobs:
+        account = job.account
+        account_id = account["id"]
+        email_addr = account["email_address"]
+        result = results[account_id]
+
+        console.print(f"\n[bold]--- {email_addr} ---[/bold]")
         if account["initial_sync_done"]:
-            try:
-                result = incremental_sync(account_id, creds, rate_limiter=gmail_limiter)
+            if "error" in result:
+                console.print(f"[yellow]  Incremental sync failed ({result['error']}).[/yellow]")
+            else:
                 console.print(
                     f"[green]  Incremental sync: {result['messages_fetched']} fetched, "
                     f"{result['messages_stored']} stored, "
                     f"{result['conversations_created']} new, "
                     f"{result['conversations_updated']} updated.[/green]"
                 )
-            except Exception as exc:
-                log.warning("Incremental sync failed for %s: %s", email_addr, exc)
-                console.print(f"[yellow]  Incremental sync failed ({exc}).[/yellow]")
         else:
-            query = account["backfill_query"] or config.GMAIL_QUERY
-            console.print(f"  Running initial sync (query: [cyan]{query}[/cyan])...")
-            try:
-                result = initial_sync(account_id, creds, rate_limiter=gmail_limiter)
-                console.print(
-                    f"[green]  Initial sync: {result['messages_fetched']} fetched, "
-                    f"{result['messages_stored']} stored, "
-                    f"{result['conversations_created']} conversations.[/green]"
-                )
-            except Exception as exc:
-                log.warning("Initial sync failed for %s: %s", email_addr, exc)
-                console.print(f"[red]  Initial sync failed ({exc}).[/red]")
+            if "error" in result:
+                console.print(f"[red]  Initial sync failed ({result['error']}).[/red]")
                 continue
+            console.print(
+                f"[green]  Initial sync: {result['messages_fetched']} fetched, "
+                f"{result['messages_stored']} stored, "
+                f"{result['conversations_created']} conversations.[/green]"
+            )
 
         # Process conversations (triage + summarize)
-        if config.ANTHROPIC_API_KEY:
+        if summarization_enabled():
+            model = "stub" if config.CLAUDE_STUB else config.CLAUDE_MODEL
             console.print(
-                f"  Processing conversations (model: [cyan]{config.CLAUDE_MODEL}[/cyan])..."
+                f"  Processing conversations (model: [cyan]{model}[/cyan])..."
             )
         else:
             console.print("  Processing conversations (triage only)...")
 
         try:
             triaged, summarized, topics = process_conversations(
-                account_id, creds, user_email,
-                rate_limiter=gmail_limiter,
+                account_id, job.creds, user_emails[account_id],
+                rate_limiter=job.rate_limiter,
                 claude_limiter=claude_limiter,
             )
             console.print(
@@ -342,7 +355,7 @@ def cmd_infer_relationships(args: argparse.Namespace) -> None:
     init_db()
 
     console.print("[bold]Inferring relationships from conversation co-occurrence...[/bold]")
-    count = infer_relationships()
+    count = infer_relationships(incremental=args.incremental)
     console.print(f"\n[bold green]{count} relationship(s) upserted.[/bold green]")
 
 
@@ -896,8 +909,8 @@ def cmd_migrate(args: argparse.Namespace) -> None:
     import importlib
     import sqlite3 as _sqlite3
 
-    LATEST_VERSION = 19
-    MIGRATIONS = list(range(2, LATEST_VERSION + 1))  # [2, 3, ..., 19]
+    LATEST_VERSION = 25
+    MIGRATIONS = list(range(2, LATEST_VERSION + 1))  # [2, 3, ..., 25]
 
     db_path = args.db
     if not db_path:
@@ -914,20 +927,18 @@ def cmd_migrate(args: argparse.Namespace) -> None:
         conn.close()
 
     # Fresh databases (created by init_db) have user_version=0 but already
-    # have the latest schema.  Detect this by checking for a table that only
-    # exists in v19+.
+    # have the latest schema.  Detect this by checking for a column that only
+    # exists in v25+.
     if current == 0:
         conn = _sqlite3.connect(str(db_path))
         try:
-            tables = {
-                r[0]
-                for r in conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                )
-            }
+            has_latest = conn.execute(
+                "SELECT 1 FROM pragma_table_info('conversations') "
+                "WHERE name = 'ai_summary_hash'"
+            ).fetchone()
         finally:
             conn.close()
-        if "outbound_email_queue" in tables:
+        if has_latest:
             console.print(
                 f"[green]Database is already at the latest schema (v{LATEST_VERSION}).[/green]"
             )
@@ -962,6 +973,10 @@ def cmd_migrate(args: argparse.Namespace) -> None:
     )
 
 
+# Rows shown in the resolve-domains results table
+_RESOLVE_DOMAINS_MAX_ROWS = 100
+
+
 def cmd_resolve_domains(args: argparse.Namespace) -> None:
     """Resolve unlinked contacts to companies by email domain."""
     from .domain_resolver import resolve_unlinked_contacts
@@ -980,7 +995,7 @@ def cmd_resolve_domains(args: argparse.Namespace) -> None:
         table.add_column("Email")
         table.add_column("Company")
 
-        for d in result.details:
+        for d in result.details[:_RESOLVE_DOMAINS_MAX_ROWS]:
             table.add_row(
                 d["contact_name"] or d["contact_id"][:8],
                 d["email"],
@@ -988,6 +1003,9 @@ def cmd_resolve_domains(args: argparse.Namespace) -> None:
             )
 
         console.print(table)
+        hidden = len(result.details) - _RESOLVE_DOMAINS_MAX_ROWS
+        if hidden > 0:
+            console.print(f"  ... and {hidden} more")
         console.print()
 
     console.print(
@@ -1037,7 +1055,8 @@ def cmd_score_companies(args: argparse.Namespace) -> None:
     batch = score_all_companies(triggered_by="cli")
     console.print(
         f"[green]  Scored: {batch['scored']}[/green], "
-        f"Skipped (no data): {batch['skipped']}"
+        f"Skipped (no data): {batch['skipped']} "
+        f"in {batch['elapsed_s']:.2f}s"
     )
 
     # Display top results
@@ -1127,7 +1146,8 @@ def cmd_score_contacts(args: argparse.Namespace) -> None:
     batch = score_all_contacts(triggered_by="cli")
     console.print(
         f"[green]  Scored: {batch['scored']}[/green], "
-        f"Skipped (no data): {batch['skipped']}"
+        f"Skipped (no data): {batch['skipped']} "
+        f"in {batch['elapsed_s']:.2f}s"
     )
 
     with get_connection() as conn:
@@ -1268,7 +1288,7 @@ def cmd_enrich_new_companies(args: argparse.Namespace) -> None:
     init_db()
     console.print("\n[bold]Enriching new companies...[/bold]")
 
-    stats = enrich_new_companies()
+    stats = enrich_new_companies(workers=args.workers)
 
     console.print(
         f"\n[bold green]Batch enrichment complete.[/bold green]\n"
@@ -1324,7 +1344,7 @@ def cmd_import_vcards(args: argparse.Namespace) -> None:
     try:
         result = import_vcards(
             args.path, recursive=args.recursive,
-            customer_id=customer_id, user_id=user_id,
+            customer_id=customer_id, user_id=user_id, bulk=args.bulk,
         )
     except (FileNotFoundError, ValueError) as exc:
         console.print(f"\n[red]Error:[/red] {exc}")
@@ -1465,7 +1485,11 @@ def build_parser() -> argparse.ArgumentParser:
     ra.add_argument("email", help="Email address of the account to re-authorize")
 
     # infer-relationships
-    sub.add_parser("infer-relationships", help="Infer contact relationships from conversations")
+    ir = sub.add_parser("infer-relationships", help="Infer contact relationships from conversations")
+    ir.add_argument(
+        "--incremental", action="store_true",
+        help="Only recompute pairs whose participants changed since the last run",
+    )
 
     # show-relationships
     sr = sub.add_parser("show-relationships", help="Display inferred relationships")
@@ -1583,10 +1607,14 @@ def build_parser() -> argparse.ArgumentParser:
     iv.add_argument("path", help="Path to a .vcf file or directory of .vcf files")
     iv.add_argument("--recursive", action="store_true",
                     help="Scan subdirectories for .vcf files")
+    iv.add_argument("--bulk", action="store_true",
+                    help="Parse files in parallel and write all contacts in one transaction")
 
     # enrich-new-companies
-    sub.add_parser("enrich-new-companies",
-                   help="Batch-enrich companies with domains but no completed enrichment")
+    enc = sub.add_parser("enrich-new-companies",
+                         help="Batch-enrich companies with domains but no completed enrichment")
+    enc.add_argument("--workers", type=int, default=None,
+                     help="Companies enriched concurrently (default: POC_ENRICH_WORKERS)")
 
     # enrich-company
     ec = sub.add_parser("enrich-company", help="Enrich a company from external sources")
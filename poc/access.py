@@ -67,22 +67,17 @@ def visible_conversations_query(
     """Return (WHERE clause, params) for conversations visible to a user.
 
     Visible = user has access to a provider_account that produced a communication
-    in this conversation, OR the conversation was explicitly shared.
+    in this conversation, OR the conversation was explicitly shared.  Both rules
+    are materialized in ``conversation_visibility`` (kept current by triggers),
+    so this is a single primary-key probe per conversation.
     """
     where = (
-        "conv.customer_id = ? AND ("
-        "  EXISTS ("
-        "    SELECT 1 FROM conversation_communications cc "
-        "    JOIN communications comm ON comm.id = cc.communication_id "
-        "    JOIN user_provider_accounts upa ON upa.account_id = comm.account_id "
-        "    WHERE cc.conversation_id = conv.id AND upa.user_id = ?"
-        "  ) OR EXISTS ("
-        "    SELECT 1 FROM conversation_shares cs "
-        "    WHERE cs.conversation_id = conv.id AND cs.user_id = ?"
-        "  )"
+        "conv.customer_id = ? AND EXISTS ("
+        "  SELECT 1 FROM conversation_visibility cv "
+        "  WHERE cv.user_id = ? AND cv.conversation_id = conv.id"
         ")"
     )
-    return where, [customer_id, user_id, user_id]
+    return where, [customer_id, user_id]
 
 
 def visible_communications_query(
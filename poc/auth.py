@@ -1,10 +1,20 @@
-"""Google OAuth 2.0 flow with token persistence."""
+"""Google OAuth 2.0 flow with token persistence.
+
+Credentials are cached per token file, so repeated lookups for an account
+return the same object without re-reading the file (which also lets
+``google_clients`` reuse that account's built services).  A cached entry is
+reloaded when the token file's mtime changes, and refreshed once it is
+within ``config.GOOGLE_TOKEN_REFRESH_MARGIN`` seconds of expiry — on lookup,
+or ahead of time by the background refresher the web server starts.
+"""
 
 from __future__ import annotations
 
 import json
 import logging
 import shutil
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from google.auth.transport.requests import Request
@@ -17,13 +27,136 @@ from .gmail_client import get_user_email
 
 log = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# Credential cache
+# ---------------------------------------------------------------------------
+
+_REFRESHER_INTERVAL = 60.0  # seconds between background refresh sweeps
+
+_cache_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+# token path -> (token file mtime_ns, credentials)
+_credentials: dict[Path, tuple[int, Credentials]] = {}
+_transport: Request | None = None
+_refresher: threading.Thread | None = None
+_refresher_stop = threading.Event()
+
+
+def _token_mtime(token_path: Path) -> int | None:
+    try:
+        return token_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _expiring(creds: Credentials) -> bool:
+    """True if *creds* has no token or expires within the refresh margin."""
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return False
+    # google-auth keeps expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    margin = timedelta(seconds=config.GOOGLE_TOKEN_REFRESH_MARGIN)
+    return creds.expiry - margin <= now
+
+
+def _refresh(creds: Credentials) -> bool:
+    """Refresh *creds* if it is still expiring; False if the refresh failed."""
+    global _transport
+    with _refresh_lock:
+        if not _expiring(creds):
+            return True
+        if _transport is None:
+            _transport = Request()  # one requests.Session for every refresh
+        try:
+            creds.refresh(_transport)
+        except Exception as exc:
+            log.warning("Token refresh failed: %s", exc)
+            return False
+    return True
+
+
+def _cache(token_path: Path, creds: Credentials) -> None:
+    mtime = _token_mtime(token_path)
+    if mtime is not None:
+        with _cache_lock:
+            _credentials[token_path] = (mtime, creds)
+
+
+def clear_credential_cache() -> None:
+    """Forget every cached credential (they are reloaded on next lookup)."""
+    with _cache_lock:
+        _credentials.clear()
+
+
+def refresh_cached_credentials() -> int:
+    """Refresh every cached credential that is close to expiry.
+
+    Returns the number refreshed.
+    """
+    with _cache_lock:
+        cached = [creds for _, creds in _credentials.values()]
+    refreshed = 0
+    for creds in cached:
+        if creds.refresh_token and _expiring(creds) and _refresh(creds):
+            refreshed += 1
+    return refreshed
+
+
+def _refresher_loop() -> None:
+    while not _refresher_stop.wait(_REFRESHER_INTERVAL):
+        try:
+            count = refresh_cached_credentials()
+        except Exception:
+            log.exception("Background credential refresh failed")
+            continue
+        if count:
+            log.info("Refreshed %d cached Google credential(s)", count)
+
+
+def start_credential_refresher() -> None:
+    """Start the daemon thread that refreshes cached credentials ahead of expiry."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _refresher_stop.clear()
+    _refresher = threading.Thread(
+        target=_refresher_loop, name="credential-refresher", daemon=True,
+    )
+    _refresher.start()
+
+
+def stop_credential_refresher() -> None:
+    """Stop the background refresher started by ``start_credential_refresher``."""
+    global _refresher
+    _refresher_stop.set()
+    if _refresher is not None:
+        _refresher.join(timeout=5)
+        _refresher = None
+
+
+# ---------------------------------------------------------------------------
+# Credential lookup and OAuth flows
+# ---------------------------------------------------------------------------
 
 def get_credentials_for_account(token_path: Path) -> Credentials:
     """Return valid Google OAuth credentials for a specific account token path.
 
     Handles load/refresh/re-authorize cycle and persists the token.
     Also performs one-time migration if token_path is the old generic path.
+    Served from the credential cache while the token file is unchanged.
     """
+    token_path = Path(token_path)
+    with _cache_lock:
+        cached = _credentials.get(token_path)
+    if cached and cached[0] == _token_mtime(token_path):
+        creds = cached[1]
+        if creds.refresh_token and _expiring(creds):
+            _refresh(creds)
+        if creds.valid:
+            return creds
+
     creds: Credentials | None = None
 
     # Try loading saved token
@@ -37,12 +170,8 @@ def get_credentials_for_account(token_path: Path) -> Credentials:
             creds = None
 
     # Refresh or re-authorize
-    if creds and creds.expired and creds.refresh_token:
-        try:
-            creds.refresh(Request())
-        except Exception:
-            log.warning("Token refresh failed, re-authenticating")
-            creds = None
+    if creds and _expiring(creds) and creds.refresh_token:
+        _refresh(creds)
 
     if not creds or not creds.valid:
         if not config.CLIENT_SECRET_PATH.exists():
@@ -79,6 +208,7 @@ def get_credentials_for_account(token_path: Path) -> Credentials:
         except Exception as exc:
             log.warning("Token migration failed (non-fatal): %s", exc)
 
+    _cache(token_path, creds)
     return creds
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -50,6 +51,62 @@ def _score_conversation(
     return score, matched_tags, title_matched
 
 
+class _TopicAutomaton:
+    """Aho–Corasick automaton over lowercased topic names.
+
+    :meth:`find` scans a text once and returns the indices of every pattern
+    that occurs in it as a substring, however many patterns there are.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[int]] = [set()]
+        # An empty pattern is a substring of everything, including ""
+        self._always = {i for i, p in enumerate(patterns) if not p}
+
+        for i, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].add(i)
+
+        # Breadth-first failure links; each state inherits the outputs of
+        # its failure state so find() never walks the fail chain for output.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[int]:
+        found = set(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
 def find_matching_topics(
     project_id: str,
     *,
@@ -58,8 +115,10 @@ def find_matching_topics(
     """Find the best topic match for each unassigned conversation.
 
     Loads all topics for the project and all candidate conversations,
-    scores every pair, and picks the highest-scoring topic per conversation.
-    Ties broken alphabetically by topic name.
+    compiles the topic names into one automaton, and scores each
+    conversation in a single pass over its title and tags (same scoring as
+    :func:`_score_conversation`).  Picks the highest-scoring topic per
+    conversation; ties broken alphabetically by topic name.
 
     Raises ValueError if the project has no topics.
     """
@@ -94,36 +153,60 @@ def find_matching_topics(
             {"include_triaged": 1 if include_triaged else 0},
         ).fetchall()
 
-    # Score each conversation against each topic
+    # One automaton over the distinct topic names; each title and each
+    # distinct tag is scanned once instead of once per topic.
+    patterns: list[str] = []
+    pattern_topics: list[list[int]] = []
+    pattern_index: dict[str, int] = {}
+    for i, (_, topic_name) in enumerate(topics):
+        key = topic_name.lower()
+        if key not in pattern_index:
+            pattern_index[key] = len(patterns)
+            patterns.append(key)
+            pattern_topics.append([])
+        pattern_topics[pattern_index[key]].append(i)
+    automaton = _TopicAutomaton(patterns)
+    tag_hits: dict[str, set[int]] = {}
+
     assignments: list[MatchResult] = []
     for row in rows:
-        conv_id = row["id"]
         conv_title = row["title"] or ""
         tag_names = row["tag_names"].split("||") if row["tag_names"] else []
 
-        best: MatchResult | None = None
-        for topic_id, topic_name in topics:
-            score, matched_tags, title_matched = _score_conversation(
-                conv_title, tag_names, topic_name,
-            )
-            if score < 1:
-                continue
-            candidate = MatchResult(
-                conversation_id=conv_id,
-                conversation_title=conv_title,
-                topic_id=topic_id,
-                topic_name=topic_name,
-                score=score,
-                matched_tags=matched_tags,
-                title_matched=title_matched,
-            )
-            if best is None or score > best.score or (
-                score == best.score and topic_name < best.topic_name
-            ):
-                best = candidate
+        matched: dict[int, list[str]] = {}
+        for tag in tag_names:
+            hits = tag_hits.get(tag)
+            if hits is None:
+                hits = tag_hits[tag] = automaton.find(tag.lower())
+            for p in hits:
+                matched.setdefault(p, []).append(tag)
+        title_hits = automaton.find(conv_title.lower()) if conv_title else set()
+
+        # Highest score wins; ties go to the alphabetically first topic name,
+        # then to the first topic loaded.
+        best_key = None
+        best: tuple[int, list[str], bool] | None = None
+        for p in matched.keys() | title_hits:
+            tags = matched.get(p, [])
+            title_matched = p in title_hits
+            score = 2 * len(tags) + (1 if title_matched else 0)
+            for i in pattern_topics[p]:
+                key = (-score, topics[i][1], i)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best = (i, tags, title_matched)
 
         if best is not None:
-            assignments.append(best)
+            i, tags, title_matched = best
+            assignments.append(MatchResult(
+                conversation_id=row["id"],
+                conversation_title=conv_title,
+                topic_id=topics[i][0],
+                topic_name=topics[i][1],
+                score=-best_key[0],
+                matched_tags=tags,
+                title_matched=title_matched,
+            ))
 
     total = len(rows)
     matched = len(assignments)
@@ -146,9 +229,8 @@ def apply_assignments(assignments: list[MatchResult]) -> int:
 
     now = datetime.now(timezone.utc).isoformat()
     with get_connection() as conn:
-        for match in assignments:
-            conn.execute(
-                "UPDATE conversations SET topic_id = ?, updated_at = ? WHERE id = ?",
-                (match.topic_id, now, match.conversation_id),
-            )
+        conn.executemany(
+            "UPDATE conversations SET topic_id = ?, updated_at = ? WHERE id = ?",
+            [(m.topic_id, now, m.conversation_id) for m in assignments],
+        )
     return len(assignments)
@@ -6,9 +6,9 @@ import logging
 from datetime import datetime, timezone
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .google_clients import get_service
 from .rate_limiter import RateLimiter
 
 log = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ def list_calendars(
 ) -> list[dict]:
     """Fetch all calendars the user has access to."""
     _check_calendar_scope(creds)
-    service = build("calendar", "v3", credentials=creds)
+    service = get_service("calendar", "v3", creds)
     calendars: list[dict] = []
     page_token: str | None = None
 
@@ -82,7 +82,7 @@ def fetch_events(
     If sync_token returns HTTP 410, raises SyncTokenExpiredError.
     """
     _check_calendar_scope(creds)
-    service = build("calendar", "v3", credentials=creds)
+    service = get_service("calendar", "v3", creds)
     events: list[dict] = []
     page_token: str | None = None
     next_sync_token: str | None = None
@@ -0,0 +1,81 @@
+"""Offline stand-in for the Anthropic client.
+
+Enabled with ``POC_CLAUDE_STUB=1``.  It implements the two calls the
+summarizer uses — ``messages.create`` and the ``messages.batches``
+create/retrieve/results cycle — and answers every request with a
+deterministic summary built from the prompt, so summarization can be
+exercised without network access or an API key.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from types import SimpleNamespace
+
+
+def _reply(params: dict) -> SimpleNamespace:
+    """A Messages API response whose text is a valid summary JSON object."""
+    prompt = params["messages"][-1]["content"]
+    subject = ""
+    for line in prompt.splitlines():
+        if line.startswith("Subject: "):
+            subject = line[len("Subject: "):].strip()
+            break
+    text = json.dumps({
+        "status": "UNCERTAIN",
+        "summary": f"Stub summary of '{subject}' ({len(prompt)} chars).",
+        "action_items": [],
+        "key_topics": [subject.lower()] if subject else [],
+    })
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        model=params.get("model"),
+        stop_reason="end_turn",
+    )
+
+
+class _StubBatches:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._batches: dict[str, list[dict]] = {}
+
+    def create(self, *, requests: list[dict]) -> SimpleNamespace:
+        batch_id = f"msgbatch_stub_{uuid.uuid4().hex}"
+        with self._lock:
+            self._batches[batch_id] = list(requests)
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+    def retrieve(self, batch_id: str) -> SimpleNamespace:
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    def results(self, batch_id: str):
+        with self._lock:
+            requests = self._batches.pop(batch_id, [])
+        for req in requests:
+            yield SimpleNamespace(
+                custom_id=req["custom_id"],
+                result=SimpleNamespace(
+                    type="succeeded", message=_reply(req["params"]),
+                ),
+            )
+
+
+class _StubMessages:
+    def __init__(self) -> None:
+        self.batches = _StubBatches()
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def create(self, **params) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+        return _reply(params)
+
+
+class StubClient:
+    """Drop-in replacement for ``anthropic.Anthropic`` used by the summarizer."""
+
+    def __init__(self, **_kwargs) -> None:
+        self.messages = _StubMessages()
@@ -5,68 +5,9 @@ from __future__ import annotations
 import json
 import uuid
 from datetime import datetime, timezone
-from urllib.parse import urlparse
 
 from .database import get_connection
-from .domain_resolver import PUBLIC_DOMAINS
-
-# Two-part country-code TLDs that need special handling when extracting
-# the root domain.  "mail.acme.co.uk" → "acme.co.uk", not "co.uk".
-_COMPOUND_TLDS = frozenset({
-    "co.uk", "org.uk", "ac.uk", "gov.uk",
-    "co.jp", "co.kr", "co.nz", "co.za", "co.in",
-    "com.au", "com.br", "com.cn", "com.mx", "com.sg", "com.tw",
-    "org.au", "net.au",
-})
-
-
-# ---------------------------------------------------------------------------
-# Domain normalisation
-# ---------------------------------------------------------------------------
-
-def normalize_domain(raw: str | None) -> str:
-    """Normalise a domain string to its root form.
-
-    * Strips protocol, path, query, www. prefix
-    * Lowercases
-    * Extracts root domain (handles compound TLDs like .co.uk)
-    * Returns empty string for None / blank / unparseable input
-    """
-    if not raw:
-        return ""
-    raw = raw.strip().lower()
-
-    # Strip protocol if present
-    if "://" in raw:
-        try:
-            parsed = urlparse(raw)
-            raw = parsed.hostname or ""
-        except Exception:
-            return ""
-    else:
-        # Remove path/query even without protocol
-        raw = raw.split("/", 1)[0].split("?", 1)[0]
-
-    if not raw:
-        return ""
-
-    # Strip www.
-    if raw.startswith("www."):
-        raw = raw[4:]
-
-    # Extract root domain
-    parts = raw.split(".")
-    if len(parts) <= 2:
-        return raw
-
-    # Check for compound TLD
-    last_two = f"{parts[-2]}.{parts[-1]}"
-    if last_two in _COMPOUND_TLDS:
-        # Keep last 3 segments: "acme.co.uk"
-        return ".".join(parts[-3:]) if len(parts) >= 3 else raw
-
-    # Standard TLD: keep last 2 segments
-    return ".".join(parts[-2:])
+from .domain_resolver import PUBLIC_DOMAINS, backfill_normalized_domains, normalize_domain
 
 
 # ---------------------------------------------------------------------------
@@ -76,21 +17,26 @@ def normalize_domain(raw: str | None) -> str:
 def find_duplicates_for_domain(domain: str) -> list[dict]:
     """Find all active companies matching *domain* (normalised).
 
-    Returns an empty list for public domains or when no matches exist.
+    Matches the indexed ``normalized_domain`` of ``companies`` and of their
+    domain identifiers.  Returns an empty list for public domains or when
+    no matches exist.
     """
     norm = normalize_domain(domain)
     if not norm or norm in PUBLIC_DOMAINS:
         return []
 
     with get_connection() as conn:
-        # Companies whose primary domain matches
+        backfill_normalized_domains(conn)
         rows = conn.execute(
-            """SELECT DISTINCT c.*
-               FROM companies c
-               LEFT JOIN company_identifiers ci
-                 ON ci.company_id = c.id AND ci.type = 'domain'
-               WHERE c.status = 'active'
-                 AND (c.domain = ? OR ci.value = ?)""",
+            """SELECT * FROM companies
+               WHERE status = 'active'
+                 AND id IN (
+                     SELECT id FROM companies WHERE normalized_domain = ?
+                     UNION
+                     SELECT company_id FROM company_identifiers
+                     WHERE type = 'domain' AND normalized_domain = ?
+                 )
+               ORDER BY rowid""",
             (norm, norm),
         ).fetchall()
 
@@ -100,44 +46,56 @@ def find_duplicates_for_domain(domain: str) -> list[dict]:
 def detect_all_duplicates() -> list[dict]:
     """Scan all companies for domain-based duplicates.
 
+    Groups active companies by ``normalized_domain`` (their own and their
+    domain identifiers') in SQL and only loads the groups with more than
+    one company.
+
     Returns a list of ``{"domain": str, "companies": [dict, ...]}`` sorted
     by group size (largest first).  Public domains and singleton groups are
     excluded.
     """
+    public = sorted(PUBLIC_DOMAINS)
+    placeholders = ", ".join("?" for _ in public)
     with get_connection() as conn:
-        # Collect every domain value (companies.domain + company_identifiers)
+        backfill_normalized_domains(conn)
         rows = conn.execute(
-            """SELECT c.id, c.name, c.domain AS raw_domain, c.industry,
-                      ci.value AS ci_domain
-               FROM companies c
-               LEFT JOIN company_identifiers ci
-                 ON ci.company_id = c.id AND ci.type = 'domain'
-               WHERE c.status = 'active'"""
+            f"""WITH pairs AS (
+                    SELECT normalized_domain AS nd, id AS company_id
+                    FROM companies
+                    WHERE status = 'active' AND normalized_domain != ''
+                    UNION
+                    SELECT ci.normalized_domain, ci.company_id
+                    FROM company_identifiers ci
+                    JOIN companies c ON c.id = ci.company_id
+                    WHERE ci.type = 'domain' AND c.status = 'active'
+                      AND ci.normalized_domain != ''
+                ),
+                dupes AS (
+                    SELECT nd FROM pairs
+                    WHERE nd NOT IN ({placeholders})
+                    GROUP BY nd HAVING COUNT(*) > 1
+                )
+                SELECT p.nd, c.id, c.name, c.domain, c.industry
+                FROM pairs p
+                JOIN dupes d ON d.nd = p.nd
+                JOIN companies c ON c.id = p.company_id
+                ORDER BY p.nd, c.rowid""",
+            public,
         ).fetchall()
 
-    # Map normalised domain → set of company dicts (keyed by id)
-    domain_map: dict[str, dict[str, dict]] = {}
+    domain_map: dict[str, list[dict]] = {}
     for row in rows:
-        rd = dict(row)
-        for raw in (rd.get("raw_domain"), rd.get("ci_domain")):
-            norm = normalize_domain(raw)
-            if not norm or norm in PUBLIC_DOMAINS:
-                continue
-            domain_map.setdefault(norm, {})[rd["id"]] = {
-                "id": rd["id"],
-                "name": rd["name"],
-                "domain": rd.get("raw_domain") or "",
-                "industry": rd.get("industry") or "",
-            }
-
-    groups = []
-    for domain, company_map in domain_map.items():
-        if len(company_map) >= 2:
-            groups.append({
-                "domain": domain,
-                "companies": list(company_map.values()),
-            })
-
+        domain_map.setdefault(row["nd"], []).append({
+            "id": row["id"],
+            "name": row["name"],
+            "domain": row["domain"] or "",
+            "industry": row["industry"] or "",
+        })
+
+    groups = [
+        {"domain": domain, "companies": companies}
+        for domain, companies in domain_map.items()
+    ]
     groups.sort(key=lambda g: len(g["companies"]), reverse=True)
     return groups
 
@@ -526,6 +484,10 @@ def merge_companies(
                 backfill_updates[field] = absorbed_row[field]
 
         if backfill_updates:
+            if "domain" in backfill_updates:
+                backfill_updates["normalized_domain"] = normalize_domain(
+                    backfill_updates["domain"]
+                )
             backfill_updates["updated_at"] = now
             set_clause = ", ".join(f"{k} = ?" for k in backfill_updates)
             vals = list(backfill_updates.values()) + [surviving_id]
@@ -38,16 +38,50 @@ GOOGLE_SCOPES = [
     "https://www.googleapis.com/auth/calendar.readonly",
 ]
 
+# Cached OAuth credentials are refreshed once they are this many seconds
+# from expiry (by the caller, or by the web server's background refresher)
+GOOGLE_TOKEN_REFRESH_MARGIN = int(_env("POC_GOOGLE_TOKEN_REFRESH_MARGIN", "300"))
+
 # Calendar sync
 CALENDAR_SYNC_DAYS = 90
 
 # Gmail query defaults
 GMAIL_QUERY = _env("POC_GMAIL_QUERY", "newer_than:7d")
 GMAIL_MAX_THREADS = int(_env("POC_GMAIL_MAX_THREADS", "50"))
+# Sub-requests per Gmail HTTP batch call (Google caps batches at 100)
+GMAIL_BATCH_SIZE = max(1, min(100, int(_env("POC_GMAIL_BATCH_SIZE", "50"))))
+
+# Multi-account sync scheduler: concurrent account fetchers and pages
+# buffered between the fetch, clean and store stages
+SYNC_MAX_WORKERS = int(_env("POC_SYNC_MAX_WORKERS", "4"))
+SYNC_QUEUE_SIZE = int(_env("POC_SYNC_QUEUE_SIZE", "4"))
+
+# Quote-stripping process pool: worker processes (1 = run inline) and
+# bodies sent to a worker per task
+CLEAN_WORKERS = int(_env("POC_CLEAN_WORKERS", str(os.cpu_count() or 1)))
+CLEAN_CHUNK_SIZE = max(1, int(_env("POC_CLEAN_CHUNK_SIZE", "32")))
+
+# Bulk vCard import: worker processes parsing .vcf files (1 = inline)
+VCARD_PARSE_WORKERS = int(_env("POC_VCARD_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+# Company enrichment: concurrent companies in a batch and the website
+# scraper's request budget shared by all of them (requests per second)
+ENRICH_WORKERS = max(1, int(_env("POC_ENRICH_WORKERS", "8")))
+ENRICH_RATE_LIMIT = float(_env("POC_ENRICH_RATE_LIMIT", "10"))
+# Website scraper HTTP cache file (default: http_cache.db next to the database)
+HTTP_CACHE_PATH = _env("POC_HTTP_CACHE_PATH")
+# Days after its last fetch or revalidation that a cache entry is deleted
+HTTP_CACHE_TTL_DAYS = float(_env("POC_HTTP_CACHE_TTL_DAYS", "180"))
 
 # Anthropic
 ANTHROPIC_API_KEY = _env("ANTHROPIC_API_KEY")
 CLAUDE_MODEL = _env("POC_CLAUDE_MODEL", "claude-sonnet-4-20250514")
+# Summarization: concurrent Claude requests, backlog size at which the
+# Message Batches API is used instead (0 = never), and an offline stub
+# client for development and tests
+CLAUDE_WORKERS = max(1, int(_env("POC_CLAUDE_WORKERS", "4")))
+CLAUDE_BATCH_THRESHOLD = int(_env("POC_CLAUDE_BATCH_THRESHOLD", "0"))
+CLAUDE_STUB = _env("POC_CLAUDE_STUB", "").lower() in ("true", "1", "yes")
 
 # Conversation target — keep fetching batches until this many pass triage
 TARGET_CONVERSATIONS = int(_env("POC_TARGET_CONVERSATIONS", "5"))
@@ -58,6 +92,17 @@ CLAUDE_RATE_LIMIT = float(_env("POC_CLAUDE_RATE_LIMIT", "2"))
 
 # Database
 DB_PATH = Path(_env("POC_DB_PATH", "") or str(_PROJECT_ROOT / "data" / "crm_extender.db"))
+# Idle connections kept open for reuse (0 = open/close per use) and the
+# pragmas applied once when each pooled connection is created
+DB_POOL_SIZE = int(_env("POC_DB_POOL_SIZE", "8"))
+DB_CACHE_SIZE_KB = int(_env("POC_DB_CACHE_SIZE_KB", "16384"))
+DB_MMAP_SIZE = int(_env("POC_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_SYNCHRONOUS = _env("POC_DB_SYNCHRONOUS", "NORMAL").upper()
+if DB_SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    logging.getLogger(__name__).warning(
+        "Invalid POC_DB_SYNCHRONOUS %r, falling back to NORMAL", DB_SYNCHRONOUS,
+    )
+    DB_SYNCHRONOUS = "NORMAL"
 
 # Timezone for display (all storage remains UTC)
 _tz_name = _env("CRM_TIMEZONE", "UTC")
@@ -74,6 +119,9 @@ except (KeyError, Exception):
 CRM_AUTH_ENABLED = _env("CRM_AUTH_ENABLED", "true").lower() in ("true", "1", "yes")
 SESSION_SECRET_KEY = _env("SESSION_SECRET_KEY", "change-me-in-production")
 SESSION_TTL_HOURS = int(_env("SESSION_TTL_HOURS", "720"))
+# Per-process cache of validated sessions (0 seconds disables it)
+SESSION_CACHE_TTL_SECONDS = float(_env("SESSION_CACHE_TTL_SECONDS", "60"))
+SESSION_CACHE_SIZE = int(_env("SESSION_CACHE_SIZE", "1024"))
 
 # Google OAuth (for web login)
 def _load_google_oauth_config() -> tuple[str, str]:
@@ -89,6 +137,9 @@ GOOGLE_OAUTH_CLIENT_ID, GOOGLE_OAUTH_CLIENT_SECRET = _load_google_oauth_config()
 
 # Summarization
 MAX_CONVERSATION_CHARS = int(_env("POC_MAX_CONVERSATION_CHARS", "6000"))
+# Estimated tokens of thread text per summarization prompt (default: the
+# character limit at ~4 chars per token)
+PROMPT_TOKEN_BUDGET = int(_env("POC_PROMPT_TOKEN_BUDGET", "0")) or MAX_CONVERSATION_CHARS // 4
 
 # File uploads (notes attachments)
 UPLOAD_DIR = Path(_env("CRM_UPLOAD_DIR", "") or str(_PROJECT_ROOT / "data" / "uploads"))
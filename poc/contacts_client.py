@@ -5,13 +5,22 @@ from __future__ import annotations
 import logging
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
+from .google_clients import get_service
 from .models import KnownContact
 from .rate_limiter import RateLimiter
 
 log = logging.getLogger(__name__)
 
+_PERSON_FIELDS = (
+    "names,emailAddresses,organizations,phoneNumbers,addresses,biographies,memberships"
+)
+
+
+class SyncTokenExpiredError(Exception):
+    """Raised when a People API sync token is no longer accepted."""
+
 
 # ---------------------------------------------------------------------------
 # Google → CRM type mappers
@@ -52,7 +61,7 @@ def fetch_contact_groups(
 
     System groups (myContacts, starred, etc.) are filtered out.
     """
-    service = build("people", "v1", credentials=creds)
+    service = get_service("people", "v1", creds)
     if rate_limiter:
         rate_limiter.acquire()
 
@@ -123,16 +132,67 @@ def _extract_labels(person: dict, group_map: dict[str, str]) -> list[str]:
     return labels
 
 
-def fetch_contacts(
+def _person_to_contacts(person: dict, group_map: dict[str, str]) -> list[KnownContact]:
+    """Build one KnownContact per email address of a People API person."""
+    emails = person.get("emailAddresses", [])
+    names = person.get("names", [])
+    orgs = person.get("organizations", [])
+    bios = person.get("biographies", [])
+
+    name = names[0].get("displayName", "") if names else ""
+    resource_name = person.get("resourceName", "")
+    company = orgs[0].get("name", "") if orgs else ""
+    title = orgs[0].get("title", "") if orgs else ""
+    biography = bios[0].get("value", "") if bios else ""
+
+    phones = _extract_phones(person)
+    addresses = _extract_addresses(person)
+    labels = _extract_labels(person, group_map)
+
+    contacts: list[KnownContact] = []
+    for email_entry in emails:
+        addr = email_entry.get("value", "").strip().lower()
+        if addr:
+            contacts.append(
+                KnownContact(
+                    email=addr,
+                    name=name,
+                    resource_name=resource_name,
+                    company=company,
+                    title=title,
+                    phones=phones,
+                    addresses=addresses,
+                    biography=biography,
+                    labels=labels,
+                )
+            )
+    return contacts
+
+
+def _is_expired_sync_token(exc: HttpError) -> bool:
+    """People API reports an expired token as 410, or 400 EXPIRED_SYNC_TOKEN."""
+    if exc.resp.status == 410:
+        return True
+    return exc.resp.status == 400 and b"EXPIRED_SYNC_TOKEN" in (exc.content or b"")
+
+
+def fetch_contact_changes(
     creds: Credentials,
     rate_limiter: RateLimiter | None = None,
     *,
     group_map: dict[str, str] | None = None,
-) -> list[KnownContact]:
-    """Fetch all contacts with email addresses from Google People API."""
-    service = build("people", "v1", credentials=creds)
+    sync_token: str | None = None,
+) -> tuple[list[KnownContact], str | None]:
+    """Fetch contacts, returning (contacts, next_sync_token).
+
+    Without *sync_token* every connection is listed; with one, only people
+    changed since that token was issued.  Deleted people are skipped.
+    If the token has expired, raises SyncTokenExpiredError.
+    """
+    service = get_service("people", "v1", creds)
     contacts: list[KnownContact] = []
     page_token: str | None = None
+    next_sync_token: str | None = None
 
     if group_map is None:
         group_map = {}
@@ -141,54 +201,49 @@ def fetch_contacts(
         if rate_limiter:
             rate_limiter.acquire()
 
-        result = (
-            service.people()
-            .connections()
-            .list(
-                resourceName="people/me",
-                pageSize=200,
-                personFields="names,emailAddresses,organizations,phoneNumbers,addresses,biographies,memberships",
-                pageToken=page_token or "",
-            )
-            .execute()
-        )
+        kwargs: dict = {
+            "resourceName": "people/me",
+            "pageSize": 1000,
+            "personFields": _PERSON_FIELDS,
+            "requestSyncToken": True,
+            "pageToken": page_token or "",
+        }
+        # The API requires the sync token on every page of an incremental list
+        if sync_token:
+            kwargs["syncToken"] = sync_token
+
+        try:
+            result = service.people().connections().list(**kwargs).execute()
+        except HttpError as exc:
+            if sync_token and _is_expired_sync_token(exc):
+                raise SyncTokenExpiredError("Contacts sync token expired") from exc
+            raise
 
         for person in result.get("connections", []):
-            emails = person.get("emailAddresses", [])
-            names = person.get("names", [])
-            orgs = person.get("organizations", [])
-            bios = person.get("biographies", [])
-
-            name = names[0].get("displayName", "") if names else ""
-            resource_name = person.get("resourceName", "")
-            company = orgs[0].get("name", "") if orgs else ""
-            title = orgs[0].get("title", "") if orgs else ""
-            biography = bios[0].get("value", "") if bios else ""
-
-            phones = _extract_phones(person)
-            addresses = _extract_addresses(person)
-            labels = _extract_labels(person, group_map)
-
-            for email_entry in emails:
-                addr = email_entry.get("value", "").strip().lower()
-                if addr:
-                    contacts.append(
-                        KnownContact(
-                            email=addr,
-                            name=name,
-                            resource_name=resource_name,
-                            company=company,
-                            title=title,
-                            phones=phones,
-                            addresses=addresses,
-                            biography=biography,
-                            labels=labels,
-                        )
-                    )
+            if person.get("metadata", {}).get("deleted"):
+                continue
+            contacts.extend(_person_to_contacts(person, group_map))
 
         page_token = result.get("nextPageToken")
+        next_sync_token = result.get("nextSyncToken") or next_sync_token
         if not page_token:
             break
 
-    log.info("Fetched %d contacts with email addresses", len(contacts))
+    log.info(
+        "Fetched %d contacts with email addresses (incremental=%s)",
+        len(contacts), sync_token is not None,
+    )
+    return contacts, next_sync_token
+
+
+def fetch_contacts(
+    creds: Credentials,
+    rate_limiter: RateLimiter | None = None,
+    *,
+    group_map: dict[str, str] | None = None,
+) -> list[KnownContact]:
+    """Fetch all contacts with email addresses from Google People API."""
+    contacts, _ = fetch_contact_changes(
+        creds, rate_limiter=rate_limiter, group_map=group_map,
+    )
     return contacts
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterator
@@ -66,6 +68,8 @@ CREATE TABLE IF NOT EXISTS companies (
     customer_id            TEXT REFERENCES customers(id) ON DELETE CASCADE,
     name                   TEXT NOT NULL,
     domain                 TEXT,
+    -- Root form of domain (see _NORMALIZED_DOMAIN_SQL)
+    normalized_domain      TEXT,
     industry               TEXT,
     description            TEXT,
     website                TEXT,
@@ -93,6 +97,10 @@ CREATE TABLE IF NOT EXISTS contacts (
     source                   TEXT,
     status                   TEXT DEFAULT 'active',
     automated_email_opt_out  INTEGER DEFAULT 0,
+    -- Denormalized by triggers (see _CONTACT_PRIMARY_SQL)
+    primary_email            TEXT,
+    primary_phone            TEXT,
+    primary_address          TEXT,
     created_by TEXT REFERENCES users(id) ON DELETE SET NULL,
     updated_by TEXT REFERENCES users(id) ON DELETE SET NULL,
     created_at TEXT NOT NULL,
@@ -205,6 +213,7 @@ CREATE TABLE IF NOT EXISTS conversations (
     ai_action_items     TEXT,
     ai_topics           TEXT,
     ai_summarized_at    TEXT,
+    ai_summary_hash     TEXT,
     triage_result       TEXT,
     dismissed           INTEGER DEFAULT 0,
     dismissed_reason    TEXT,
@@ -560,6 +569,7 @@ CREATE TABLE IF NOT EXISTS company_identifiers (
     company_id  TEXT NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
     type        TEXT NOT NULL DEFAULT 'domain',
     value       TEXT NOT NULL,
+    normalized_domain TEXT,
     is_primary  INTEGER DEFAULT 0,
     source      TEXT,
     created_at  TEXT NOT NULL,
@@ -1018,6 +1028,7 @@ CREATE INDEX IF NOT EXISTS idx_commpart_contact    ON communication_participants
 -- Contact resolution
 CREATE INDEX IF NOT EXISTS idx_ci_contact          ON contact_identifiers(contact_id);
 CREATE INDEX IF NOT EXISTS idx_ci_current          ON contact_identifiers(is_current);
+CREATE INDEX IF NOT EXISTS idx_ci_email_lower      ON contact_identifiers(LOWER(value)) WHERE type = 'email';
 
 -- Companies
 CREATE INDEX IF NOT EXISTS idx_companies_domain    ON companies(domain);
@@ -1125,9 +1136,11 @@ CREATE INDEX IF NOT EXISTS idx_sessions_expires      ON sessions(expires_at);
 CREATE INDEX IF NOT EXISTS idx_user_contacts_user       ON user_contacts(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_contacts_contact    ON user_contacts(contact_id);
 CREATE INDEX IF NOT EXISTS idx_user_contacts_visibility ON user_contacts(visibility);
+CREATE INDEX IF NOT EXISTS idx_user_contacts_contact_vis ON user_contacts(contact_id, visibility);
 CREATE INDEX IF NOT EXISTS idx_user_companies_user      ON user_companies(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_companies_company   ON user_companies(company_id);
 CREATE INDEX IF NOT EXISTS idx_user_companies_visibility ON user_companies(visibility);
+CREATE INDEX IF NOT EXISTS idx_user_companies_company_vis ON user_companies(company_id, visibility);
 CREATE INDEX IF NOT EXISTS idx_upa_user                 ON user_provider_accounts(user_id);
 CREATE INDEX IF NOT EXISTS idx_upa_account              ON user_provider_accounts(account_id);
 
@@ -1182,6 +1195,273 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_settings_user_unique
 """
 
 
+# Contacts carry their primary email/phone/address as plain columns so the
+# contact grid can sort and filter on them instead of running a correlated
+# subquery per row.  Triggers on the source tables keep them current no
+# matter which write path touches an identifier.
+_PRIMARY_EMAIL_SQL = (
+    "(SELECT ci.value FROM contact_identifiers ci "
+    "WHERE ci.contact_id = contacts.id AND ci.type = 'email' "
+    "ORDER BY ci.is_primary DESC, ci.created_at ASC LIMIT 1)"
+)
+_PRIMARY_PHONE_SQL = (
+    "(SELECT pn.number FROM phone_numbers pn "
+    "WHERE pn.entity_type = 'contact' AND pn.entity_id = contacts.id "
+    "AND pn.is_current = 1 ORDER BY pn.created_at ASC LIMIT 1)"
+)
+_PRIMARY_ADDRESS_SQL = (
+    "(SELECT a.street FROM addresses a "
+    "WHERE a.entity_type = 'contact' AND a.entity_id = contacts.id "
+    "AND a.is_current = 1 ORDER BY a.created_at ASC LIMIT 1)"
+)
+
+# (column, value subquery, source table, contact id column, row filter,
+#  columns whose update can change the value)
+_CONTACT_PRIMARY_SOURCES = [
+    ("primary_email", _PRIMARY_EMAIL_SQL, "contact_identifiers", "contact_id",
+     "{row}.type = 'email'", "contact_id, type, value, is_primary, created_at"),
+    ("primary_phone", _PRIMARY_PHONE_SQL, "phone_numbers", "entity_id",
+     "{row}.entity_type = 'contact'",
+     "entity_type, entity_id, number, is_current, created_at"),
+    ("primary_address", _PRIMARY_ADDRESS_SQL, "addresses", "entity_id",
+     "{row}.entity_type = 'contact'",
+     "entity_type, entity_id, street, is_current, created_at"),
+]
+
+
+def _contact_primary_sql() -> str:
+    parts = [
+        "CREATE INDEX IF NOT EXISTS idx_contacts_primary_email "
+        "ON contacts(primary_email COLLATE NOCASE);",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_primary_phone "
+        "ON contacts(primary_phone);",
+    ]
+    for column, value_sql, table, id_col, row_filter, watched in _CONTACT_PRIMARY_SOURCES:
+        refresh = f"UPDATE contacts SET {column} = {value_sql}"
+        new_f, old_f = row_filter.format(row="NEW"), row_filter.format(row="OLD")
+        parts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{column}_ins AFTER INSERT ON {table} "
+            f"WHEN {new_f} BEGIN {refresh} WHERE id = NEW.{id_col}; END;"
+        )
+        parts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{column}_del AFTER DELETE ON {table} "
+            f"WHEN {old_f} BEGIN {refresh} WHERE id = OLD.{id_col}; END;"
+        )
+        parts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{column}_upd "
+            f"AFTER UPDATE OF {watched} ON {table} "
+            f"WHEN {new_f} OR {old_f} "
+            f"BEGIN {refresh} WHERE id IN (NEW.{id_col}, OLD.{id_col}); END;"
+        )
+    return "\n".join(parts)
+
+
+_CONTACT_PRIMARY_SQL = _contact_primary_sql()
+
+_BACKFILL_CONTACT_PRIMARY_SQL = (
+    f"UPDATE contacts SET primary_email = {_PRIMARY_EMAIL_SQL}, "
+    f"primary_phone = {_PRIMARY_PHONE_SQL}, "
+    f"primary_address = {_PRIMARY_ADDRESS_SQL}"
+)
+
+
+# conversation_visibility materializes "which users can see which
+# conversation" (a provider account they have access to produced one of its
+# communications, or it was shared with them) so list/count/search queries
+# probe one indexed table instead of a three-table EXISTS per row.  Triggers
+# on every source table keep it current; removals re-check the pair against
+# the remaining sources rather than assuming the removed row was the only
+# grant.
+_CONVERSATION_VISIBLE_SQL = (
+    "(EXISTS (SELECT 1 FROM conversation_communications cc "
+    "JOIN communications comm ON comm.id = cc.communication_id "
+    "JOIN user_provider_accounts upa ON upa.account_id = comm.account_id "
+    "WHERE cc.conversation_id = conversation_visibility.conversation_id "
+    "AND upa.user_id = conversation_visibility.user_id) "
+    "OR EXISTS (SELECT 1 FROM conversation_shares cs "
+    "WHERE cs.conversation_id = conversation_visibility.conversation_id "
+    "AND cs.user_id = conversation_visibility.user_id))"
+)
+
+_CV_PRUNE = (
+    "DELETE FROM conversation_visibility WHERE {where} "
+    f"AND NOT {_CONVERSATION_VISIBLE_SQL};"
+)
+_CV_COMM_CONVERSATIONS = (
+    "conversation_id IN (SELECT conversation_id FROM conversation_communications "
+    "WHERE communication_id = NEW.id)"
+)
+_CV_SHARE_PAIR = "user_id = OLD.user_id AND conversation_id = OLD.conversation_id"
+
+_CV_GRANT_COMM = (
+    "INSERT INTO conversation_visibility (user_id, conversation_id) "
+    "SELECT upa.user_id, {row}.conversation_id FROM communications comm "
+    "JOIN user_provider_accounts upa ON upa.account_id = comm.account_id "
+    "WHERE comm.id = {row}.communication_id ON CONFLICT DO NOTHING;"
+)
+
+_CV_GRANT_ACCOUNT = (
+    "INSERT INTO conversation_visibility (user_id, conversation_id) "
+    "SELECT {row}.user_id, cc.conversation_id FROM communications comm "
+    "JOIN conversation_communications cc ON cc.communication_id = comm.id "
+    "WHERE comm.account_id = {row}.account_id ON CONFLICT DO NOTHING;"
+)
+
+_CONVERSATION_VISIBILITY_SQL = f"""\
+CREATE TABLE IF NOT EXISTS conversation_visibility (
+    user_id         TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+    PRIMARY KEY (user_id, conversation_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cv_conversation ON conversation_visibility(conversation_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_cv_cc_ins AFTER INSERT ON conversation_communications
+BEGIN {_CV_GRANT_COMM.format(row="NEW")} END;
+CREATE TRIGGER IF NOT EXISTS trg_cv_cc_del AFTER DELETE ON conversation_communications
+BEGIN {_CV_PRUNE.format(where="conversation_id = OLD.conversation_id")} END;
+CREATE TRIGGER IF NOT EXISTS trg_cv_cc_upd
+AFTER UPDATE OF conversation_id, communication_id ON conversation_communications
+WHEN OLD.conversation_id IS NOT NEW.conversation_id
+  OR OLD.communication_id IS NOT NEW.communication_id
+BEGIN
+    {_CV_PRUNE.format(where="conversation_id = OLD.conversation_id")}
+    {_CV_GRANT_COMM.format(row="NEW")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cv_comm_account
+AFTER UPDATE OF account_id ON communications
+WHEN OLD.account_id IS NOT NEW.account_id
+BEGIN
+    {_CV_PRUNE.format(where=_CV_COMM_CONVERSATIONS)}
+    INSERT INTO conversation_visibility (user_id, conversation_id)
+    SELECT upa.user_id, cc.conversation_id FROM conversation_communications cc
+    JOIN user_provider_accounts upa ON upa.account_id = NEW.account_id
+    WHERE cc.communication_id = NEW.id ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cv_upa_ins AFTER INSERT ON user_provider_accounts
+BEGIN {_CV_GRANT_ACCOUNT.format(row="NEW")} END;
+CREATE TRIGGER IF NOT EXISTS trg_cv_upa_del AFTER DELETE ON user_provider_accounts
+BEGIN {_CV_PRUNE.format(where="user_id = OLD.user_id")} END;
+CREATE TRIGGER IF NOT EXISTS trg_cv_upa_upd
+AFTER UPDATE OF user_id, account_id ON user_provider_accounts
+WHEN OLD.user_id IS NOT NEW.user_id OR OLD.account_id IS NOT NEW.account_id
+BEGIN
+    {_CV_PRUNE.format(where="user_id = OLD.user_id")}
+    {_CV_GRANT_ACCOUNT.format(row="NEW")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cv_share_ins AFTER INSERT ON conversation_shares
+BEGIN
+    INSERT INTO conversation_visibility (user_id, conversation_id)
+    VALUES (NEW.user_id, NEW.conversation_id) ON CONFLICT DO NOTHING;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cv_share_del AFTER DELETE ON conversation_shares
+BEGIN {_CV_PRUNE.format(where=_CV_SHARE_PAIR)} END;
+"""
+
+_BACKFILL_CONVERSATION_VISIBILITY_SQL = """\
+INSERT OR IGNORE INTO conversation_visibility (user_id, conversation_id)
+SELECT upa.user_id, cc.conversation_id FROM conversation_communications cc
+JOIN communications comm ON comm.id = cc.communication_id
+JOIN user_provider_accounts upa ON upa.account_id = comm.account_id
+UNION
+SELECT cs.user_id, cs.conversation_id FROM conversation_shares cs
+"""
+
+
+# Incremental relationship inference: every conversation_participants change
+# queues the affected contact ids, and relationship_inference_state keeps the
+# normalization maxima between runs (see relationship_inference).
+_RELATIONSHIP_INFERENCE_SQL = """\
+CREATE TABLE IF NOT EXISTS relationship_inference_queue (
+    contact_id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS relationship_inference_state (
+    id                INTEGER PRIMARY KEY CHECK (id = 1),
+    max_conversations INTEGER NOT NULL,
+    max_messages      INTEGER NOT NULL,
+    last_full_run_at  TEXT NOT NULL,
+    last_run_at       TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_rel_queue_cp_ins AFTER INSERT ON conversation_participants
+WHEN NEW.contact_id IS NOT NULL
+BEGIN
+    INSERT INTO relationship_inference_queue (contact_id) VALUES (NEW.contact_id) ON CONFLICT DO NOTHING;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_rel_queue_cp_del AFTER DELETE ON conversation_participants
+WHEN OLD.contact_id IS NOT NULL
+BEGIN
+    INSERT INTO relationship_inference_queue (contact_id) VALUES (OLD.contact_id) ON CONFLICT DO NOTHING;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_rel_queue_cp_upd
+AFTER UPDATE OF contact_id, communication_count, first_seen_at, last_seen_at
+ON conversation_participants
+BEGIN
+    INSERT INTO relationship_inference_queue (contact_id)
+    SELECT NEW.contact_id WHERE NEW.contact_id IS NOT NULL
+    UNION SELECT OLD.contact_id WHERE OLD.contact_id IS NOT NULL
+    ON CONFLICT DO NOTHING;
+END;
+"""
+
+
+# Same-name canonical identity map: any contact insert, delete or rename
+# bumps the generation so cached maps (see relationship_inference) reload.
+_CANONICAL_MAP_SQL = """\
+CREATE TABLE IF NOT EXISTS canonical_map_state (
+    id         INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO canonical_map_state (id, generation) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_canonical_contact_ins AFTER INSERT ON contacts
+BEGIN
+    UPDATE canonical_map_state SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_canonical_contact_del AFTER DELETE ON contacts
+BEGIN
+    UPDATE canonical_map_state SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_canonical_contact_name AFTER UPDATE OF name ON contacts
+WHEN OLD.name IS NOT NEW.name
+BEGIN
+    UPDATE canonical_map_state SET generation = generation + 1 WHERE id = 1;
+END;
+"""
+
+
+# normalized_domain holds the root form of companies.domain and of domain
+# identifiers (``normalize_domain``: no scheme/path/www., compound-TLD aware)
+# so duplicate scans are index probes.  The Python writers set it alongside
+# the raw value; these triggers reset it to NULL when the raw value is
+# changed by anything that did not, and NULL rows are filled in by
+# ``domain_resolver.backfill_normalized_domains`` at startup.  Sync-time
+# lookups match the exact domain through the LOWER() expression indexes.
+_NORMALIZED_DOMAIN_SQL = """\
+CREATE INDEX IF NOT EXISTS idx_companies_norm_domain ON companies(normalized_domain);
+CREATE INDEX IF NOT EXISTS idx_coid_norm_domain ON company_identifiers(type, normalized_domain);
+CREATE INDEX IF NOT EXISTS idx_companies_domain_lower ON companies(LOWER(domain));
+CREATE INDEX IF NOT EXISTS idx_coid_value_lower ON company_identifiers(type, LOWER(value));
+
+CREATE TRIGGER IF NOT EXISTS trg_companies_domain_changed
+AFTER UPDATE OF domain ON companies
+WHEN NEW.domain IS NOT OLD.domain AND NEW.normalized_domain IS OLD.normalized_domain
+BEGIN
+    UPDATE companies SET normalized_domain = NULL WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_coid_value_changed
+AFTER UPDATE OF type, value ON company_identifiers
+WHEN (NEW.value IS NOT OLD.value OR NEW.type IS NOT OLD.type)
+ AND NEW.normalized_domain IS OLD.normalized_domain
+BEGIN
+    UPDATE company_identifiers SET normalized_domain = NULL WHERE id = NEW.id;
+END;
+"""
+
+
 _SEED_RELATIONSHIP_TYPES_SQL = """\
 INSERT OR IGNORE INTO relationship_types
     (id, name, from_entity_type, to_entity_type, forward_label, reverse_label,
@@ -1247,6 +1527,39 @@ def init_db(db_path: Path | None = None) -> None:
             conn.execute(
                 "ALTER TABLE provider_accounts ADD COLUMN is_active INTEGER DEFAULT 1"
             )
+        # Defensive: add denormalized primary-identifier columns for existing DBs
+        c_cols = {r[1] for r in conn.execute("PRAGMA table_info(contacts)")}
+        missing = [
+            col for col in ("primary_email", "primary_phone", "primary_address")
+            if col not in c_cols
+        ]
+        for col in missing:
+            conn.execute(f"ALTER TABLE contacts ADD COLUMN {col} TEXT")
+        conn.executescript(_CONTACT_PRIMARY_SQL)
+        if missing:
+            conn.execute(_BACKFILL_CONTACT_PRIMARY_SQL)
+        # Defensive: create and backfill conversation_visibility for existing DBs
+        has_cv = conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'conversation_visibility'"
+        ).fetchone()
+        conn.executescript(_CONVERSATION_VISIBILITY_SQL)
+        if not has_cv:
+            conn.execute(_BACKFILL_CONVERSATION_VISIBILITY_SQL)
+        conn.executescript(_RELATIONSHIP_INFERENCE_SQL)
+        conn.executescript(_CANONICAL_MAP_SQL)
+        # Defensive: add ai_summary_hash column for existing DBs
+        conv_cols = {r[1] for r in conn.execute("PRAGMA table_info(conversations)")}
+        if "ai_summary_hash" not in conv_cols:
+            conn.execute("ALTER TABLE conversations ADD COLUMN ai_summary_hash TEXT")
+        # Defensive: add normalized_domain columns for existing DBs
+        for table in ("companies", "company_identifiers"):
+            t_cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+            if "normalized_domain" not in t_cols:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN normalized_domain TEXT")
+        conn.executescript(_NORMALIZED_DOMAIN_SQL)
+        from .domain_resolver import backfill_normalized_domains
+        backfill_normalized_domains(conn)
         now = datetime.now(timezone.utc).isoformat()
         conn.executescript(_SEED_RELATIONSHIP_TYPES_SQL.format(now=now))
         # Seed contact_company_roles for each customer
@@ -1266,17 +1579,151 @@ def init_db(db_path: Path | None = None) -> None:
         conn.close()
 
 
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+_pool_lock = threading.Lock()
+_idle: list[tuple[str, sqlite3.Connection]] = []  # least recently used first
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    """Open a connection with the per-connection pragmas applied once."""
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA foreign_keys=ON;")
+    conn.execute(f"PRAGMA synchronous={config.DB_SYNCHRONOUS};")
+    conn.execute(f"PRAGMA cache_size=-{config.DB_CACHE_SIZE_KB};")
+    conn.execute(f"PRAGMA mmap_size={config.DB_MMAP_SIZE};")
+    return conn
+
+
+def _acquire(path: Path) -> sqlite3.Connection:
+    key = str(path)
+    conn = None
+    with _pool_lock:
+        for i in range(len(_idle) - 1, -1, -1):
+            if _idle[i][0] == key:
+                conn = _idle.pop(i)[1]
+                break
+    if conn is None:
+        conn = _connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _release(path: Path, conn: sqlite3.Connection) -> None:
+    """Return *conn* to the pool, closing it (or the oldest idle one) when full."""
+    to_close = [conn]
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        pass
+    else:
+        with _pool_lock:
+            if config.DB_POOL_SIZE > 0:
+                _idle.append((str(path), conn))
+                to_close = [c for _, c in _idle[:-config.DB_POOL_SIZE]]
+                del _idle[:-config.DB_POOL_SIZE]
+    for c in to_close:
+        c.close()
+
+
+def close_pool() -> None:
+    """Close every idle pooled connection."""
+    with _pool_lock:
+        conns = [c for _, c in _idle]
+        _idle.clear()
+    for c in conns:
+        c.close()
+
+
+class _Scope:
+    """Connection shared by every ``get_connection()`` call in one context."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn: sqlite3.Connection | None = None
+        self.depth = 0
+
+
+_scope: ContextVar[_Scope | None] = ContextVar("db_connection_scope", default=None)
+
+
+@contextmanager
+def connection_scope(db_path: Path | None = None) -> Iterator[None]:
+    """Share one pooled connection among all ``get_connection()`` calls within.
+
+    The connection is checked out on first use and returned to the pool when
+    the scope exits.  The web app opens one scope per HTTP request so session
+    lookup, settings and the route handler all reuse a single connection.
+    Calls within one scope must not run concurrently.
+    """
+    scope = _Scope(db_path or _db_path())
+    token = _scope.set(scope)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+        if scope.conn is not None:
+            _release(scope.path, scope.conn)
+
+
+def _end_savepoint(conn: sqlite3.Connection, name: str, *, commit: bool) -> None:
+    try:
+        if not commit:
+            conn.execute(f"ROLLBACK TO {name}")
+        conn.execute(f"RELEASE {name}")
+    except sqlite3.OperationalError:
+        # The caller committed inside the block, which ends every savepoint
+        if commit:
+            conn.commit()
+        else:
+            conn.rollback()
+
+
+def _scoped_connection(scope: _Scope) -> Iterator[sqlite3.Connection]:
+    if scope.conn is None:
+        scope.conn = _acquire(scope.path)
+    conn = scope.conn
+    # The outermost block commits like a standalone connection; nested
+    # blocks get a savepoint so they only undo their own work.
+    savepoint = f"scope_sp_{scope.depth}" if scope.depth else None
+    if savepoint:
+        conn.execute(f"SAVEPOINT {savepoint}")
+    scope.depth += 1
+    try:
+        yield conn
+        if savepoint:
+            _end_savepoint(conn, savepoint, commit=True)
+        else:
+            conn.commit()
+    except Exception:
+        if savepoint:
+            _end_savepoint(conn, savepoint, commit=False)
+        else:
+            conn.rollback()
+        raise
+    finally:
+        scope.depth -= 1
+
+
 @contextmanager
 def get_connection(db_path: Path | None = None) -> Iterator[sqlite3.Connection]:
     """Context manager yielding a SQLite connection with WAL and FK enforcement.
 
-    Commits on clean exit, rolls back on exception.
+    Commits on clean exit, rolls back on exception.  Connections come from a
+    pool with their pragmas already applied; inside :func:`connection_scope`
+    every call shares the scope's connection.
     """
     path = db_path or _db_path()
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA foreign_keys=ON;")
+    scope = _scope.get()
+    if scope is not None and scope.path == path:
+        yield from _scoped_connection(scope)
+        return
+
+    conn = _acquire(path)
     try:
         yield conn
         conn.commit()
@@ -1284,4 +1731,4 @@ def get_connection(db_path: Path | None = None) -> Iterator[sqlite3.Connection]:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        _release(path, conn)
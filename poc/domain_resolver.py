@@ -5,6 +5,7 @@ from __future__ import annotations
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from urllib.parse import urlparse
 
 from .database import get_connection
 
@@ -20,6 +21,15 @@ PUBLIC_DOMAINS: frozenset[str] = frozenset({
     "cox.net", "charter.net", "earthlink.net",
 })
 
+# Two-part country-code TLDs that need special handling when extracting
+# the root domain.  "mail.acme.co.uk" → "acme.co.uk", not "co.uk".
+_COMPOUND_TLDS = frozenset({
+    "co.uk", "org.uk", "ac.uk", "gov.uk",
+    "co.jp", "co.kr", "co.nz", "co.za", "co.in",
+    "com.au", "com.br", "com.cn", "com.mx", "com.sg", "com.tw",
+    "org.au", "net.au",
+})
+
 
 def extract_domain(email: str) -> str | None:
     """Extract the domain from an email address, lowercased.
@@ -39,19 +49,98 @@ def is_public_domain(domain: str) -> bool:
     return domain.lower() in PUBLIC_DOMAINS
 
 
+def normalize_domain(raw: str | None) -> str:
+    """Normalise a domain string to its root form.
+
+    * Strips protocol, path, query, www. prefix
+    * Lowercases
+    * Extracts root domain (handles compound TLDs like .co.uk)
+    * Returns empty string for None / blank / unparseable input
+    """
+    if not raw:
+        return ""
+    raw = raw.strip().lower()
+
+    # Strip protocol if present
+    if "://" in raw:
+        try:
+            parsed = urlparse(raw)
+            raw = parsed.hostname or ""
+        except Exception:
+            return ""
+    else:
+        # Remove path/query even without protocol
+        raw = raw.split("/", 1)[0].split("?", 1)[0]
+
+    if not raw:
+        return ""
+
+    # Strip www.
+    if raw.startswith("www."):
+        raw = raw[4:]
+
+    # Extract root domain
+    parts = raw.split(".")
+    if len(parts) <= 2:
+        return raw
+
+    # Check for compound TLD
+    last_two = f"{parts[-2]}.{parts[-1]}"
+    if last_two in _COMPOUND_TLDS:
+        # Keep last 3 segments: "acme.co.uk"
+        return ".".join(parts[-3:]) if len(parts) >= 3 else raw
+
+    # Standard TLD: keep last 2 segments
+    return ".".join(parts[-2:])
+
+
+def backfill_normalized_domains(conn) -> int:
+    """Fill ``normalized_domain`` wherever it is NULL.
+
+    Covers rows written without it (raw SQL, older code) and rows whose raw
+    domain was changed, which the invalidation triggers reset to NULL.  Both
+    probes are indexed, so this is cheap when nothing is pending.  Returns
+    the number of rows updated.
+    """
+    companies = conn.execute(
+        "SELECT id, domain FROM companies WHERE normalized_domain IS NULL"
+    ).fetchall()
+    if companies:
+        conn.executemany(
+            "UPDATE companies SET normalized_domain = ? WHERE id = ?",
+            [(normalize_domain(r[1]), r[0]) for r in companies],
+        )
+    identifiers = conn.execute(
+        "SELECT id, value FROM company_identifiers "
+        "WHERE type = 'domain' AND normalized_domain IS NULL"
+    ).fetchall()
+    if identifiers:
+        conn.executemany(
+            "UPDATE company_identifiers SET normalized_domain = ? WHERE id = ?",
+            [(normalize_domain(r[1]), r[0]) for r in identifiers],
+        )
+    return len(companies) + len(identifiers)
+
+
 def resolve_company_by_domain(conn, domain: str) -> dict | None:
     """Look up an active company by domain.
 
     1. Check ``companies.domain`` directly.
     2. Fallback: check ``company_identifiers`` with ``type='domain'``.
 
+    Both match the exact domain case-insensitively and are probes of the
+    ``LOWER(...)`` expression indexes.  Subdomains are not folded into a
+    root domain here: that would merge unrelated companies under shared
+    suffixes (``*.com.ar``, ``*.github.io``).
+
     Returns the company row as a dict, or None.
     """
     domain = domain.lower()
 
     # Direct match on companies.domain
     row = conn.execute(
-        "SELECT * FROM companies WHERE domain = ? AND status = 'active'",
+        "SELECT * FROM companies WHERE LOWER(domain) = ? AND status = 'active' "
+        "ORDER BY rowid LIMIT 1",
         (domain,),
     ).fetchone()
     if row:
@@ -59,9 +148,10 @@ def resolve_company_by_domain(conn, domain: str) -> dict | None:
 
     # Fallback: company_identifiers
     row = conn.execute(
-        "SELECT c.* FROM companies c "
-        "JOIN company_identifiers ci ON ci.company_id = c.id "
-        "WHERE ci.type = 'domain' AND ci.value = ? AND c.status = 'active'",
+        "SELECT c.* FROM company_identifiers ci "
+        "JOIN companies c ON c.id = ci.company_id "
+        "WHERE ci.type = 'domain' AND LOWER(ci.value) = ? AND c.status = 'active' "
+        "ORDER BY ci.rowid LIMIT 1",
         (domain,),
     ).fetchone()
     if row:
@@ -77,11 +167,13 @@ def ensure_domain_identifier(conn, company_id: str, domain: str) -> bool:
     Returns True if a new row was inserted, False if it already existed.
     """
     now = datetime.now(timezone.utc).isoformat()
+    domain = domain.lower()
     cursor = conn.execute(
         "INSERT OR IGNORE INTO company_identifiers "
-        "(id, company_id, type, value, is_primary, source, created_at, updated_at) "
-        "VALUES (?, ?, 'domain', ?, 0, 'auto', ?, ?)",
-        (str(uuid.uuid4()), company_id, domain.lower(), now, now),
+        "(id, company_id, type, value, normalized_domain, is_primary, source, "
+        "created_at, updated_at) "
+        "VALUES (?, ?, 'domain', ?, ?, 0, 'auto', ?, ?)",
+        (str(uuid.uuid4()), company_id, domain, normalize_domain(domain), now, now),
     )
     return cursor.rowcount > 0
 
@@ -110,12 +202,40 @@ class DomainResolveResult:
     details: list[dict] = field(default_factory=list)
 
 
+def _load_domain_map(conn) -> dict[str, dict]:
+    """Map the lowercased domains of active companies to ``{"id", "name"}``.
+
+    ``companies.domain`` entries win over ``company_identifiers``.
+    """
+    rows = conn.execute(
+        "SELECT id, name, domain AS value FROM companies "
+        "WHERE status = 'active' AND domain IS NOT NULL AND domain != '' "
+        "ORDER BY rowid",
+    ).fetchall()
+    rows += conn.execute(
+        "SELECT c.id, c.name, ci.value FROM company_identifiers ci "
+        "JOIN companies c ON c.id = ci.company_id "
+        "WHERE ci.type = 'domain' AND c.status = 'active' "
+        "ORDER BY ci.rowid",
+    ).fetchall()
+
+    domains: dict[str, dict] = {}
+    for r in rows:
+        domains.setdefault(r["value"].lower(), {"id": r["id"], "name": r["name"]})
+    return domains
+
+
 def resolve_unlinked_contacts(*, dry_run: bool = False) -> DomainResolveResult:
     """Bulk backfill: link unlinked contacts to companies by email domain.
 
     Contacts with no affiliation in ``contact_companies`` are checked
     against known company domains (both ``companies.domain`` and
-    ``company_identifiers``).
+    ``company_identifiers``).  The domain map and Employee roles are loaded
+    once and all contacts are matched in memory on their exact email
+    domain.  Subdomains are not folded into a root domain: without a
+    public-suffix list, ``acme.com.ar`` / ``globex.com.ar`` or
+    ``alice.github.io`` / ``bob.github.io`` would collapse into one
+    company.  Affiliations are inserted with one ``executemany``.
 
     Args:
         dry_run: If True, compute results without writing to the database.
@@ -138,6 +258,18 @@ def resolve_unlinked_contacts(*, dry_run: bool = False) -> DomainResolveResult:
         result.contacts_checked = len(rows)
         now = datetime.now(timezone.utc).isoformat()
 
+        domain_map = _load_domain_map(conn)
+        # Default Employee role per customer
+        emp_roles: dict[str | None, str] = {}
+        for r in conn.execute(
+            "SELECT customer_id, id FROM contact_company_roles "
+            "WHERE name = 'Employee' AND customer_id IS NOT NULL ORDER BY rowid",
+        ).fetchall():
+            emp_roles.setdefault(r["customer_id"], r["id"])
+
+        inserts: list[tuple] = []
+        linked_pairs: set[tuple[str, str]] = set()
+
         for row in rows:
             email = row["email"]
             domain = extract_domain(email)
@@ -149,7 +281,7 @@ def resolve_unlinked_contacts(*, dry_run: bool = False) -> DomainResolveResult:
                 result.contacts_skipped_public += 1
                 continue
 
-            company = resolve_company_by_domain(conn, domain)
+            company = domain_map.get(domain)
             if not company:
                 result.contacts_skipped_no_match += 1
                 continue
@@ -163,22 +295,22 @@ def resolve_unlinked_contacts(*, dry_run: bool = False) -> DomainResolveResult:
                 "company_name": company["name"],
             })
 
-            if not dry_run:
-                import uuid as _uuid
-                # Use default Employee role for the customer
-                emp_role = conn.execute(
-                    "SELECT id FROM contact_company_roles "
-                    "WHERE name = 'Employee' AND customer_id = ?",
-                    (row["customer_id"],),
-                ).fetchone()
-                emp_role_id = emp_role["id"] if emp_role else None
-                conn.execute(
-                    """INSERT OR IGNORE INTO contact_companies
-                       (id, contact_id, company_id, role_id, is_primary, is_current,
-                        source, created_at, updated_at)
-                       VALUES (?, ?, ?, ?, 1, 1, 'domain_resolver', ?, ?)""",
-                    (str(_uuid.uuid4()), row["contact_id"], company["id"],
-                     emp_role_id, now, now),
-                )
+            # A contact with several emails at one company gets one affiliation
+            pair = (row["contact_id"], company["id"])
+            if pair not in linked_pairs:
+                linked_pairs.add(pair)
+                inserts.append((
+                    str(uuid.uuid4()), row["contact_id"], company["id"],
+                    emp_roles.get(row["customer_id"]), now, now,
+                ))
+
+        if not dry_run:
+            conn.executemany(
+                """INSERT OR IGNORE INTO contact_companies
+                   (id, contact_id, company_id, role_id, is_primary, is_current,
+                    source, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, 1, 1, 'domain_resolver', ?, ?)""",
+                inserts,
+            )
 
     return result
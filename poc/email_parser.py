@@ -11,10 +11,17 @@ falling back to the plain-text pipeline when HTML is absent.
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 
 from mailparser_reply import EmailReplyParser
 
+from . import config
+
 log = logging.getLogger(__name__)
 
 # Patterns for content we want to strip
@@ -576,3 +583,59 @@ def strip_quotes(body: str, body_html: str | None = None) -> str:
     body = re.sub(r"\n{3,}", "\n\n", body)
 
     return body.strip()
+
+
+# ---------------------------------------------------------------------------
+# Bulk cleaning
+# ---------------------------------------------------------------------------
+
+def _strip_one(item: tuple[str, str | None]) -> str:
+    body, body_html = item
+    try:
+        return strip_quotes(body, body_html or None)
+    except Exception as exc:
+        log.warning("Quote stripping failed, keeping original body: %s", exc)
+        return body
+
+
+@contextmanager
+def clean_pool(workers: int | None = None) -> Iterator[ProcessPoolExecutor | None]:
+    """Yield a process pool for :func:`strip_quotes_many`, or None to run inline.
+
+    Workers are spawned rather than forked because callers such as the
+    sync scheduler have other threads running.
+    """
+    workers = config.CLEAN_WORKERS if workers is None else workers
+    if workers <= 1:
+        yield None
+        return
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def strip_quotes_many(
+    items: Iterable[tuple[str, str | None]],
+    *,
+    pool: ProcessPoolExecutor | None = None,
+    chunk_size: int | None = None,
+) -> list[str]:
+    """Run :func:`strip_quotes` over ``(body, body_html)`` pairs.
+
+    Results come back in input order.  With *pool*, bodies are sent to its
+    worker processes *chunk_size* at a time; inputs no larger than one chunk
+    (or no pool) are cleaned inline.  A body that fails to clean is returned
+    unchanged.
+    """
+    items = list(items)
+    chunk_size = chunk_size or config.CLEAN_CHUNK_SIZE
+    if pool is not None and len(items) > chunk_size:
+        try:
+            return list(pool.map(_strip_one, items, chunksize=chunk_size))
+        except BrokenProcessPool as exc:
+            log.warning("Clean pool failed, stripping inline: %s", exc)
+    return [_strip_one(item) for item in items]
@@ -5,8 +5,12 @@ from __future__ import annotations
 
 import logging
 import uuid
-from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
 
+from . import config
 from .database import get_connection
 from .enrichment_provider import FieldValue, SourceTier, get_provider, list_providers
 from .hierarchy import (
@@ -27,6 +31,9 @@ log = logging.getLogger(__name__)
 # Confidence threshold for auto-accepting field values
 AUTO_ACCEPT_THRESHOLD = 0.7
 
+# Pending/running runs older than this are left over from an interrupted batch
+STALE_RUN_AFTER = timedelta(hours=1)
+
 # Direct company fields that map straight to update_company()
 DIRECT_FIELDS = {
     "name", "description", "industry", "website", "stock_symbol", "size_range",
@@ -347,6 +354,32 @@ def _run_single_provider(
     provider,
 ) -> dict:
     """Execute a single provider against an entity."""
+    run_id, entity = _begin_run(entity_type, entity_id, provider)
+    if not entity:
+        return _failed_result(run_id, "Entity not found")
+
+    try:
+        field_values = provider.enrich(entity)
+    except Exception as exc:
+        log.exception("Provider %s failed for %s/%s", provider.name, entity_type, entity_id)
+        _update_run_status(run_id, "failed", str(exc))
+        return _failed_result(run_id, str(exc))
+
+    return _finish_run(run_id, entity_type, entity_id, entity, provider, field_values)
+
+
+def _failed_result(run_id: str | None, error: str) -> dict:
+    return {"run_id": run_id, "status": "failed",
+            "fields_discovered": 0, "fields_applied": 0,
+            "error": error}
+
+
+def _begin_run(entity_type: str, entity_id: str, provider) -> tuple[str, dict | None]:
+    """Create a run and load its entity. Returns (run_id, entity).
+
+    The run is marked running, or failed if the entity does not exist
+    (in which case entity is None).
+    """
     run = create_enrichment_run(entity_type, entity_id, provider.name)
     run_id = run["id"]
 
@@ -358,21 +391,21 @@ def _run_single_provider(
 
     if not entity:
         _update_run_status(run_id, "failed", "Entity not found")
-        return {"run_id": run_id, "status": "failed",
-                "fields_discovered": 0, "fields_applied": 0,
-                "error": "Entity not found"}
+        return run_id, None
 
     _update_run_status(run_id, "running")
+    return run_id, entity
 
-    try:
-        field_values = provider.enrich(entity)
-    except Exception as exc:
-        log.exception("Provider %s failed for %s/%s", provider.name, entity_type, entity_id)
-        _update_run_status(run_id, "failed", str(exc))
-        return {"run_id": run_id, "status": "failed",
-                "fields_discovered": 0, "fields_applied": 0,
-                "error": str(exc)}
 
+def _finish_run(
+    run_id: str,
+    entity_type: str,
+    entity_id: str,
+    entity: dict,
+    provider,
+    field_values: list[FieldValue],
+) -> dict:
+    """Store and apply a provider's field values, then complete the run."""
     # Store raw field values
     _store_field_values(run_id, field_values)
 
@@ -411,16 +444,68 @@ def _run_single_provider(
 # Batch enrichment for newly-created companies
 # ---------------------------------------------------------------------------
 
-def enrich_new_companies() -> dict:
+def _fail_stale_runs() -> int:
+    """Fail company runs a previous, interrupted batch left pending or running."""
+    now = datetime.now(timezone.utc)
+    cutoff = (now - STALE_RUN_AFTER).isoformat()
+    with get_connection() as conn:
+        cur = conn.execute(
+            "UPDATE enrichment_runs SET status = 'failed', completed_at = ?, "
+            "error_message = 'Interrupted' "
+            "WHERE entity_type = 'company' AND status IN ('pending', 'running') "
+            "AND created_at < ?",
+            (now.isoformat(), cutoff),
+        )
+    return cur.rowcount
+
+
+def _company_host(company: dict) -> str:
+    """Host the website scraper will contact for *company*."""
+    site = (company.get("website") or company.get("domain") or "").strip().lower()
+    if "//" not in site:
+        site = "//" + site
+    host = urlparse(site).hostname or ""
+    return host.removeprefix("www.")
+
+
+def _enrich_entity(providers: list, entity: dict) -> list[tuple[list | None, str | None]]:
+    """Worker: run each provider's network-bound enrich().
+
+    Returns one (field_values, error) pair per provider.  No database access.
+    """
+    outcomes = []
+    for provider in providers:
+        try:
+            outcomes.append((provider.enrich(entity), None))
+        except Exception as exc:
+            log.exception("Provider %s failed for company/%s", provider.name, entity.get("id"))
+            outcomes.append((None, str(exc)))
+    return outcomes
+
+
+def enrich_new_companies(*, workers: int | None = None) -> dict:
     """Find companies with a domain but no completed enrichment run, and enrich them.
 
     Failed enrichment runs are retried (only ``status='completed'`` is excluded).
+    Companies are enriched concurrently by *workers* threads (default
+    ``config.ENRICH_WORKERS``) that only run the providers' network fetches;
+    run bookkeeping and entity updates stay on the calling thread.  At most
+    one company per website host is in flight at a time.
+
+    Progress lives in ``enrichment_runs``: an interrupted batch leaves its
+    finished companies completed, and the next call resumes with the rest.
+    Companies with a run started by another batch within ``STALE_RUN_AFTER``
+    are skipped.
 
     Returns a stats dict: ``{"found": N, "enriched": N, "failed": N}``.
     """
     # Import here to trigger provider auto-registration
     from . import website_scraper  # noqa: F401
 
+    stale = _fail_stale_runs()
+    if stale:
+        log.info("Marked %d interrupted enrichment runs as failed", stale)
+
     with get_connection() as conn:
         rows = conn.execute(
             """SELECT c.* FROM companies c
@@ -428,15 +513,35 @@ def enrich_new_companies() -> dict:
                  AND c.domain IS NOT NULL AND c.domain != ''
                  AND c.id NOT IN (
                      SELECT DISTINCT entity_id FROM enrichment_runs
-                     WHERE entity_type = 'company' AND status = 'completed'
-                 )""",
+                     WHERE entity_type = 'company'
+                       AND status IN ('completed', 'pending', 'running')
+                 )
+               ORDER BY c.created_at, c.id""",
         ).fetchall()
 
     companies = [dict(r) for r in rows]
     stats = {"found": len(companies), "enriched": 0, "failed": 0}
-
+    if not companies:
+        log.info("Batch enrichment complete: %s", stats)
+        return stats
+
+    providers = [p for p in list_providers() if "company" in p.entity_types]
+    if not providers:
+        stats["failed"] = len(companies)
+        log.warning("Batch enrichment skipped: no providers available")
+        return stats
+
+    workers = workers or config.ENRICH_WORKERS
+    # One queue per website host; *ready* holds the hosts with queued
+    # companies and none in flight, so each pick is O(1)
+    queues: dict[str, deque] = {}
     for company in companies:
-        result = execute_enrichment("company", company["id"])
+        queues.setdefault(_company_host(company) or company["id"], deque()).append(company)
+    ready = deque(queues)
+    # future -> (company, host, [(provider, run_id)], entity)
+    in_flight: dict = {}
+
+    def _record(company: dict, result: dict) -> None:
         if result["status"] == "completed":
             stats["enriched"] += 1
         else:
@@ -446,5 +551,64 @@ def enrich_new_companies() -> dict:
                 company["name"], company["id"], result.get("error"),
             )
 
+    def _release(host: str) -> None:
+        if queues[host]:
+            ready.append(host)
+        else:
+            del queues[host]
+
+    def _finish_company(company: dict, runs: list, entity: dict, outcomes: list) -> dict:
+        result = None
+        for i, ((provider, run_id), (field_values, error)) in enumerate(zip(runs, outcomes)):
+            if error is not None:
+                _update_run_status(run_id, "failed", error)
+                result = _failed_result(run_id, error)
+                continue
+            try:
+                result = _finish_run(
+                    run_id, "company", company["id"], entity, provider, field_values,
+                )
+            except Exception as exc:
+                log.exception("Storing enrichment failed for company/%s", company["id"])
+                # Fail this run and the ones not reached yet
+                for _provider, rest_id in runs[i:]:
+                    _update_run_status(rest_id, "failed", str(exc))
+                return _failed_result(run_id, str(exc))
+        return result
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+    try:
+        while ready or in_flight:
+            # Fill free worker slots with the next company of an idle host
+            while ready and len(in_flight) < workers:
+                host = ready.popleft()
+                company = queues[host].popleft()
+                runs = []
+                entity = None
+                for provider in providers:
+                    run_id, entity = _begin_run("company", company["id"], provider)
+                    runs.append((provider, run_id))
+                if entity is None:
+                    _record(company, _failed_result(runs[-1][1], "Entity not found"))
+                    _release(host)
+                    continue
+                future = pool.submit(_enrich_entity, providers, entity)
+                in_flight[future] = (company, host, runs, entity)
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                company, host, runs, entity = in_flight.pop(future)
+                _release(host)
+                # Like execute_enrichment, the last provider decides the outcome
+                _record(company, _finish_company(company, runs, entity, future.result()))
+    except BaseException:
+        # Don't leave runs "running": fail them so the next batch retries
+        for _company, _host, runs, _entity in in_flight.values():
+            for _provider, run_id in runs:
+                _update_run_status(run_id, "failed", "Interrupted")
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
     log.info("Batch enrichment complete: %s", stats)
     return stats
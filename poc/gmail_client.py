@@ -7,6 +7,7 @@ import email.utils
 import html as html_mod
 import logging
 import re
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from email.header import decode_header
 from email.mime.base import MIMEBase
@@ -15,9 +16,9 @@ from email.mime.text import MIMEText
 from email import encoders
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 
 from . import config
+from .google_clients import get_service
 from .models import ParsedEmail
 from .rate_limiter import RateLimiter
 
@@ -174,9 +175,54 @@ def _parse_message(msg: dict) -> ParsedEmail:
     )
 
 
+def _execute_batched(
+    service,
+    requests: list[tuple[str, object]],
+    rate_limiter: RateLimiter | None = None,
+    batch_size: int | None = None,
+) -> dict[str, dict]:
+    """Execute Gmail API requests as HTTP batch calls.
+
+    *requests* is a list of ``(key, HttpRequest)`` pairs.  Requests are sent
+    in batches of ``config.GMAIL_BATCH_SIZE`` so one round trip retrieves
+    many resources.  Every sub-request still consumes a rate-limiter token,
+    since Gmail quota is charged per sub-request.
+
+    Returns a dict mapping key -> response.  Failed sub-requests are logged
+    and omitted; duplicate keys are fetched once.
+    """
+    batch_size = batch_size or config.GMAIL_BATCH_SIZE
+    results: dict[str, dict] = {}
+
+    def _callback(request_id: str, response: dict, exception: Exception | None) -> None:
+        if exception is not None:
+            log.warning("Failed to fetch %s: %s", request_id, exception)
+            return
+        results[request_id] = response
+
+    unique: dict[str, object] = {}
+    for key, request in requests:
+        unique.setdefault(key, request)
+    pending = list(unique.items())
+
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        batch = service.new_batch_http_request(callback=_callback)
+        for key, request in chunk:
+            if rate_limiter:
+                rate_limiter.acquire()
+            batch.add(request, request_id=key)
+        try:
+            batch.execute()
+        except Exception as exc:
+            log.warning("Batch request failed (%d items): %s", len(chunk), exc)
+
+    return results
+
+
 def get_user_email(creds: Credentials) -> str:
     """Return the authenticated user's email address from the Gmail profile."""
-    service = build("gmail", "v1", credentials=creds)
+    service = get_service("gmail", "v1", creds)
     profile = service.users().getProfile(userId="me").execute()
     return profile["emailAddress"].lower()
 
@@ -193,8 +239,11 @@ def fetch_threads(
     Returns (threads, next_page_token) where threads is a list of threads,
     each thread being a list of ParsedEmail sorted by date ascending.
     The next_page_token can be passed back to continue fetching.
+
+    Full thread bodies are retrieved with Gmail HTTP batch requests
+    (``config.GMAIL_BATCH_SIZE`` threads per round trip).
     """
-    service = build("gmail", "v1", credentials=creds)
+    service = get_service("gmail", "v1", creds)
     query = query or config.GMAIL_QUERY
     max_threads = max_threads or config.GMAIL_MAX_THREADS
 
@@ -228,33 +277,31 @@ def fetch_threads(
 
     log.info("Found %d threads matching query: %s", len(thread_ids), query)
 
-    # Step 2: Fetch full thread data
+    # Step 2: Fetch full thread data in HTTP batches
     threads: list[list[ParsedEmail]] = []
+    responses = _execute_batched(
+        service,
+        [
+            (tid, service.users().threads().get(userId="me", id=tid, format="full"))
+            for tid in thread_ids
+        ],
+        rate_limiter=rate_limiter,
+    )
     for tid in thread_ids:
-        try:
-            if rate_limiter:
-                rate_limiter.acquire()
-
-            thread_data = (
-                service.users()
-                .threads()
-                .get(userId="me", id=tid, format="full")
-                .execute()
-            )
+        thread_data = responses.get(tid)
+        if thread_data is None:
+            continue
 
-            emails = []
-            for msg in thread_data.get("messages", []):
-                try:
-                    emails.append(_parse_message(msg))
-                except Exception as exc:
-                    log.warning("Failed to parse message %s: %s", msg.get("id"), exc)
+        emails = []
+        for msg in thread_data.get("messages", []):
+            try:
+                emails.append(_parse_message(msg))
+            except Exception as exc:
+                log.warning("Failed to parse message %s: %s", msg.get("id"), exc)
 
-            # Sort by date ascending
-            emails.sort(key=lambda e: e.date or datetime.min.replace(tzinfo=timezone.utc))
-            threads.append(emails)
-
-        except Exception as exc:
-            log.warning("Failed to fetch thread %s: %s", tid, exc)
+        # Sort by date ascending
+        emails.sort(key=lambda e: e.date or datetime.min.replace(tzinfo=timezone.utc))
+        threads.append(emails)
 
     log.info("Fetched %d threads with %d total messages",
              len(threads), sum(len(t) for t in threads))
@@ -263,23 +310,46 @@ def fetch_threads(
 
 def get_history_id(creds: Credentials) -> str:
     """Return the current Gmail historyId for the authenticated user."""
-    service = build("gmail", "v1", credentials=creds)
+    service = get_service("gmail", "v1", creds)
     profile = service.users().getProfile(userId="me").execute()
     return str(profile["historyId"])
 
 
-def fetch_history(
+@dataclass
+class HistoryChanges:
+    """Net mailbox changes reported by ``users.history.list``.
+
+    ``added`` holds message IDs in first-seen order, without duplicates and
+    without messages deleted later in the same window.  ``labels`` maps a
+    message ID to its most recent full label set, as carried by the
+    messageAdded / labelAdded / labelRemoved records themselves.
+    """
+
+    added: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    labels: dict[str, list[str]] = field(default_factory=dict)
+
+
+def fetch_history_changes(
     creds: Credentials,
     start_history_id: str,
     rate_limiter: RateLimiter | None = None,
-) -> tuple[list[str], list[str]]:
-    """Fetch Gmail history changes since start_history_id.
+    *,
+    labels: bool = True,
+) -> HistoryChanges:
+    """Fetch Gmail history since start_history_id, folded into net changes.
 
-    Returns (added_message_ids, deleted_message_ids).
+    With *labels* set, label-change records are requested too, so read-state
+    changes can be applied without fetching any message.
     """
-    service = build("gmail", "v1", credentials=creds)
-    added: list[str] = []
-    deleted: list[str] = []
+    service = get_service("gmail", "v1", creds)
+    history_types = ["messageAdded", "messageDeleted"]
+    if labels:
+        history_types += ["labelAdded", "labelRemoved"]
+
+    added: dict[str, None] = {}
+    deleted: dict[str, None] = {}
+    label_sets: dict[str, list[str]] = {}
     page_token: str | None = None
 
     while True:
@@ -290,7 +360,7 @@ def fetch_history(
             params: dict = {
                 "userId": "me",
                 "startHistoryId": start_history_id,
-                "historyTypes": ["messageAdded", "messageDeleted"],
+                "historyTypes": history_types,
             }
             if page_token:
                 params["pageToken"] = page_token
@@ -301,22 +371,68 @@ def fetch_history(
             break
 
         for record in result.get("history", []):
-            for msg_added in record.get("messagesAdded", []):
-                mid = msg_added.get("message", {}).get("id")
-                if mid:
-                    added.append(mid)
+            for key in ("messagesAdded", "labelsAdded", "labelsRemoved"):
+                for change in record.get(key, []):
+                    msg = change.get("message", {})
+                    mid = msg.get("id")
+                    if not mid:
+                        continue
+                    if key == "messagesAdded":
+                        added[mid] = None
+                        deleted.pop(mid, None)
+                    if "labelIds" in msg:
+                        label_sets[mid] = msg["labelIds"]
             for msg_deleted in record.get("messagesDeleted", []):
                 mid = msg_deleted.get("message", {}).get("id")
                 if mid:
-                    deleted.append(mid)
+                    deleted[mid] = None
+                    added.pop(mid, None)
+                    label_sets.pop(mid, None)
 
         page_token = result.get("nextPageToken")
         if not page_token:
             break
 
-    log.info("History since %s: %d added, %d deleted",
-             start_history_id, len(added), len(deleted))
-    return added, deleted
+    changes = HistoryChanges(
+        added=list(added), deleted=list(deleted), labels=label_sets,
+    )
+    log.info("History since %s: %d added, %d deleted, %d with labels",
+             start_history_id, len(changes.added), len(changes.deleted),
+             len(changes.labels))
+    return changes
+
+
+def fetch_history(
+    creds: Credentials,
+    start_history_id: str,
+    rate_limiter: RateLimiter | None = None,
+) -> tuple[list[str], list[str]]:
+    """Fetch Gmail history changes since start_history_id.
+
+    Returns (added_message_ids, deleted_message_ids).
+    """
+    changes = fetch_history_changes(
+        creds, start_history_id, rate_limiter=rate_limiter, labels=False,
+    )
+    return changes.added, changes.deleted
+
+
+def fetch_message_labels(
+    creds: Credentials,
+    message_ids: list[str],
+    rate_limiter: RateLimiter | None = None,
+) -> dict[str, list[str]]:
+    """Return each message's label IDs using ``format=minimal`` (no headers or body)."""
+    service = get_service("gmail", "v1", creds)
+    responses = _execute_batched(
+        service,
+        [
+            (mid, service.users().messages().get(userId="me", id=mid, format="minimal"))
+            for mid in message_ids
+        ],
+        rate_limiter=rate_limiter,
+    )
+    return {mid: msg.get("labelIds", []) for mid, msg in responses.items()}
 
 
 def fetch_messages(
@@ -326,25 +442,28 @@ def fetch_messages(
 ) -> list[ParsedEmail]:
     """Fetch full message data for a list of message IDs.
 
-    Returns parsed emails (skips failures).
+    Uses the same batched retrieval as ``fetch_threads``.
+    Returns parsed emails in input order (skips failures).
     """
-    service = build("gmail", "v1", credentials=creds)
+    service = get_service("gmail", "v1", creds)
     emails: list[ParsedEmail] = []
 
+    responses = _execute_batched(
+        service,
+        [
+            (mid, service.users().messages().get(userId="me", id=mid, format="full"))
+            for mid in message_ids
+        ],
+        rate_limiter=rate_limiter,
+    )
     for mid in message_ids:
+        msg = responses.get(mid)
+        if msg is None:
+            continue
         try:
-            if rate_limiter:
-                rate_limiter.acquire()
-
-            msg = (
-                service.users()
-                .messages()
-                .get(userId="me", id=mid, format="full")
-                .execute()
-            )
             emails.append(_parse_message(msg))
         except Exception as exc:
-            log.warning("Failed to fetch message %s: %s", mid, exc)
+            log.warning("Failed to parse message %s: %s", mid, exc)
 
     log.info("Fetched %d/%d messages", len(emails), len(message_ids))
     return emails
@@ -413,7 +532,7 @@ def send_message(
     raw = base64.urlsafe_b64encode(msg.as_bytes()).decode("ascii")
 
     # Send via Gmail API
-    service = build("gmail", "v1", credentials=creds)
+    service = get_service("gmail", "v1", creds)
     send_body: dict = {"raw": raw}
     if thread_id:
         send_body["threadId"] = thread_id
@@ -0,0 +1,80 @@
+"""Per-account registry of built Google API service objects.
+
+``googleapiclient.discovery.build`` parses the API's discovery document and
+generates the resource methods on every call, which costs far more than the
+request that usually follows it.  ``get_service`` builds each
+(credentials, API, version) service once and hands the same object back
+afterwards.  Builds always use the discovery documents bundled with
+``google-api-python-client`` (``static_discovery=True``), so no discovery
+request ever goes over the network.
+
+httplib2 connections are not thread-safe, so the registry is per thread:
+each thread owns one ``httplib2.Http`` — its keep-alive connection pool —
+shared by every account and API that thread talks to, and each account's
+service wraps that pool in an ``AuthorizedHttp`` bound to its credentials.
+Services are keyed weakly on the credentials object, which
+``auth.get_credentials_for_account`` caches per token file, so a re-authorized
+account gets fresh services.  The cached ``AuthorizedHttp`` holds only a weak
+proxy to its credentials — a strong one would keep the registry's own key
+alive — so once ``auth`` replaces or forgets a credential and its callers are
+done with it, the entry and its services are released.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+
+import google_auth_httplib2
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+
+_local = threading.local()
+
+
+def _registry() -> weakref.WeakKeyDictionary:
+    registry = getattr(_local, "services", None)
+    if registry is None:
+        registry = _local.services = weakref.WeakKeyDictionary()
+    return registry
+
+
+def _http_pool():
+    """This thread's shared httplib2 connection pool."""
+    http = getattr(_local, "http", None)
+    if http is None:
+        http = _local.http = build_http()
+    return http
+
+
+def get_service(api: str, version: str, creds: Credentials):
+    """Return the cached *api*/*version* service for *creds*, building it once per thread."""
+    registry = _registry()
+    services = registry.get(creds)
+    if services is None:
+        services = registry[creds] = {}
+    service = services.get((api, version))
+    if service is None:
+        http = google_auth_httplib2.AuthorizedHttp(
+            weakref.proxy(creds), http=_http_pool(),
+        )
+        service = build(
+            api, version, http=http,
+            static_discovery=True, cache_discovery=False,
+        )
+        services[(api, version)] = service
+    return service
+
+
+def clear() -> None:
+    """Drop this thread's cached services and close its connection pool."""
+    _local.services = None
+    http = getattr(_local, "http", None)
+    _local.http = None
+    if http is not None:
+        for conn in list(getattr(http, "connections", {}).values()):
+            try:
+                conn.close()
+            except Exception:
+                pass
@@ -6,7 +6,9 @@ import uuid
 from datetime import datetime, timezone
 
 from .database import get_connection
+from .domain_resolver import normalize_domain
 from .models import Company, CompanyHierarchy, CompanyIdentifier, Project, Topic, User
+from .session import invalidate_user_sessions
 
 
 # ---------------------------------------------------------------------------
@@ -228,6 +230,8 @@ def update_user(user_id: str, **fields) -> dict | None:
         row = conn.execute(
             "SELECT * FROM users WHERE id = ?", (user_id,)
         ).fetchone()
+    # Cached sessions carry the user's name, role and active flag
+    invalidate_user_sessions(user_id)
     return dict(row) if row else None
 
 
@@ -260,11 +264,12 @@ def create_company(
         row = company.to_row(created_by=created_by, updated_by=created_by)
         row["customer_id"] = customer_id
         conn.execute(
-            "INSERT INTO companies (id, name, domain, industry, description, "
-            "status, customer_id, created_by, updated_by, created_at, updated_at) "
-            "VALUES (:id, :name, :domain, :industry, :description, "
+            "INSERT INTO companies (id, name, domain, normalized_domain, industry, "
+            "description, status, customer_id, created_by, updated_by, created_at, "
+            "updated_at) "
+            "VALUES (:id, :name, :domain, :normalized_domain, :industry, :description, "
             ":status, :customer_id, :created_by, :updated_by, :created_at, :updated_at)",
-            row,
+            {**row, "normalized_domain": normalize_domain(row.get("domain"))},
         )
 
         # Auto-add domain to company_identifiers if it's a non-public domain
@@ -339,6 +344,8 @@ def update_company(company_id: str, **fields) -> dict | None:
     if not updates:
         return None
     now = datetime.now(timezone.utc).isoformat()
+    if "domain" in updates:
+        updates["normalized_domain"] = normalize_domain(updates["domain"])
     updates["updated_at"] = now
     set_clause = ", ".join(f"{k} = ?" for k in updates)
     values = list(updates.values()) + [company_id]
@@ -406,13 +413,15 @@ def add_company_identifier(
         is_primary=is_primary, source=source,
     )
     row = ci.to_row()
+    normalized = normalize_domain(value) if type == "domain" else None
     with get_connection() as conn:
         conn.execute(
             "INSERT INTO company_identifiers "
-            "(id, company_id, type, value, is_primary, source, created_at, updated_at) "
-            "VALUES (:id, :company_id, :type, :value, :is_primary, :source, "
-            ":created_at, :updated_at)",
-            row,
+            "(id, company_id, type, value, normalized_domain, is_primary, source, "
+            "created_at, updated_at) "
+            "VALUES (:id, :company_id, :type, :value, :normalized_domain, :is_primary, "
+            ":source, :created_at, :updated_at)",
+            {**row, "normalized_domain": normalized},
         )
     return row
 
@@ -0,0 +1,145 @@
+"""On-disk HTTP response cache for the website scraper.
+
+Entries are keyed by URL and keep the response status, the validators
+needed for conditional revalidation (``ETag`` / ``Last-Modified``), and a
+small text payload: the body for robots.txt, or the JSON-encoded field
+values extracted from an HTML page.  Full page bodies are never stored.
+
+Non-200 statuses are cached too (negative caching), so probe paths that
+404 are not requested again until the entry expires.
+
+The cache lives in its own SQLite file so scraper worker threads never
+write to the CRM database.  Entries not fetched or revalidated within the
+cache's *ttl* are deleted when it is opened and, in long-running processes,
+at most once per ``_SWEEP_INTERVAL`` on write.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url           TEXT PRIMARY KEY,
+    status        INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    kind          TEXT,
+    payload       TEXT,
+    fetched_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_http_cache_fetched ON http_cache(fetched_at);
+"""
+
+_SWEEP_INTERVAL = 3600
+
+
+@dataclass
+class CacheEntry:
+    """A cached response for one URL."""
+
+    url: str
+    status: int
+    etag: str | None
+    last_modified: str | None
+    kind: str | None
+    payload: str | None
+    fetched_at: float
+
+    def age(self) -> float:
+        """Seconds since the entry was fetched or last revalidated."""
+        return time.time() - self.fetched_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """URL-keyed response cache backed by a SQLite file. Safe to share between threads."""
+
+    def __init__(self, path: Path, *, ttl: float | None = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._last_sweep = 0.0
+        with self._lock:
+            self._sweep()
+            self._conn.commit()
+
+    def _sweep(self) -> int:
+        """Delete entries older than the TTL. Caller holds the lock."""
+        self._last_sweep = time.time()
+        if not self.ttl:
+            return 0
+        cur = self._conn.execute(
+            "DELETE FROM http_cache WHERE fetched_at < ?",
+            (self._last_sweep - self.ttl,),
+        )
+        return cur.rowcount
+
+    def get(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, etag, last_modified, kind, payload, fetched_at "
+                "FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def put(
+        self,
+        url: str,
+        status: int,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        kind: str | None = None,
+        payload: str | None = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, status, etag, last_modified, kind, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, status, etag, last_modified, kind, payload, time.time()),
+            )
+            if time.time() - self._last_sweep >= _SWEEP_INTERVAL:
+                self._sweep()
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET fetched_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def default_cache_path() -> Path:
+    """``POC_HTTP_CACHE_PATH``, or ``http_cache.db`` next to the CRM database."""
+    if config.HTTP_CACHE_PATH:
+        return Path(config.HTTP_CACHE_PATH)
+    return Path(config.DB_PATH).with_name("http_cache.db")
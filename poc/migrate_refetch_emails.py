@@ -14,7 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from poc import config
 from poc.auth import get_credentials
 from poc.database import get_connection
-from poc.email_parser import strip_quotes
+from poc.email_parser import clean_pool, strip_quotes_many
 from poc.gmail_client import fetch_messages
 from poc.rate_limiter import RateLimiter
 
@@ -31,7 +31,7 @@ def migrate():
 
     rate_limiter = RateLimiter(rate=config.GMAIL_RATE_LIMIT)
 
-    with get_connection() as conn:
+    with get_connection() as conn, clean_pool() as pool:
         cursor = conn.cursor()
 
         # Get all communications with their Gmail message IDs
@@ -46,7 +46,9 @@ def migrate():
 
         updated = 0
         failed = 0
-        batch_size = 50
+        # fetch_messages splits each slice into Gmail HTTP batches; a larger
+        # slice keeps every clean worker busy
+        batch_size = 500
 
         # Process in batches
         for i in range(0, len(emails), batch_size):
@@ -64,23 +66,20 @@ def migrate():
             # Create lookup by message ID
             parsed_by_id = {e.message_id: e for e in parsed_emails}
 
+            found = [(db_id, parsed_by_id[msg_id]) for db_id, msg_id, _ in batch
+                     if msg_id in parsed_by_id]
+            failed += len(batch) - len(found)
+            new_bodies = strip_quotes_many(
+                ((parsed.body_plain or "", parsed.body_html) for _, parsed in found),
+                pool=pool,
+            )
+
             # Update each email
-            for db_id, msg_id, subject in batch:
-                if msg_id not in parsed_by_id:
-                    failed += 1
-                    continue
-
-                parsed = parsed_by_id[msg_id]
-                new_body = strip_quotes(
-                    parsed.body_plain or "",
-                    parsed.body_html or None,
-                )
-
-                cursor.execute(
-                    "UPDATE communications SET original_text = ? WHERE id = ?",
-                    (new_body, db_id)
-                )
-                updated += 1
+            cursor.executemany(
+                "UPDATE communications SET original_text = ? WHERE id = ?",
+                [(new_body, db_id) for (db_id, _), new_body in zip(found, new_bodies)],
+            )
+            updated += len(found)
 
             print(f"  Processed {min(i + batch_size, len(emails))}/{len(emails)} emails...")
 
@@ -8,12 +8,12 @@ from pathlib import Path
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from poc.email_parser import strip_quotes
+from poc.email_parser import clean_pool, strip_quotes_many
 from poc.database import get_connection
 
 
 def migrate():
-    """Re-process all email bodies through strip_quotes."""
+    """Re-process all email bodies through strip_quotes (in a process pool)."""
     with get_connection() as conn:
         cursor = conn.cursor()
 
@@ -23,13 +23,14 @@ def migrate():
 
         print(f"Processing {len(communications)} communications...")
 
-        updated = 0
-        for email_id, body, original_html in communications:
-            if not body:
-                continue
-
-            stripped = strip_quotes(body, original_html or None)
+        rows = [(email_id, body, html) for email_id, body, html in communications if body]
+        with clean_pool() as pool:
+            stripped_bodies = strip_quotes_many(
+                ((body, html) for _, body, html in rows), pool=pool,
+            )
 
+        updated = 0
+        for (email_id, body, _), stripped in zip(rows, stripped_bodies):
             # Only update if content changed
             if stripped != body:
                 cursor.execute(
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Migrate the CRMExtender database from v19 to v20.
+
+Denormalizes each contact's primary identifiers so the contact grid can
+sort and filter on plain columns instead of per-row correlated subqueries:
+- contacts gains primary_email, primary_phone, primary_address
+- indexes on primary_email / primary_phone
+- triggers on contact_identifiers, phone_numbers and addresses keep the
+  columns current
+- existing contacts are backfilled
+
+Usage:
+    python3 -m poc.migrate_to_v20 [--db PATH] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DB = Path("data/crm_extender.db")
+
+_PRIMARY_EMAIL_SQL = (
+    "(SELECT ci.value FROM contact_identifiers ci "
+    "WHERE ci.contact_id = contacts.id AND ci.type = 'email' "
+    "ORDER BY ci.is_primary DESC, ci.created_at ASC LIMIT 1)"
+)
+_PRIMARY_PHONE_SQL = (
+    "(SELECT pn.number FROM phone_numbers pn "
+    "WHERE pn.entity_type = 'contact' AND pn.entity_id = contacts.id "
+    "AND pn.is_current = 1 ORDER BY pn.created_at ASC LIMIT 1)"
+)
+_PRIMARY_ADDRESS_SQL = (
+    "(SELECT a.street FROM addresses a "
+    "WHERE a.entity_type = 'contact' AND a.entity_id = contacts.id "
+    "AND a.is_current = 1 ORDER BY a.created_at ASC LIMIT 1)"
+)
+
+# (column, value subquery, source table, contact id column, row filter,
+#  columns whose update can change the value)
+_SOURCES = [
+    ("primary_email", _PRIMARY_EMAIL_SQL, "contact_identifiers", "contact_id",
+     "{row}.type = 'email'", "contact_id, type, value, is_primary, created_at"),
+    ("primary_phone", _PRIMARY_PHONE_SQL, "phone_numbers", "entity_id",
+     "{row}.entity_type = 'contact'",
+     "entity_type, entity_id, number, is_current, created_at"),
+    ("primary_address", _PRIMARY_ADDRESS_SQL, "addresses", "entity_id",
+     "{row}.entity_type = 'contact'",
+     "entity_type, entity_id, street, is_current, created_at"),
+]
+
+
+def migrate(db_path: Path, *, dry_run: bool = False) -> None:
+    """Run the full v19 -> v20 migration."""
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    backup_path = db_path.with_suffix(
+        f".v19-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    )
+    print(f"Backing up to {backup_path}...")
+    shutil.copy2(str(db_path), str(backup_path))
+    print(f"  Backup created ({backup_path.stat().st_size:,} bytes)")
+
+    if dry_run:
+        db_path = backup_path
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        _run_migration(conn)
+        conn.commit()
+        print("\nMigration committed successfully.")
+    except Exception:
+        conn.rollback()
+        print("\nMigration FAILED — rolled back.")
+        raise
+    finally:
+        conn.close()
+
+    if dry_run:
+        print(f"\nDry run complete. Changes applied to backup: {backup_path}")
+        print("Production database was NOT modified.")
+    else:
+        print(f"\nProduction database migrated. Backup at: {backup_path}")
+
+
+def _run_migration(conn: sqlite3.Connection) -> None:
+    """Execute all migration steps in order."""
+    # -------------------------------------------------------------------
+    # Step 1: Add primary-identifier columns to contacts
+    # -------------------------------------------------------------------
+    c_cols = {r[1] for r in conn.execute("PRAGMA table_info(contacts)")}
+    for column, *_ in _SOURCES:
+        if column not in c_cols:
+            print(f"\nStep 1: Adding {column} to contacts...")
+            conn.execute(f"ALTER TABLE contacts ADD COLUMN {column} TEXT")
+            print("  Done.")
+        else:
+            print(f"\nStep 1: {column} already exists, skipping.")
+
+    # -------------------------------------------------------------------
+    # Step 2: Indexes
+    # -------------------------------------------------------------------
+    print("\nStep 2: Creating indexes...")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_primary_email "
+        "ON contacts(primary_email COLLATE NOCASE)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_primary_phone "
+        "ON contacts(primary_phone)"
+    )
+    print("  Done.")
+
+    # -------------------------------------------------------------------
+    # Step 3: Maintenance triggers
+    # -------------------------------------------------------------------
+    print("\nStep 3: Creating maintenance triggers...")
+    for column, value_sql, table, id_col, row_filter, watched in _SOURCES:
+        refresh = f"UPDATE contacts SET {column} = {value_sql}"
+        new_f, old_f = row_filter.format(row="NEW"), row_filter.format(row="OLD")
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{column}_ins AFTER INSERT ON {table} "
+            f"WHEN {new_f} BEGIN {refresh} WHERE id = NEW.{id_col}; END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{column}_del AFTER DELETE ON {table} "
+            f"WHEN {old_f} BEGIN {refresh} WHERE id = OLD.{id_col}; END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{column}_upd "
+            f"AFTER UPDATE OF {watched} ON {table} "
+            f"WHEN {new_f} OR {old_f} "
+            f"BEGIN {refresh} WHERE id IN (NEW.{id_col}, OLD.{id_col}); END"
+        )
+    print("  Done.")
+
+    # -------------------------------------------------------------------
+    # Step 4: Backfill existing contacts
+    # -------------------------------------------------------------------
+    print("\nStep 4: Backfilling primary identifiers...")
+    cur = conn.execute(
+        f"UPDATE contacts SET primary_email = {_PRIMARY_EMAIL_SQL}, "
+        f"primary_phone = {_PRIMARY_PHONE_SQL}, "
+        f"primary_address = {_PRIMARY_ADDRESS_SQL}"
+    )
+    print(f"  {cur.rowcount} contacts updated.")
+
+    # -------------------------------------------------------------------
+    # Step 5: Bump schema version
+    # -------------------------------------------------------------------
+    print("\nStep 5: Bumping schema version to 20...")
+    conn.execute("PRAGMA user_version = 20")
+    print("  Schema version set to 20.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrate CRMExtender database from v19 to v20.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB,
+        help=f"Path to database (default: {DEFAULT_DB})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Run on a backup copy; do not modify production database.",
+    )
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
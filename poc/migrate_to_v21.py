@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Migrate the CRMExtender database from v20 to v21.
+
+Materializes conversation visibility so conversation lists, counts and
+search probe one indexed table instead of joining
+conversation_communications -> communications -> user_provider_accounts
+per row:
+- conversation_visibility(user_id, conversation_id) table
+- triggers on conversation_communications, communications.account_id,
+  user_provider_accounts and conversation_shares keep it current
+- existing visibility is backfilled
+- composite (entity, visibility) indexes on user_contacts / user_companies
+
+Usage:
+    python3 -m poc.migrate_to_v21 [--db PATH] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DB = Path("data/crm_extender.db")
+
+_VISIBLE_SQL = (
+    "(EXISTS (SELECT 1 FROM conversation_communications cc "
+    "JOIN communications comm ON comm.id = cc.communication_id "
+    "JOIN user_provider_accounts upa ON upa.account_id = comm.account_id "
+    "WHERE cc.conversation_id = conversation_visibility.conversation_id "
+    "AND upa.user_id = conversation_visibility.user_id) "
+    "OR EXISTS (SELECT 1 FROM conversation_shares cs "
+    "WHERE cs.conversation_id = conversation_visibility.conversation_id "
+    "AND cs.user_id = conversation_visibility.user_id))"
+)
+
+_PRUNE = (
+    "DELETE FROM conversation_visibility WHERE {where} "
+    f"AND NOT {_VISIBLE_SQL};"
+)
+_COMM_CONVERSATIONS = (
+    "conversation_id IN (SELECT conversation_id FROM conversation_communications "
+    "WHERE communication_id = NEW.id)"
+)
+_SHARE_PAIR = "user_id = OLD.user_id AND conversation_id = OLD.conversation_id"
+
+_GRANT_COMM = (
+    "INSERT INTO conversation_visibility (user_id, conversation_id) "
+    "SELECT upa.user_id, {row}.conversation_id FROM communications comm "
+    "JOIN user_provider_accounts upa ON upa.account_id = comm.account_id "
+    "WHERE comm.id = {row}.communication_id ON CONFLICT DO NOTHING;"
+)
+_GRANT_ACCOUNT = (
+    "INSERT INTO conversation_visibility (user_id, conversation_id) "
+    "SELECT {row}.user_id, cc.conversation_id FROM communications comm "
+    "JOIN conversation_communications cc ON cc.communication_id = comm.id "
+    "WHERE comm.account_id = {row}.account_id ON CONFLICT DO NOTHING;"
+)
+
+_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_cc_ins AFTER INSERT ON conversation_communications
+    BEGIN {_GRANT_COMM.format(row="NEW")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_cc_del AFTER DELETE ON conversation_communications
+    BEGIN {_PRUNE.format(where="conversation_id = OLD.conversation_id")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_cc_upd
+    AFTER UPDATE OF conversation_id, communication_id ON conversation_communications
+    WHEN OLD.conversation_id IS NOT NEW.conversation_id
+      OR OLD.communication_id IS NOT NEW.communication_id
+    BEGIN
+        {_PRUNE.format(where="conversation_id = OLD.conversation_id")}
+        {_GRANT_COMM.format(row="NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_comm_account
+    AFTER UPDATE OF account_id ON communications
+    WHEN OLD.account_id IS NOT NEW.account_id
+    BEGIN
+        {_PRUNE.format(where=_COMM_CONVERSATIONS)}
+        INSERT INTO conversation_visibility (user_id, conversation_id)
+        SELECT upa.user_id, cc.conversation_id FROM conversation_communications cc
+        JOIN user_provider_accounts upa ON upa.account_id = NEW.account_id
+        WHERE cc.communication_id = NEW.id ON CONFLICT DO NOTHING;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_upa_ins AFTER INSERT ON user_provider_accounts
+    BEGIN {_GRANT_ACCOUNT.format(row="NEW")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_upa_del AFTER DELETE ON user_provider_accounts
+    BEGIN {_PRUNE.format(where="user_id = OLD.user_id")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_upa_upd
+    AFTER UPDATE OF user_id, account_id ON user_provider_accounts
+    WHEN OLD.user_id IS NOT NEW.user_id OR OLD.account_id IS NOT NEW.account_id
+    BEGIN
+        {_PRUNE.format(where="user_id = OLD.user_id")}
+        {_GRANT_ACCOUNT.format(row="NEW")}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_cv_share_ins AFTER INSERT ON conversation_shares
+    BEGIN
+        INSERT INTO conversation_visibility (user_id, conversation_id)
+        VALUES (NEW.user_id, NEW.conversation_id) ON CONFLICT DO NOTHING;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_cv_share_del AFTER DELETE ON conversation_shares
+    BEGIN {_PRUNE.format(where=_SHARE_PAIR)} END""",
+]
+
+
+def migrate(db_path: Path, *, dry_run: bool = False) -> None:
+    """Run the full v20 -> v21 migration."""
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    backup_path = db_path.with_suffix(
+        f".v20-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    )
+    print(f"Backing up to {backup_path}...")
+    shutil.copy2(str(db_path), str(backup_path))
+    print(f"  Backup created ({backup_path.stat().st_size:,} bytes)")
+
+    if dry_run:
+        db_path = backup_path
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        _run_migration(conn)
+        conn.commit()
+        print("\nMigration committed successfully.")
+    except Exception:
+        conn.rollback()
+        print("\nMigration FAILED — rolled back.")
+        raise
+    finally:
+        conn.close()
+
+    if dry_run:
+        print(f"\nDry run complete. Changes applied to backup: {backup_path}")
+        print("Production database was NOT modified.")
+    else:
+        print(f"\nProduction database migrated. Backup at: {backup_path}")
+
+
+def _run_migration(conn: sqlite3.Connection) -> None:
+    """Execute all migration steps in order."""
+    # -------------------------------------------------------------------
+    # Step 1: Create conversation_visibility
+    # -------------------------------------------------------------------
+    print("\nStep 1: Creating conversation_visibility table...")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS conversation_visibility (
+            user_id         TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+            PRIMARY KEY (user_id, conversation_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_cv_conversation "
+        "ON conversation_visibility(conversation_id)"
+    )
+    print("  Done.")
+
+    # -------------------------------------------------------------------
+    # Step 2: Maintenance triggers
+    # -------------------------------------------------------------------
+    print("\nStep 2: Creating maintenance triggers...")
+    for sql in _TRIGGERS:
+        conn.execute(sql)
+    print(f"  {len(_TRIGGERS)} triggers in place.")
+
+    # -------------------------------------------------------------------
+    # Step 3: Backfill visibility
+    # -------------------------------------------------------------------
+    print("\nStep 3: Backfilling conversation visibility...")
+    cur = conn.execute("""
+        INSERT OR IGNORE INTO conversation_visibility (user_id, conversation_id)
+        SELECT upa.user_id, cc.conversation_id FROM conversation_communications cc
+        JOIN communications comm ON comm.id = cc.communication_id
+        JOIN user_provider_accounts upa ON upa.account_id = comm.account_id
+        UNION
+        SELECT cs.user_id, cs.conversation_id FROM conversation_shares cs
+    """)
+    print(f"  {cur.rowcount} visibility rows inserted.")
+
+    # -------------------------------------------------------------------
+    # Step 4: Contact / company visibility indexes
+    # -------------------------------------------------------------------
+    print("\nStep 4: Creating visibility indexes...")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_contacts_contact_vis "
+        "ON user_contacts(contact_id, visibility)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_companies_company_vis "
+        "ON user_companies(company_id, visibility)"
+    )
+    print("  Done.")
+
+    # -------------------------------------------------------------------
+    # Step 5: Bump schema version
+    # -------------------------------------------------------------------
+    print("\nStep 5: Bumping schema version to 21...")
+    conn.execute("PRAGMA user_version = 21")
+    print("  Schema version set to 21.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrate CRMExtender database from v20 to v21.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB,
+        help=f"Path to database (default: {DEFAULT_DB})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Run on a backup copy; do not modify production database.",
+    )
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
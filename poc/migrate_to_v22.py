@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Migrate the CRMExtender database from v21 to v22.
+
+Adds the bookkeeping for incremental relationship inference:
+- relationship_inference_queue(contact_id): contacts whose conversation
+  participation changed since the last inference run
+- relationship_inference_state: normalization maxima and run timestamps
+- triggers on conversation_participants that fill the queue
+
+No backfill is needed: the first ``infer-relationships --incremental`` run
+finds no state row and performs a full rebuild.
+
+Usage:
+    python3 -m poc.migrate_to_v22 [--db PATH] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DB = Path("data/crm_extender.db")
+
+_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_rel_queue_cp_ins
+    AFTER INSERT ON conversation_participants
+    WHEN NEW.contact_id IS NOT NULL
+    BEGIN
+        INSERT INTO relationship_inference_queue (contact_id)
+        VALUES (NEW.contact_id) ON CONFLICT DO NOTHING;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_rel_queue_cp_del
+    AFTER DELETE ON conversation_participants
+    WHEN OLD.contact_id IS NOT NULL
+    BEGIN
+        INSERT INTO relationship_inference_queue (contact_id)
+        VALUES (OLD.contact_id) ON CONFLICT DO NOTHING;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_rel_queue_cp_upd
+    AFTER UPDATE OF contact_id, communication_count, first_seen_at, last_seen_at
+    ON conversation_participants
+    BEGIN
+        INSERT INTO relationship_inference_queue (contact_id)
+        SELECT NEW.contact_id WHERE NEW.contact_id IS NOT NULL
+        UNION SELECT OLD.contact_id WHERE OLD.contact_id IS NOT NULL
+    ON CONFLICT DO NOTHING;
+    END""",
+]
+
+
+def migrate(db_path: Path, *, dry_run: bool = False) -> None:
+    """Run the full v21 -> v22 migration."""
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    backup_path = db_path.with_suffix(
+        f".v21-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    )
+    print(f"Backing up to {backup_path}...")
+    shutil.copy2(str(db_path), str(backup_path))
+    print(f"  Backup created ({backup_path.stat().st_size:,} bytes)")
+
+    if dry_run:
+        db_path = backup_path
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        _run_migration(conn)
+        conn.commit()
+        print("\nMigration committed successfully.")
+    except Exception:
+        conn.rollback()
+        print("\nMigration FAILED — rolled back.")
+        raise
+    finally:
+        conn.close()
+
+    if dry_run:
+        print(f"\nDry run complete. Changes applied to backup: {backup_path}")
+        print("Production database was NOT modified.")
+    else:
+        print(f"\nProduction database migrated. Backup at: {backup_path}")
+
+
+def _run_migration(conn: sqlite3.Connection) -> None:
+    """Execute all migration steps in order."""
+    # -------------------------------------------------------------------
+    # Step 1: Queue and state tables
+    # -------------------------------------------------------------------
+    print("\nStep 1: Creating relationship inference tables...")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS relationship_inference_queue (
+            contact_id TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS relationship_inference_state (
+            id                INTEGER PRIMARY KEY CHECK (id = 1),
+            max_conversations INTEGER NOT NULL,
+            max_messages      INTEGER NOT NULL,
+            last_full_run_at  TEXT NOT NULL,
+            last_run_at       TEXT NOT NULL
+        )
+    """)
+    print("  Done.")
+
+    # -------------------------------------------------------------------
+    # Step 2: Queue triggers
+    # -------------------------------------------------------------------
+    print("\nStep 2: Creating queue triggers...")
+    for sql in _TRIGGERS:
+        conn.execute(sql)
+    print(f"  {len(_TRIGGERS)} triggers in place.")
+
+    # -------------------------------------------------------------------
+    # Step 3: Bump schema version
+    # -------------------------------------------------------------------
+    print("\nStep 3: Bumping schema version to 22...")
+    conn.execute("PRAGMA user_version = 22")
+    print("  Schema version set to 22.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrate CRMExtender database from v21 to v22.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB,
+        help=f"Path to database (default: {DEFAULT_DB})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Run on a backup copy; do not modify production database.",
+    )
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Migrate the CRMExtender database from v22 to v23.
+
+Adds a generation counter for the same-name canonical contact map so
+relationship lookups can reuse a cached map instead of rebuilding it:
+- canonical_map_state(generation) single-row table
+- triggers on contacts (insert, delete, rename) that bump the generation
+
+Usage:
+    python3 -m poc.migrate_to_v23 [--db PATH] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DB = Path("data/crm_extender.db")
+
+_BUMP = "UPDATE canonical_map_state SET generation = generation + 1 WHERE id = 1;"
+
+_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_canonical_contact_ins AFTER INSERT ON contacts
+    BEGIN {_BUMP} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_canonical_contact_del AFTER DELETE ON contacts
+    BEGIN {_BUMP} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_canonical_contact_name
+    AFTER UPDATE OF name ON contacts
+    WHEN OLD.name IS NOT NEW.name
+    BEGIN {_BUMP} END""",
+]
+
+
+def migrate(db_path: Path, *, dry_run: bool = False) -> None:
+    """Run the full v22 -> v23 migration."""
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    backup_path = db_path.with_suffix(
+        f".v22-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    )
+    print(f"Backing up to {backup_path}...")
+    shutil.copy2(str(db_path), str(backup_path))
+    print(f"  Backup created ({backup_path.stat().st_size:,} bytes)")
+
+    if dry_run:
+        db_path = backup_path
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        _run_migration(conn)
+        conn.commit()
+        print("\nMigration committed successfully.")
+    except Exception:
+        conn.rollback()
+        print("\nMigration FAILED — rolled back.")
+        raise
+    finally:
+        conn.close()
+
+    if dry_run:
+        print(f"\nDry run complete. Changes applied to backup: {backup_path}")
+        print("Production database was NOT modified.")
+    else:
+        print(f"\nProduction database migrated. Backup at: {backup_path}")
+
+
+def _run_migration(conn: sqlite3.Connection) -> None:
+    """Execute all migration steps in order."""
+    # -------------------------------------------------------------------
+    # Step 1: Generation table
+    # -------------------------------------------------------------------
+    print("\nStep 1: Creating canonical_map_state table...")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS canonical_map_state (
+            id         INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO canonical_map_state (id, generation) VALUES (1, 0)"
+    )
+    print("  Done.")
+
+    # -------------------------------------------------------------------
+    # Step 2: Contact triggers
+    # -------------------------------------------------------------------
+    print("\nStep 2: Creating contact triggers...")
+    for sql in _TRIGGERS:
+        conn.execute(sql)
+    print(f"  {len(_TRIGGERS)} triggers in place.")
+
+    # -------------------------------------------------------------------
+    # Step 3: Bump schema version
+    # -------------------------------------------------------------------
+    print("\nStep 3: Bumping schema version to 23...")
+    conn.execute("PRAGMA user_version = 23")
+    print("  Schema version set to 23.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrate CRMExtender database from v22 to v23.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB,
+        help=f"Path to database (default: {DEFAULT_DB})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Run on a backup copy; do not modify production database.",
+    )
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
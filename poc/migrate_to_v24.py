@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Migrate the CRMExtender database from v23 to v24.
+
+Adds a persisted, indexed root-domain column so company duplicate scans are
+index probes instead of Python normalisation, and case-insensitive indexes
+for the exact-domain lookups done during sync:
+- companies.normalized_domain and company_identifiers.normalized_domain
+- backfill of both from normalize_domain()
+- idx_companies_norm_domain, idx_coid_norm_domain
+- idx_companies_domain_lower, idx_coid_value_lower
+- triggers that reset the column to NULL when the raw domain changes
+
+Usage:
+    python3 -m poc.migrate_to_v24 [--db PATH] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DB = Path("data/crm_extender.db")
+
+_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_companies_domain_changed
+    AFTER UPDATE OF domain ON companies
+    WHEN NEW.domain IS NOT OLD.domain AND NEW.normalized_domain IS OLD.normalized_domain
+    BEGIN
+        UPDATE companies SET normalized_domain = NULL WHERE id = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_coid_value_changed
+    AFTER UPDATE OF type, value ON company_identifiers
+    WHEN (NEW.value IS NOT OLD.value OR NEW.type IS NOT OLD.type)
+     AND NEW.normalized_domain IS OLD.normalized_domain
+    BEGIN
+        UPDATE company_identifiers SET normalized_domain = NULL WHERE id = NEW.id;
+    END""",
+]
+
+
+def migrate(db_path: Path, *, dry_run: bool = False) -> None:
+    """Run the full v23 -> v24 migration."""
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    backup_path = db_path.with_suffix(
+        f".v23-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    )
+    print(f"Backing up to {backup_path}...")
+    shutil.copy2(str(db_path), str(backup_path))
+    print(f"  Backup created ({backup_path.stat().st_size:,} bytes)")
+
+    if dry_run:
+        db_path = backup_path
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        _run_migration(conn)
+        conn.commit()
+        print("\nMigration committed successfully.")
+    except Exception:
+        conn.rollback()
+        print("\nMigration FAILED — rolled back.")
+        raise
+    finally:
+        conn.close()
+
+    if dry_run:
+        print(f"\nDry run complete. Changes applied to backup: {backup_path}")
+        print("Production database was NOT modified.")
+    else:
+        print(f"\nProduction database migrated. Backup at: {backup_path}")
+
+
+def _run_migration(conn: sqlite3.Connection) -> None:
+    """Execute all migration steps in order."""
+    from poc.domain_resolver import normalize_domain
+
+    # -------------------------------------------------------------------
+    # Step 1: Columns
+    # -------------------------------------------------------------------
+    print("\nStep 1: Adding normalized_domain columns...")
+    for table in ("companies", "company_identifiers"):
+        cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+        if "normalized_domain" in cols:
+            print(f"  {table}: already present.")
+            continue
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN normalized_domain TEXT")
+        print(f"  {table}: added.")
+
+    # -------------------------------------------------------------------
+    # Step 2: Backfill
+    # -------------------------------------------------------------------
+    print("\nStep 2: Backfilling normalized_domain...")
+    rows = conn.execute(
+        "SELECT id, domain FROM companies WHERE normalized_domain IS NULL"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE companies SET normalized_domain = ? WHERE id = ?",
+        [(normalize_domain(r["domain"]), r["id"]) for r in rows],
+    )
+    print(f"  {len(rows)} companies.")
+    rows = conn.execute(
+        "SELECT id, value FROM company_identifiers "
+        "WHERE type = 'domain' AND normalized_domain IS NULL"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE company_identifiers SET normalized_domain = ? WHERE id = ?",
+        [(normalize_domain(r["value"]), r["id"]) for r in rows],
+    )
+    print(f"  {len(rows)} domain identifiers.")
+
+    # -------------------------------------------------------------------
+    # Step 3: Indexes and triggers
+    # -------------------------------------------------------------------
+    print("\nStep 3: Creating indexes and triggers...")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_companies_norm_domain "
+        "ON companies(normalized_domain)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_coid_norm_domain "
+        "ON company_identifiers(type, normalized_domain)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_companies_domain_lower "
+        "ON companies(LOWER(domain))"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_coid_value_lower "
+        "ON company_identifiers(type, LOWER(value))"
+    )
+    for sql in _TRIGGERS:
+        conn.execute(sql)
+    print(f"  4 indexes and {len(_TRIGGERS)} triggers in place.")
+
+    # -------------------------------------------------------------------
+    # Step 4: Bump schema version
+    # -------------------------------------------------------------------
+    print("\nStep 4: Bumping schema version to 24...")
+    conn.execute("PRAGMA user_version = 24")
+    print("  Schema version set to 24.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrate CRMExtender database from v23 to v24.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB,
+        help=f"Path to database (default: {DEFAULT_DB})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Run on a backup copy; do not modify production database.",
+    )
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
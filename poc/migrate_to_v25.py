@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Migrate the CRMExtender database from v24 to v25.
+
+Adds conversations.ai_summary_hash: a fingerprint of the prompt text a
+summary was generated from, so conversations whose summary was invalidated
+without their content changing are not sent to Claude again.
+
+Usage:
+    python3 -m poc.migrate_to_v25 [--db PATH] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DB = Path("data/crm_extender.db")
+
+
+def migrate(db_path: Path, *, dry_run: bool = False) -> None:
+    """Run the full v24 -> v25 migration."""
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        sys.exit(1)
+
+    backup_path = db_path.with_suffix(
+        f".v24-backup-{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    )
+    print(f"Backing up to {backup_path}...")
+    shutil.copy2(str(db_path), str(backup_path))
+    print(f"  Backup created ({backup_path.stat().st_size:,} bytes)")
+
+    if dry_run:
+        db_path = backup_path
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        _run_migration(conn)
+        conn.commit()
+        print("\nMigration committed successfully.")
+    except Exception:
+        conn.rollback()
+        print("\nMigration FAILED — rolled back.")
+        raise
+    finally:
+        conn.close()
+
+    if dry_run:
+        print(f"\nDry run complete. Changes applied to backup: {backup_path}")
+        print("Production database was NOT modified.")
+    else:
+        print(f"\nProduction database migrated. Backup at: {backup_path}")
+
+
+def _run_migration(conn: sqlite3.Connection) -> None:
+    """Execute all migration steps in order."""
+    # -------------------------------------------------------------------
+    # Step 1: Column
+    # -------------------------------------------------------------------
+    print("\nStep 1: Adding conversations.ai_summary_hash...")
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(conversations)")}
+    if "ai_summary_hash" in cols:
+        print("  Already present.")
+    else:
+        conn.execute("ALTER TABLE conversations ADD COLUMN ai_summary_hash TEXT")
+        print("  Added.")
+
+    # -------------------------------------------------------------------
+    # Step 2: Bump schema version
+    # -------------------------------------------------------------------
+    print("\nStep 2: Bumping schema version to 25...")
+    conn.execute("PRAGMA user_version = 25")
+    print("  Schema version set to 25.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migrate CRMExtender database from v24 to v25.",
+    )
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB,
+        help=f"Path to database (default: {DEFAULT_DB})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Run on a backup copy; do not modify production database.",
+    )
+    args = parser.parse_args()
+    migrate(args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -140,32 +140,51 @@ def create_note(
     if entity_type not in VALID_ENTITY_TYPES:
         raise ValueError(f"Invalid entity_type: {entity_type}")
 
+    with get_connection() as conn:
+        return _insert_note(
+            conn, customer_id, entity_type, entity_id,
+            title=title, content_json=content_json,
+            content_html=content_html, created_by=created_by,
+        )
+
+
+def _insert_note(
+    conn,
+    customer_id: str,
+    entity_type: str,
+    entity_id: str,
+    *,
+    title: str | None = None,
+    content_json: str | None = None,
+    content_html: str | None = None,
+    created_by: str | None = None,
+) -> dict[str, Any]:
+    """Insert a note and its first revision on *conn* (caller commits)."""
     now = _now()
     note_id = _uuid()
     rev_id = _uuid()
 
-    with get_connection() as conn:
-        conn.execute(
-            "INSERT INTO notes "
-            "(id, customer_id, title, current_revision_id, "
-            " created_by, updated_by, created_at, updated_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (note_id, customer_id, title, rev_id, created_by, created_by, now, now),
-        )
-        conn.execute(
-            "INSERT INTO note_entities "
-            "(note_id, entity_type, entity_id, is_pinned, created_at) "
-            "VALUES (?, ?, ?, 0, ?)",
-            (note_id, entity_type, entity_id, now),
-        )
-        conn.execute(
-            "INSERT INTO note_revisions "
-            "(id, note_id, revision_number, content_json, content_html, revised_by, created_at) "
-            "VALUES (?, ?, 1, ?, ?, ?, ?)",
-            (rev_id, note_id, content_json, content_html, created_by, now),
-        )
-        _update_fts(conn, note_id, title, content_html)
-        _sync_mentions(conn, note_id, content_json)
+    conn.execute(
+        "INSERT INTO notes "
+        "(id, customer_id, title, current_revision_id, "
+        " created_by, updated_by, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (note_id, customer_id, title, rev_id, created_by, created_by, now, now),
+    )
+    conn.execute(
+        "INSERT INTO note_entities "
+        "(note_id, entity_type, entity_id, is_pinned, created_at) "
+        "VALUES (?, ?, ?, 0, ?)",
+        (note_id, entity_type, entity_id, now),
+    )
+    conn.execute(
+        "INSERT INTO note_revisions "
+        "(id, note_id, revision_number, content_json, content_html, revised_by, created_at) "
+        "VALUES (?, ?, 1, ?, ?, ?, ?)",
+        (rev_id, note_id, content_json, content_html, created_by, now),
+    )
+    _update_fts(conn, note_id, title, content_html)
+    _sync_mentions(conn, note_id, content_json)
 
     return {
         "id": note_id,
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import logging
 import math
+import threading
 import uuid
 from datetime import datetime, timezone
 
@@ -19,8 +20,8 @@ SELECT
     cp2.contact_id  AS contact_b,
     COUNT(DISTINCT cp1.conversation_id) AS shared_conversations,
     SUM(cp1.communication_count + cp2.communication_count) AS shared_messages,
-    MAX(cp1.last_seen_at, cp2.last_seen_at) AS last_interaction,
-    MIN(cp1.first_seen_at, cp2.first_seen_at) AS first_interaction
+    MAX(MAX(cp1.last_seen_at, cp2.last_seen_at)) AS last_interaction,
+    MIN(MIN(cp1.first_seen_at, cp2.first_seen_at)) AS first_interaction
 FROM conversation_participants cp1
 JOIN conversation_participants cp2
     ON cp1.conversation_id = cp2.conversation_id
@@ -31,6 +32,35 @@ GROUP BY cp1.contact_id, cp2.contact_id
 HAVING shared_conversations >= 1
 """
 
+# Same statistics restricted to pairs with at least one side in :contact_ids
+# (a JSON array).  Only conversations those contacts appear in are joined,
+# so the cost follows the size of the change rather than the whole table.
+_CO_OCCURRENCE_SCOPED_SQL = """\
+WITH scope(contact_id) AS (SELECT value FROM json_each(:contact_ids)),
+touched(conversation_id) AS (
+    SELECT DISTINCT conversation_id FROM conversation_participants
+    WHERE contact_id IN (SELECT contact_id FROM scope)
+)
+SELECT
+    cp1.contact_id  AS contact_a,
+    cp2.contact_id  AS contact_b,
+    COUNT(DISTINCT cp1.conversation_id) AS shared_conversations,
+    SUM(cp1.communication_count + cp2.communication_count) AS shared_messages,
+    MAX(MAX(cp1.last_seen_at, cp2.last_seen_at)) AS last_interaction,
+    MIN(MIN(cp1.first_seen_at, cp2.first_seen_at)) AS first_interaction
+FROM touched t
+JOIN conversation_participants cp1
+    ON cp1.conversation_id = t.conversation_id
+JOIN conversation_participants cp2
+    ON cp2.conversation_id = t.conversation_id
+    AND cp1.contact_id < cp2.contact_id
+WHERE cp1.contact_id IS NOT NULL
+  AND cp2.contact_id IS NOT NULL
+  AND (cp1.contact_id IN (SELECT contact_id FROM scope)
+       OR cp2.contact_id IN (SELECT contact_id FROM scope))
+GROUP BY cp1.contact_id, cp2.contact_id
+"""
+
 KNOWS_TYPE_ID = "rt-knows"
 
 
@@ -116,96 +146,286 @@ def _build_canonical_map(conn) -> dict[str, str]:
     return canonical
 
 
-def infer_relationships() -> int:
+# ---------------------------------------------------------------------------
+# Canonical map cache
+# ---------------------------------------------------------------------------
+# The same-name canonical map is cached per process and database file (the
+# one *conn* is attached to, not config.DB_PATH).  Triggers
+# on contacts bump canonical_map_state.generation on every insert, delete and
+# rename (and infer_relationships bumps it after a full rebuild), so while
+# the map is current a lookup costs one single-row read.
+
+_canonical_lock = threading.Lock()
+# db path -> (generation, contact_id -> canonical_id)
+_canonical_cache: dict[str, tuple[int, dict[str, str]]] = {}
+
+
+def _canonical_map(conn) -> dict[str, str]:
+    """Return the canonical map, rebuilding it only when contacts changed."""
+    key = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not key:
+        return _build_canonical_map(conn)  # in-memory databases share no file
+    generation = conn.execute(
+        "SELECT generation FROM canonical_map_state WHERE id = 1"
+    ).fetchone()[0]
+    with _canonical_lock:
+        cached = _canonical_cache.get(key)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    canonical = _build_canonical_map(conn)
+    with _canonical_lock:
+        _canonical_cache[key] = (generation, canonical)
+    return canonical
+
+
+def clear_canonical_cache() -> None:
+    """Drop every cached canonical map."""
+    with _canonical_lock:
+        _canonical_cache.clear()
+
+
+def _merge_pairs(rows, canonical: dict[str, str]) -> dict[tuple[str, str], dict]:
+    """Aggregate co-occurrence rows into canonical, ordered contact pairs."""
+    merged: dict[tuple[str, str], dict] = {}
+    for row in rows:
+        cid_a = canonical.get(row["contact_a"], row["contact_a"])
+        cid_b = canonical.get(row["contact_b"], row["contact_b"])
+
+        # Skip self-relationships (same person, different emails)
+        if cid_a == cid_b:
+            continue
+
+        # Normalize ordering
+        if cid_a > cid_b:
+            cid_a, cid_b = cid_b, cid_a
+
+        key = (cid_a, cid_b)
+        if key not in merged:
+            merged[key] = {
+                "shared_conversations": 0,
+                "shared_messages": 0,
+                "last_interaction": None,
+                "first_interaction": None,
+            }
+
+        entry = merged[key]
+        entry["shared_conversations"] += row["shared_conversations"]
+        entry["shared_messages"] += row["shared_messages"]
+
+        last = row["last_interaction"]
+        if last and (entry["last_interaction"] is None or last > entry["last_interaction"]):
+            entry["last_interaction"] = last
+
+        first = row["first_interaction"]
+        if first and (entry["first_interaction"] is None or first < entry["first_interaction"]):
+            entry["first_interaction"] = first
+
+    return merged
+
+
+def _upsert_pairs(
+    conn,
+    merged: dict[tuple[str, str], dict],
+    max_convos: int,
+    max_msgs: int,
+) -> int:
+    for (cid_a, cid_b), entry in merged.items():
+        strength = _compute_strength(
+            entry["shared_conversations"],
+            entry["shared_messages"],
+            entry["last_interaction"],
+            max_conversations=max(max_convos, 2),
+            max_messages=max(max_msgs, 2),
+        )
+
+        rel = Relationship(
+            from_entity_id=cid_a,
+            to_entity_id=cid_b,
+            relationship_type_id=KNOWS_TYPE_ID,
+            source="inferred",
+            strength=strength,
+            shared_conversations=entry["shared_conversations"],
+            shared_messages=entry["shared_messages"],
+            last_interaction=entry["last_interaction"],
+            first_interaction=entry["first_interaction"],
+        )
+
+        _upsert_relationship(conn, rel, is_bidirectional=True)
+    return len(merged)
+
+
+def _save_state(conn, max_convos: int, max_msgs: int, *, full: bool) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    if full:
+        conn.execute(
+            """\
+            INSERT INTO relationship_inference_state
+                (id, max_conversations, max_messages, last_full_run_at, last_run_at)
+            VALUES (1, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                max_conversations = excluded.max_conversations,
+                max_messages = excluded.max_messages,
+                last_full_run_at = excluded.last_full_run_at,
+                last_run_at = excluded.last_run_at
+            """,
+            (max_convos, max_msgs, now, now),
+        )
+    else:
+        conn.execute(
+            "UPDATE relationship_inference_state "
+            "SET max_conversations = ?, max_messages = ?, last_run_at = ? WHERE id = 1",
+            (max_convos, max_msgs, now),
+        )
+
+
+def _rescale_strengths(conn, max_convos: int, max_msgs: int) -> None:
+    """Recompute stored strengths of every inferred pair against new maxima."""
+    rows = conn.execute(
+        "SELECT id, properties FROM relationships "
+        "WHERE source = 'inferred' AND relationship_type_id = ?",
+        (KNOWS_TYPE_ID,),
+    ).fetchall()
+    updates = []
+    for row in rows:
+        props = json.loads(row["properties"] or "{}")
+        props["strength"] = _compute_strength(
+            props.get("shared_conversations") or 0,
+            props.get("shared_messages") or 0,
+            props.get("last_interaction"),
+            max_conversations=max(max_convos, 2),
+            max_messages=max(max_msgs, 2),
+        )
+        updates.append((json.dumps(props), row["id"]))
+    conn.executemany("UPDATE relationships SET properties = ? WHERE id = ?", updates)
+
+
+def _infer_full(conn, canonical: dict[str, str]) -> int:
+    rows = conn.execute(_CO_OCCURRENCE_SQL).fetchall()
+
+    if not rows:
+        log.info("No co-occurring contact pairs found.")
+        return 0
+
+    merged = _merge_pairs(rows, canonical)
+
+    if not merged:
+        log.info("No relationships after deduplication.")
+        return 0
+
+    # Determine max values for normalization
+    max_convos = max(e["shared_conversations"] for e in merged.values())
+    max_msgs = max(e["shared_messages"] for e in merged.values())
+
+    # Clear only inferred relationships before full rewrite
+    conn.execute("DELETE FROM relationships WHERE source = 'inferred'")
+
+    count = _upsert_pairs(conn, merged, max_convos, max_msgs)
+    conn.execute("DELETE FROM relationship_inference_queue")
+    _save_state(conn, max_convos, max_msgs, full=True)
+
+    log.info("Upserted %d relationships.", count)
+    return count
+
+
+def _infer_incremental(conn, canonical: dict[str, str], state) -> int:
+    queued = [r["contact_id"] for r in conn.execute(
+        "SELECT contact_id FROM relationship_inference_queue"
+    )]
+    if not queued:
+        _save_state(conn, state["max_conversations"], state["max_messages"], full=False)
+        log.info("No participant changes since the last run.")
+        return 0
+
+    # A queued contact invalidates every pair of its canonical identity, so
+    # widen the scope to all contacts sharing that identity.
+    dirty = {canonical.get(cid, cid) for cid in queued}
+    scope = set(queued) | dirty | {
+        cid for cid, canon in canonical.items() if canon in dirty
+    }
+    scope_json = json.dumps(sorted(scope))
+
+    rows = conn.execute(
+        _CO_OCCURRENCE_SCOPED_SQL, {"contact_ids": scope_json},
+    ).fetchall()
+    merged = _merge_pairs(rows, canonical)
+
+    # Inferred pairs touching the scope that no longer co-occur
+    existing = conn.execute(
+        "SELECT from_entity_id, to_entity_id FROM relationships "
+        "WHERE source = 'inferred' AND relationship_type_id = ? "
+        "AND from_entity_id IN (SELECT value FROM json_each(?))",
+        (KNOWS_TYPE_ID, scope_json),
+    ).fetchall()
+    stale = [
+        (r["from_entity_id"], r["to_entity_id"]) for r in existing
+        if tuple(sorted((r["from_entity_id"], r["to_entity_id"]))) not in merged
+    ]
+    conn.executemany(
+        "DELETE FROM relationships WHERE source = 'inferred' "
+        "AND relationship_type_id = ? AND from_entity_id = ? AND to_entity_id = ?",
+        [(KNOWS_TYPE_ID, a, b) for a, b in stale]
+        + [(KNOWS_TYPE_ID, b, a) for a, b in stale],
+    )
+
+    # Maxima only grow between full runs; when they do, every stored
+    # strength is rescaled so all pairs stay on the same scale.
+    max_convos = max(
+        [state["max_conversations"]] + [e["shared_conversations"] for e in merged.values()]
+    )
+    max_msgs = max(
+        [state["max_messages"]] + [e["shared_messages"] for e in merged.values()]
+    )
+
+    count = _upsert_pairs(conn, merged, max_convos, max_msgs)
+    if (max_convos, max_msgs) != (state["max_conversations"], state["max_messages"]):
+        _rescale_strengths(conn, max_convos, max_msgs)
+
+    conn.execute(
+        "DELETE FROM relationship_inference_queue "
+        "WHERE contact_id IN (SELECT value FROM json_each(?))",
+        (json.dumps(queued),),
+    )
+    _save_state(conn, max_convos, max_msgs, full=False)
+
+    log.info(
+        "Incremental inference: %d contact(s) changed, %d pair(s) upserted, %d removed.",
+        len(queued), count, len(stale),
+    )
+    return count
+
+
+def infer_relationships(*, incremental: bool = False) -> int:
     """Mine conversation participants for co-occurrence and upsert relationships.
 
     Contacts with the same name are merged into a single canonical identity
     so that the same real person using multiple email addresses does not
     produce duplicate or self-referencing relationship pairs.
 
+    By default all inferred relationships are rebuilt.  With
+    ``incremental=True`` only pairs involving contacts whose conversation
+    participation changed since the last run are recomputed (falling back
+    to a full rebuild when no full run has been recorded).  Normalization
+    maxima carry over between incremental runs and are reset by the next
+    full rebuild, which also picks up contact renames.
+
     Returns the number of relationships upserted.
     """
     with get_connection() as conn:
-        canonical = _build_canonical_map(conn)
-
-        rows = conn.execute(_CO_OCCURRENCE_SQL).fetchall()
-
-        if not rows:
-            log.info("No co-occurring contact pairs found.")
-            return 0
-
-        # Aggregate co-occurrence data after mapping to canonical IDs
-        merged: dict[tuple[str, str], dict] = {}
-        for row in rows:
-            cid_a = canonical.get(row["contact_a"], row["contact_a"])
-            cid_b = canonical.get(row["contact_b"], row["contact_b"])
-
-            # Skip self-relationships (same person, different emails)
-            if cid_a == cid_b:
-                continue
-
-            # Normalize ordering
-            if cid_a > cid_b:
-                cid_a, cid_b = cid_b, cid_a
-
-            key = (cid_a, cid_b)
-            if key not in merged:
-                merged[key] = {
-                    "shared_conversations": 0,
-                    "shared_messages": 0,
-                    "last_interaction": None,
-                    "first_interaction": None,
-                }
-
-            entry = merged[key]
-            entry["shared_conversations"] += row["shared_conversations"]
-            entry["shared_messages"] += row["shared_messages"]
-
-            last = row["last_interaction"]
-            if last and (entry["last_interaction"] is None or last > entry["last_interaction"]):
-                entry["last_interaction"] = last
-
-            first = row["first_interaction"]
-            if first and (entry["first_interaction"] is None or first < entry["first_interaction"]):
-                entry["first_interaction"] = first
-
-        if not merged:
-            log.info("No relationships after deduplication.")
-            return 0
-
-        # Determine max values for normalization
-        max_convos = max(e["shared_conversations"] for e in merged.values())
-        max_msgs = max(e["shared_messages"] for e in merged.values())
-
-        # Clear only inferred relationships before full rewrite
-        conn.execute("DELETE FROM relationships WHERE source = 'inferred'")
-
-        count = 0
-        for (cid_a, cid_b), entry in merged.items():
-            strength = _compute_strength(
-                entry["shared_conversations"],
-                entry["shared_messages"],
-                entry["last_interaction"],
-                max_conversations=max(max_convos, 2),
-                max_messages=max(max_msgs, 2),
-            )
-
-            rel = Relationship(
-                from_entity_id=cid_a,
-                to_entity_id=cid_b,
-                relationship_type_id=KNOWS_TYPE_ID,
-                source="inferred",
-                strength=strength,
-                shared_conversations=entry["shared_conversations"],
-                shared_messages=entry["shared_messages"],
-                last_interaction=entry["last_interaction"],
-                first_interaction=entry["first_interaction"],
-            )
-
-            _upsert_relationship(conn, rel, is_bidirectional=True)
-            count += 1
-
-        log.info("Upserted %d relationships.", count)
+        if incremental:
+            state = conn.execute(
+                "SELECT * FROM relationship_inference_state WHERE id = 1"
+            ).fetchone()
+            if state is not None:
+                return _infer_incremental(conn, _canonical_map(conn), state)
+            log.info("No previous full inference run; rebuilding all relationships.")
+
+        count = _infer_full(conn, _build_canonical_map(conn))
+        # Participant counts decide which same-name contact is canonical, so
+        # make cached maps reload against the relationships just written.
+        conn.execute(
+            "UPDATE canonical_map_state SET generation = generation + 1 WHERE id = 1"
+        )
         return count
 
 
@@ -319,8 +539,7 @@ def load_relationships(
         # Resolve contact_id to its canonical ID
         lookup_id = contact_id
         if contact_id:
-            canonical = _build_canonical_map(conn)
-            lookup_id = canonical.get(contact_id, contact_id)
+            lookup_id = _canonical_map(conn).get(contact_id, contact_id)
 
         clauses = []
         params: list = []
@@ -13,7 +13,9 @@ from __future__ import annotations
 import json
 import logging
 import math
-from datetime import datetime, timezone
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from .database import get_connection
@@ -186,6 +188,71 @@ WHERE ci.contact_id = :contact_id
 """
 
 
+_BATCH_STATS_COLUMNS = """\
+    COUNT(*) AS total_comms,
+    SUM(CASE WHEN c.direction = 'outbound' THEN 1 ELSE 0 END) AS outbound_count,
+    SUM(CASE WHEN c.direction = 'inbound' THEN 1 ELSE 0 END) AS inbound_count,
+    SUM(CASE WHEN c.direction = 'outbound'
+              AND c.timestamp >= :window_start THEN 1 ELSE 0 END) AS recent_outbound,
+    SUM(CASE WHEN c.direction = 'inbound'
+              AND c.timestamp >= :window_start THEN 1 ELSE 0 END) AS recent_inbound,
+    MIN(c.timestamp) AS first_ts,
+    MAX(c.timestamp) AS last_ts"""
+
+# Batch variants: the same statistics for every entity in one grouped pass.
+# Driving from the communication side lets each row probe
+# idx_ci_email_lower instead of rescanning participants once per entity.
+
+_CONTACT_BATCH_STATS_SQL = f"""\
+SELECT ci.contact_id AS entity_id,
+{_BATCH_STATS_COLUMNS}
+FROM communication_participants cp
+JOIN contact_identifiers ci ON ci.type = 'email' AND LOWER(ci.value) = LOWER(cp.address)
+JOIN communications c ON c.id = cp.communication_id
+GROUP BY ci.contact_id
+"""
+
+_CONTACT_BATCH_SENDER_STATS_SQL = f"""\
+SELECT ci.contact_id AS entity_id,
+{_BATCH_STATS_COLUMNS}
+FROM communications c
+JOIN contact_identifiers ci ON ci.type = 'email' AND LOWER(ci.value) = LOWER(c.sender_address)
+GROUP BY ci.contact_id
+"""
+
+_CONTACT_BATCH_BREADTH_SQL = """\
+SELECT ci.contact_id AS entity_id,
+       COUNT(DISTINCT cp2.conversation_id) AS distinct_conversations
+FROM communication_participants cpart
+JOIN contact_identifiers ci ON ci.type = 'email' AND LOWER(ci.value) = LOWER(cpart.address)
+JOIN conversation_communications cc ON cc.communication_id = cpart.communication_id
+JOIN conversation_participants cp2 ON cp2.conversation_id = cc.conversation_id
+                                   AND cp2.contact_id = ci.contact_id
+GROUP BY ci.contact_id
+"""
+
+_COMPANY_BATCH_STATS_SQL = f"""\
+SELECT ccx.company_id AS entity_id,
+{_BATCH_STATS_COLUMNS},
+    COUNT(DISTINCT ci.contact_id) AS distinct_contacts
+FROM communication_participants cp
+JOIN contact_identifiers ci ON ci.type = 'email' AND LOWER(ci.value) = LOWER(cp.address)
+JOIN contact_companies ccx ON ccx.contact_id = ci.contact_id
+JOIN communications c ON c.id = cp.communication_id
+GROUP BY ccx.company_id
+"""
+
+_COMPANY_BATCH_SENDER_STATS_SQL = f"""\
+SELECT ccx.company_id AS entity_id,
+{_BATCH_STATS_COLUMNS},
+    COUNT(DISTINCT ci.contact_id) AS distinct_contacts
+FROM communications c
+JOIN contact_identifiers ci ON ci.type = 'email' AND LOWER(ci.value) = LOWER(c.sender_address)
+JOIN contact_companies ccx ON ccx.contact_id = ci.contact_id
+GROUP BY ccx.company_id
+"""
+
+
 def _merge_stats(row_a: dict, row_b: dict) -> dict:
     """Merge two stats rows (participants path + sender path), avoiding double-counting."""
     # For counts, sum them (the sender path catches communications not in participants)
@@ -222,6 +289,44 @@ def _merge_stats(row_a: dict, row_b: dict) -> dict:
     }
 
 
+def _window_start(now: datetime) -> str:
+    return (now - timedelta(days=FREQUENCY_WINDOW_DAYS)).isoformat()
+
+
+def _days_since(last_ts: str | None, now: datetime) -> float | None:
+    if not last_ts:
+        return None
+    try:
+        last_dt = datetime.fromisoformat(last_ts)
+    except (ValueError, TypeError):
+        return None
+    if last_dt.tzinfo is None:
+        last_dt = last_dt.replace(tzinfo=timezone.utc)
+    return (now - last_dt).total_seconds() / 86400
+
+
+def _score_stats(
+    stats: dict,
+    distinct_count: int,
+    now: datetime,
+    weights: dict[str, float],
+) -> tuple[float, dict[str, float]]:
+    """Turn merged stats into (score, factors), both rounded for storage."""
+    factors = {
+        "recency": _recency_score(_days_since(stats["last_ts"], now)),
+        "frequency": _frequency_score(
+            stats["recent_outbound"], stats["recent_inbound"],
+        ),
+        "reciprocity": _reciprocity_score(
+            stats["outbound_count"], stats["inbound_count"],
+        ),
+        "breadth": _breadth_score(distinct_count),
+        "duration": _duration_score(stats["first_ts"], stats["last_ts"]),
+    }
+    score = sum(factors[k] * weights.get(k, 0) for k in factors)
+    return round(score, 4), {k: round(v, 4) for k, v in factors.items()}
+
+
 # ---------------------------------------------------------------------------
 # Compute functions
 # ---------------------------------------------------------------------------
@@ -235,15 +340,8 @@ def compute_company_score(
 
     Returns {"score": float, "factors": dict, "raw": dict} or None if no data.
     """
-    w = weights or DEFAULT_WEIGHTS
     now = datetime.now(timezone.utc)
-    window_start = (
-        now.replace(hour=0, minute=0, second=0, microsecond=0)
-    )
-    from datetime import timedelta
-    window_start = (now - timedelta(days=FREQUENCY_WINDOW_DAYS)).isoformat()
-
-    params = {"company_id": company_id, "window_start": window_start}
+    params = {"company_id": company_id, "window_start": _window_start(now)}
 
     row_a = dict(conn.execute(_COMPANY_STATS_SQL, params).fetchone())
     row_b = dict(conn.execute(_COMPANY_SENDER_STATS_SQL, params).fetchone())
@@ -252,38 +350,10 @@ def compute_company_score(
     if stats["total_comms"] == 0:
         return None
 
-    # Recency
-    last_ts = stats["last_ts"]
-    if last_ts:
-        try:
-            last_dt = datetime.fromisoformat(last_ts)
-            if last_dt.tzinfo is None:
-                last_dt = last_dt.replace(tzinfo=timezone.utc)
-            days_since = (now - last_dt).total_seconds() / 86400
-        except (ValueError, TypeError):
-            days_since = None
-    else:
-        days_since = None
-
-    factors = {
-        "recency": _recency_score(days_since),
-        "frequency": _frequency_score(
-            stats["recent_outbound"], stats["recent_inbound"],
-        ),
-        "reciprocity": _reciprocity_score(
-            stats["outbound_count"], stats["inbound_count"],
-        ),
-        "breadth": _breadth_score(stats["distinct_contacts"]),
-        "duration": _duration_score(stats["first_ts"], stats["last_ts"]),
-    }
-
-    score = sum(factors[k] * w.get(k, 0) for k in factors)
-
-    return {
-        "score": round(score, 4),
-        "factors": {k: round(v, 4) for k, v in factors.items()},
-        "raw": stats,
-    }
+    score, factors = _score_stats(
+        stats, stats["distinct_contacts"], now, weights or DEFAULT_WEIGHTS,
+    )
+    return {"score": score, "factors": factors, "raw": stats}
 
 
 def compute_contact_score(
@@ -295,28 +365,15 @@ def compute_contact_score(
 
     Returns {"score": float, "factors": dict, "raw": dict} or None if no data.
     """
-    w = weights or DEFAULT_WEIGHTS
     now = datetime.now(timezone.utc)
-    from datetime import timedelta
-    window_start = (now - timedelta(days=FREQUENCY_WINDOW_DAYS)).isoformat()
-
-    params = {"contact_id": contact_id, "window_start": window_start}
+    params = {"contact_id": contact_id, "window_start": _window_start(now)}
 
     row_a = dict(conn.execute(_CONTACT_STATS_SQL, params).fetchone())
     row_b = dict(conn.execute(_CONTACT_SENDER_STATS_SQL, params).fetchone())
+    stats = _merge_stats(row_a, row_b)
+    del stats["distinct_contacts"]
 
-    # Merge counts
-    total = (row_a.get("total_comms") or 0) + (row_b.get("total_comms") or 0)
-    outbound = (row_a.get("outbound_count") or 0) + (row_b.get("outbound_count") or 0)
-    inbound = (row_a.get("inbound_count") or 0) + (row_b.get("inbound_count") or 0)
-    recent_out = (row_a.get("recent_outbound") or 0) + (row_b.get("recent_outbound") or 0)
-    recent_in = (row_a.get("recent_inbound") or 0) + (row_b.get("recent_inbound") or 0)
-    first_a, first_b = row_a.get("first_ts"), row_b.get("first_ts")
-    first_ts = min(filter(None, [first_a, first_b]), default=None)
-    last_a, last_b = row_a.get("last_ts"), row_b.get("last_ts")
-    last_ts = max(filter(None, [last_a, last_b]), default=None)
-
-    if total == 0:
+    if stats["total_comms"] == 0:
         return None
 
     # Breadth for contact = distinct conversations
@@ -324,51 +381,30 @@ def compute_contact_score(
         _CONTACT_BREADTH_SQL, {"contact_id": contact_id},
     ).fetchone()
     distinct_conversations = (breadth_row["distinct_conversations"] or 0) if breadth_row else 0
+    stats["distinct_conversations"] = distinct_conversations
 
-    # Recency
-    if last_ts:
-        try:
-            last_dt = datetime.fromisoformat(last_ts)
-            if last_dt.tzinfo is None:
-                last_dt = last_dt.replace(tzinfo=timezone.utc)
-            days_since = (now - last_dt).total_seconds() / 86400
-        except (ValueError, TypeError):
-            days_since = None
-    else:
-        days_since = None
-
-    factors = {
-        "recency": _recency_score(days_since),
-        "frequency": _frequency_score(recent_out, recent_in),
-        "reciprocity": _reciprocity_score(outbound, inbound),
-        "breadth": _breadth_score(distinct_conversations),
-        "duration": _duration_score(first_ts, last_ts),
-    }
-
-    score = sum(factors[k] * w.get(k, 0) for k in factors)
-
-    raw = {
-        "total_comms": total,
-        "outbound_count": outbound,
-        "inbound_count": inbound,
-        "recent_outbound": recent_out,
-        "recent_inbound": recent_in,
-        "first_ts": first_ts,
-        "last_ts": last_ts,
-        "distinct_conversations": distinct_conversations,
-    }
-
-    return {
-        "score": round(score, 4),
-        "factors": {k: round(v, 4) for k, v in factors.items()},
-        "raw": raw,
-    }
+    score, factors = _score_stats(
+        stats, distinct_conversations, now, weights or DEFAULT_WEIGHTS,
+    )
+    return {"score": score, "factors": factors, "raw": stats}
 
 
 # ---------------------------------------------------------------------------
 # Persistence
 # ---------------------------------------------------------------------------
 
+_UPSERT_SCORE_SQL = """\
+INSERT INTO entity_scores (id, entity_type, entity_id, score_type,
+                           score_value, factors, computed_at, triggered_by)
+VALUES (:id, :entity_type, :entity_id, :score_type,
+        :score_value, :factors, :computed_at, :triggered_by)
+ON CONFLICT(entity_type, entity_id, score_type)
+DO UPDATE SET score_value = :score_value,
+              factors = :factors,
+              computed_at = :computed_at,
+              triggered_by = :triggered_by"""
+
+
 def upsert_entity_score(
     conn,
     entity_type: str,
@@ -379,30 +415,36 @@ def upsert_entity_score(
     triggered_by: str = "manual",
 ) -> None:
     """Insert or update an entity score row."""
-    import uuid
+    upsert_entity_scores(
+        conn, entity_type, [(entity_id, score_value, factors)],
+        score_type=score_type, triggered_by=triggered_by,
+    )
+
+
+def upsert_entity_scores(
+    conn,
+    entity_type: str,
+    scores: list[tuple[str, float, dict]],
+    score_type: str = SCORE_TYPE,
+    triggered_by: str = "manual",
+) -> None:
+    """Insert or update many (entity_id, score_value, factors) rows at once."""
     now = datetime.now(timezone.utc).isoformat()
-    factors_json = json.dumps(factors)
-
-    conn.execute(
-        """INSERT INTO entity_scores (id, entity_type, entity_id, score_type,
-                                      score_value, factors, computed_at, triggered_by)
-           VALUES (:id, :entity_type, :entity_id, :score_type,
-                   :score_value, :factors, :computed_at, :triggered_by)
-           ON CONFLICT(entity_type, entity_id, score_type)
-           DO UPDATE SET score_value = :score_value,
-                         factors = :factors,
-                         computed_at = :computed_at,
-                         triggered_by = :triggered_by""",
-        {
-            "id": str(uuid.uuid4()),
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "score_type": score_type,
-            "score_value": score_value,
-            "factors": factors_json,
-            "computed_at": now,
-            "triggered_by": triggered_by,
-        },
+    conn.executemany(
+        _UPSERT_SCORE_SQL,
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "score_type": score_type,
+                "score_value": score_value,
+                "factors": json.dumps(factors),
+                "computed_at": now,
+                "triggered_by": triggered_by,
+            }
+            for entity_id, score_value, factors in scores
+        ],
     )
 
 
@@ -438,55 +480,91 @@ def get_entity_score(
 # Batch operations
 # ---------------------------------------------------------------------------
 
+def _grouped_stats(conn, sql: str, params: dict | None = None) -> dict[str, dict]:
+    return {row["entity_id"]: dict(row) for row in conn.execute(sql, params or {})}
+
+
 def score_all_companies(
     triggered_by: str = "batch",
-) -> dict[str, int]:
-    """Score all active companies. Returns {"scored": int, "skipped": int}."""
-    scored = 0
-    skipped = 0
+) -> dict[str, Any]:
+    """Score all active companies.
+
+    Statistics for every company are gathered in two grouped passes and the
+    scores written with a single ``executemany``.  Returns
+    {"scored": int, "skipped": int, "elapsed_s": float}.
+    """
+    started = time.monotonic()
+    now = datetime.now(timezone.utc)
+    params = {"window_start": _window_start(now)}
 
     with get_connection() as conn:
-        companies = conn.execute(
-            "SELECT id, name FROM companies WHERE status = 'active' ORDER BY name COLLATE NOCASE",
-        ).fetchall()
-
-        for c in companies:
-            result = compute_company_score(conn, c["id"])
-            if result is None:
-                skipped += 1
+        company_ids = [r["id"] for r in conn.execute(
+            "SELECT id FROM companies WHERE status = 'active'",
+        )]
+        participant = _grouped_stats(conn, _COMPANY_BATCH_STATS_SQL, params)
+        sender = _grouped_stats(conn, _COMPANY_BATCH_SENDER_STATS_SQL, params)
+
+        scores = []
+        for company_id in company_ids:
+            stats = _merge_stats(
+                participant.get(company_id, {}), sender.get(company_id, {}),
+            )
+            if stats["total_comms"] == 0:
                 continue
-            upsert_entity_score(
-                conn, "company", c["id"], SCORE_TYPE,
-                result["score"], result["factors"],
-                triggered_by=triggered_by,
+            score, factors = _score_stats(
+                stats, stats["distinct_contacts"], now, DEFAULT_WEIGHTS,
             )
-            scored += 1
+            scores.append((company_id, score, factors))
 
-    return {"scored": scored, "skipped": skipped}
+        upsert_entity_scores(conn, "company", scores, triggered_by=triggered_by)
+
+    elapsed = round(time.monotonic() - started, 3)
+    log.info("Scored %d of %d companies in %.3fs", len(scores), len(company_ids), elapsed)
+    return {
+        "scored": len(scores),
+        "skipped": len(company_ids) - len(scores),
+        "elapsed_s": elapsed,
+    }
 
 
 def score_all_contacts(
     triggered_by: str = "batch",
-) -> dict[str, int]:
-    """Score all active contacts. Returns {"scored": int, "skipped": int}."""
-    scored = 0
-    skipped = 0
+) -> dict[str, Any]:
+    """Score all active contacts.
+
+    Statistics for every contact are gathered in three grouped passes and the
+    scores written with a single ``executemany``.  Returns
+    {"scored": int, "skipped": int, "elapsed_s": float}.
+    """
+    started = time.monotonic()
+    now = datetime.now(timezone.utc)
+    params = {"window_start": _window_start(now)}
 
     with get_connection() as conn:
-        contacts = conn.execute(
-            "SELECT id, name FROM contacts WHERE status = 'active' ORDER BY name COLLATE NOCASE",
-        ).fetchall()
-
-        for c in contacts:
-            result = compute_contact_score(conn, c["id"])
-            if result is None:
-                skipped += 1
-                continue
-            upsert_entity_score(
-                conn, "contact", c["id"], SCORE_TYPE,
-                result["score"], result["factors"],
-                triggered_by=triggered_by,
+        contact_ids = [r["id"] for r in conn.execute(
+            "SELECT id FROM contacts WHERE status = 'active'",
+        )]
+        participant = _grouped_stats(conn, _CONTACT_BATCH_STATS_SQL, params)
+        sender = _grouped_stats(conn, _CONTACT_BATCH_SENDER_STATS_SQL, params)
+        breadth = _grouped_stats(conn, _CONTACT_BATCH_BREADTH_SQL)
+
+        scores = []
+        for contact_id in contact_ids:
+            stats = _merge_stats(
+                participant.get(contact_id, {}), sender.get(contact_id, {}),
             )
-            scored += 1
+            if stats["total_comms"] == 0:
+                continue
+            distinct = breadth.get(contact_id, {}).get("distinct_conversations") or 0
+            score, factors = _score_stats(stats, distinct, now, DEFAULT_WEIGHTS)
+            scores.append((contact_id, score, factors))
 
-    return {"scored": scored, "skipped": skipped}
+        upsert_entity_scores(conn, "contact", scores, triggered_by=triggered_by)
+
+    elapsed = round(time.monotonic() - started, 3)
+    log.info("Scored %d of %d contacts in %.3fs", len(scores), len(contact_ids), elapsed)
+    return {
+        "scored": len(scores),
+        "skipped": len(contact_ids) - len(scores),
+        "elapsed_s": elapsed,
+    }
@@ -2,11 +2,71 @@
 
 from __future__ import annotations
 
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
+from . import config
 from .database import get_connection
 
+# ---------------------------------------------------------------------------
+# Session cache
+# ---------------------------------------------------------------------------
+# Valid sessions are cached per process for SESSION_CACHE_TTL_SECONDS so the
+# auth middleware can skip the sessions/users join on most requests.  Entries
+# are dropped by delete_session(), delete_user_sessions() and
+# invalidate_user_sessions(); the TTL bounds staleness across processes.
+
+_cache_lock = threading.Lock()
+# (db path, session id) -> (cached at, expires at, session row)
+_cache: OrderedDict[tuple[str, str], tuple[float, datetime, dict]] = OrderedDict()
+
+
+def _cache_key(session_id: str, db_path) -> tuple[str, str]:
+    return (str(db_path or config.DB_PATH), session_id)
+
+
+def _cache_get(key: tuple[str, str]) -> dict | None:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        cached_at, expires, row = entry
+        if time.monotonic() - cached_at > config.SESSION_CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+        if expires < datetime.now(timezone.utc):
+            # Let the caller take the DB path, which deletes the session
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return dict(row)
+
+
+def _cache_put(key: tuple[str, str], expires: datetime, row: dict) -> None:
+    if config.SESSION_CACHE_TTL_SECONDS <= 0 or config.SESSION_CACHE_SIZE <= 0:
+        return
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), expires, dict(row))
+        _cache.move_to_end(key)
+        while len(_cache) > config.SESSION_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def invalidate_user_sessions(user_id: str) -> None:
+    """Drop cached sessions for *user_id* (e.g. after a role or status change)."""
+    with _cache_lock:
+        for key in [k for k, (_, _, row) in _cache.items() if row["user_id"] == user_id]:
+            del _cache[key]
+
+
+def clear_session_cache() -> None:
+    """Drop every cached session."""
+    with _cache_lock:
+        _cache.clear()
+
 
 def create_session(
     user_id: str,
@@ -45,6 +105,11 @@ def create_session(
 
 def get_session(session_id: str, *, db_path=None) -> dict | None:
     """Look up a session by ID. Returns None if not found or expired."""
+    key = _cache_key(session_id, db_path)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     with get_connection(db_path) as conn:
         row = conn.execute(
             "SELECT s.*, u.email, u.name AS user_name, u.role, u.is_active "
@@ -69,11 +134,14 @@ def get_session(session_id: str, *, db_path=None) -> dict | None:
     if not r["is_active"]:
         return None
 
+    _cache_put(key, expires, r)
     return r
 
 
 def delete_session(session_id: str, *, db_path=None) -> bool:
     """Delete a session. Returns True if a session was deleted."""
+    with _cache_lock:
+        _cache.pop(_cache_key(session_id, db_path), None)
     with get_connection(db_path) as conn:
         conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
         deleted = conn.execute("SELECT changes()").fetchone()[0]
@@ -82,6 +150,7 @@ def delete_session(session_id: str, *, db_path=None) -> bool:
 
 def delete_user_sessions(user_id: str, *, db_path=None) -> int:
     """Delete all sessions for a user. Returns count deleted."""
+    invalidate_user_sessions(user_id)
     with get_connection(db_path) as conn:
         conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
         count = conn.execute("SELECT changes()").fetchone()[0]
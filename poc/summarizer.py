@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
+from typing import Iterable, Iterator
 
 import anthropic
 
@@ -50,55 +58,284 @@ Respond ONLY with valid JSON in this exact format:
 }}"""
 
 
-def _format_thread_for_prompt(conv: Conversation) -> str:
-    """Format a conversation's emails into a prompt string.
+# --- Prompt building ---
+
+# Rough token estimate for English email text; close enough for budgeting
+# without pulling in a tokenizer.
+_CHARS_PER_TOKEN = 4
+_SEPARATOR = "\n\n---\n\n"
+# Share of the budget messages kept in full may use
+_FULL_SHARE = 0.6
+# Older messages are condensed to about this many characters
+_DIGEST_CHARS = 240
+# Paragraphs shorter than this ("Thanks,", "Best, Bob") are never deduplicated
+_MIN_DEDUP_CHARS = 40
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // _CHARS_PER_TOKEN)
+
+
+@dataclass
+class PromptStats:
+    """How a thread was fitted into the prompt token budget."""
+
+    messages: int = 0
+    full: int = 0
+    digested: int = 0
+    omitted: int = 0
+    duplicate_paragraphs: int = 0
+    tokens_unbudgeted: int = 0
+    tokens_used: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_unbudgeted - self.tokens_used)
+
+
+def _email_header(em) -> str:
+    date_str = em.date.strftime("%Y-%m-%d %H:%M") if em.date else "unknown date"
+    return f"From: {em.sender}\nDate: {date_str}"
+
 
-    For long threads (>MAX_CONVERSATION_CHARS), include the first 2 and
-    last 3 messages to preserve context and recency.
+def _email_body(em) -> str:
+    return em.body_plain or em.snippet or "(no content)"
+
+
+def _dedupe_bodies(emails: list) -> tuple[list[str], int]:
+    """Drop paragraphs repeated across messages (signatures, disclaimers,
+    pasted text).  Scans newest first so the copy kept is the one most
+    likely to be sent in full.  Returns (bodies, paragraphs_dropped).
+    """
+    seen: set[str] = set()
+    dropped = 0
+    bodies: list[str] = [""] * len(emails)
+    for i in range(len(emails) - 1, -1, -1):
+        kept = []
+        for para in _PARAGRAPH_SPLIT.split(_email_body(emails[i])):
+            key = " ".join(para.split()).lower()
+            if len(key) >= _MIN_DEDUP_CHARS:
+                if key in seen:
+                    dropped += 1
+                    continue
+                seen.add(key)
+            kept.append(para)
+        bodies[i] = "\n\n".join(kept) if kept else "(repeats earlier content)"
+    return bodies, dropped
+
+
+@lru_cache(maxsize=4096)
+def _digest(body: str) -> str:
+    """Condense a message body to its opening sentences (memoized)."""
+    text = " ".join(body.split())
+    if len(text) <= _DIGEST_CHARS:
+        return text
+    cut = text[:_DIGEST_CHARS]
+    end = max(cut.rfind(". "), cut.rfind("? "), cut.rfind("! "))
+    if end >= _DIGEST_CHARS // 2:
+        return cut[:end + 1] + " [...]"
+    return cut + "..."
+
+
+def build_thread_prompt(
+    conv: Conversation, budget: int | None = None,
+) -> tuple[str, PromptStats]:
+    """Format a conversation into prompt text within a token budget.
+
+    Repeated paragraphs are removed, then the most recent messages are
+    kept in full while they fit in most of *budget* (default
+    ``config.PROMPT_TOKEN_BUDGET``).  Older messages are condensed to a
+    short digest — the thread's opening message first, then newest to
+    oldest — and whatever still does not fit is replaced by an omission
+    marker.  A newest message that alone exceeds the budget is truncated.
     """
+    budget = budget or config.PROMPT_TOKEN_BUDGET
     emails = conv.emails
+    n = len(emails)
+    head = f"Subject: {conv.subject}\n\n"
+    stats = PromptStats(messages=n)
+    stats.tokens_unbudgeted = estimate_tokens(head + _SEPARATOR.join(
+        f"{_email_header(em)}\n\n{_email_body(em)}" for em in emails
+    ))
+
+    bodies, stats.duplicate_paragraphs = _dedupe_bodies(emails)
+    remaining = budget - estimate_tokens(head)
+    included: dict[int, str] = {}
+
+    # Full messages stop at _FULL_SHARE of the budget (the newest is always
+    # kept) so older context still gets condensed digests.
+    full_floor = remaining - int(budget * _FULL_SHARE)
+    i = n - 1
+    while i >= 0:
+        entry = f"{_email_header(emails[i])}\n\n{bodies[i]}"
+        cost = estimate_tokens(entry + _SEPARATOR)
+        if cost > remaining or (i < n - 1 and remaining - cost < full_floor):
+            break
+        included[i] = entry
+        remaining -= cost
+        i -= 1
+    if i == n - 1 and n:
+        entry = f"{_email_header(emails[i])}\n\n{bodies[i]}"
+        included[i] = entry[:max(0, remaining) * _CHARS_PER_TOKEN] + "\n[truncated]"
+        remaining = 0
+        i -= 1
+    stats.full = len(included)
+
+    older = list(range(i, -1, -1))
+    if older and older[-1] == 0:
+        older = [0] + older[:-1]
+    for j in older:
+        entry = f"{_email_header(emails[j])} (condensed)\n\n{_digest(bodies[j])}"
+        cost = estimate_tokens(entry + _SEPARATOR)
+        if cost > remaining:
+            continue
+        included[j] = entry
+        remaining -= cost
+        stats.digested += 1
+    stats.omitted = n - len(included)
+
+    parts: list[str] = []
+    gap = 0
+    for j in range(n):
+        if j not in included:
+            gap += 1
+            continue
+        if gap:
+            parts.append(f"[... {gap} messages omitted for brevity ...]")
+            gap = 0
+        parts.append(included[j])
+
+    text = head + _SEPARATOR.join(parts)
+    stats.tokens_used = estimate_tokens(text)
+    return text, stats
+
+
+def _format_thread_for_prompt(conv: Conversation) -> str:
+    """Format a conversation's emails into a prompt string (see :func:`build_thread_prompt`)."""
+    return build_thread_prompt(conv)[0]
+
+
+_prompt_totals_lock = threading.Lock()
+_prompt_totals = {"prompts": 0, "tokens_used": 0, "tokens_saved": 0}
+
+
+def _record_prompt(stats: PromptStats) -> None:
+    with _prompt_totals_lock:
+        _prompt_totals["prompts"] += 1
+        _prompt_totals["tokens_used"] += stats.tokens_used
+        _prompt_totals["tokens_saved"] += stats.tokens_saved
+
+
+def prompt_token_totals() -> dict:
+    """Process-wide totals of prompts sent and estimated tokens used/saved."""
+    with _prompt_totals_lock:
+        return dict(_prompt_totals)
+
+
+def content_hash(conv: Conversation, thread_text: str | None = None) -> str:
+    """Fingerprint of what would be sent to Claude for *conv*.
+
+    Covers the model and the formatted (quote-stripped, truncated) thread
+    text, so a conversation whose summary was invalidated but whose content
+    did not actually change can keep its existing summary.  Pass
+    *thread_text* when the prompt has already been built.
+    """
+    if thread_text is None:
+        thread_text = _format_thread_for_prompt(conv)
+    h = hashlib.sha256()
+    h.update(config.CLAUDE_MODEL.encode())
+    h.update(b"\0")
+    h.update(thread_text.encode())
+    return h.hexdigest()
+
+
+def get_client():
+    """Return the Claude client, or the offline stub when ``POC_CLAUDE_STUB`` is set."""
+    if config.CLAUDE_STUB:
+        from .claude_stub import StubClient
+        return StubClient()
+    return anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
+
+
+def summarization_enabled() -> bool:
+    return bool(config.ANTHROPIC_API_KEY or config.CLAUDE_STUB)
+
+
+def _request_params(
+    conv: Conversation,
+    user_email: str,
+    prompt: tuple[str, PromptStats] | None = None,
+) -> dict:
+    """Messages API parameters for summarizing *conv*.
+
+    *prompt* is a ``build_thread_prompt(conv)`` result to reuse, if the
+    caller already built one.
+    """
+    thread_text, stats = prompt or build_thread_prompt(conv)
+    _record_prompt(stats)
+    log.debug(
+        "Prompt for thread %s: %d/%d messages in full, %d condensed, %d omitted, "
+        "%d duplicate paragraphs, ~%d tokens (~%d saved)",
+        conv.thread_id, stats.full, stats.messages, stats.digested, stats.omitted,
+        stats.duplicate_paragraphs, stats.tokens_used, stats.tokens_saved,
+    )
+    system_prompt = _SYSTEM_PROMPT_TEMPLATE.format(
+        user_email=user_email,
+        today=date.today().isoformat(),
+    )
+    return {
+        "model": config.CLAUDE_MODEL,
+        "max_tokens": 512,
+        "system": system_prompt,
+        "messages": [
+            {
+                "role": "user",
+                "content": f"Analyze this email conversation:\n\n{thread_text}",
+            }
+        ],
+    }
+
+
+def _parse_response(thread_id: str, raw_text: str) -> ConversationSummary:
+    """Build a summary from Claude's JSON reply (tolerating code fences)."""
+    raw_text = raw_text.strip()
+    json_text = raw_text
+    if json_text.startswith("```"):
+        lines = json_text.split("\n")
+        # Remove first and last lines (fences)
+        lines = [l for l in lines if not l.strip().startswith("```")]
+        json_text = "\n".join(lines)
 
-    def format_email(em) -> str:
-        date_str = em.date.strftime("%Y-%m-%d %H:%M") if em.date else "unknown date"
-        body = em.body_plain or em.snippet or "(no content)"
-        return f"From: {em.sender}\nDate: {date_str}\n\n{body}"
-
-    # Try formatting all emails first
-    all_formatted = [format_email(em) for em in emails]
-    full_text = f"Subject: {conv.subject}\n\n" + "\n\n---\n\n".join(all_formatted)
-
-    if len(full_text) <= config.MAX_CONVERSATION_CHARS:
-        return full_text
-
-    # Truncate: first 2 + last 3 messages
-    if len(emails) <= 5:
-        # If 5 or fewer, just truncate the bodies
-        truncated = []
-        remaining = config.MAX_CONVERSATION_CHARS
-        for em in emails:
-            entry = format_email(em)
-            if len(entry) > remaining // len(emails):
-                entry = entry[: remaining // len(emails)] + "..."
-            truncated.append(entry)
-        return f"Subject: {conv.subject}\n\n" + "\n\n---\n\n".join(truncated)
-
-    first = [format_email(em) for em in emails[:2]]
-    last = [format_email(em) for em in emails[-3:]]
-    omitted = len(emails) - 5
-    middle = f"\n[... {omitted} messages omitted for brevity ...]\n"
-
-    text = (
-        f"Subject: {conv.subject}\n\n"
-        + "\n\n---\n\n".join(first)
-        + middle
-        + "\n\n---\n\n".join(last)
+    try:
+        data = json.loads(json_text)
+    except json.JSONDecodeError as exc:
+        log.warning("Failed to parse Claude response for thread %s: %s",
+                    thread_id, exc)
+        return _failed(thread_id, f"JSON parse error: {exc}")
+
+    status_str = data.get("status", "UNCERTAIN").upper()
+    try:
+        status = ConversationStatus(status_str)
+    except ValueError:
+        status = ConversationStatus.UNCERTAIN
+
+    return ConversationSummary(
+        thread_id=thread_id,
+        status=status,
+        summary=data.get("summary", ""),
+        action_items=data.get("action_items", []),
+        key_topics=data.get("key_topics", []),
     )
 
-    # Final safety truncation
-    if len(text) > config.MAX_CONVERSATION_CHARS:
-        text = text[: config.MAX_CONVERSATION_CHARS] + "\n[truncated]"
 
-    return text
+def _failed(thread_id: str, error: str) -> ConversationSummary:
+    return ConversationSummary(
+        thread_id=thread_id,
+        status=ConversationStatus.UNCERTAIN,
+        summary="",
+        error=error,
+    )
 
 
 def summarize_conversation(
@@ -106,82 +343,161 @@ def summarize_conversation(
     client: anthropic.Anthropic,
     user_email: str,
     rate_limiter: RateLimiter | None = None,
+    *,
+    prompt: tuple[str, PromptStats] | None = None,
 ) -> ConversationSummary:
     """Summarize a single conversation using Claude."""
-    thread_text = _format_thread_for_prompt(conv)
-    system_prompt = _SYSTEM_PROMPT_TEMPLATE.format(
-        user_email=user_email,
-        today=date.today().isoformat(),
-    )
-
+    params = _request_params(conv, user_email, prompt)
     try:
         if rate_limiter:
             rate_limiter.acquire()
+        response = client.messages.create(**params)
+        return _parse_response(conv.thread_id, response.content[0].text)
+    except Exception as exc:
+        log.warning("Claude API error for thread %s: %s", conv.thread_id, exc)
+        return _failed(conv.thread_id, str(exc))
 
-        response = client.messages.create(
-            model=config.CLAUDE_MODEL,
-            max_tokens=512,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Analyze this email conversation:\n\n{thread_text}",
-                }
-            ],
-        )
 
-        raw_text = response.content[0].text.strip()
+def summarize_many(
+    conversations: Iterable[Conversation],
+    client,
+    user_email: str,
+    *,
+    rate_limiter: RateLimiter | None = None,
+    workers: int | None = None,
+    prompts: dict[str, tuple[str, PromptStats]] | None = None,
+) -> Iterator[ConversationSummary]:
+    """Summarize conversations concurrently, yielding results as they finish.
+
+    At most *workers* (default ``config.CLAUDE_WORKERS``) requests are in
+    flight at once; *rate_limiter* still caps the request rate across all
+    of them.  Conversations are pulled from *conversations* lazily, so a
+    large backlog is never materialized up front.  Results arrive in
+    completion order — the caller (typically the DB writer) matches them by
+    ``thread_id``.  *prompts* maps thread IDs to prompts already built.
+    """
+    workers = max(1, workers or config.CLAUDE_WORKERS)
+    prompts = prompts or {}
+    pending = iter(conversations)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as pool:
+        in_flight = set()
+        for conv in pending:
+            in_flight.add(pool.submit(
+                summarize_conversation, conv, client, user_email, rate_limiter,
+                prompt=prompts.get(conv.thread_id),
+            ))
+            if len(in_flight) < workers:
+                continue
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+        for fut in in_flight:
+            yield fut.result()
+
+
+@dataclass
+class SubmittedBatch:
+    """A Message Batch in flight: its ID and the thread behind each request."""
+
+    id: str
+    thread_ids: dict[str, str]  # custom_id -> thread_id
+
+
+def submit_batch(
+    conversations: list[Conversation],
+    client,
+    user_email: str,
+    *,
+    prompts: dict[str, tuple[str, PromptStats]] | None = None,
+) -> SubmittedBatch | None:
+    """Submit one Message Batch summarizing *conversations* without waiting for it.
+
+    Returns None when there is nothing to submit.  *prompts* maps thread IDs
+    to prompts already built.
+    """
+    if not conversations:
+        return None
+    prompts = prompts or {}
+    requests = []
+    thread_ids: dict[str, str] = {}
+    for i, conv in enumerate(conversations):
+        custom_id = f"conv-{i}"
+        thread_ids[custom_id] = conv.thread_id
+        requests.append({
+            "custom_id": custom_id,
+            "params": _request_params(conv, user_email, prompts.get(conv.thread_id)),
+        })
+    batch = client.messages.batches.create(requests=requests)
+    log.info("Submitted summary batch %s (%d conversations)", batch.id, len(requests))
+    return SubmittedBatch(id=batch.id, thread_ids=thread_ids)
+
+
+def collect_batch(
+    client, submitted: SubmittedBatch, *, poll_interval: float = 30.0,
+) -> list[ConversationSummary]:
+    """Wait for a submitted batch to end and return its summaries in input order.
 
-        # Parse JSON response — handle markdown code fences if present
-        json_text = raw_text
-        if json_text.startswith("```"):
-            lines = json_text.split("\n")
-            # Remove first and last lines (fences)
-            lines = [l for l in lines if not l.strip().startswith("```")]
-            json_text = "\n".join(lines)
+    Requests that did not succeed come back as failed summaries (``error``
+    set) so they are retried on the next run.
+    """
+    while True:
+        batch = client.messages.batches.retrieve(submitted.id)
+        if batch.processing_status == "ended":
+            break
+        time.sleep(poll_interval)
+
+    results: dict[str, ConversationSummary] = {}
+    for entry in client.messages.batches.results(submitted.id):
+        thread_id = submitted.thread_ids.get(entry.custom_id)
+        if thread_id is None:
+            continue
+        if entry.result.type == "succeeded":
+            results[entry.custom_id] = _parse_response(
+                thread_id, entry.result.message.content[0].text,
+            )
+        else:
+            results[entry.custom_id] = _failed(
+                thread_id, f"Batch request {entry.result.type}",
+            )
+    return [
+        results.get(custom_id) or _failed(thread_id, "Missing from batch results")
+        for custom_id, thread_id in submitted.thread_ids.items()
+    ]
 
-        data = json.loads(json_text)
 
-        status_str = data.get("status", "UNCERTAIN").upper()
-        try:
-            status = ConversationStatus(status_str)
-        except ValueError:
-            status = ConversationStatus.UNCERTAIN
-
-        return ConversationSummary(
-            thread_id=conv.thread_id,
-            status=status,
-            summary=data.get("summary", ""),
-            action_items=data.get("action_items", []),
-            key_topics=data.get("key_topics", []),
-        )
+def summarize_batch(
+    conversations: list[Conversation],
+    client,
+    user_email: str,
+    *,
+    poll_interval: float = 30.0,
+    prompts: dict[str, tuple[str, PromptStats]] | None = None,
+) -> list[ConversationSummary]:
+    """Summarize a backlog through the Message Batches API.
 
-    except json.JSONDecodeError as exc:
-        log.warning("Failed to parse Claude response for thread %s: %s",
-                     conv.thread_id, exc)
-        return ConversationSummary(
-            thread_id=conv.thread_id,
-            status=ConversationStatus.UNCERTAIN,
-            summary="",
-            error=f"JSON parse error: {exc}",
-        )
-    except Exception as exc:
-        log.warning("Claude API error for thread %s: %s", conv.thread_id, exc)
-        return ConversationSummary(
-            thread_id=conv.thread_id,
-            status=ConversationStatus.UNCERTAIN,
-            summary="",
-            error=str(exc),
-        )
+    Batches are processed asynchronously by Anthropic at reduced cost; this
+    submits one batch (:func:`submit_batch`), polls until it has ended and
+    returns the summaries in input order (:func:`collect_batch`).
+    """
+    submitted = submit_batch(conversations, client, user_email, prompts=prompts)
+    if submitted is None:
+        return []
+    return collect_batch(client, submitted, poll_interval=poll_interval)
 
 
 def summarize_all(
     conversations: list[Conversation],
     user_email: str = "",
     rate_limiter: RateLimiter | None = None,
+    *,
+    workers: int | None = None,
 ) -> list[ConversationSummary]:
-    """Summarize all conversations, skipping failures gracefully."""
-    if not config.ANTHROPIC_API_KEY:
+    """Summarize all conversations, skipping failures gracefully.
+
+    Requests run concurrently (see :func:`summarize_many`); the returned
+    list is in input order.
+    """
+    if not summarization_enabled():
         log.error("ANTHROPIC_API_KEY not set — skipping summarization")
         return [
             ConversationSummary(
@@ -193,12 +509,15 @@ def summarize_all(
             for c in conversations
         ]
 
-    client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
-    summaries: list[ConversationSummary] = []
-
-    for conv in conversations:
-        summary = summarize_conversation(conv, client, user_email, rate_limiter)
-        summaries.append(summary)
+    client = get_client()
+    by_thread = {
+        s.thread_id: s
+        for s in summarize_many(
+            conversations, client, user_email,
+            rate_limiter=rate_limiter, workers=workers,
+        )
+    }
+    summaries = [by_thread[c.thread_id] for c in conversations]
 
     succeeded = sum(1 for s in summaries if not s.error)
     log.info("Summarized %d/%d conversations successfully",
@@ -5,15 +5,23 @@ from __future__ import annotations
 import logging
 import uuid
 from datetime import datetime, timezone
+from typing import Iterable
 
 from google.oauth2.credentials import Credentials
 
 from . import config
-from .contacts_client import fetch_contact_groups, fetch_contacts
+from .contacts_client import (
+    SyncTokenExpiredError,
+    fetch_contact_changes,
+    fetch_contact_groups,
+    fetch_contacts,
+)
 from .database import get_connection
-from .email_parser import strip_quotes
+from .email_parser import strip_quotes_many
 from .gmail_client import (
-    fetch_history,
+    HistoryChanges,
+    fetch_history_changes,
+    fetch_message_labels,
     fetch_messages,
     fetch_threads,
     get_history_id,
@@ -32,11 +40,22 @@ from .domain_resolver import (
     ensure_domain_identifier,
     extract_domain,
     is_public_domain,
+    normalize_domain,
     resolve_company_by_domain,
 )
 from .rate_limiter import RateLimiter
-from .summarizer import summarize_conversation
-from .triage import AUTOMATED_SENDER_PATTERNS
+from .summarizer import (
+    SubmittedBatch,
+    build_thread_prompt,
+    collect_batch,
+    content_hash,
+    get_client,
+    prompt_token_totals,
+    submit_batch,
+    summarization_enabled,
+    summarize_many,
+)
+from .triage import is_automated_sender
 
 log = logging.getLogger(__name__)
 
@@ -144,7 +163,8 @@ def _resolve_company_id(
 
     Resolution:
     1. Extract domain; return None for public/no domain
-    2. Domain match via ``resolve_company_by_domain`` — return if found
+    2. Exact domain match via ``resolve_company_by_domain`` (probes of the
+       ``LOWER(domain)`` / ``LOWER(value)`` indexes) — return if found
     3. Auto-create company named after the domain
     """
     domain = extract_domain(email) if email else None
@@ -159,9 +179,10 @@ def _resolve_company_id(
     # Step 2: auto-create company named after the domain
     company_id = str(uuid.uuid4())
     conn.execute(
-        """INSERT INTO companies (id, name, domain, status, customer_id, created_at, updated_at)
-           VALUES (?, ?, ?, 'active', ?, ?, ?)""",
-        (company_id, domain, domain, customer_id, now, now),
+        """INSERT INTO companies
+           (id, name, domain, normalized_domain, status, customer_id, created_at, updated_at)
+           VALUES (?, ?, ?, ?, 'active', ?, ?, ?)""",
+        (company_id, domain, domain, normalize_domain(domain), customer_id, now, now),
     )
 
     # Create user_companies linkage
@@ -179,72 +200,249 @@ def _resolve_company_id(
     return company_id
 
 
-def _add_address_if_new(
-    contact_id: str,
-    addr: dict,
-) -> dict | None:
-    """Add an address if no matching address already exists. Returns the row or None."""
-    from .hierarchy import add_address, get_addresses
-
-    existing = get_addresses("contact", contact_id)
-    for ex in existing:
-        if (
-            ex.get("street") == addr.get("street", "")
-            and ex.get("city") == addr.get("city", "")
-            and ex.get("postal_code") == addr.get("postal_code", "")
-        ):
-            return None  # duplicate
-
-    return add_address(
-        "contact",
-        contact_id,
-        address_type=addr.get("type", "other"),
-        street=addr.get("street", ""),
-        city=addr.get("city", ""),
-        state=addr.get("state", ""),
-        postal_code=addr.get("postal_code", ""),
-        country=addr.get("country", ""),
-    )
+def _load_contact_sync_state(
+    conn, emails: list[str], *, customer_id: str | None,
+) -> dict:
+    """Preload everything the contact diff needs, keyed for in-memory lookups."""
+    contact_by_email: dict[str, str] = {}
+    for chunk in _chunked(emails):
+        for r in conn.execute(
+            "SELECT value, contact_id FROM contact_identifiers "
+            f"WHERE type = 'email' AND value IN ({_placeholders(chunk)})",
+            chunk,
+        ).fetchall():
+            contact_by_email[r["value"]] = r["contact_id"]
+
+    contact_ids = list(set(contact_by_email.values()))
+    phones: dict[str, set[str]] = {}
+    addresses: dict[str, set[tuple]] = {}
+    country: dict[str, str] = {}
+    for chunk in _chunked(contact_ids):
+        ph = _placeholders(chunk)
+        for r in conn.execute(
+            "SELECT entity_id, number FROM phone_numbers "
+            f"WHERE entity_type = 'contact' AND entity_id IN ({ph})",
+            chunk,
+        ).fetchall():
+            phones.setdefault(r["entity_id"], set()).add(r["number"])
+        # Same ordering as resolve_country_code: primary first, then oldest
+        for r in conn.execute(
+            "SELECT entity_id, street, city, postal_code, country FROM addresses "
+            f"WHERE entity_type = 'contact' AND entity_id IN ({ph}) "
+            "ORDER BY is_primary DESC, created_at ASC",
+            chunk,
+        ).fetchall():
+            addresses.setdefault(r["entity_id"], set()).add(
+                (r["street"], r["city"], r["postal_code"])
+            )
+            if r["country"] is not None:
+                country.setdefault(r["entity_id"], r["country"])
 
+    emp_role = conn.execute(
+        "SELECT id FROM contact_company_roles "
+        "WHERE name = 'Employee' AND customer_id = ?",
+        (customer_id,),
+    ).fetchone()
 
-def _store_contact_labels(
-    contact_id: str,
-    labels: list[str],
+    default_country = None
+    if customer_id:
+        from .settings import get_setting
+        default_country = get_setting(customer_id, "default_phone_country")
+
+    return {
+        "contact_by_email": contact_by_email,
+        "phones": phones,
+        "addresses": addresses,
+        "country": country,
+        "emp_role_id": emp_role["id"] if emp_role else None,
+        "default_country": default_country or "US",
+    }
+
+
+def _apply_contact_sync(
+    conn,
+    contacts: list[KnownContact],
     *,
     customer_id: str | None = None,
+    user_id: str | None = None,
 ) -> int:
-    """Upsert tags and create contact_tags rows. Returns count stored."""
+    """Diff *contacts* against the DB in memory and write the changes on *conn*.
+
+    Existing identifiers, phones, addresses and the Employee role are read
+    once up front; inserts and updates are then applied with ``executemany``.
+    Returns the number of contacts processed.
+    """
+    from .notes import _insert_note
+    from .phone_utils import normalize_phone
+
     now = _now_iso()
-    count = 0
+    state = _load_contact_sync_state(
+        conn, sorted({kc.email.lower() for kc in contacts}),
+        customer_id=customer_id,
+    )
+    contact_by_email = state["contact_by_email"]
+    phones = state["phones"]
+    addresses = state["addresses"]
+    emp_role_id = state["emp_role_id"]
+
+    company_by_domain: dict[str, str | None] = {}
+    new_contacts: list[tuple] = []
+    new_identifiers: list[tuple] = []
+    new_user_contacts: list[tuple] = []
+    name_updates: list[tuple] = []
+    affiliations: list[tuple] = []
+    title_updates: list[tuple] = []
+    new_phones: list[tuple] = []
+    new_addresses: list[tuple] = []
+    bios: list[tuple[str, str]] = []
+    labels: list[tuple[str, str]] = []
+
+    for kc in contacts:
+        email_lower = kc.email.lower()
+        domain = extract_domain(kc.email)
+        if domain not in company_by_domain:
+            company_by_domain[domain] = _resolve_company_id(
+                conn, kc.email, now,
+                customer_id=customer_id, user_id=user_id,
+            )
+        company_id = company_by_domain[domain]
+
+        contact_id = contact_by_email.get(email_lower)
+        is_new = contact_id is None
+        if is_new:
+            contact_id = str(uuid.uuid4())
+            contact_by_email[email_lower] = contact_id
+            new_contacts.append((contact_id, kc.name, customer_id, user_id, now, now))
+            new_identifiers.append((str(uuid.uuid4()), contact_id, email_lower, now, now))
+            if user_id:
+                new_user_contacts.append((str(uuid.uuid4()), user_id, contact_id, now, now))
+        else:
+            name_updates.append((kc.name, now, contact_id))
 
-    with get_connection() as conn:
-        for raw_label in labels:
-            name = raw_label.strip().lower()
-            if not name:
+        if company_id:
+            affiliations.append(
+                (str(uuid.uuid4()), contact_id, company_id, emp_role_id, now, now)
+            )
+            if kc.title:
+                title_updates.append((kc.title, contact_id, company_id))
+
+        # Phones: E.164 dedup, country taken from addresses stored before this sync
+        if kc.phones:
+            country = state["country"].get(contact_id) or state["default_country"]
+            seen = phones.setdefault(contact_id, set())
+            for phone in kc.phones:
+                normalized = normalize_phone(phone["number"], country)
+                if normalized is None or normalized in seen:
+                    continue
+                seen.add(normalized)
+                new_phones.append((
+                    str(uuid.uuid4()), contact_id, phone.get("type", "mobile"),
+                    normalized, now, now,
+                ))
+
+        # Addresses (dedup by street+city+postal_code)
+        for addr in kc.addresses:
+            key = (addr.get("street", ""), addr.get("city", ""), addr.get("postal_code", ""))
+            seen_addrs = addresses.setdefault(contact_id, set())
+            if key in seen_addrs:
                 continue
+            seen_addrs.add(key)
+            new_addresses.append((
+                str(uuid.uuid4()), contact_id, addr.get("type", "other"),
+                key[0], key[1], addr.get("state", ""), key[2],
+                addr.get("country", ""), now, now,
+            ))
 
-            tag_id = str(uuid.uuid4())
-            conn.execute(
-                """INSERT INTO tags (id, customer_id, name, source, created_at)
-                   VALUES (?, ?, ?, 'google_contacts', ?)
-                   ON CONFLICT(name) DO NOTHING""",
-                (tag_id, customer_id, name, now),
-            )
+        # Biography → note (only for new contacts to avoid duplicates)
+        if kc.biography and is_new:
+            bios.append((contact_id, kc.biography))
 
-            tag_row = conn.execute(
-                "SELECT id FROM tags WHERE name = ?", (name,),
-            ).fetchone()
-            actual_id = tag_row["id"]
+        for raw_label in kc.labels:
+            name = raw_label.strip().lower()
+            if name:
+                labels.append((contact_id, name))
+
+    conn.executemany(
+        """INSERT INTO contacts (id, name, source, status,
+           customer_id, created_by, created_at, updated_at)
+           VALUES (?, ?, 'google_contacts', 'active', ?, ?, ?, ?)""",
+        new_contacts,
+    )
+    conn.executemany(
+        """INSERT INTO contact_identifiers
+           (id, contact_id, type, value, is_primary, is_current, source, verified, created_at, updated_at)
+           VALUES (?, ?, 'email', ?, 1, 1, 'google_contacts', 1, ?, ?)""",
+        new_identifiers,
+    )
+    conn.executemany(
+        """INSERT OR IGNORE INTO user_contacts
+           (id, user_id, contact_id, visibility, is_owner, created_at, updated_at)
+           VALUES (?, ?, ?, 'public', 1, ?, ?)""",
+        new_user_contacts,
+    )
+    conn.executemany(
+        "UPDATE contacts SET name = ?, updated_at = ? WHERE id = ?",
+        name_updates,
+    )
+    conn.executemany(
+        """INSERT OR IGNORE INTO contact_companies
+           (id, contact_id, company_id, role_id, is_primary, is_current,
+            source, created_at, updated_at)
+           VALUES (?, ?, ?, ?, 1, 1, 'sync', ?, ?)""",
+        affiliations,
+    )
+    conn.executemany(
+        """UPDATE contact_companies SET title = ?
+           WHERE contact_id = ? AND company_id = ?
+             AND (title IS NULL OR title = '')""",
+        title_updates,
+    )
+    conn.executemany(
+        "INSERT INTO phone_numbers "
+        "(id, entity_type, entity_id, phone_type, number, is_primary, "
+        "is_current, source, created_at, updated_at) "
+        "VALUES (?, 'contact', ?, ?, ?, 0, 1, '', ?, ?)",
+        new_phones,
+    )
+    conn.executemany(
+        "INSERT INTO addresses "
+        "(id, entity_type, entity_id, address_type, street, city, state, "
+        "postal_code, country, is_primary, is_current, source, created_at, updated_at) "
+        "VALUES (?, 'contact', ?, ?, ?, ?, ?, ?, ?, 0, 1, '', ?, ?)",
+        new_addresses,
+    )
 
-            conn.execute(
-                """INSERT OR IGNORE INTO contact_tags
-                   (contact_id, tag_id, source, confidence, created_at)
-                   VALUES (?, ?, 'google_contacts', 1.0, ?)""",
-                (contact_id, actual_id, now),
-            )
-            count += 1
+    for contact_id, biography in bios:
+        _insert_note(
+            conn, customer_id or "", "contact", contact_id,
+            title="Google Biography",
+            content_html=f"<p>{biography}</p>",
+            created_by=user_id,
+        )
 
-    return count
+    # Labels → tags + contact_tags
+    tag_names = sorted({name for _, name in labels})
+    conn.executemany(
+        """INSERT INTO tags (id, customer_id, name, source, created_at)
+           VALUES (?, ?, ?, 'google_contacts', ?)
+           ON CONFLICT(name) DO NOTHING""",
+        [(str(uuid.uuid4()), customer_id, name, now) for name in tag_names],
+    )
+    tag_ids: dict[str, str] = {}
+    for chunk in _chunked(tag_names):
+        for r in conn.execute(
+            f"SELECT id, name FROM tags WHERE name IN ({_placeholders(chunk)})",
+            chunk,
+        ).fetchall():
+            tag_ids[r["name"]] = r["id"]
+    conn.executemany(
+        """INSERT OR IGNORE INTO contact_tags
+           (contact_id, tag_id, source, confidence, created_at)
+           VALUES (?, ?, 'google_contacts', 1.0, ?)""",
+        [(contact_id, tag_ids[name], now) for contact_id, name in labels],
+    )
+
+    return len(contacts)
 
 
 def sync_contacts(
@@ -253,139 +451,50 @@ def sync_contacts(
     *,
     customer_id: str | None = None,
     user_id: str | None = None,
+    account_id: str | None = None,
 ) -> int:
     """Fetch contacts from Google People API and UPSERT into contacts + contact_identifiers.
 
-    Two-pass approach:
-      Pass 1 — create/update contacts, identifiers, affiliations, titles (single transaction)
-      Pass 2 — store phones, addresses, biographies, labels (each uses own connection)
+    People API results are staged in memory, diffed against existing
+    identifiers, phones, addresses and tags, and applied in one transaction.
+
+    When *account_id*, *customer_id* and *user_id* are all given, the People
+    API sync token is kept as a user setting and later runs only fetch people
+    changed since the previous sync (falling back to a full fetch if the
+    token has expired).  People deleted in Google are not removed locally.
 
     Returns the number of contacts stored.
     """
-    from .hierarchy import add_phone_number
-    from .notes import create_note
+    from .settings import get_setting, set_setting
 
     # Fetch contact groups first, then contacts with the group map
     group_map = fetch_contact_groups(creds, rate_limiter=rate_limiter)
-    contacts = fetch_contacts(creds, rate_limiter=rate_limiter, group_map=group_map)
-    now = _now_iso()
-    count = 0
-
-    # Accumulate (contact_id, kc, is_new) for pass 2
-    pass2_items: list[tuple[str, KnownContact, bool]] = []
 
-    # ------------------------------------------------------------------
-    # Pass 1: contacts, identifiers, affiliations, titles
-    # ------------------------------------------------------------------
-    with get_connection() as conn:
-        for kc in contacts:
-            email_lower = kc.email.lower()
-            company_id = _resolve_company_id(
-                conn, kc.email, now,
-                customer_id=customer_id, user_id=user_id,
+    token_key = None
+    next_token = None
+    if account_id and customer_id and user_id:
+        token_key = f"contacts_sync_token_{account_id}"
+        sync_token = get_setting(customer_id, token_key, user_id=user_id)
+        try:
+            contacts, next_token = fetch_contact_changes(
+                creds, rate_limiter=rate_limiter, group_map=group_map,
+                sync_token=sync_token,
             )
-
-            # Check if identifier already exists
-            existing = conn.execute(
-                "SELECT ci.contact_id FROM contact_identifiers ci WHERE ci.type = 'email' AND ci.value = ?",
-                (email_lower,),
-            ).fetchone()
-
-            is_new = False
-            if existing:
-                # Update existing contact
-                contact_id = existing["contact_id"]
-                conn.execute(
-                    "UPDATE contacts SET name = ?, updated_at = ? WHERE id = ?",
-                    (kc.name, now, contact_id),
-                )
-            else:
-                # Insert new contact + identifier
-                is_new = True
-                contact_id = str(uuid.uuid4())
-                conn.execute(
-                    """INSERT INTO contacts (id, name, source, status,
-                       customer_id, created_by, created_at, updated_at)
-                       VALUES (?, ?, 'google_contacts', 'active', ?, ?, ?, ?)""",
-                    (contact_id, kc.name,
-                     customer_id, user_id, now, now),
-                )
-                conn.execute(
-                    """INSERT INTO contact_identifiers
-                       (id, contact_id, type, value, is_primary, is_current, source, verified, created_at, updated_at)
-                       VALUES (?, ?, 'email', ?, 1, 1, 'google_contacts', 1, ?, ?)""",
-                    (str(uuid.uuid4()), contact_id, email_lower, now, now),
-                )
-                # Create user_contacts linkage
-                if user_id:
-                    conn.execute(
-                        """INSERT OR IGNORE INTO user_contacts
-                           (id, user_id, contact_id, visibility, is_owner, created_at, updated_at)
-                           VALUES (?, ?, ?, 'public', 1, ?, ?)""",
-                        (str(uuid.uuid4()), user_id, contact_id, now, now),
-                    )
-
-            # Create affiliation if company resolved
-            if company_id:
-                # Use default Employee role for the customer
-                emp_role = conn.execute(
-                    "SELECT id FROM contact_company_roles "
-                    "WHERE name = 'Employee' AND customer_id = ?",
-                    (customer_id,),
-                ).fetchone()
-                emp_role_id = emp_role["id"] if emp_role else None
-                conn.execute(
-                    """INSERT OR IGNORE INTO contact_companies
-                       (id, contact_id, company_id, role_id, is_primary, is_current,
-                        source, created_at, updated_at)
-                       VALUES (?, ?, ?, ?, 1, 1, 'sync', ?, ?)""",
-                    (str(uuid.uuid4()), contact_id, company_id, emp_role_id, now, now),
-                )
-
-                # Update title on affiliation if provided and not already set
-                if kc.title:
-                    conn.execute(
-                        """UPDATE contact_companies SET title = ?
-                           WHERE contact_id = ? AND company_id = ?
-                             AND (title IS NULL OR title = '')""",
-                        (kc.title, contact_id, company_id),
-                    )
-
-            pass2_items.append((contact_id, kc, is_new))
-            count += 1
-
-    # ------------------------------------------------------------------
-    # Pass 2: phones, addresses, biographies, labels
-    # ------------------------------------------------------------------
-    for contact_id, kc, is_new in pass2_items:
-        # Phones (add_phone_number has built-in E.164 normalization + dedup)
-        for phone in kc.phones:
-            add_phone_number(
-                "contact", contact_id, phone["number"],
-                phone_type=phone.get("type", "mobile"),
-                customer_id=customer_id,
+        except SyncTokenExpiredError:
+            log.info("Contacts sync token expired for %s, doing full re-sync", account_id)
+            contacts, next_token = fetch_contact_changes(
+                creds, rate_limiter=rate_limiter, group_map=group_map,
             )
+    else:
+        contacts = fetch_contacts(creds, rate_limiter=rate_limiter, group_map=group_map)
 
-        # Addresses (dedup by street+city+postal_code)
-        for addr in kc.addresses:
-            _add_address_if_new(contact_id, addr)
-
-        # Biography → note (only for new contacts to avoid duplicates)
-        if kc.biography and is_new:
-            create_note(
-                customer_id or "",
-                "contact",
-                contact_id,
-                title="Google Biography",
-                content_html=f"<p>{kc.biography}</p>",
-                created_by=user_id,
-            )
+    with get_connection() as conn:
+        count = _apply_contact_sync(
+            conn, contacts, customer_id=customer_id, user_id=user_id,
+        )
 
-        # Labels → tags + contact_tags
-        if kc.labels:
-            _store_contact_labels(
-                contact_id, kc.labels, customer_id=customer_id,
-            )
+    if token_key and next_token:
+        set_setting(customer_id, token_key, next_token, scope="user", user_id=user_id)
 
     log.info("Synced %d contacts to database", count)
     return count
@@ -527,26 +636,19 @@ def sync_contact_email(
             if not threads:
                 break
 
+            messages_fetched += sum(len(t) for t in threads)
             with get_connection() as conn:
-                for thread_emails in threads:
-                    messages_fetched += len(thread_emails)
-                    created, updated = _store_thread(
-                        conn, account_id, account_email, thread_emails, contact_index,
-                        customer_id=customer_id, created_by=user_id,
-                    )
-                    if created:
-                        conversations_created += 1
-                    if updated:
-                        conversations_updated += 1
+                stored = _store_threads(
+                    conn, account_id, account_email, threads, contact_index,
+                    customer_id=customer_id, created_by=user_id,
+                )
+            messages_new += stored["messages_stored"]
+            conversations_created += len(stored["created_threads"])
+            conversations_updated += len(stored["updated_threads"])
 
             if not page_token:
                 break
 
-    # Count new messages (messages_fetched - already-existed)
-    # Since _store_thread uses INSERT OR IGNORE, messages_new = total new comms
-    # We approximate by counting all comms for this contact
-    messages_new = messages_fetched  # Best estimate; duplicates are skipped by INSERT OR IGNORE
-
     return {
         "messages_fetched": messages_fetched,
         "messages_new": messages_new,
@@ -561,8 +663,7 @@ def sync_contact_email(
 
 def _is_blocked_sender(addr: str) -> bool:
     """Return True if the address matches an automated/blocked sender pattern."""
-    addr = addr.lower().strip()
-    return any(pat.search(addr) for pat in AUTOMATED_SENDER_PATTERNS)
+    return is_automated_sender(addr)
 
 
 def _should_create_conversation(
@@ -595,18 +696,24 @@ def _should_create_conversation(
         if sender == account_lower:
             user_sent = True
 
-        # Check sender (skip the user themselves)
+        if has_known_nonblocked:
+            continue
+
+        # Check sender (skip the user themselves).  The contact lookup is
+        # cheaper than the pattern check and rules out most CC addresses.
         if sender and sender != account_lower:
-            if not _is_blocked_sender(sender) and sender in contact_index:
+            if sender in contact_index and not _is_blocked_sender(sender):
                 has_known_nonblocked = True
+                continue
 
         # Check recipients from communication_participants
         participants = row.get("_participants", [])
         for p in participants:
             addr = (p.get("address") or "").lower()
             if addr and addr != account_lower:
-                if not _is_blocked_sender(addr) and addr in contact_index:
+                if addr in contact_index and not _is_blocked_sender(addr):
                     has_known_nonblocked = True
+                    break
 
     if total == 1:
         row = comm_rows[0]
@@ -626,6 +733,77 @@ def _should_create_conversation(
 # Conversation + communication persistence
 # ---------------------------------------------------------------------------
 
+# Max bound parameters per IN (...) list — stays well under SQLite's limit
+_SQL_CHUNK = 500
+
+_COMM_COLUMNS = (
+    "id", "account_id", "channel", "timestamp",
+    "original_text", "original_html", "cleaned_html", "search_text",
+    "direction", "source",
+    "sender_address", "sender_name", "subject", "snippet",
+    "provider_message_id", "provider_thread_id",
+    "header_message_id", "header_references", "header_in_reply_to",
+    "is_read", "is_current", "created_at", "updated_at",
+)
+
+_INSERT_COMM_SQL = (
+    f"INSERT OR IGNORE INTO communications ({', '.join(_COMM_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COMM_COLUMNS)})"
+)
+
+_LINK_COMM_SQL = """INSERT OR IGNORE INTO conversation_communications
+   (conversation_id, communication_id, assignment_source, confidence, reviewed, created_at)
+   VALUES (?, ?, 'sync', 1.0, 1, ?)"""
+
+# Per-conversation, per-address participant stats.  Senders contribute one
+# row per communication (counted + dated); recipients only register presence.
+_PARTICIPANT_STATS_SQL = """\
+WITH addrs AS (
+    SELECT cc.conversation_id, LOWER(c.sender_address) AS address,
+           1 AS is_sender, c.timestamp AS ts
+    FROM conversation_communications cc
+    JOIN communications c ON c.id = cc.communication_id
+    WHERE cc.conversation_id IN ({ph})
+      AND c.sender_address IS NOT NULL AND c.sender_address != ''
+    UNION ALL
+    SELECT cc.conversation_id, LOWER(cp.address), 0, NULL
+    FROM conversation_communications cc
+    JOIN communication_participants cp ON cp.communication_id = cc.communication_id
+    WHERE cc.conversation_id IN ({ph})
+      AND cp.address IS NOT NULL AND cp.address != ''
+)
+SELECT a.conversation_id, a.address,
+       SUM(a.is_sender) AS cnt, MIN(a.ts) AS first_dt, MAX(a.ts) AS last_dt,
+       (SELECT ci.contact_id FROM contact_identifiers ci
+        WHERE ci.type = 'email' AND ci.value = a.address) AS contact_id
+FROM addrs a
+GROUP BY a.conversation_id, a.address"""
+
+
+def _chunked(items: list, size: int = _SQL_CHUNK):
+    """Yield successive slices of *items* of at most *size* elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _placeholders(items: list) -> str:
+    return ",".join("?" for _ in items)
+
+
+def _stored_message_ids(conn, account_id: str, message_ids: list[str]) -> set[str]:
+    """Return the subset of *message_ids* already stored for the account."""
+    stored: set[str] = set()
+    for chunk in _chunked(message_ids):
+        stored.update(
+            r["provider_message_id"] for r in conn.execute(
+                f"""SELECT provider_message_id FROM communications
+                    WHERE account_id = ? AND provider_message_id IN ({_placeholders(chunk)})""",
+                [account_id, *chunk],
+            )
+        )
+    return stored
+
+
 def _store_thread(
     conn,
     account_id: str,
@@ -638,245 +816,289 @@ def _store_thread(
 ) -> tuple[bool, bool]:
     """Store a single thread's communications and conditionally create a conversation.
 
+    Thin wrapper around ``_store_threads`` for a one-thread batch.
+
+    Returns (conversation_created, conversation_updated).
+    """
+    if not thread_emails:
+        return False, False
+
+    result = _store_threads(
+        conn, account_id, account_email, [thread_emails], contact_index,
+        customer_id=customer_id, created_by=created_by,
+    )
+    thread_id = thread_emails[0].thread_id
+    return (
+        thread_id in result["created_threads"],
+        thread_id in result["updated_threads"],
+    )
+
+
+def _store_threads(
+    conn,
+    account_id: str,
+    account_email: str,
+    threads: list[list[ParsedEmail]],
+    contact_index: dict[str, KnownContact],
+    *,
+    customer_id: str | None = None,
+    created_by: str | None = None,
+    strip: bool = True,
+) -> dict:
+    """Store a page of threads using set-based inserts and grouped recounts.
+
     Communications are always stored. A conversation is only created when the
     thread satisfies the conversation-creation rules (known contacts, user
     participation, etc.).  When a previously-skipped thread later qualifies,
     the conversation is created retroactively and ALL existing communications
     for that thread are linked.
 
-    Returns (conversation_created, conversation_updated).
+    Work is done per batch rather than per row: one lookup for already-stored
+    messages, ``executemany`` inserts for communications, participants and
+    links, and a single grouped query to rebuild ``conversation_participants``
+    and counters for every touched conversation.
+
+    Quote stripping runs on new messages only; pass ``strip=False`` when
+    bodies were already cleaned upstream (see ``sync_scheduler``).
+
+    Returns a dict with ``created_threads`` and ``updated_threads`` (sets of
+    provider thread IDs), ``messages_stored`` (newly inserted) and
+    ``messages_skipped`` (already present for this account).
     """
-    if not thread_emails:
-        return False, False
+    result: dict = {
+        "created_threads": set(),
+        "updated_threads": set(),
+        "messages_stored": 0,
+        "messages_skipped": 0,
+    }
 
-    thread_id = thread_emails[0].thread_id
-    subject = thread_emails[0].subject or "(no subject)"
-    now = _now_iso()
+    # Group by provider thread, keeping the first email's subject
+    by_thread: dict[str, list[ParsedEmail]] = {}
+    for thread_emails in threads:
+        if thread_emails:
+            by_thread.setdefault(thread_emails[0].thread_id, []).extend(thread_emails)
+    if not by_thread:
+        return result
 
-    # Strip quotes from bodies
-    for em in thread_emails:
-        em.body_plain = strip_quotes(em.body_plain, em.body_html or None)
+    now = _now_iso()
+    thread_ids = list(by_thread)
 
     # ------------------------------------------------------------------
-    # Step 1: Always store communications + participants first
+    # Step 1: Store new communications + participants
     # Dedup note: CRM-composed outbound emails already have a communications
-    # record with the same (account_id, provider_message_id). The INSERT OR
-    # IGNORE below silently skips those, preventing duplicates.
+    # record with the same (account_id, provider_message_id).  Those are
+    # skipped up front, and INSERT OR IGNORE covers any remaining races.
     # ------------------------------------------------------------------
-    new_comm_ids: list[str] = []
-    for em in thread_emails:
+    all_message_ids = [em.message_id for emails in by_thread.values() for em in emails]
+    seen = _stored_message_ids(conn, account_id, all_message_ids)
+    result["messages_skipped"] = len(seen)
+
+    new_emails: list[tuple[str, ParsedEmail]] = []
+    for thread_id, emails in by_thread.items():
+        for em in emails:
+            if em.message_id in seen:
+                continue
+            seen.add(em.message_id)
+            new_emails.append((thread_id, em))
+    if strip:
+        cleaned = strip_quotes_many(
+            (em.body_plain, em.body_html) for _, em in new_emails
+        )
+        for (_, em), body in zip(new_emails, cleaned):
+            em.body_plain = body
+
+    comm_rows: list[tuple] = []
+    participant_rows: dict[str, list[tuple]] = {}
+    comm_thread: dict[str, str] = {}
+    for thread_id, em in new_emails:
         comm_id = str(uuid.uuid4())
         row = em.to_row(
             account_id=account_id,
             communication_id=comm_id,
             account_email=account_email,
         )
-        try:
-            conn.execute(
-                """INSERT OR IGNORE INTO communications
-                   (id, account_id, channel, timestamp,
-                    original_text, original_html, cleaned_html, search_text,
-                    direction, source,
-                    sender_address, sender_name, subject, snippet,
-                    provider_message_id, provider_thread_id,
-                    header_message_id, header_references, header_in_reply_to,
-                    is_read, is_current, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    row["id"], row["account_id"], row["channel"],
-                    row["timestamp"],
-                    row["original_text"], row["original_html"],
-                    row["cleaned_html"], row["search_text"],
-                    row["direction"], row["source"],
-                    row["sender_address"], row["sender_name"],
-                    row["subject"], row["snippet"],
-                    row["provider_message_id"], row["provider_thread_id"],
-                    row["header_message_id"], row["header_references"],
-                    row["header_in_reply_to"], row["is_read"],
-                    row["is_current"], row["created_at"], row["updated_at"],
-                ),
-            )
-        except Exception:
-            continue
+        comm_rows.append(tuple(row[col] for col in _COMM_COLUMNS))
+        participant_rows[comm_id] = [
+            (r["communication_id"], r["address"], r["name"], r["role"])
+            for r in em.recipient_rows(comm_id)
+        ]
+        comm_thread[comm_id] = thread_id
+
+    inserted = _insert_communications(conn, comm_rows)
+    new_by_thread: dict[str, list[str]] = {}
+    for comm_id in inserted:
+        new_by_thread.setdefault(comm_thread[comm_id], []).append(comm_id)
+    result["messages_stored"] = len(inserted)
+
+    conn.executemany(
+        """INSERT OR IGNORE INTO communication_participants
+           (communication_id, address, name, role)
+           VALUES (?, ?, ?, ?)""",
+        [p for cid in inserted for p in participant_rows[cid]],
+    )
 
-        # Check if this was actually inserted (not ignored due to UNIQUE)
-        if conn.execute(
-            "SELECT 1 FROM communications WHERE id = ?", (comm_id,)
-        ).fetchone():
-            new_comm_ids.append(comm_id)
+    # ------------------------------------------------------------------
+    # Step 2: Existing conversations — link new communications
+    # ------------------------------------------------------------------
+    existing: dict[str, str] = {}
+    for chunk in _chunked(thread_ids):
+        for r in conn.execute(
+            f"""SELECT c.provider_thread_id, cc.conversation_id
+                FROM communications c
+                JOIN conversation_communications cc ON cc.communication_id = c.id
+                WHERE c.provider_thread_id IN ({_placeholders(chunk)})""",
+            chunk,
+        ):
+            existing.setdefault(r["provider_thread_id"], r["conversation_id"])
+
+    conn.executemany(
+        _LINK_COMM_SQL,
+        [
+            (conv_id, cid, now)
+            for thread_id, conv_id in existing.items()
+            for cid in new_by_thread.get(thread_id, [])
+        ],
+    )
 
-            # Insert recipients into communication_participants
-            for rec_row in em.recipient_rows(comm_id):
-                conn.execute(
-                    """INSERT OR IGNORE INTO communication_participants
-                       (communication_id, address, name, role)
-                       VALUES (?, ?, ?, ?)""",
-                    (rec_row["communication_id"], rec_row["address"],
-                     rec_row["name"], rec_row["role"]),
-                )
+    updated_convs = {
+        existing[t]: t for t in existing if new_by_thread.get(t)
+    }
+    counter_updates = []
+    for chunk in _chunked(list(updated_convs)):
+        for r in conn.execute(
+            f"""SELECT cc.conversation_id, COUNT(*) AS cnt,
+                       MIN(c.timestamp) AS first_dt, MAX(c.timestamp) AS last_dt
+                FROM conversation_communications cc
+                JOIN communications c ON c.id = cc.communication_id
+                WHERE cc.conversation_id IN ({_placeholders(chunk)})
+                GROUP BY cc.conversation_id""",
+            chunk,
+        ):
+            counter_updates.append(
+                (r["cnt"], r["first_dt"], r["last_dt"], now, r["conversation_id"])
+            )
+    conn.executemany(
+        """UPDATE conversations
+           SET communication_count = ?, first_activity_at = ?, last_activity_at = ?,
+               ai_summarized_at = NULL, updated_at = ?
+           WHERE id = ?""",
+        counter_updates,
+    )
+    result["updated_threads"].update(updated_convs.values())
 
     # ------------------------------------------------------------------
-    # Step 2: Check for existing conversation
+    # Step 3: No existing conversation — evaluate creation rules against
+    # ALL communications for the thread (including previously stored ones)
     # ------------------------------------------------------------------
-    existing = conn.execute(
-        """SELECT cc.conversation_id, conv.communication_count
-           FROM communications c
-           JOIN conversation_communications cc ON cc.communication_id = c.id
-           JOIN conversations conv ON conv.id = cc.conversation_id
-           WHERE c.provider_thread_id = ?
-           LIMIT 1""",
-        (thread_id,),
-    ).fetchone()
+    pending = [t for t in thread_ids if t not in existing]
+    thread_comms: dict[str, list[dict]] = {}
+    comm_by_id: dict[str, dict] = {}
+    for chunk in _chunked(pending):
+        for r in conn.execute(
+            f"""SELECT c.id, c.sender_address, c.direction, c.timestamp, c.provider_thread_id
+                FROM communications c
+                WHERE c.provider_thread_id IN ({_placeholders(chunk)})""",
+            chunk,
+        ):
+            d = dict(r)
+            d["_participants"] = []
+            thread_comms.setdefault(d["provider_thread_id"], []).append(d)
+            comm_by_id[d["id"]] = d
+
+    comm_ids = list(comm_by_id)
+    for chunk in _chunked(comm_ids):
+        for p in conn.execute(
+            f"""SELECT communication_id, address, role FROM communication_participants
+                WHERE communication_id IN ({_placeholders(chunk)})""",
+            chunk,
+        ):
+            comm_by_id[p["communication_id"]]["_participants"].append(
+                {"address": p["address"], "role": p["role"]}
+            )
 
-    conversation_created = False
-    conversation_updated = False
+    new_convs: list[tuple] = []
+    new_links: list[tuple] = []
+    created_conv_ids: list[str] = []
+    for thread_id in pending:
+        comm_dicts = thread_comms.get(thread_id, [])
+        if not _should_create_conversation(comm_dicts, account_email, contact_index):
+            # Rules say no conversation — communications stored but unlinked
+            continue
 
-    if existing:
-        # Conversation already exists — link new communications to it
-        conv_id = existing["conversation_id"]
-        for cid in new_comm_ids:
-            conn.execute(
-                """INSERT OR IGNORE INTO conversation_communications
-                   (conversation_id, communication_id, assignment_source, confidence, reviewed, created_at)
-                   VALUES (?, ?, 'sync', 1.0, 1, ?)""",
-                (conv_id, cid, now),
-            )
+        conv_id = str(uuid.uuid4())
+        subject = by_thread[thread_id][0].subject or "(no subject)"
+        total_count = len(comm_dicts)
+        stamps = [d["timestamp"] for d in comm_dicts if d["timestamp"] is not None]
+        first_dt = min(stamps) if stamps else None
+        last_dt = max(stamps) if stamps else None
+        new_convs.append((
+            conv_id, account_id, subject, subject,
+            total_count, total_count,
+            first_dt, last_dt, first_dt, last_dt,
+            customer_id, created_by, now, now,
+        ))
+        new_links.extend((conv_id, d["id"], now) for d in comm_dicts)
+        created_conv_ids.append(conv_id)
+        result["created_threads"].add(thread_id)
+
+    conn.executemany(
+        """INSERT INTO conversations
+           (id, account_id, title, subject, status,
+            communication_count, message_count, participant_count,
+            first_activity_at, last_activity_at, first_message_at, last_message_at,
+            dismissed, customer_id, created_by, created_at, updated_at)
+           VALUES (?, ?, ?, ?, 'active', ?, ?, 0, ?, ?, ?, ?, 0, ?, ?, ?, ?)""",
+        new_convs,
+    )
+    conn.executemany(_LINK_COMM_SQL, new_links)
 
-        if new_comm_ids:
-            # Update conversation counts and timestamps
-            actual_count = conn.execute(
-                "SELECT COUNT(*) as cnt FROM conversation_communications WHERE conversation_id = ?",
-                (conv_id,),
-            ).fetchone()["cnt"]
-
-            date_row = conn.execute(
-                """SELECT MIN(c.timestamp) as first_dt, MAX(c.timestamp) as last_dt
-                   FROM communications c
-                   JOIN conversation_communications cc ON cc.communication_id = c.id
-                   WHERE cc.conversation_id = ?""",
-                (conv_id,),
-            ).fetchone()
+    # ------------------------------------------------------------------
+    # Step 4: Upsert conversation participants for every conversation
+    # touched by this batch, then refresh participant_count
+    # ------------------------------------------------------------------
+    touched = list(dict.fromkeys([*existing.values(), *created_conv_ids]))
+    _refresh_conversation_participants(conn, touched)
 
-            conn.execute(
-                """UPDATE conversations
-                   SET communication_count = ?, first_activity_at = ?, last_activity_at = ?,
-                       ai_summarized_at = NULL, updated_at = ?
-                   WHERE id = ?""",
-                (actual_count, date_row["first_dt"], date_row["last_dt"], now, conv_id),
-            )
-            conversation_updated = True
-    else:
-        # ------------------------------------------------------------------
-        # Step 3: No existing conversation — evaluate creation rules
-        # ------------------------------------------------------------------
-        # Load ALL communications for this thread (including previously stored ones)
-        all_thread_comms = conn.execute(
-            """SELECT c.id, c.sender_address, c.direction
-               FROM communications c
-               WHERE c.provider_thread_id = ?""",
-            (thread_id,),
-        ).fetchall()
+    return result
 
-        # Enrich with participant data for _should_create_conversation
-        comm_dicts = []
-        for cr in all_thread_comms:
-            d = dict(cr)
-            parts = conn.execute(
-                "SELECT address, role FROM communication_participants WHERE communication_id = ?",
-                (d["id"],),
-            ).fetchall()
-            d["_participants"] = [dict(p) for p in parts]
-            comm_dicts.append(d)
-
-        if _should_create_conversation(comm_dicts, account_email, contact_index):
-            # Create conversation and link ALL thread communications (retroactive)
-            conv_id = str(uuid.uuid4())
-            all_comm_ids = [d["id"] for d in comm_dicts]
-            total_count = len(all_comm_ids)
-
-            # Calculate date range from all thread communications
-            date_row = conn.execute(
-                """SELECT MIN(c.timestamp) as first_dt, MAX(c.timestamp) as last_dt
-                   FROM communications c
-                   WHERE c.provider_thread_id = ?""",
-                (thread_id,),
-            ).fetchone()
 
-            conn.execute(
-                """INSERT INTO conversations
-                   (id, account_id, title, subject, status,
-                    communication_count, message_count, participant_count,
-                    first_activity_at, last_activity_at, first_message_at, last_message_at,
-                    dismissed, customer_id, created_by, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, 'active', ?, ?, 0, ?, ?, ?, ?, 0, ?, ?, ?, ?)""",
-                (conv_id, account_id, subject, subject,
-                 total_count, total_count,
-                 date_row["first_dt"], date_row["last_dt"],
-                 date_row["first_dt"], date_row["last_dt"],
-                 customer_id, created_by, now, now),
-            )
-            conversation_created = True
+def _insert_communications(conn, comm_rows: list[tuple]) -> list[str]:
+    """Bulk-insert communication rows; return the IDs actually inserted."""
+    if not comm_rows:
+        return []
+    ids = [row[0] for row in comm_rows]
+    try:
+        cur = conn.executemany(_INSERT_COMM_SQL, comm_rows)
+        if cur.rowcount == len(comm_rows):
+            return ids
+    except Exception:
+        # One bad row aborts executemany — retry row by row, skipping failures
+        for row in comm_rows:
+            try:
+                conn.execute(_INSERT_COMM_SQL, row)
+            except Exception:
+                continue
 
-            # Link ALL thread communications to the new conversation
-            for cid in all_comm_ids:
-                conn.execute(
-                    """INSERT OR IGNORE INTO conversation_communications
-                       (conversation_id, communication_id, assignment_source, confidence, reviewed, created_at)
-                       VALUES (?, ?, 'sync', 1.0, 1, ?)""",
-                    (conv_id, cid, now),
-                )
-        else:
-            # Rules say no conversation — communications stored but unlinked
-            return False, False
+    # Some rows were ignored (UNIQUE) or failed — find which ones landed
+    inserted: set[str] = set()
+    for chunk in _chunked(ids):
+        inserted.update(
+            r["id"] for r in conn.execute(
+                f"SELECT id FROM communications WHERE id IN ({_placeholders(chunk)})",
+                chunk,
+            )
+        )
+    return [cid for cid in ids if cid in inserted]
 
-    # ------------------------------------------------------------------
-    # Step 4: Upsert conversation participants
-    # ------------------------------------------------------------------
-    all_participants: dict[str, None] = {}
-    # Gather from ALL communications linked to this conversation
-    linked_comms = conn.execute(
-        """SELECT c.sender_address FROM communications c
-           JOIN conversation_communications cc ON cc.communication_id = c.id
-           WHERE cc.conversation_id = ?""",
-        (conv_id,),
-    ).fetchall()
-    for lc in linked_comms:
-        if lc["sender_address"]:
-            all_participants[lc["sender_address"].lower()] = None
-
-    linked_parts = conn.execute(
-        """SELECT cp.address FROM communication_participants cp
-           JOIN conversation_communications cc ON cc.communication_id = cp.communication_id
-           WHERE cc.conversation_id = ?""",
-        (conv_id,),
-    ).fetchall()
-    for lp in linked_parts:
-        if lp["address"]:
-            all_participants[lp["address"].lower()] = None
-
-    for addr in all_participants:
-        contact_row = conn.execute(
-            "SELECT contact_id FROM contact_identifiers WHERE type = 'email' AND value = ?",
-            (addr.lower(),),
-        ).fetchone()
-        contact_id = contact_row["contact_id"] if contact_row else None
-
-        msg_count = conn.execute(
-            """SELECT COUNT(*) as cnt FROM communications c
-               JOIN conversation_communications cc ON cc.communication_id = c.id
-               WHERE cc.conversation_id = ? AND LOWER(c.sender_address) = ?""",
-            (conv_id, addr),
-        ).fetchone()["cnt"]
-
-        date_row = conn.execute(
-            """SELECT MIN(c.timestamp) as first_dt, MAX(c.timestamp) as last_dt
-               FROM communications c
-               JOIN conversation_communications cc ON cc.communication_id = c.id
-               WHERE cc.conversation_id = ? AND LOWER(c.sender_address) = ?""",
-            (conv_id, addr),
-        ).fetchone()
 
-        conn.execute(
+def _refresh_conversation_participants(conn, conversation_ids: list[str]) -> None:
+    """Recompute conversation_participants and participant_count in bulk."""
+    for chunk in _chunked(conversation_ids, _SQL_CHUNK // 2):
+        ph = _placeholders(chunk)
+        stats = conn.execute(
+            _PARTICIPANT_STATS_SQL.format(ph=ph), [*chunk, *chunk],
+        ).fetchall()
+        conn.executemany(
             """INSERT INTO conversation_participants
                (conversation_id, email_address, address, contact_id,
                 communication_count, first_seen_at, last_seen_at)
@@ -887,27 +1109,187 @@ def _store_thread(
                    communication_count = excluded.communication_count,
                    first_seen_at = excluded.first_seen_at,
                    last_seen_at = excluded.last_seen_at""",
-            (conv_id, addr, addr, contact_id, msg_count,
-             date_row["first_dt"], date_row["last_dt"]),
+            [
+                (s["conversation_id"], s["address"], s["address"], s["contact_id"],
+                 s["cnt"], s["first_dt"], s["last_dt"])
+                for s in stats
+            ],
+        )
+        conn.execute(
+            f"""UPDATE conversations
+                SET participant_count = (
+                    SELECT COUNT(*) FROM conversation_participants cp
+                    WHERE cp.conversation_id = conversations.id
+                )
+                WHERE id IN ({ph})""",
+            chunk,
         )
-
-    # Update participant_count on conversation
-    part_count = conn.execute(
-        "SELECT COUNT(*) as cnt FROM conversation_participants WHERE conversation_id = ?",
-        (conv_id,),
-    ).fetchone()["cnt"]
-    conn.execute(
-        "UPDATE conversations SET participant_count = ? WHERE id = ?",
-        (part_count, conv_id),
-    )
-
-    return conversation_created, conversation_updated
 
 
 # ---------------------------------------------------------------------------
 # Initial sync
 # ---------------------------------------------------------------------------
 
+def _start_sync_log(
+    account_id: str, sync_type: str, cursor_before: str | None = None,
+) -> str:
+    """Insert a 'running' sync_log row and return its ID."""
+    sync_id = str(uuid.uuid4())
+    with get_connection() as conn:
+        conn.execute(
+            """INSERT INTO sync_log
+               (id, account_id, sync_type, started_at, cursor_before, status)
+               VALUES (?, ?, ?, ?, ?, 'running')""",
+            (sync_id, account_id, sync_type, _now_iso(), cursor_before),
+        )
+    return sync_id
+
+
+def _complete_sync(
+    account_id: str,
+    sync_id: str,
+    history_id: str,
+    counts: dict,
+    *,
+    initial: bool = False,
+) -> None:
+    """Advance the account's sync cursor and mark the sync_log row completed."""
+    now = _now_iso()
+    with get_connection() as conn:
+        if initial:
+            conn.execute(
+                """UPDATE provider_accounts
+                   SET sync_cursor = ?, initial_sync_done = 1,
+                       last_synced_at = ?, updated_at = ?
+                   WHERE id = ?""",
+                (history_id, now, now, account_id),
+            )
+        else:
+            conn.execute(
+                """UPDATE provider_accounts
+                   SET sync_cursor = ?, last_synced_at = ?, updated_at = ?
+                   WHERE id = ?""",
+                (history_id, now, now, account_id),
+            )
+        conn.execute(
+            """UPDATE sync_log
+               SET status = 'completed', completed_at = ?,
+                   messages_fetched = ?, messages_stored = ?,
+                   conversations_created = ?, conversations_updated = ?,
+                   cursor_after = ?
+               WHERE id = ?""",
+            (now, counts["messages_fetched"], counts["messages_stored"],
+             counts["conversations_created"], counts["conversations_updated"],
+             history_id, sync_id),
+        )
+
+
+def _fail_sync(sync_id: str, error: str) -> None:
+    """Mark a sync_log row failed with the given error text."""
+    with get_connection() as conn:
+        conn.execute(
+            """UPDATE sync_log SET status = 'failed', completed_at = ?, error = ?
+               WHERE id = ?""",
+            (_now_iso(), error, sync_id),
+        )
+
+
+def _group_by_thread(emails: list[ParsedEmail]) -> list[list[ParsedEmail]]:
+    """Group emails by provider thread, each thread sorted by date."""
+    threads_map: dict[str, list[ParsedEmail]] = {}
+    for em in emails:
+        threads_map.setdefault(em.thread_id, []).append(em)
+    for thread_emails in threads_map.values():
+        thread_emails.sort(
+            key=lambda e: e.date or datetime.min.replace(tzinfo=timezone.utc)
+        )
+    return list(threads_map.values())
+
+
+# Gmail system labels whose messages are never stored; threads.list leaves
+# them out of the initial sync too (includeSpamTrash defaults to false)
+_SKIP_LABELS = frozenset({"SPAM", "TRASH"})
+
+
+def _messages_to_fetch(
+    creds: Credentials,
+    account_id: str,
+    changes: HistoryChanges,
+    rate_limiter: RateLimiter | None = None,
+) -> list[str]:
+    """Return the history additions that still need a full fetch.
+
+    Additions already in ``communications`` for the account (CRM-composed
+    mail, labels re-added, overlapping history windows) are dropped against
+    the ``(account_id, provider_message_id)`` index, and spam/trash is
+    dropped by label.  Labels usually arrive with the history record; the
+    rest are looked up with a ``format=minimal`` fetch before any full one.
+    """
+    with get_connection() as conn:
+        stored = _stored_message_ids(conn, account_id, changes.added)
+    pending = [mid for mid in changes.added if mid not in stored]
+
+    unknown = [mid for mid in pending if mid not in changes.labels]
+    if unknown:
+        changes.labels.update(
+            fetch_message_labels(creds, unknown, rate_limiter=rate_limiter)
+        )
+    return [
+        mid for mid in pending
+        if _SKIP_LABELS.isdisjoint(changes.labels.get(mid, ()))
+    ]
+
+
+def _apply_label_changes(conn, account_id: str, labels: dict[str, list[str]]) -> int:
+    """Mirror Gmail's UNREAD label onto ``is_read``; returns rows changed."""
+    now = _now_iso()
+    rows = []
+    for mid, label_ids in labels.items():
+        is_read = 0 if "UNREAD" in label_ids else 1
+        rows.append((is_read, now, account_id, mid, is_read))
+    cur = conn.executemany(
+        """UPDATE communications SET is_read = ?, updated_at = ?
+           WHERE account_id = ? AND provider_message_id = ?
+             AND is_read IS NOT ?""",
+        rows,
+    )
+    return max(cur.rowcount, 0)
+
+
+def _apply_deletions(conn, account_id: str, deleted_ids: list[str]) -> None:
+    """Delete communications removed upstream and recount their conversations."""
+    for mid in deleted_ids:
+        # Find the communication and its conversation
+        comm_row = conn.execute(
+            "SELECT id FROM communications WHERE account_id = ? AND provider_message_id = ?",
+            (account_id, mid),
+        ).fetchone()
+        if comm_row:
+            comm_id = comm_row["id"]
+            # Find conversation via join table
+            cc_row = conn.execute(
+                "SELECT conversation_id FROM conversation_communications WHERE communication_id = ?",
+                (comm_id,),
+            ).fetchone()
+            conv_id = cc_row["conversation_id"] if cc_row else None
+
+            # Delete the communication (CASCADE removes join rows)
+            conn.execute(
+                "DELETE FROM communications WHERE id = ?",
+                (comm_id,),
+            )
+            # Update conversation communication count
+            if conv_id:
+                actual_count = conn.execute(
+                    "SELECT COUNT(*) as cnt FROM conversation_communications WHERE conversation_id = ?",
+                    (conv_id,),
+                ).fetchone()["cnt"]
+                conn.execute(
+                    "UPDATE conversations SET communication_count = ?, updated_at = ? WHERE id = ?",
+                    (actual_count, _now_iso(), conv_id),
+                )
+
+
 def initial_sync(
     account_id: str,
     creds: Credentials,
@@ -927,18 +1309,7 @@ def initial_sync(
     account_email = account["email_address"]
     query = account["backfill_query"] or config.GMAIL_QUERY
 
-    # Start sync log
-    sync_id = str(uuid.uuid4())
-    now = _now_iso()
-
-    with get_connection() as conn:
-        conn.execute(
-            """INSERT INTO sync_log
-               (id, account_id, sync_type, started_at, status)
-               VALUES (?, ?, 'initial', ?, 'running')""",
-            (sync_id, account_id, now),
-        )
-
+    sync_id = _start_sync_log(account_id, "initial")
     contact_index = load_contact_index()
 
     # Fetch all threads
@@ -960,53 +1331,22 @@ def initial_sync(
         if not threads:
             break
 
+        messages_fetched += sum(len(t) for t in threads)
         with get_connection() as conn:
-            for thread_emails in threads:
-                messages_fetched += len(thread_emails)
-                created, updated = _store_thread(
-                    conn, account_id, account_email, thread_emails, contact_index,
-                    customer_id=customer_id, created_by=user_id,
-                )
-                if created:
-                    conversations_created += 1
-                if updated:
-                    conversations_updated += 1
-                # Count net new communications stored
-                for em in thread_emails:
-                    row = conn.execute(
-                        "SELECT 1 FROM communications WHERE account_id = ? AND provider_message_id = ?",
-                        (account_id, em.message_id),
-                    ).fetchone()
-                    if row:
-                        messages_stored += 1
+            stored = _store_threads(
+                conn, account_id, account_email, threads, contact_index,
+                customer_id=customer_id, created_by=user_id,
+            )
+        conversations_created += len(stored["created_threads"])
+        conversations_updated += len(stored["updated_threads"])
+        # Messages present for this account after the page (new + already stored)
+        messages_stored += stored["messages_stored"] + stored["messages_skipped"]
 
         if not page_token:
             break
 
     # Record sync cursor (current historyId)
     history_id = get_history_id(creds)
-    now = _now_iso()
-
-    with get_connection() as conn:
-        conn.execute(
-            """UPDATE provider_accounts
-               SET sync_cursor = ?, initial_sync_done = 1,
-                   last_synced_at = ?, updated_at = ?
-               WHERE id = ?""",
-            (history_id, now, now, account_id),
-        )
-        conn.execute(
-            """UPDATE sync_log
-               SET status = 'completed', completed_at = ?,
-                   messages_fetched = ?, messages_stored = ?,
-                   conversations_created = ?, conversations_updated = ?,
-                   cursor_after = ?
-               WHERE id = ?""",
-            (now, messages_fetched, messages_stored,
-             conversations_created, conversations_updated,
-             history_id, sync_id),
-        )
-
     result = {
         "sync_id": sync_id,
         "messages_fetched": messages_fetched,
@@ -1015,6 +1355,7 @@ def initial_sync(
         "conversations_updated": conversations_updated,
         "history_id": history_id,
     }
+    _complete_sync(account_id, sync_id, history_id, result, initial=True)
     log.info("Initial sync complete: %s", result)
     return result
 
@@ -1033,6 +1374,8 @@ def incremental_sync(
 ) -> dict:
     """Run an incremental sync using Gmail historyId.
 
+    Only additions not already stored are fetched (see
+    ``_messages_to_fetch``); label changes update ``is_read`` in place.
     Returns a summary dict with counts.
     """
     account = get_account(account_id)
@@ -1045,121 +1388,56 @@ def incremental_sync(
     if not cursor_before:
         raise ValueError(f"Account {account_id} has no sync_cursor; run initial_sync first")
 
-    # Start sync log
-    sync_id = str(uuid.uuid4())
-    now = _now_iso()
-
-    with get_connection() as conn:
-        conn.execute(
-            """INSERT INTO sync_log
-               (id, account_id, sync_type, started_at, cursor_before, status)
-               VALUES (?, ?, 'incremental', ?, ?, 'running')""",
-            (sync_id, account_id, now, cursor_before),
-        )
-
+    sync_id = _start_sync_log(account_id, "incremental", cursor_before)
     contact_index = load_contact_index()
 
-    # Fetch history changes
-    added_ids, deleted_ids = fetch_history(
+    # Fetch history changes, skipping messages that are already stored
+    changes = fetch_history_changes(
         creds, cursor_before, rate_limiter=rate_limiter,
     )
+    added_ids = _messages_to_fetch(
+        creds, account_id, changes, rate_limiter=rate_limiter,
+    )
 
     messages_fetched = len(added_ids)
     messages_stored = 0
     conversations_created = 0
     conversations_updated = 0
+    labels_updated = 0
 
     # Process additions: fetch full messages and store
     if added_ids:
         new_emails = fetch_messages(creds, added_ids, rate_limiter=rate_limiter)
-
-        # Group by thread_id
-        threads_map: dict[str, list[ParsedEmail]] = {}
-        for em in new_emails:
-            threads_map.setdefault(em.thread_id, []).append(em)
+        messages_stored = len(new_emails)
 
         with get_connection() as conn:
-            for thread_id, thread_emails in threads_map.items():
-                # Sort by date
-                thread_emails.sort(
-                    key=lambda e: e.date or datetime.min.replace(tzinfo=timezone.utc)
-                )
-                created, updated = _store_thread(
-                    conn, account_id, account_email, thread_emails, contact_index,
-                    customer_id=customer_id, created_by=user_id,
-                )
-                if created:
-                    conversations_created += 1
-                if updated:
-                    conversations_updated += 1
-                messages_stored += len(thread_emails)
-
-    # Process deletions
-    if deleted_ids:
+            stored = _store_threads(
+                conn, account_id, account_email, _group_by_thread(new_emails),
+                contact_index, customer_id=customer_id, created_by=user_id,
+            )
+        conversations_created += len(stored["created_threads"])
+        conversations_updated += len(stored["updated_threads"])
+
+    # Process deletions and label changes
+    if changes.deleted or changes.labels:
         with get_connection() as conn:
-            for mid in deleted_ids:
-                # Find the communication and its conversation
-                comm_row = conn.execute(
-                    "SELECT id FROM communications WHERE account_id = ? AND provider_message_id = ?",
-                    (account_id, mid),
-                ).fetchone()
-                if comm_row:
-                    comm_id = comm_row["id"]
-                    # Find conversation via join table
-                    cc_row = conn.execute(
-                        "SELECT conversation_id FROM conversation_communications WHERE communication_id = ?",
-                        (comm_id,),
-                    ).fetchone()
-                    conv_id = cc_row["conversation_id"] if cc_row else None
-
-                    # Delete the communication (CASCADE removes join rows)
-                    conn.execute(
-                        "DELETE FROM communications WHERE id = ?",
-                        (comm_id,),
-                    )
-                    # Update conversation communication count
-                    if conv_id:
-                        actual_count = conn.execute(
-                            "SELECT COUNT(*) as cnt FROM conversation_communications WHERE conversation_id = ?",
-                            (conv_id,),
-                        ).fetchone()["cnt"]
-                        conn.execute(
-                            "UPDATE conversations SET communication_count = ?, updated_at = ? WHERE id = ?",
-                            (actual_count, _now_iso(), conv_id),
-                        )
+            if changes.deleted:
+                _apply_deletions(conn, account_id, changes.deleted)
+            labels_updated = _apply_label_changes(conn, account_id, changes.labels)
 
     # Update sync cursor
     history_id = get_history_id(creds)
-    now = _now_iso()
-
-    with get_connection() as conn:
-        conn.execute(
-            """UPDATE provider_accounts
-               SET sync_cursor = ?, last_synced_at = ?, updated_at = ?
-               WHERE id = ?""",
-            (history_id, now, now, account_id),
-        )
-        conn.execute(
-            """UPDATE sync_log
-               SET status = 'completed', completed_at = ?,
-                   messages_fetched = ?, messages_stored = ?,
-                   conversations_created = ?, conversations_updated = ?,
-                   cursor_after = ?
-               WHERE id = ?""",
-            (now, messages_fetched, messages_stored,
-             conversations_created, conversations_updated,
-             history_id, sync_id),
-        )
-
     result = {
         "sync_id": sync_id,
         "messages_fetched": messages_fetched,
         "messages_stored": messages_stored,
         "conversations_created": conversations_created,
         "conversations_updated": conversations_updated,
+        "labels_updated": labels_updated,
         "cursor_before": cursor_before,
         "history_id": history_id,
     }
+    _complete_sync(account_id, sync_id, history_id, result)
     log.info("Incremental sync complete: %s", result)
     return result
 
@@ -1180,11 +1458,18 @@ def process_conversations(
     Triage is no longer needed here — conversations are pre-filtered at
     creation time by ``_should_create_conversation()``.
 
+    Conversations are loaded a page at a time with batched queries and
+    summarized concurrently (``POC_CLAUDE_WORKERS`` requests in flight,
+    *claude_limiter* capping the rate); this thread writes the results.  A
+    backlog of at least ``POC_CLAUDE_BATCH_THRESHOLD`` conversations goes
+    through the Message Batches API instead: every page is submitted as a
+    batch before any is polled, then the results are written page by page.
+    A conversation whose prompt text hashes to the ``ai_summary_hash`` of
+    its existing summary is marked summarized again without calling Claude.
+
     Returns (triaged_count, summarized_count, tag_count).
     triaged_count is always 0 (kept for backward-compatible return signature).
     """
-    import anthropic
-
     # Find conversations needing summarization
     with get_connection() as conn:
         rows = conn.execute(
@@ -1198,65 +1483,39 @@ def process_conversations(
         log.info("No conversations need processing")
         return 0, 0, 0
 
+    # Summarize (only if API key is set)
+    if not summarization_enabled():
+        return 0, 0, 0
+
+    client = get_client()
+    prompts_before = prompt_token_totals()
+    use_batch = 0 < config.CLAUDE_BATCH_THRESHOLD <= len(rows)
     summarized_count = 0
+    reused_count = 0
     tag_count = 0
-
-    for conv_row in rows:
-        conv_id = conv_row["id"]
-
-        # Summarize (only if API key is set)
-        if not config.ANTHROPIC_API_KEY:
-            continue
-
-        # Load communications for this conversation via join
-        with get_connection() as conn:
-            comm_rows = conn.execute(
-                """SELECT c.* FROM communications c
-                   JOIN conversation_communications cc ON cc.communication_id = c.id
-                   WHERE cc.conversation_id = ?
-                   ORDER BY c.timestamp""",
-                (conv_id,),
-            ).fetchall()
-
-        emails = []
-        for cr in comm_rows:
-            with get_connection() as conn:
-                rec_rows = conn.execute(
-                    "SELECT * FROM communication_participants WHERE communication_id = ?",
-                    (cr["id"],),
-                ).fetchall()
-            emails.append(ParsedEmail.from_row(cr, recipients=rec_rows))
-
-        # Reconstruct Conversation object for summarization
-        conv = Conversation(
-            thread_id=conv_id,
-            title=conv_row["title"] or "",
-            emails=emails,
-            participants=[],
-        )
-
-        # Collect participants
-        all_participants: dict[str, None] = {}
-        for em in conv.emails:
-            for p in em.all_participants:
-                all_participants[p] = None
-        conv.participants = list(all_participants.keys())
-
-        client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
-        summary = summarize_conversation(conv, client, user_email, claude_limiter)
-
-        if not summary.error:
+    # Batch mode: one Message Batch per page, all submitted before any is
+    # polled, so Anthropic works through them in parallel
+    submitted: list[tuple[SubmittedBatch, dict[str, str]]] = []
+
+    def _store(summaries: Iterable[ConversationSummary], hashes: dict[str, str]) -> None:
+        nonlocal summarized_count, tag_count
+        for summary in summaries:
+            if summary.error:
+                continue
+            conv_id = summary.thread_id
             update = summary.to_update_dict()
             with get_connection() as conn:
                 conn.execute(
                     """UPDATE conversations
                        SET ai_summary = ?, ai_status = ?, ai_action_items = ?,
-                           ai_topics = ?, ai_summarized_at = ?, updated_at = ?
+                           ai_topics = ?, ai_summarized_at = ?, ai_summary_hash = ?,
+                           updated_at = ?
                        WHERE id = ?""",
                     (
                         update["ai_summary"], update["ai_status"],
                         update["ai_action_items"], update["ai_topics"],
-                        update["ai_summarized_at"], _now_iso(), conv_id,
+                        update["ai_summarized_at"], hashes[conv_id], _now_iso(),
+                        conv_id,
                     ),
                 )
             summarized_count += 1
@@ -1265,9 +1524,62 @@ def process_conversations(
             if summary.key_topics:
                 tag_count += _store_tags(conv_id, summary.key_topics)
 
+    for page in _chunked(rows, _CONVERSATION_PAGE):
+        with get_connection() as conn:
+            convs = _assemble_conversations(conn, page, {})
+
+        to_summarize: list[Conversation] = []
+        hashes: dict[str, str] = {}
+        prompts: dict[str, tuple] = {}
+        reused: list[tuple] = []
+        now = _now_iso()
+        for conv_row, conv in zip(page, convs):
+            # Collect participants
+            all_participants: dict[str, None] = {}
+            for em in conv.emails:
+                for p in em.all_participants:
+                    all_participants[p] = None
+            conv.participants = list(all_participants.keys())
+
+            # Build the prompt once: it is both hashed and sent
+            prompt = build_thread_prompt(conv)
+            h = content_hash(conv, prompt[0])
+            if conv_row["ai_summary"] and conv_row["ai_summary_hash"] == h:
+                reused.append((now, now, conv.thread_id))
+            else:
+                hashes[conv.thread_id] = h
+                prompts[conv.thread_id] = prompt
+                to_summarize.append(conv)
+
+        if reused:
+            with get_connection() as conn:
+                conn.executemany(
+                    "UPDATE conversations SET ai_summarized_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    reused,
+                )
+            reused_count += len(reused)
+
+        if use_batch:
+            batch = submit_batch(to_summarize, client, user_email, prompts=prompts)
+            if batch:
+                submitted.append((batch, hashes))
+        else:
+            _store(summarize_many(
+                to_summarize, client, user_email,
+                rate_limiter=claude_limiter, prompts=prompts,
+            ), hashes)
+
+    for batch, hashes in submitted:
+        _store(collect_batch(client, batch), hashes)
+
+    prompts_after = prompt_token_totals()
     log.info(
-        "Processing complete: %d summarized, %d tags",
-        summarized_count, tag_count,
+        "Processing complete: %d summarized, %d unchanged, %d tags "
+        "(~%d prompt tokens sent, ~%d saved by the prompt budget)",
+        summarized_count, reused_count, tag_count,
+        prompts_after["tokens_used"] - prompts_before["tokens_used"],
+        prompts_after["tokens_saved"] - prompts_before["tokens_saved"],
     )
     return 0, summarized_count, tag_count
 
@@ -1319,166 +1631,214 @@ _store_topics = _store_tags
 # Query helpers (for display / __main__)
 # ---------------------------------------------------------------------------
 
-def load_conversations_for_display(
-    account_id: str | None = None,
+# Conversations assembled per page (display loading and summarization)
+_CONVERSATION_PAGE = 200
+
+
+def _display_query(
+    ids: list[str],
+    triage_clause: str,
     *,
-    account_ids: list[str] | None = None,
-    include_triaged: bool = False,
+    columns: str = "conv.*",
     limit: int | None = None,
-) -> tuple[list[Conversation], list[ConversationSummary], list]:
-    """Load conversations with their summaries from DB.
+    offset: int = 0,
+) -> tuple[str, list]:
+    """Build the conversation query for the display loader.
 
-    Conversations are now account-independent. When account_ids are given,
-    we filter to conversations that contain at least one communication from
-    those accounts.
-    Returns (conversations, summaries, triage_filtered) ready for display.py.
+    With *ids*, only conversations containing a communication from one of
+    those accounts are returned.
     """
-    ids = account_ids or ([account_id] if account_id else [])
-
-    # Build email-address lookup for account badges
-    account_email_map: dict[str, str] = {}
+    params: list = []
+    sql = f"SELECT {columns} FROM conversations conv WHERE {triage_clause}"
     if ids:
-        with get_connection() as conn:
-            for aid in ids:
-                row = conn.execute(
-                    "SELECT email_address FROM provider_accounts WHERE id = ?", (aid,)
-                ).fetchone()
-                if row:
-                    account_email_map[aid] = row["email_address"]
-
-    with get_connection() as conn:
-        if ids:
-            placeholders = ",".join("?" for _ in ids)
-            # Find conversations that have at least one communication from these accounts
-            if include_triaged:
-                query = f"""SELECT DISTINCT conv.* FROM conversations conv
-                           JOIN conversation_communications cc ON cc.conversation_id = conv.id
-                           JOIN communications comm ON comm.id = cc.communication_id
-                           WHERE comm.account_id IN ({placeholders})
-                           ORDER BY conv.last_activity_at DESC"""
-            else:
-                query = f"""SELECT DISTINCT conv.* FROM conversations conv
-                           JOIN conversation_communications cc ON cc.conversation_id = conv.id
-                           JOIN communications comm ON comm.id = cc.communication_id
-                           WHERE comm.account_id IN ({placeholders}) AND conv.triage_result IS NULL
-                           ORDER BY conv.last_activity_at DESC"""
-            if limit:
-                query += f" LIMIT {limit}"
-            conv_rows = conn.execute(query, ids).fetchall()
-        else:
-            # No account filter — load all conversations
-            if include_triaged:
-                query = "SELECT * FROM conversations ORDER BY last_activity_at DESC"
-            else:
-                query = "SELECT * FROM conversations WHERE triage_result IS NULL ORDER BY last_activity_at DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            conv_rows = conn.execute(query).fetchall()
-
-    conversations: list[Conversation] = []
-    summaries: list[ConversationSummary] = []
-    triage_filtered: list[TriageResult] = []
+        sql += (
+            " AND conv.id IN (SELECT cc.conversation_id"
+            " FROM conversation_communications cc"
+            " JOIN communications comm ON comm.id = cc.communication_id"
+            f" WHERE comm.account_id IN ({_placeholders(ids)}))"
+        )
+        params.extend(ids)
+    sql += " ORDER BY conv.last_activity_at DESC"
+    if limit or offset:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([limit or -1, offset])
+    return sql, params
+
+
+def _assemble_conversations(
+    conn, conv_rows: list, account_email_map: dict[str, str],
+) -> list[Conversation]:
+    """Assemble :class:`Conversation` objects for *conv_rows* in bulk.
+
+    Communications, their participants, conversation participants and
+    matched contacts are each fetched with chunked ``IN (...)`` queries
+    rather than one query per row.
+    """
+    conv_ids = [r["id"] for r in conv_rows]
+
+    comms: dict[str, list] = {cid: [] for cid in conv_ids}
+    for chunk in _chunked(conv_ids):
+        for row in conn.execute(
+            f"""SELECT cc.conversation_id AS _conversation_id, c.*
+                FROM communications c
+                JOIN conversation_communications cc ON cc.communication_id = c.id
+                WHERE cc.conversation_id IN ({_placeholders(chunk)})
+                ORDER BY c.timestamp""",
+            chunk,
+        ):
+            comms[row["_conversation_id"]].append(row)
+
+    comm_ids = list({row["id"] for rows in comms.values() for row in rows})
+    recipients: dict[str, list] = {}
+    for chunk in _chunked(comm_ids):
+        for row in conn.execute(
+            "SELECT * FROM communication_participants "
+            f"WHERE communication_id IN ({_placeholders(chunk)})",
+            chunk,
+        ):
+            recipients.setdefault(row["communication_id"], []).append(row)
+
+    participants: dict[str, list] = {}
+    for chunk in _chunked(conv_ids):
+        for row in conn.execute(
+            "SELECT * FROM conversation_participants "
+            f"WHERE conversation_id IN ({_placeholders(chunk)})",
+            chunk,
+        ):
+            participants.setdefault(row["conversation_id"], []).append(row)
+
+    contact_ids = list({
+        row["contact_id"]
+        for rows in participants.values() for row in rows if row["contact_id"]
+    })
+    contacts: dict[str, KnownContact] = {}
+    for chunk in _chunked(contact_ids):
+        for row in conn.execute(
+            f"""SELECT c.*, ci.value AS email
+                FROM contacts c
+                LEFT JOIN contact_identifiers ci ON ci.contact_id = c.id AND ci.type = 'email'
+                WHERE c.id IN ({_placeholders(chunk)})""",
+            chunk,
+        ):
+            if row["id"] not in contacts:
+                contacts[row["id"]] = KnownContact.from_row(row)
 
+    conversations = []
     for cr in conv_rows:
-        conv_id = cr["id"]
-
-        # Check if triaged out
-        if cr["triage_result"]:
-            triage_filtered.append(
-                TriageResult(
-                    thread_id=conv_id,
-                    subject=cr["title"] or "",
-                    reason=filter_reason_from_db(cr["triage_result"]),
-                )
-            )
-            continue
-
-        # Load communications via join
-        with get_connection() as conn:
-            comm_rows = conn.execute(
-                """SELECT c.* FROM communications c
-                   JOIN conversation_communications cc ON cc.communication_id = c.id
-                   WHERE cc.conversation_id = ?
-                   ORDER BY c.timestamp""",
-                (conv_id,),
-            ).fetchall()
-
-        emails = []
-        for cr2 in comm_rows:
-            with get_connection() as conn:
-                rec_rows = conn.execute(
-                    "SELECT * FROM communication_participants WHERE communication_id = ?",
-                    (cr2["id"],),
-                ).fetchall()
-            emails.append(ParsedEmail.from_row(cr2, recipients=rec_rows))
-
+        cid = cr["id"]
+        comm_rows = comms[cid]
+        emails = [
+            ParsedEmail.from_row(row, recipients=recipients.get(row["id"], []))
+            for row in comm_rows
+        ]
         # Derive account_email from the first communication's account_id
         first_account_id = comm_rows[0]["account_id"] if comm_rows else None
-        account_email = account_email_map.get(first_account_id, "") if first_account_id else ""
-
-        # Build conversation
         conv = Conversation(
-            thread_id=conv_id,
+            thread_id=cid,
             title=cr["title"] or "",
             emails=emails,
             participants=[],
-            account_email=account_email,
+            account_email=account_email_map.get(first_account_id, "") if first_account_id else "",
         )
+        for pr in participants.get(cid, []):
+            conv.participants.append(pr["address"])
+            contact = contacts.get(pr["contact_id"]) if pr["contact_id"] else None
+            if contact:
+                conv.matched_contacts[pr["address"]] = contact
+        conversations.append(conv)
+    return conversations
 
-        # Load participants and match contacts
-        with get_connection() as conn:
-            part_rows = conn.execute(
-                "SELECT * FROM conversation_participants WHERE conversation_id = ?",
-                (conv_id,),
-            ).fetchall()
 
-        for pr in part_rows:
-            conv.participants.append(pr["address"])
-            if pr["contact_id"]:
-                with get_connection() as conn:
-                    contact_row = conn.execute(
-                        """SELECT c.*, ci.value AS email
-                           FROM contacts c
-                           LEFT JOIN contact_identifiers ci ON ci.contact_id = c.id AND ci.type = 'email'
-                           WHERE c.id = ?""",
-                        (pr["contact_id"],),
-                    ).fetchone()
-                if contact_row:
-                    conv.matched_contacts[pr["address"]] = KnownContact.from_row(contact_row)
+def _triage_result_from_row(row) -> TriageResult:
+    return TriageResult(
+        thread_id=row["id"],
+        subject=row["title"] or "",
+        reason=filter_reason_from_db(row["triage_result"]),
+    )
 
-        conversations.append(conv)
 
-        # Load summary
-        summary = ConversationSummary.from_conversation_row(cr)
-        if summary:
-            summaries.append(summary)
+def iter_conversations_for_display(
+    account_id: str | None = None,
+    *,
+    account_ids: list[str] | None = None,
+    include_triaged: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+    page_size: int = _CONVERSATION_PAGE,
+):
+    """Yield ``(conversations, summaries, triage_filtered)`` one page at a time.
+
+    Each page is assembled with a fixed number of batched queries, so the
+    caller can start rendering before everything is loaded.  *limit* and
+    *offset* page through the kept (non-triaged) conversations; when
+    *include_triaged* is False the triaged-out rows are reported in a final
+    page of their own.
+    """
+    ids = account_ids or ([account_id] if account_id else [])
 
-    # Also load triage-only rows if not already included
+    with get_connection() as conn:
+        # Build email-address lookup for account badges
+        account_email_map: dict[str, str] = {}
+        for chunk in _chunked(ids):
+            for row in conn.execute(
+                "SELECT id, email_address FROM provider_accounts "
+                f"WHERE id IN ({_placeholders(chunk)})",
+                chunk,
+            ):
+                account_email_map[row["id"]] = row["email_address"]
+
+        sql, params = _display_query(
+            ids, "1" if include_triaged else "conv.triage_result IS NULL",
+            limit=limit, offset=offset,
+        )
+        conv_rows = conn.execute(sql, params).fetchall()
+
+    for page in _chunked(conv_rows, page_size):
+        triage_filtered = [_triage_result_from_row(r) for r in page if r["triage_result"]]
+        kept = [r for r in page if not r["triage_result"]]
+        with get_connection() as conn:
+            conversations = _assemble_conversations(conn, kept, account_email_map)
+        summaries = [
+            s for s in (ConversationSummary.from_conversation_row(r) for r in kept) if s
+        ]
+        yield conversations, summaries, triage_filtered
+
+    # Also report triage-only rows if not already included
     if not include_triaged:
+        sql, params = _display_query(
+            ids, "conv.triage_result IS NOT NULL",
+            columns="conv.id, conv.title, conv.triage_result",
+        )
         with get_connection() as conn:
-            if ids:
-                placeholders = ",".join("?" for _ in ids)
-                triaged_rows = conn.execute(
-                    f"""SELECT DISTINCT conv.* FROM conversations conv
-                       JOIN conversation_communications cc ON cc.conversation_id = conv.id
-                       JOIN communications comm ON comm.id = cc.communication_id
-                       WHERE comm.account_id IN ({placeholders}) AND conv.triage_result IS NOT NULL
-                       ORDER BY conv.last_activity_at DESC""",
-                    ids,
-                ).fetchall()
-            else:
-                triaged_rows = conn.execute(
-                    """SELECT * FROM conversations
-                       WHERE triage_result IS NOT NULL
-                       ORDER BY last_activity_at DESC""",
-                ).fetchall()
-        for tr in triaged_rows:
-            triage_filtered.append(
-                TriageResult(
-                    thread_id=tr["id"],
-                    subject=tr["title"] or "",
-                    reason=filter_reason_from_db(tr["triage_result"]),
-                )
-            )
+            triaged_rows = conn.execute(sql, params).fetchall()
+        if triaged_rows:
+            yield [], [], [_triage_result_from_row(r) for r in triaged_rows]
 
+
+def load_conversations_for_display(
+    account_id: str | None = None,
+    *,
+    account_ids: list[str] | None = None,
+    include_triaged: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+) -> tuple[list[Conversation], list[ConversationSummary], list]:
+    """Load conversations with their summaries from DB.
+
+    Conversations are now account-independent. When account_ids are given,
+    we filter to conversations that contain at least one communication from
+    those accounts.
+    Returns (conversations, summaries, triage_filtered) ready for display.py.
+    See :func:`iter_conversations_for_display` to stream page by page.
+    """
+    conversations: list[Conversation] = []
+    summaries: list[ConversationSummary] = []
+    triage_filtered: list[TriageResult] = []
+    for convs, sums, triaged in iter_conversations_for_display(
+        account_id, account_ids=account_ids, include_triaged=include_triaged,
+        limit=limit, offset=offset,
+    ):
+        conversations.extend(convs)
+        summaries.extend(sums)
+        triage_filtered.extend(triaged)
     return conversations, summaries, triage_filtered
@@ -0,0 +1,359 @@
+"""Pipelined multi-account email sync.
+
+Splits a sync run into three stages connected by bounded queues:
+
+  fetch  — one worker per provider account (network bound), each with its
+           own Gmail ``RateLimiter`` since quota is charged per mailbox
+  clean  — quote/boilerplate stripping of fetched bodies (CPU bound),
+           fanned out to a process pool
+  store  — a single SQLite writer on the calling thread
+
+Accounts are fetched concurrently, so wall-clock time for a run approaches
+the slowest mailbox rather than the sum of all of them, while SQLite only
+ever sees one writer.  If the store stage is interrupted (an exception or
+Ctrl-C), a stop event winds the fetch and clean stages down and every
+account that had not finished has its sync_log row marked failed.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from google.oauth2.credentials import Credentials
+
+from . import config
+from .database import get_connection
+from .email_parser import clean_pool, strip_quotes_many
+from .gmail_client import fetch_history_changes, fetch_messages, fetch_threads, get_history_id
+from .models import ParsedEmail
+from .rate_limiter import RateLimiter
+from .sync import (
+    _apply_deletions,
+    _apply_label_changes,
+    _complete_sync,
+    _fail_sync,
+    _group_by_thread,
+    _messages_to_fetch,
+    _start_sync_log,
+    _store_threads,
+    load_contact_index,
+)
+
+log = logging.getLogger(__name__)
+
+_STOP_POLL = 0.2  # seconds a blocked queue operation waits between stop checks
+
+
+@dataclass
+class SyncJob:
+    """One provider account to sync in a scheduler run."""
+
+    account: dict
+    creds: Credentials
+    rate_limiter: RateLimiter | None = None
+    customer_id: str | None = None
+    user_id: str | None = None
+
+
+@dataclass
+class _JobState:
+    job: SyncJob
+    initial: bool
+    sync_id: str = ""
+    cursor_before: str | None = None
+    history_id: str = ""
+    deleted_ids: list[str] = field(default_factory=list)
+    labels: dict[str, list[str]] = field(default_factory=dict)
+    labels_updated: int = 0
+    messages_fetched: int = 0
+    messages_stored: int = 0
+    conversations_created: int = 0
+    conversations_updated: int = 0
+    error: str | None = None
+    finished: bool = False
+
+    @property
+    def account_id(self) -> str:
+        return self.job.account["id"]
+
+    def result(self) -> dict:
+        if self.error:
+            return {"sync_id": self.sync_id or None, "error": self.error}
+        result = {
+            "sync_id": self.sync_id,
+            "messages_fetched": self.messages_fetched,
+            "messages_stored": self.messages_stored,
+            "conversations_created": self.conversations_created,
+            "conversations_updated": self.conversations_updated,
+            "history_id": self.history_id,
+        }
+        if not self.initial:
+            result["labels_updated"] = self.labels_updated
+            result["cursor_before"] = self.cursor_before
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put *item* on bounded *q*, giving up once *stop* is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_STOP_POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _discard(q: queue.Queue) -> None:
+    """Drop everything currently queued on *q*."""
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _fetch_account(state: _JobState, out_q: queue.Queue, stop: threading.Event) -> None:
+    """Fetch stage: push pages of threads for one account onto *out_q*.
+
+    Returns early, without a final message, once *stop* is set.
+    """
+    job = state.job
+    try:
+        if state.initial:
+            query = job.account.get("backfill_query") or config.GMAIL_QUERY
+            page_token: str | None = None
+            while not stop.is_set():
+                threads, page_token = fetch_threads(
+                    job.creds,
+                    query=query,
+                    max_threads=config.GMAIL_MAX_THREADS,
+                    rate_limiter=job.rate_limiter,
+                    page_token=page_token,
+                )
+                if not threads:
+                    break
+                state.messages_fetched += sum(len(t) for t in threads)
+                if not _put(out_q, ("page", state, threads), stop):
+                    return
+                if not page_token:
+                    break
+        else:
+            changes = fetch_history_changes(
+                job.creds, state.cursor_before, rate_limiter=job.rate_limiter,
+            )
+            # Read-only index lookup; the store stage stays the only writer
+            added_ids = _messages_to_fetch(
+                job.creds, state.account_id, changes, rate_limiter=job.rate_limiter,
+            )
+            state.messages_fetched = len(added_ids)
+            state.deleted_ids = changes.deleted
+            state.labels = changes.labels
+            if added_ids:
+                new_emails = fetch_messages(
+                    job.creds, added_ids, rate_limiter=job.rate_limiter,
+                )
+                state.messages_stored = len(new_emails)
+                threads = _group_by_thread(new_emails)
+                page_size = config.GMAIL_MAX_THREADS
+                for start in range(0, len(threads), page_size):
+                    page = threads[start:start + page_size]
+                    if not _put(out_q, ("page", state, page), stop):
+                        return
+        if stop.is_set():
+            return
+
+        state.history_id = get_history_id(job.creds)
+        _put(out_q, ("done", state, None), stop)
+    except Exception as exc:
+        log.warning("Fetch failed for %s: %s", job.account.get("email_address"), exc)
+        _put(out_q, ("error", state, exc), stop)
+
+
+def _clean_worker(
+    in_q: queue.Queue, out_q: queue.Queue, pool, stop: threading.Event,
+) -> None:
+    """Clean stage: strip bodies of each page, forwarding everything in order.
+
+    Runs until it reads the ``None`` sentinel or *stop* is set.
+    """
+    while not stop.is_set():
+        try:
+            item = in_q.get(timeout=_STOP_POLL)
+        except queue.Empty:
+            continue
+        if item is None:
+            return
+        kind, _state, payload = item
+        if kind == "page":
+            emails = [em for thread in payload for em in thread]
+            try:
+                cleaned = strip_quotes_many(
+                    ((em.body_plain, em.body_html) for em in emails), pool=pool,
+                )
+            except Exception as exc:
+                log.warning("Quote stripping failed for page: %s", exc)
+            else:
+                for em, body in zip(emails, cleaned):
+                    em.body_plain = body
+        if not _put(out_q, item, stop):
+            return
+
+
+def _store_page(state: _JobState, threads: list[list[ParsedEmail]], contact_index) -> None:
+    job = state.job
+    with get_connection() as conn:
+        stored = _store_threads(
+            conn, state.account_id, job.account["email_address"], threads,
+            contact_index, customer_id=job.customer_id, created_by=job.user_id,
+            strip=False,
+        )
+    state.conversations_created += len(stored["created_threads"])
+    state.conversations_updated += len(stored["updated_threads"])
+    if state.initial:
+        state.messages_stored += stored["messages_stored"] + stored["messages_skipped"]
+
+
+def _finish(state: _JobState) -> None:
+    if state.deleted_ids or state.labels:
+        with get_connection() as conn:
+            if state.deleted_ids:
+                _apply_deletions(conn, state.account_id, state.deleted_ids)
+            state.labels_updated = _apply_label_changes(
+                conn, state.account_id, state.labels,
+            )
+    _complete_sync(
+        state.account_id, state.sync_id, state.history_id,
+        state.result(), initial=state.initial,
+    )
+    state.finished = True
+    log.info("Sync complete for %s: %s",
+             state.job.account.get("email_address"), state.result())
+
+
+def _mark_failed(state: _JobState, error: str) -> None:
+    state.error = error
+    try:
+        _fail_sync(state.sync_id, error)
+    except Exception as exc:
+        log.warning("Could not record sync failure %s: %s", state.sync_id, exc)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def sync_accounts(
+    jobs: list[SyncJob],
+    *,
+    max_workers: int | None = None,
+    queue_size: int | None = None,
+) -> dict[str, dict]:
+    """Sync several provider accounts concurrently.
+
+    Each account runs an initial sync (``initial_sync_done`` unset) or an
+    incremental history sync.  Returns a dict mapping account_id to the same
+    summary dict ``initial_sync`` / ``incremental_sync`` return, or to
+    ``{"sync_id": ..., "error": "..."}`` when that account failed.  A failure
+    in one account never aborts the others.
+    """
+    max_workers = max_workers or config.SYNC_MAX_WORKERS
+    queue_size = queue_size or config.SYNC_QUEUE_SIZE
+
+    states: list[_JobState] = []
+    results: dict[str, dict] = {}
+    for job in jobs:
+        if job.rate_limiter is None:
+            job.rate_limiter = RateLimiter(rate=config.GMAIL_RATE_LIMIT)
+        state = _JobState(job=job, initial=not job.account.get("initial_sync_done"))
+        if state.initial:
+            state.sync_id = _start_sync_log(state.account_id, "initial")
+        else:
+            state.cursor_before = job.account.get("sync_cursor")
+            if not state.cursor_before:
+                state.error = (
+                    f"Account {state.account_id} has no sync_cursor; "
+                    "run initial_sync first"
+                )
+                results[state.account_id] = state.result()
+                continue
+            state.sync_id = _start_sync_log(
+                state.account_id, "incremental", state.cursor_before,
+            )
+        states.append(state)
+
+    if not states:
+        return results
+
+    fetch_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    store_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reason = "Sync run aborted"
+
+    try:
+        contact_index = load_contact_index()
+        with clean_pool() as pool:
+            fetchers = ThreadPoolExecutor(
+                max_workers=min(max_workers, len(states)),
+                thread_name_prefix="sync-fetch",
+            )
+            cleaner = threading.Thread(
+                target=_clean_worker, args=(fetch_q, store_q, pool, stop),
+                name="sync-clean", daemon=True,
+            )
+            cleaner.start()
+            try:
+                for state in states:
+                    fetchers.submit(_fetch_account, state, fetch_q, stop)
+
+                # Store stage — the only SQLite writer for the run
+                remaining = len(states)
+                while remaining:
+                    kind, state, payload = store_q.get()
+                    if kind in ("done", "error"):
+                        remaining -= 1
+                    if state.error:
+                        continue  # drain pages from an account that already failed
+                    if kind == "error":
+                        _mark_failed(state, str(payload))
+                        continue
+                    try:
+                        if kind == "page":
+                            _store_page(state, payload, contact_index)
+                        else:
+                            _finish(state)
+                    except Exception as exc:
+                        log.warning("Store failed for %s: %s",
+                                    state.job.account.get("email_address"), exc)
+                        _mark_failed(state, str(exc))
+            finally:
+                # Unblock every stage: fetchers and the cleaner give up on
+                # their next queue operation, and whatever is queued is dropped.
+                stop.set()
+                fetchers.shutdown(wait=False, cancel_futures=True)
+                _discard(fetch_q)
+                try:
+                    fetch_q.put_nowait(None)
+                except queue.Full:
+                    pass  # the cleaner exits on the stop event instead
+                _discard(store_q)
+                cleaner.join()
+    except BaseException as exc:
+        reason = str(exc) or type(exc).__name__
+        raise
+    finally:
+        for state in states:
+            if not state.finished and not state.error:
+                _mark_failed(state, reason)
+
+    for state in states:
+        results[state.account_id] = state.result()
+    return results
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 
 from .models import Conversation, FilterReason, TriageResult
 
@@ -61,13 +62,41 @@ _AUTOMATED_SUBJECT_PATTERNS = [
 _UNSUBSCRIBE_PATTERN = re.compile(r"unsubscribe", re.IGNORECASE)
 
 
+def _combine(patterns: list[re.Pattern]) -> re.Pattern:
+    """Compile a pattern list into one alternation, so a check is one scan."""
+    return re.compile(
+        "|".join(f"(?:{pat.pattern})" for pat in patterns), re.IGNORECASE,
+    )
+
+
+_AUTOMATED_SENDER_RE = _combine(AUTOMATED_SENDER_PATTERNS)
+_AUTOMATED_SUBJECT_RE = _combine(_AUTOMATED_SUBJECT_PATTERNS)
+
+# Distinct addresses seen during a sync; the same newsletter senders and
+# CC lists recur on every message, so verdicts are memoized.
+_SENDER_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=_SENDER_CACHE_SIZE)
+def _sender_verdict(addr: str) -> bool:
+    return _AUTOMATED_SENDER_RE.search(addr) is not None
+
+
+def is_automated_sender(addr: str) -> bool:
+    """Return True if *addr* matches an automated/no-reply sender pattern.
+
+    Shared by triage and the sync-time conversation rules; verdicts are
+    cached per normalised address.
+    """
+    return _sender_verdict(addr.lower().strip())
+
+
 def _is_automated_sender(addr: str) -> bool:
-    addr = addr.lower().strip()
-    return any(pat.search(addr) for pat in AUTOMATED_SENDER_PATTERNS)
+    return is_automated_sender(addr)
 
 
 def _is_automated_subject(subject: str) -> bool:
-    return any(pat.search(subject) for pat in _AUTOMATED_SUBJECT_PATTERNS)
+    return _AUTOMATED_SUBJECT_RE.search(subject) is not None
 
 
 def _is_marketing(emails: list) -> bool:
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import re
+import sqlite3
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
 import vobject
 
+from . import config
 from .database import get_connection
-from .domain_resolver import extract_domain, is_public_domain
+from .domain_resolver import extract_domain, is_public_domain, resolve_company_by_domain
 from .hierarchy import (
     add_address,
     add_contact_identifier,
@@ -240,6 +245,7 @@ def import_vcards(
     recursive: bool = False,
     customer_id: str | None = None,
     user_id: str | None = None,
+    bulk: bool = False,
 ) -> ImportResult:
     """Import contacts from vCard file(s).
 
@@ -251,11 +257,19 @@ def import_vcards(
        if no domain match and ORG present, look up by name / create company
     6. Create affiliation with Employee role + title from vCard
     7. Add phones and addresses
+
+    With ``bulk=True`` the same rules run against lookup sets preloaded
+    once per import, files are parsed in parallel, and all rows are written
+    in a single transaction (see :func:`_import_bulk`).
     """
     result = ImportResult()
 
     files = find_vcf_files(path, recursive=recursive)
 
+    if bulk:
+        _import_bulk(files, result, customer_id=customer_id, user_id=user_id)
+        return result
+
     for vcf_path in files:
         result.files_processed += 1
         vcards = parse_vcard_file(vcf_path)
@@ -483,3 +497,413 @@ def _import_single_contact(
         "emails": [em["value"] for em in emails],
         "company": data.get("org") or "",
     })
+
+
+# ---------------------------------------------------------------------------
+# Bulk import
+# ---------------------------------------------------------------------------
+
+_INSERT_CONTACT_SQL = (
+    "INSERT INTO contacts "
+    "(id, name, source, status, customer_id, created_by, created_at, updated_at) "
+    "VALUES (?, ?, 'vcard_import', 'active', ?, ?, ?, ?)"
+)
+_INSERT_USER_CONTACT_SQL = (
+    "INSERT OR IGNORE INTO user_contacts "
+    "(id, user_id, contact_id, visibility, is_owner, created_at, updated_at) "
+    "VALUES (?, ?, ?, 'public', 1, ?, ?)"
+)
+_INSERT_IDENTIFIER_SQL = (
+    "INSERT INTO contact_identifiers "
+    "(id, contact_id, type, value, label, is_primary, is_current, source, "
+    "created_at, updated_at) "
+    "VALUES (?, ?, 'email', ?, ?, ?, 1, 'vcard_import', ?, ?)"
+)
+_INSERT_AFFILIATION_SQL = (
+    "INSERT OR IGNORE INTO contact_companies "
+    "(id, contact_id, company_id, role_id, title, is_primary, is_current, "
+    "source, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, 1, 1, 'vcard_import', ?, ?)"
+)
+_INSERT_PHONE_SQL = (
+    "INSERT INTO phone_numbers "
+    "(id, entity_type, entity_id, phone_type, number, is_primary, is_current, "
+    "source, created_at, updated_at) "
+    "VALUES (?, 'contact', ?, ?, ?, 0, 1, '', ?, ?)"
+)
+_INSERT_ADDRESS_SQL = (
+    "INSERT INTO addresses "
+    "(id, entity_type, entity_id, address_type, street, city, state, postal_code, "
+    "country, is_primary, is_current, source, created_at, updated_at) "
+    "VALUES (?, 'contact', ?, ?, ?, ?, ?, ?, ?, 0, 1, '', ?, ?)"
+)
+
+
+# Cards per parse task, so one large export is spread over the workers too
+_PARSE_CHUNK_CARDS = 500
+_CARD_START_RE = re.compile(r"^BEGIN:VCARD", re.IGNORECASE | re.MULTILINE)
+
+
+def _split_cards(text: str, per_chunk: int | None = None) -> list[str]:
+    """Split vCard *text* into chunks of at most *per_chunk* cards."""
+    per_chunk = per_chunk or _PARSE_CHUNK_CARDS
+    starts = [m.start() for m in _CARD_START_RE.finditer(text)]
+    bounds = [0, *starts[per_chunk::per_chunk], len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])] or [text]
+
+
+def _parse_chunk(text: str) -> list[dict | None] | None:
+    """Parse and extract every card in *text*; None if it fails to parse."""
+    try:
+        vcards = list(vobject.readComponents(text))
+    except Exception:
+        return None
+    return [extract_contact_data(vcard) for vcard in vcards]
+
+
+def _parse_files(files: list[Path], workers: int | None = None) -> list:
+    """Parse *files* into extracted cards per file, in file order.
+
+    Each file is split into chunks of cards which are spread over a spawned
+    process pool when there is more than one chunk and more than one worker.
+    A file yields None — invalid, as with :func:`parse_vcard_file` — when it
+    cannot be read, any chunk fails to parse or it holds no cards.
+    """
+    workers = config.VCARD_PARSE_WORKERS if workers is None else workers
+    owners: list[int] = []
+    chunks: list[str] = []
+    unreadable: set[int] = set()
+    for i, path in enumerate(files):
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError as exc:
+            log.warning("Failed to read %s: %s", path, exc)
+            unreadable.add(i)
+            continue
+        for chunk in _split_cards(text):
+            owners.append(i)
+            chunks.append(chunk)
+
+    if workers <= 1 or len(chunks) <= 1:
+        parsed = [_parse_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            parsed = list(pool.map(_parse_chunk, chunks))
+
+    per_file: list[list | None] = [None if i in unreadable else [] for i in range(len(files))]
+    for i, cards in zip(owners, parsed):
+        if per_file[i] is None:
+            continue
+        if cards is None:
+            log.warning("Failed to parse %s", files[i])
+            per_file[i] = None
+        else:
+            per_file[i].extend(cards)
+    return [cards or None for cards in per_file]
+
+
+@dataclass
+class _BulkState:
+    """Duplicate-check sets, company caches and pending rows for one import."""
+
+    customer_id: str | None
+    user_id: str | None
+    now: str
+    country: str
+    employee_role_id: str | None
+    emails: set[str]
+    phones: set[str]
+    names: set[str]
+    domain_companies: dict[str, str | None] = field(default_factory=dict)
+    org_companies: dict[str, str | None] = field(default_factory=dict)
+    contacts: list[tuple] = field(default_factory=list)
+    user_contacts: list[tuple] = field(default_factory=list)
+    identifiers: list[tuple] = field(default_factory=list)
+    affiliations: list[tuple] = field(default_factory=list)
+    phone_rows: list[tuple] = field(default_factory=list)
+    address_rows: list[tuple] = field(default_factory=list)
+    imported: list[dict] = field(default_factory=list)
+
+
+def _load_bulk_state(conn, *, customer_id, user_id, country) -> _BulkState:
+    """Preload the lookups :func:`_is_duplicate` would otherwise query per card."""
+    emails = {r[0] for r in conn.execute(
+        "SELECT value FROM contact_identifiers WHERE type = 'email'"
+    )}
+    phones = {r[0] for r in conn.execute(
+        "SELECT pn.number FROM phone_numbers pn "
+        "JOIN contacts c ON c.id = pn.entity_id "
+        "WHERE pn.entity_type = 'contact' AND c.customer_id = ?",
+        (customer_id,),
+    )}
+    names = {r[0] for r in conn.execute(
+        "SELECT name FROM contacts WHERE customer_id = ?", (customer_id,),
+    )}
+    emp_role = conn.execute(
+        "SELECT id FROM contact_company_roles "
+        "WHERE name = 'Employee' AND customer_id = ?",
+        (customer_id,),
+    ).fetchone()
+    return _BulkState(
+        customer_id=customer_id,
+        user_id=user_id,
+        now=datetime.now(timezone.utc).isoformat(),
+        country=country,
+        employee_role_id=emp_role["id"] if emp_role else None,
+        emails=emails,
+        phones=phones,
+        names=names,
+    )
+
+
+def _normalized_phones(data: dict, state: _BulkState) -> list[tuple[str, str]]:
+    """Return ``(phone_type, E.164 number)`` for each parseable phone, deduped."""
+    from .phone_utils import normalize_phone
+
+    seen: dict[str, str] = {}
+    for phone in data["phones"]:
+        normalized = normalize_phone(phone["number"], state.country)
+        if normalized and normalized not in seen:
+            seen[normalized] = phone["type"]
+    return [(phone_type, number) for number, phone_type in seen.items()]
+
+
+def _is_duplicate_bulk(data: dict, phones: list[tuple[str, str]], state: _BulkState) -> bool:
+    """Same three-tier waterfall as :func:`_is_duplicate`, against *state*."""
+    emails = data["emails"]
+    if any(em["value"] in state.emails for em in emails):
+        return True
+    if phones and not emails:
+        return any(number in state.phones for _, number in phones)
+    if not emails:
+        return data["name"] in state.names
+    return False
+
+
+def _bulk_domain_company(conn, email: str, state: _BulkState, result: ImportResult) -> str | None:
+    """Resolve (or auto-create) the company for *email*'s domain, once per domain."""
+    domain = extract_domain(email)
+    if not domain or is_public_domain(domain):
+        return None
+    if domain in state.domain_companies:
+        return state.domain_companies[domain]
+
+    company = resolve_company_by_domain(conn, domain)
+    if company:
+        company_id = company["id"]
+    elif conn.execute("SELECT 1 FROM companies WHERE name = ?", (domain,)).fetchone():
+        result.errors.append(f"Company {domain}: name already taken by an inactive company")
+        company_id = None
+    else:
+        company_id = _resolve_company_id(
+            conn, email, state.now,
+            customer_id=state.customer_id, user_id=state.user_id,
+        )
+        result.companies_created += 1
+    state.domain_companies[domain] = company_id
+    return company_id
+
+
+def _bulk_org_company(conn, org: str, state: _BulkState, result: ImportResult) -> str | None:
+    """Find or create the company named *org*, once per name."""
+    if org in state.org_companies:
+        return state.org_companies[org]
+
+    row = conn.execute(
+        "SELECT id FROM companies WHERE name = ? AND status = 'active'", (org,)
+    ).fetchone()
+    if row:
+        company_id = row["id"]
+    elif conn.execute("SELECT 1 FROM companies WHERE name = ?", (org,)).fetchone():
+        company_id = None  # held by an inactive company, as create_company would find
+    else:
+        company_id = str(uuid.uuid4())
+        conn.execute(
+            "INSERT INTO companies (id, name, status, customer_id, created_by, "
+            "updated_by, created_at, updated_at) VALUES (?, ?, 'active', ?, ?, ?, ?, ?)",
+            (company_id, org, state.customer_id, state.user_id, state.user_id,
+             state.now, state.now),
+        )
+        if state.user_id:
+            conn.execute(
+                """INSERT OR IGNORE INTO user_companies
+                   (id, user_id, company_id, visibility, is_owner, created_at, updated_at)
+                   VALUES (?, ?, ?, 'public', 1, ?, ?)""",
+                (str(uuid.uuid4()), state.user_id, company_id, state.now, state.now),
+            )
+        result.companies_created += 1
+    state.org_companies[org] = company_id
+    return company_id
+
+
+def _stage_contact(conn, data: dict, state: _BulkState, result: ImportResult) -> None:
+    """Queue the rows for one card, or count it as a duplicate."""
+    phones = _normalized_phones(data, state)
+    if _is_duplicate_bulk(data, phones, state):
+        result.contacts_skipped_duplicate += 1
+        return
+
+    now = state.now
+    contact_id = str(uuid.uuid4())
+    emails = list({em["value"]: em for em in data["emails"]}.values())
+
+    # Resolve the company first so a failure leaves nothing half-queued
+    company_id = None
+    if emails:
+        company_id = _bulk_domain_company(conn, emails[0]["value"], state, result)
+    if not company_id and data.get("org"):
+        company_id = _bulk_org_company(conn, data["org"], state, result)
+
+    state.contacts.append(
+        (contact_id, data["name"], state.customer_id, state.user_id, now, now)
+    )
+    if state.user_id:
+        state.user_contacts.append((str(uuid.uuid4()), state.user_id, contact_id, now, now))
+
+    for i, em in enumerate(emails):
+        state.identifiers.append(
+            (str(uuid.uuid4()), contact_id, em["value"], em["label"], int(i == 0), now, now)
+        )
+        state.emails.add(em["value"])
+
+    if company_id:
+        state.affiliations.append(
+            (str(uuid.uuid4()), contact_id, company_id, state.employee_role_id,
+             data.get("title"), now, now)
+        )
+
+    for phone_type, number in phones:
+        state.phone_rows.append((str(uuid.uuid4()), contact_id, phone_type, number, now, now))
+
+    for addr in data["addresses"]:
+        state.address_rows.append(
+            (str(uuid.uuid4()), contact_id, addr["type"], addr["street"], addr["city"],
+             addr["state"], addr["postal_code"], addr["country"], now, now)
+        )
+
+    # Later cards in this import must see this contact, as they would in the DB
+    if state.customer_id is not None:
+        state.names.add(data["name"])
+        state.phones.update(number for _, number in phones)
+
+    state.imported.append({
+        "id": contact_id,
+        "name": data["name"],
+        "emails": [em["value"] for em in emails],
+        "company": data.get("org") or "",
+    })
+
+
+def _insert_rows(conn, sql: str, rows: list[tuple]) -> tuple[int, list[tuple]]:
+    """Insert *rows* with one ``executemany``.
+
+    On a constraint violation the batch is rolled back to a savepoint and
+    retried row by row, so only the offending rows are lost, as in the
+    per-contact path.  Returns ``(rows inserted, [(row, error), ...])``.
+    """
+    if not rows:
+        return 0, []
+    conn.execute("SAVEPOINT vcard_bulk")
+    try:
+        inserted = conn.executemany(sql, rows).rowcount
+        conn.execute("RELEASE vcard_bulk")
+        return inserted, []
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK TO vcard_bulk")
+        conn.execute("RELEASE vcard_bulk")
+
+    inserted = 0
+    failed: list[tuple] = []
+    for row in rows:
+        try:
+            inserted += conn.execute(sql, row).rowcount
+        except sqlite3.IntegrityError as exc:
+            failed.append((row, exc))
+    return inserted, failed
+
+
+def _write_bulk(conn, state: _BulkState, result: ImportResult) -> None:
+    """Write the staged rows and count only what was actually inserted.
+
+    Rows that violate a constraint are reported in ``result.errors``; the
+    dependent rows of a contact that could not be inserted are dropped.
+    """
+    # Releasing an outermost savepoint would commit, so keep one transaction
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    names = {row[0]: row[1] for row in state.contacts}
+    inserted, failed = _insert_rows(conn, _INSERT_CONTACT_SQL, state.contacts)
+    dropped = {row[0] for row, _ in failed}
+    for row, exc in failed:
+        result.errors.append(f"{row[1]}: {exc}")
+        log.warning("Error importing %s: %s", row[1], exc)
+    result.contacts_created += inserted
+    result.imported_contacts.extend(c for c in state.imported if c["id"] not in dropped)
+
+    def _kept(rows: list[tuple], contact_col: int = 1) -> list[tuple]:
+        return [r for r in rows if r[contact_col] not in dropped] if dropped else rows
+
+    _insert_rows(conn, _INSERT_USER_CONTACT_SQL, _kept(state.user_contacts, 2))
+
+    inserted, failed = _insert_rows(conn, _INSERT_IDENTIFIER_SQL, _kept(state.identifiers))
+    result.emails_added += inserted
+    result.errors.extend(f"Email {row[2]}: {exc}" for row, exc in failed)
+
+    inserted, failed = _insert_rows(conn, _INSERT_AFFILIATION_SQL, _kept(state.affiliations))
+    result.affiliations_created += inserted
+    result.errors.extend(f"{names[row[1]]}: {exc}" for row, exc in failed)
+
+    inserted, failed = _insert_rows(conn, _INSERT_PHONE_SQL, _kept(state.phone_rows))
+    result.phones_added += inserted
+    result.errors.extend(f"Phone {row[3]}: {exc}" for row, exc in failed)
+
+    inserted, failed = _insert_rows(conn, _INSERT_ADDRESS_SQL, _kept(state.address_rows))
+    result.addresses_added += inserted
+    result.errors.extend(f"Address for {names[row[1]]}: {exc}" for row, exc in failed)
+
+
+def _import_bulk(
+    files: list[Path],
+    result: ImportResult,
+    *,
+    customer_id: str | None,
+    user_id: str | None,
+) -> None:
+    """Bulk engine behind ``import_vcards(bulk=True)``.
+
+    Duplicate checks run against email / phone / name sets loaded once,
+    companies are resolved once per domain or ORG name, and every row is
+    written in one transaction with ``executemany`` (see :func:`_write_bulk`).
+    """
+    from .phone_utils import resolve_country_code
+
+    country = resolve_country_code("system", None, customer_id=customer_id)
+    parsed = _parse_files(files)
+
+    with get_connection() as conn:
+        state = _load_bulk_state(
+            conn, customer_id=customer_id, user_id=user_id, country=country,
+        )
+        for vcf_path, cards in zip(files, parsed):
+            result.files_processed += 1
+            if cards is None:
+                result.invalid_files.append(str(vcf_path))
+                continue
+            for data in cards:
+                result.vcards_parsed += 1
+                if data is None:
+                    result.contacts_skipped_no_name += 1
+                    continue
+                try:
+                    _stage_contact(conn, data, state, result)
+                except Exception as exc:
+                    result.errors.append(f"{data['name']}: {exc}")
+                    log.warning("Error importing %s: %s", data["name"], exc)
+
+        _write_bulk(conn, state, result)
+
+    log.info("Bulk vCard import: %d contacts from %d files",
+             result.contacts_created, result.files_processed)
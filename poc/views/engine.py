@@ -7,8 +7,10 @@ renders dynamic SELECT / WHERE / ORDER BY clauses.
 
 from __future__ import annotations
 
+import base64
 import json
 import sqlite3
+from dataclasses import dataclass
 
 from ..access import (
     my_companies_query,
@@ -77,6 +79,128 @@ def execute_view(
     scope : "all" (default) or "mine" — "mine" restricts to user-owned rows
     extra_where : additional WHERE clauses as (sql_fragment, params_list) tuples
     """
+    q = _build_query(
+        entity_type, columns, filters, search=search, customer_id=customer_id,
+        user_id=user_id, scope=scope, extra_where=extra_where,
+    )
+    _, sort_def, direction = _resolve_sort(q.entity_def, sort_field, sort_direction)
+    order_sql = _build_order_by(q.entity_def, sort_def, direction)
+
+    total = _count(conn, q)
+
+    # Data query
+    offset = (page - 1) * per_page
+    data_sql = (
+        f"SELECT {q.select_str}\n"
+        f"FROM {q.from_sql}\n"
+        f"WHERE {q.where_sql}\n"
+        f"{q.group_sql}\n"
+        f"{order_sql}\n"
+        f"LIMIT ? OFFSET ?"
+    )
+    data_params = q.params + [per_page, offset]
+    rows = conn.execute(data_sql, data_params).fetchall()
+
+    return [_row_dict(row, q.select_keys) for row in rows], total
+
+
+def execute_view_keyset(
+    conn: sqlite3.Connection,
+    *,
+    entity_type: str,
+    columns: list[dict],
+    filters: list[dict],
+    sort_field: str | None = None,
+    sort_direction: str = "asc",
+    search: str = "",
+    cursor: str | None = None,
+    per_page: int = 50,
+    customer_id: str = "",
+    user_id: str = "",
+    scope: str = "all",
+    extra_where: list[tuple[str, list]] | None = None,
+    with_count: bool = False,
+) -> tuple[list[dict], str | None, int | None]:
+    """Execute a view query one keyset page at a time.
+
+    Returns (rows, next_cursor, total_count).  Pages are keyed on the sort
+    expression plus ``id`` rather than an OFFSET, so deep pages cost the
+    same as the first.  Pass the returned *next_cursor* (None on the last
+    page) to fetch the following page.  The count query only runs when
+    *with_count* is true; otherwise total_count is None.
+
+    Raises ValueError for a malformed cursor or one issued for a different
+    sort.
+    """
+    q = _build_query(
+        entity_type, columns, filters, search=search, customer_id=customer_id,
+        user_id=user_id, scope=scope, extra_where=extra_where,
+    )
+    sort_key, sort_def, direction = _resolve_sort(q.entity_def, sort_field, sort_direction)
+    order_sql = _build_order_by(q.entity_def, sort_def, direction)
+    id_col = f"{q.entity_def.alias}.id"
+
+    total = _count(conn, q) if with_count else None
+
+    where_sql, having_sql = q.where_sql, ""
+    params = list(q.params)
+    having_params: list = []
+    if cursor:
+        value, last_id = _decode_cursor(cursor, sort_key, direction)
+        pred, pred_params = _keyset_predicate(sort_def, direction, value, last_id, id_col)
+        # Grouped queries may sort on per-group values, so filter after grouping
+        if q.group_sql:
+            having_sql, having_params = f"HAVING {pred}", pred_params
+        else:
+            where_sql = f"({where_sql}) AND {pred}"
+            params.extend(pred_params)
+
+    data_sql = (
+        f"SELECT {q.select_str}, {sort_def.sql} AS _sort_value\n"
+        f"FROM {q.from_sql}\n"
+        f"WHERE {where_sql}\n"
+        f"{q.group_sql} {having_sql}\n"
+        f"{order_sql}\n"
+        f"LIMIT ?"
+    )
+    rows = conn.execute(data_sql, params + having_params + [per_page + 1]).fetchall()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort_key, direction, last["_sort_value"], last["id"])
+
+    return [_row_dict(row, q.select_keys) for row in rows], next_cursor, total
+
+
+# ---------------------------------------------------------------------------
+# Query building
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _ViewQuery:
+    entity_def: EntityDef
+    select_str: str
+    select_keys: list[str]
+    from_sql: str
+    where_sql: str
+    params: list
+    group_sql: str
+
+
+def _build_query(
+    entity_type: str,
+    columns: list[dict],
+    filters: list[dict],
+    *,
+    search: str,
+    customer_id: str,
+    user_id: str,
+    scope: str,
+    extra_where: list[tuple[str, list]] | None,
+) -> _ViewQuery:
+    """Build the SELECT list, FROM/JOINs, WHERE and GROUP BY for a view."""
     entity_def = ENTITY_TYPES.get(entity_type)
     if not entity_def:
         raise ValueError(f"Unknown entity type: {entity_type}")
@@ -164,42 +288,36 @@ def execute_view(
     # GROUP BY (prevents JOIN expansion for contacts)
     group_sql = f"GROUP BY {entity_def.group_by}" if entity_def.group_by else ""
 
-    # ORDER BY
-    order_sql = _build_order_by(entity_def, sort_field, sort_direction)
-
-    # Count query
-    count_sql = (
-        f"SELECT COUNT(*) AS cnt FROM ("
-        f"SELECT {entity_def.alias}.id FROM {from_clause}\n{join_clause}\n"
-        f"WHERE {where_sql} {group_sql})"
-    )
-    total = conn.execute(count_sql, params).fetchone()["cnt"]
-
-    # Data query
-    offset = (page - 1) * per_page
     if select_exprs:
         select_str = f"{entity_def.alias}.id, " + ", ".join(select_exprs)
     else:
         select_str = f"{entity_def.alias}.id"
-    data_sql = (
-        f"SELECT {select_str}\n"
-        f"FROM {from_clause}\n{join_clause}\n"
-        f"WHERE {where_sql}\n"
-        f"{group_sql}\n"
-        f"{order_sql}\n"
-        f"LIMIT ? OFFSET ?"
+
+    return _ViewQuery(
+        entity_def=entity_def,
+        select_str=select_str,
+        select_keys=select_keys,
+        from_sql=f"{from_clause}\n{join_clause}",
+        where_sql=where_sql,
+        params=params,
+        group_sql=group_sql,
     )
-    data_params = params + [per_page, offset]
-    rows = conn.execute(data_sql, data_params).fetchall()
 
-    result = []
-    for row in rows:
-        d = {"id": row["id"]}
-        for key in select_keys:
-            d[key] = row[key]
-        result.append(d)
 
-    return result, total
+def _count(conn: sqlite3.Connection, q: _ViewQuery) -> int:
+    count_sql = (
+        f"SELECT COUNT(*) AS cnt FROM ("
+        f"SELECT {q.entity_def.alias}.id FROM {q.from_sql}\n"
+        f"WHERE {q.where_sql} {q.group_sql})"
+    )
+    return conn.execute(count_sql, q.params).fetchone()["cnt"]
+
+
+def _row_dict(row: sqlite3.Row, select_keys: list[str]) -> dict:
+    d = {"id": row["id"]}
+    for key in select_keys:
+        d[key] = row[key]
+    return d
 
 
 def _build_select(
@@ -237,12 +355,12 @@ def _build_select(
     return exprs, keys
 
 
-def _build_order_by(
+def _resolve_sort(
     entity_def: EntityDef,
     sort_field: str | None,
     sort_direction: str,
-) -> str:
-    """Build ORDER BY clause with NULL-last handling."""
+) -> tuple[str, FieldDef, str]:
+    """Return (field_key, field_def, "ASC"|"DESC"), falling back to the default sort."""
     if not sort_field:
         sort_field, sort_direction = entity_def.default_sort
 
@@ -252,8 +370,55 @@ def _build_order_by(
         field_def = entity_def.fields[sort_field]
 
     direction = "DESC" if sort_direction == "desc" else "ASC"
-    sql_expr = field_def.sql
+    return sort_field, field_def, direction
 
-    # Case-insensitive sort for text fields; NULLs sort last
+
+def _sort_expr(field_def: FieldDef) -> str:
+    # Case-insensitive sort for text fields
     collate = " COLLATE NOCASE" if field_def.type == "text" else ""
-    return f"ORDER BY ({sql_expr}) IS NULL, {sql_expr}{collate} {direction}"
+    return f"({field_def.sql}){collate}"
+
+
+def _build_order_by(entity_def: EntityDef, field_def: FieldDef, direction: str) -> str:
+    """Build ORDER BY clause with NULL-last handling and an ``id`` tiebreaker."""
+    return (
+        f"ORDER BY ({field_def.sql}) IS NULL, {_sort_expr(field_def)} {direction}, "
+        f"{entity_def.alias}.id {direction}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Keyset cursors
+# ---------------------------------------------------------------------------
+
+def _keyset_predicate(
+    field_def: FieldDef, direction: str, value, last_id: str, id_col: str,
+) -> tuple[str, list]:
+    """Rows strictly after (value, last_id) in ``_build_order_by`` order."""
+    op = "<" if direction == "DESC" else ">"
+    if value is None:
+        # Already in the NULLs-last tail: only the id tiebreaker remains
+        return f"(({field_def.sql}) IS NULL AND {id_col} {op} ?)", [last_id]
+    expr = _sort_expr(field_def)
+    return (
+        f"(({field_def.sql}) IS NULL OR {expr} {op} ? "
+        f"OR ({expr} = ? AND {id_col} {op} ?))",
+        [value, value, last_id],
+    )
+
+
+def _encode_cursor(sort_key: str, direction: str, value, last_id: str) -> str:
+    payload = json.dumps([sort_key, direction, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: str, direction: str) -> tuple:
+    """Return (sort_value, last_id) from *cursor*, checking it matches the sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, dirn, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if key != sort_key or dirn != direction:
+        raise ValueError("Cursor does not match the current sort")
+    return value, last_id
@@ -70,11 +70,7 @@ ENTITY_TYPES: dict[str, EntityDef] = {
             ),
             "email": FieldDef(
                 label="Email",
-                sql=(
-                    "(SELECT ci2.value FROM contact_identifiers ci2 "
-                    "WHERE ci2.contact_id = c.id AND ci2.type = 'email' "
-                    "ORDER BY ci2.is_primary DESC, ci2.created_at ASC LIMIT 1)"
-                ),
+                sql="c.primary_email",
                 type="text",
                 sortable=True,
                 filterable=True,
@@ -117,21 +113,17 @@ ENTITY_TYPES: dict[str, EntityDef] = {
             ),
             "phone": FieldDef(
                 label="Phone",
-                sql=(
-                    "(SELECT pn.number FROM phone_numbers pn "
-                    "WHERE pn.entity_type = 'contact' AND pn.entity_id = c.id "
-                    "AND pn.is_current = 1 ORDER BY pn.created_at ASC LIMIT 1)"
-                ),
+                sql="c.primary_phone",
                 type="text",
+                sortable=True,
+                filterable=True,
             ),
             "address": FieldDef(
                 label="Address",
-                sql=(
-                    "(SELECT a.street FROM addresses a "
-                    "WHERE a.entity_type = 'contact' AND a.entity_id = c.id "
-                    "AND a.is_current = 1 ORDER BY a.created_at ASC LIMIT 1)"
-                ),
+                sql="c.primary_address",
                 type="text",
+                sortable=True,
+                filterable=True,
             ),
             "source": FieldDef(
                 label="Source",
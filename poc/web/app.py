@@ -42,7 +42,10 @@ async def lifespan(app: FastAPI):
         init_db()
     except Exception as exc:
         log.warning("init_db had issues (may need migration): %s", exc)
+    from ..auth import start_credential_refresher, stop_credential_refresher
+    start_credential_refresher()
     yield
+    stop_credential_refresher()
 
 
 def create_app() -> FastAPI:
@@ -62,9 +65,11 @@ def create_app() -> FastAPI:
 
     app.state.templates = templates
 
-    # Auth middleware
-    from .middleware import AuthMiddleware
+    # Auth middleware, wrapped by the per-request DB connection so session
+    # lookup shares the route's connection
+    from .middleware import AuthMiddleware, DBConnectionMiddleware
     app.add_middleware(AuthMiddleware)
+    app.add_middleware(DBConnectionMiddleware)
 
     from .routes import (
         api,
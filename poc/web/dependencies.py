@@ -1,9 +1,14 @@
-"""FastAPI dependencies for authentication."""
+"""FastAPI dependencies for authentication and database access."""
 
 from __future__ import annotations
 
+import sqlite3
+from typing import Iterator
+
 from fastapi import HTTPException, Request
 
+from ..database import get_connection
+
 
 def get_current_user(request: Request) -> dict:
     """Return the authenticated user or raise 401."""
@@ -19,3 +24,13 @@ def require_admin(request: Request) -> dict:
     if user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
+
+
+def get_db() -> Iterator[sqlite3.Connection]:
+    """Yield the request's shared database connection.
+
+    Commits when the route returns and rolls back if it raises, like
+    ``get_connection()``.
+    """
+    with get_connection() as conn:
+        yield conn
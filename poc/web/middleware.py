@@ -1,4 +1,4 @@
-"""Authentication middleware for the CRM Extender web UI."""
+"""Authentication and database middleware for the CRM Extender web UI."""
 
 from __future__ import annotations
 
@@ -7,8 +7,10 @@ import logging
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from .. import config
+from ..database import connection_scope
 
 log = logging.getLogger(__name__)
 
@@ -94,3 +96,21 @@ class AuthMiddleware(BaseHTTPMiddleware):
             request.state.customer_id = ""
 
         return await call_next(request)
+
+
+class DBConnectionMiddleware:
+    """Give each HTTP request one pooled SQLite connection.
+
+    Every ``get_connection()`` call made while handling the request, from
+    the auth middleware's session lookup to the route handler, shares it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with connection_scope():
+            await self.app(scope, receive, send)
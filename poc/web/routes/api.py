@@ -26,7 +26,7 @@ from ...views.crud import (
     update_view_columns,
     update_view_filters,
 )
-from ...views.engine import execute_view
+from ...views.engine import execute_view, execute_view_keyset
 from ...views.layout_overrides import (
     delete_all_layout_overrides,
     delete_layout_override,
@@ -121,7 +121,15 @@ def view_data(
     search: str = Query(""),
     scope: str = Query("all"),
     filters: str = Query(""),
+    cursor: str | None = Query(None),
+    count: bool | None = Query(None),
 ):
+    """Return one page of view rows.
+
+    Passing ``cursor`` (empty for the first page) switches to keyset paging:
+    the response carries ``next_cursor`` instead of relying on ``page``, and
+    ``total`` is only computed for the first page unless ``count`` is set.
+    """
     cid = request.state.customer_id
     uid = request.state.user["id"] if request.state.user else ""
 
@@ -147,20 +155,36 @@ def view_data(
                 "value": ef.get("value"),
             })
 
-        rows, total = execute_view(
-            conn,
+        query_args = dict(
             entity_type=view["entity_type"],
             columns=view["columns"],
             filters=all_filters,
             sort_field=sort or view.get("sort_field"),
             sort_direction=sort_direction if sort else view.get("sort_direction", "asc"),
             search=search,
-            page=page,
             per_page=view.get("per_page", 50),
             customer_id=cid,
             user_id=uid,
             scope=scope,
         )
+        if cursor is not None:
+            try:
+                rows, next_cursor, total = execute_view_keyset(
+                    conn, cursor=cursor,
+                    with_count=count if count is not None else not cursor,
+                    **query_args,
+                )
+            except ValueError as exc:
+                return JSONResponse({"error": str(exc)}, status_code=400)
+            return {
+                "rows": rows,
+                "total": total,
+                "per_page": query_args["per_page"],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+
+        rows, total = execute_view(conn, page=page, **query_args)
 
     per_page = view.get("per_page", 50)
     return {
@@ -2106,10 +2130,7 @@ def search_entities(
                 "WHERE c.customer_id = ? AND (c.name LIKE ? COLLATE NOCASE OR ci.value LIKE ? COLLATE NOCASE)"
             ),
             "results_sql": (
-                "SELECT DISTINCT c.id, c.name, "
-                "  (SELECT ci2.value FROM contact_identifiers ci2 "
-                "   WHERE ci2.contact_id = c.id AND ci2.type = 'email' "
-                "   ORDER BY ci2.is_primary DESC, ci2.created_at ASC LIMIT 1) AS subtitle, "
+                "SELECT DISTINCT c.id, c.name, c.primary_email AS subtitle, "
                 "  (SELECT co.name FROM companies co "
                 "   JOIN contact_companies cc ON cc.company_id = co.id "
                 "   WHERE cc.contact_id = c.id AND cc.is_primary = 1 LIMIT 1) AS secondary "
@@ -130,12 +130,8 @@ def sync_now(request: Request):
     from ...auth import get_credentials_for_account
     from ...gmail_client import get_user_email
     from ...rate_limiter import RateLimiter
-    from ...sync import (
-        incremental_sync,
-        initial_sync,
-        process_conversations,
-        sync_contacts,
-    )
+    from ...sync import process_conversations, sync_contacts
+    from ...sync_scheduler import SyncJob, sync_accounts
     from ... import config
 
     user = request.state.user
@@ -165,7 +161,6 @@ def sync_now(request: Request):
     if not accounts:
         return HTMLResponse("No accounts registered.")
 
-    gmail_limiter = RateLimiter(rate=config.GMAIL_RATE_LIMIT)
     claude_limiter = RateLimiter(rate=config.CLAUDE_RATE_LIMIT)
 
     total_contacts = 0
@@ -173,6 +168,8 @@ def sync_now(request: Request):
     total_triaged = 0
     total_summarized = 0
     errors: list[str] = []
+    jobs: list[SyncJob] = []
+    user_emails: dict[str, str] = {}
 
     for account in accounts:
         account_id = account["id"]
@@ -186,41 +183,41 @@ def sync_now(request: Request):
             errors.append(f"{email_addr}: auth failed ({exc})")
             continue
 
-        user_email = get_user_email(creds)
+        user_emails[account_id] = get_user_email(creds)
+        gmail_limiter = RateLimiter(rate=config.GMAIL_RATE_LIMIT)
 
         # Sync contacts
         try:
             total_contacts += sync_contacts(
                 creds, rate_limiter=gmail_limiter,
-                customer_id=cid, user_id=uid,
+                customer_id=cid, user_id=uid, account_id=account_id,
             )
         except Exception as exc:
             log.warning("Contact sync failed for %s: %s", email_addr, exc)
             errors.append(f"{email_addr}: contact sync failed ({exc})")
 
-        # Sync emails
-        try:
-            if account["initial_sync_done"]:
-                result = incremental_sync(
-                    account_id, creds, rate_limiter=gmail_limiter,
-                    customer_id=cid, user_id=uid,
-                )
-                total_fetched += result.get("messages_fetched", 0)
-            else:
-                result = initial_sync(
-                    account_id, creds, rate_limiter=gmail_limiter,
-                    customer_id=cid, user_id=uid,
-                )
-                total_fetched += result.get("messages_fetched", 0)
-        except Exception as exc:
-            log.warning("Email sync failed for %s: %s", email_addr, exc)
-            errors.append(f"{email_addr}: email sync failed ({exc})")
+        jobs.append(SyncJob(
+            account=account, creds=creds, rate_limiter=gmail_limiter,
+            customer_id=cid, user_id=uid,
+        ))
+
+    # Sync emails for all accounts concurrently
+    results = sync_accounts(jobs)
+
+    for job in jobs:
+        account_id = job.account["id"]
+        email_addr = job.account["email_address"]
+        result = results[account_id]
+        if "error" in result:
+            errors.append(f"{email_addr}: email sync failed ({result['error']})")
+        else:
+            total_fetched += result.get("messages_fetched", 0)
 
         # Process conversations
         try:
             triaged, summarized, _topics = process_conversations(
-                account_id, creds, user_email,
-                rate_limiter=gmail_limiter,
+                account_id, job.creds, user_emails[account_id],
+                rate_limiter=job.rate_limiter,
                 claude_limiter=claude_limiter,
             )
             total_triaged += triaged
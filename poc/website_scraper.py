@@ -5,17 +5,24 @@ from __future__ import annotations
 import json
 import logging
 import re
+import threading
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Callable
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from . import config
 from .enrichment_provider import (
     EnrichmentProvider,
     FieldValue,
     SourceTier,
     register_provider,
 )
+from .http_cache import CacheEntry, HttpCache, default_cache_path
 from .rate_limiter import RateLimiter
 
 log = logging.getLogger(__name__)
@@ -24,6 +31,15 @@ _USER_AGENT = "CRMExtender/0.1 (enrichment bot; +https://example.com/bot)"
 _TIMEOUT = 10
 _MAX_CONTENT_BYTES = 2 * 1024 * 1024  # 2 MB
 
+# robots.txt is reused from the HTTP cache for this long before revalidating
+_ROBOTS_TTL_SECONDS = 24 * 3600
+
+# Bump when the extractors change so cached field values are recomputed
+_EXTRACT_VERSION = 1
+
+# Statuses cached as "page does not exist" for probe paths
+_NEGATIVE_STATUSES = {404, 410}
+
 # Pages to crawl (in order of preference for about/contact)
 _ABOUT_PATHS = ["/about", "/about-us", "/about_us"]
 _CONTACT_PATHS = ["/contact", "/contact-us", "/contact_us"]
@@ -63,58 +79,144 @@ def _normalize_url(domain: str) -> str:
     return domain
 
 
-def _fetch_robots_txt(session: requests.Session, base_url: str) -> str | None:
-    """Fetch robots.txt for a domain. Returns content or None."""
+def _fetch_robots_txt(
+    session: requests.Session,
+    base_url: str,
+    cache: HttpCache | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> str | None:
+    """Fetch robots.txt for a domain. Returns content or None.
+
+    With a *cache*, a copy younger than a day is reused as-is (without
+    touching the rate limiter) and an older one is revalidated with a
+    conditional request.
+    """
+    url = urljoin(base_url, "/robots.txt")
+    entry = cache.get(url) if cache else None
+    if entry and entry.age() < _ROBOTS_TTL_SECONDS:
+        return entry.payload if entry.status == 200 else None
+
+    headers = entry.validators() if entry and entry.status == 200 else {}
+    if rate_limiter:
+        rate_limiter.acquire()
     try:
-        resp = session.get(
-            urljoin(base_url, "/robots.txt"),
-            timeout=_TIMEOUT,
-        )
-        if resp.status_code == 200:
-            return resp.text
+        resp = session.get(url, timeout=_TIMEOUT, headers=headers)
     except requests.RequestException:
-        pass
+        return None
+
+    if resp.status_code == 304 and headers:
+        cache.touch(url)
+        return entry.payload
+    if cache:
+        cache.put(
+            url, resp.status_code,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            payload=resp.text if resp.status_code == 200 else None,
+        )
+    if resp.status_code == 200:
+        return resp.text
     return None
 
 
-def _is_allowed_by_robots(robots_txt: str | None, path: str) -> bool:
-    """Basic robots.txt check — look for Disallow matching our path."""
-    if not robots_txt:
-        return True
+@lru_cache(maxsize=1024)
+def _disallowed_paths(robots_txt: str) -> tuple[str, ...]:
+    """Parse the Disallow prefixes out of a robots.txt body."""
+    paths = []
     for line in robots_txt.splitlines():
         line = line.strip()
         if line.lower().startswith("disallow:"):
             disallowed = line.split(":", 1)[1].strip()
-            if disallowed and path.startswith(disallowed):
-                return False
-    return True
+            if disallowed:
+                paths.append(disallowed)
+    return tuple(paths)
 
 
-def _fetch_page(
+def _is_allowed_by_robots(robots_txt: str | None, path: str) -> bool:
+    """Basic robots.txt check — look for Disallow matching our path."""
+    if not robots_txt:
+        return True
+    return not any(path.startswith(d) for d in _disallowed_paths(robots_txt))
+
+
+def _get_page(
     session: requests.Session,
     url: str,
     rate_limiter: RateLimiter | None = None,
-) -> BeautifulSoup | None:
-    """Fetch a URL and return parsed BeautifulSoup, or None on failure."""
+    headers: dict[str, str] | None = None,
+) -> tuple[int, requests.Response | None]:
+    """GET an HTML page. Returns (status, response); status 0 on network errors.
+
+    The response is None unless the status is 200 and the body is within
+    the size limit.
+    """
     if rate_limiter:
         rate_limiter.acquire()
     try:
         resp = session.get(
             url, timeout=_TIMEOUT,
-            headers={"Accept": "text/html"},
+            headers={"Accept": "text/html", **(headers or {})},
             stream=True,
         )
         if resp.status_code != 200:
-            return None
+            return resp.status_code, None
         content_length = resp.headers.get("Content-Length")
         if content_length and int(content_length) > _MAX_CONTENT_BYTES:
-            return None
-        # Read limited content
-        content = resp.content[:_MAX_CONTENT_BYTES]
-        return BeautifulSoup(content, "lxml")
+            return resp.status_code, None
+        return resp.status_code, resp
     except requests.RequestException as exc:
         log.debug("Failed to fetch %s: %s", url, exc)
-        return None
+        return 0, None
+
+
+def _scrape_page(
+    session: requests.Session,
+    url: str,
+    kind: str,
+    extract: Callable[[BeautifulSoup], list[FieldValue]],
+    *,
+    rate_limiter: RateLimiter | None = None,
+    cache: HttpCache | None = None,
+    max_age: float = 0,
+) -> list[FieldValue]:
+    """Fetch *url* and run *extract* on it, going through the HTTP cache.
+
+    The cache stores the extracted field values rather than the page, keyed
+    by *kind* (which extractors ran).  A matching entry younger than
+    *max_age* seconds is returned without any request; an older one is
+    revalidated, and a 304 reuses its values without parsing the page.
+    """
+    kind = f"{kind}:v{_EXTRACT_VERSION}"
+    entry = cache.get(url) if cache else None
+    usable = entry is not None and entry.status == 200 and entry.kind == kind
+    if usable and entry.age() < max_age:
+        return _decode_fields(entry)
+
+    headers = entry.validators() if usable else None
+    status, resp = _get_page(session, url, rate_limiter, headers)
+    if status == 304 and usable:
+        cache.touch(url)
+        return _decode_fields(entry)
+    if resp is None:
+        if cache and status in _NEGATIVE_STATUSES:
+            cache.put(url, status)
+        return []
+
+    soup = BeautifulSoup(resp.content[:_MAX_CONTENT_BYTES], "lxml")
+    fields = extract(soup)
+    if cache:
+        cache.put(
+            url, 200,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            kind=kind,
+            payload=json.dumps([asdict(fv) for fv in fields]),
+        )
+    return fields
+
+
+def _decode_fields(entry: CacheEntry) -> list[FieldValue]:
+    return [FieldValue(**d) for d in json.loads(entry.payload or "[]")]
 
 
 def _extract_meta(soup: BeautifulSoup) -> list[FieldValue]:
@@ -317,18 +419,32 @@ def _extract_contact_info(soup: BeautifulSoup, base_domain: str) -> list[FieldVa
 
 def _resolve_page_url(base_url: str, paths: list[str], session: requests.Session,
                       robots_txt: str | None,
-                      rate_limiter: RateLimiter | None = None) -> str | None:
-    """Try multiple path variants, return first that succeeds."""
+                      rate_limiter: RateLimiter | None = None,
+                      cache: HttpCache | None = None,
+                      max_age: float = 0) -> str | None:
+    """Try multiple path variants, return first that succeeds.
+
+    Fresh cache entries answer the probe without a request: a cached page
+    means the path exists, a cached 404/410 means it does not.
+    """
     for path in paths:
         if not _is_allowed_by_robots(robots_txt, path):
             continue
         url = urljoin(base_url, path)
+        entry = cache.get(url) if cache else None
+        if entry and entry.age() < max_age:
+            if entry.status == 200:
+                return url
+            if entry.status in _NEGATIVE_STATUSES:
+                continue
         if rate_limiter:
             rate_limiter.acquire()
         try:
             resp = session.head(url, timeout=_TIMEOUT, allow_redirects=True)
             if resp.status_code == 200:
                 return url
+            if cache and resp.status_code in _NEGATIVE_STATUSES:
+                cache.put(url, resp.status_code)
         except requests.RequestException:
             continue
     return None
@@ -351,7 +467,7 @@ class WebsiteScraperProvider(EnrichmentProvider):
 
     @property
     def rate_limit(self) -> float:
-        return 2.0
+        return config.ENRICH_RATE_LIMIT
 
     @property
     def cost_per_lookup(self) -> float:
@@ -362,7 +478,35 @@ class WebsiteScraperProvider(EnrichmentProvider):
         return 90
 
     def __init__(self) -> None:
-        self._rate_limiter = RateLimiter(rate=2.0, burst=2)
+        # Shared by every concurrent enrich() call: one global request budget
+        # and one connection pool
+        self._rate_limiter = RateLimiter(rate=self.rate_limit)
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self._cache: HttpCache | None = None
+
+    def _get_session(self) -> requests.Session:
+        """Return the provider's HTTP session, creating it on first use."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                session.headers["User-Agent"] = _USER_AGENT
+                adapter = HTTPAdapter(
+                    pool_connections=max(10, 2 * config.ENRICH_WORKERS),
+                    pool_maxsize=config.ENRICH_WORKERS,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _get_cache(self) -> HttpCache:
+        """Return the HTTP cache, (re)opening it if the configured path changed."""
+        path = default_cache_path()
+        with self._session_lock:
+            if self._cache is None or self._cache.path != path:
+                self._cache = HttpCache(path, ttl=config.HTTP_CACHE_TTL_DAYS * 86400)
+            return self._cache
 
     def enrich(self, entity: dict) -> list[FieldValue]:
         """Scrape up to 3 pages from the entity's domain/website."""
@@ -374,43 +518,59 @@ class WebsiteScraperProvider(EnrichmentProvider):
         parsed = urlparse(base_url)
         base_domain = parsed.netloc or parsed.path
 
-        session = requests.Session()
-        session.headers["User-Agent"] = _USER_AGENT
+        session = self._get_session()
+        cache = self._get_cache()
+        # Pages (and negative probe results) are trusted for the refresh cadence
+        max_age = self.refresh_cadence_days * 86400
 
         # Check robots.txt
-        robots_txt = _fetch_robots_txt(session, base_url)
+        robots_txt = _fetch_robots_txt(session, base_url, cache, self._rate_limiter)
 
         all_results: list[FieldValue] = []
 
         # 1. Homepage
         if _is_allowed_by_robots(robots_txt, "/"):
-            soup = _fetch_page(session, base_url, self._rate_limiter)
-            if soup:
-                all_results.extend(_extract_meta(soup))
-                all_results.extend(_extract_json_ld(soup))
-                all_results.extend(_extract_social_links(soup, base_domain))
-                all_results.extend(_extract_contact_info(soup, base_domain))
+            all_results.extend(_scrape_page(
+                session, base_url, "home",
+                lambda soup: (
+                    _extract_meta(soup)
+                    + _extract_json_ld(soup)
+                    + _extract_social_links(soup, base_domain)
+                    + _extract_contact_info(soup, base_domain)
+                ),
+                rate_limiter=self._rate_limiter, cache=cache, max_age=max_age,
+            ))
 
         # 2. About page
         about_url = _resolve_page_url(
-            base_url, _ABOUT_PATHS, session, robots_txt, self._rate_limiter
+            base_url, _ABOUT_PATHS, session, robots_txt, self._rate_limiter,
+            cache, max_age,
         )
         if about_url:
-            soup = _fetch_page(session, about_url, self._rate_limiter)
-            if soup:
-                all_results.extend(_extract_meta(soup))
-                all_results.extend(_extract_json_ld(soup))
-                all_results.extend(_extract_social_links(soup, base_domain))
+            all_results.extend(_scrape_page(
+                session, about_url, "about",
+                lambda soup: (
+                    _extract_meta(soup)
+                    + _extract_json_ld(soup)
+                    + _extract_social_links(soup, base_domain)
+                ),
+                rate_limiter=self._rate_limiter, cache=cache, max_age=max_age,
+            ))
 
         # 3. Contact page
         contact_url = _resolve_page_url(
-            base_url, _CONTACT_PATHS, session, robots_txt, self._rate_limiter
+            base_url, _CONTACT_PATHS, session, robots_txt, self._rate_limiter,
+            cache, max_age,
         )
         if contact_url:
-            soup = _fetch_page(session, contact_url, self._rate_limiter)
-            if soup:
-                all_results.extend(_extract_contact_info(soup, base_domain))
-                all_results.extend(_extract_social_links(soup, base_domain))
+            all_results.extend(_scrape_page(
+                session, contact_url, "contact",
+                lambda soup: (
+                    _extract_contact_info(soup, base_domain)
+                    + _extract_social_links(soup, base_domain)
+                ),
+                rate_limiter=self._rate_limiter, cache=cache, max_age=max_age,
+            ))
 
         # Deduplicate: keep highest confidence per (field_name, field_value)
         best: dict[tuple[str, str], FieldValue] = {}
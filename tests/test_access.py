@@ -230,3 +230,79 @@ class TestVisibleConversations:
             convs = get_visible_conversations(conn, "cust-1", "user-1")
         ids = {c["id"] for c in convs}
         assert "conv-shared" not in ids
+
+
+class TestConversationVisibilityMaintenance:
+    """conversation_visibility follows sync, sharing and account changes."""
+
+    def _visible(self, db, user_id):
+        with get_connection(db) as conn:
+            return {c["id"] for c in get_visible_conversations(conn, "cust-1", user_id)}
+
+    def test_backfilled_rows_match_sources(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            rows = {tuple(r) for r in conn.execute(
+                "SELECT user_id, conversation_id FROM conversation_visibility"
+            )}
+        assert rows == {("user-1", "conv-1"), ("user-2", "conv-shared")}
+
+    def test_assigning_account_grants_existing_conversations(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            conn.execute(
+                "INSERT INTO user_provider_accounts "
+                "(id, user_id, account_id, role, created_at) "
+                "VALUES ('upa-2', 'user-2', 'acct-1', 'shared', ?)", (_NOW,),
+            )
+        assert "conv-1" in self._visible(tmp_db, "user-2")
+
+        with get_connection(tmp_db) as conn:
+            conn.execute("DELETE FROM user_provider_accounts WHERE id = 'upa-2'")
+        assert "conv-1" not in self._visible(tmp_db, "user-2")
+
+    def test_unassign_keeps_explicit_share(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            conn.execute(
+                "INSERT INTO conversation_shares (id, conversation_id, user_id, created_at) "
+                "VALUES ('s-2', 'conv-1', 'user-1', ?)", (_NOW,),
+            )
+            conn.execute("DELETE FROM user_provider_accounts WHERE user_id = 'user-1'")
+        assert "conv-1" in self._visible(tmp_db, "user-1")
+
+        with get_connection(tmp_db) as conn:
+            conn.execute("DELETE FROM conversation_shares WHERE id = 's-2'")
+        assert "conv-1" not in self._visible(tmp_db, "user-1")
+
+    def test_new_communication_link_grants_and_unlink_revokes(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            conn.execute(
+                "INSERT INTO conversation_communications "
+                "(conversation_id, communication_id, created_at) "
+                "VALUES ('conv-shared', 'comm-1', ?)", (_NOW,),
+            )
+        assert "conv-shared" in self._visible(tmp_db, "user-1")
+
+        with get_connection(tmp_db) as conn:
+            conn.execute(
+                "DELETE FROM conversation_communications "
+                "WHERE conversation_id = 'conv-shared'"
+            )
+        assert "conv-shared" not in self._visible(tmp_db, "user-1")
+        assert "conv-shared" in self._visible(tmp_db, "user-2")
+
+    def test_deleting_communication_revokes(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            conn.execute("DELETE FROM communications WHERE id = 'comm-1'")
+        assert "conv-1" not in self._visible(tmp_db, "user-1")
+
+    def test_deleting_provider_account_revokes(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            conn.execute("DELETE FROM provider_accounts WHERE id = 'acct-1'")
+        assert "conv-1" not in self._visible(tmp_db, "user-1")
+
+    def test_deleting_conversation_cascades(self, tmp_db):
+        with get_connection(tmp_db) as conn:
+            conn.execute("DELETE FROM conversations WHERE id = 'conv-1'")
+            count = conn.execute(
+                "SELECT COUNT(*) FROM conversation_visibility WHERE conversation_id = 'conv-1'"
+            ).fetchone()[0]
+        assert count == 0
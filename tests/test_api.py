@@ -218,6 +218,32 @@ class TestViews:
         assert data["per_page"] == 50  # default
         assert data["total"] == 5
 
+    def test_view_data_keyset(self, client):
+        _seed_contacts(5)
+        views = client.get("/api/v1/views?entity_type=contact").json()
+        view_id = views[0]["id"]
+        with get_connection() as conn:
+            conn.execute("UPDATE views SET per_page = 2 WHERE id = ?", (view_id,))
+
+        first = client.get(f"/api/v1/views/{view_id}/data?cursor=").json()
+        assert first["total"] == 5
+        assert first["has_more"] is True
+        names = [r["name"] for r in first["rows"]]
+
+        cursor = first["next_cursor"]
+        while cursor:
+            page = client.get(f"/api/v1/views/{view_id}/data?cursor={cursor}").json()
+            assert page["total"] is None  # count only on the first page
+            names.extend(r["name"] for r in page["rows"])
+            cursor = page["next_cursor"]
+        assert names == [f"Contact {i}" for i in range(5)]
+
+    def test_view_data_bad_cursor(self, client):
+        views = client.get("/api/v1/views?entity_type=contact").json()
+        view_id = views[0]["id"]
+        resp = client.get(f"/api/v1/views/{view_id}/data?cursor=garbage")
+        assert resp.status_code == 400
+
     def test_company_view(self, client):
         _seed_companies(3)
         views = client.get("/api/v1/views?entity_type=company").json()
@@ -8,6 +8,7 @@ from poc.auto_assign import (
     AutoAssignReport,
     MatchResult,
     _score_conversation,
+    _TopicAutomaton,
     apply_assignments,
     find_matching_topics,
 )
@@ -249,6 +250,46 @@ class TestFindMatchingTopics:
         assert report.assignments[0].topic_name == "Alpha"
 
 
+    def test_overlapping_topic_names(self, tmp_db):
+        proj = create_project("TestProj")
+        create_topic(proj["id"], "Tax")
+        create_topic(proj["id"], "Tax Return")
+
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1", title="2023 tax return")
+            tag = _insert_tag(conn, "tax return prep")
+            _link_tag(conn, "c1", tag)
+            _insert_conversation(conn, "c2", title="Tax question")
+
+        report = find_matching_topics(proj["id"])
+        by_conv = {a.conversation_id: a for a in report.assignments}
+        # Both topics score 3 on c1; "Tax" wins the tie alphabetically
+        assert by_conv["c1"].topic_name == "Tax"
+        assert by_conv["c1"].score == 3
+        assert by_conv["c1"].matched_tags == ["tax return prep"]
+        assert by_conv["c2"].topic_name == "Tax"
+        assert by_conv["c2"].score == 1
+
+
+# ---------------------------------------------------------------------------
+# Unit tests: _TopicAutomaton
+# ---------------------------------------------------------------------------
+
+class TestTopicAutomaton:
+
+    def test_matches_naive_substring_search(self):
+        patterns = ["he", "she", "his", "hers", "tax", "ax", "x", "taxes"]
+        automaton = _TopicAutomaton(patterns)
+        for text in ("ushers", "taxes and shes", "hi", "", "ahishers", "xtaxax"):
+            expected = {i for i, p in enumerate(patterns) if p in text}
+            assert automaton.find(text) == expected, text
+
+    def test_empty_pattern_matches_everything(self):
+        automaton = _TopicAutomaton(["", "tax"])
+        assert automaton.find("") == {0}
+        assert automaton.find("tax") == {0, 1}
+
+
 # ---------------------------------------------------------------------------
 # Integration tests: apply_assignments
 # ---------------------------------------------------------------------------
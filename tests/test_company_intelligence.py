@@ -237,8 +237,8 @@ class TestV7Schema:
                     "PRAGMA table_info(company_identifiers)"
                 ).fetchall()
             }
-        expected = {"id", "company_id", "type", "value", "is_primary", "source",
-                    "created_at", "updated_at"}
+        expected = {"id", "company_id", "type", "value", "normalized_domain",
+                    "is_primary", "source", "created_at", "updated_at"}
         assert expected == cols
 
     def test_entity_scores_unique_index(self, tmp_db):
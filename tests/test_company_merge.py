@@ -272,6 +272,14 @@ class TestFindDuplicates:
         result = find_duplicates_for_domain("https://www.acme.com/about")
         assert len(result) == 1
 
+    def test_matches_stored_variants(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "c1", "Acme Corp", "www.acme.com")
+            _insert_company(conn, "c2", "Acme UK", "")
+            _insert_identifier(conn, "c2", "mail.acme.com")
+        result = find_duplicates_for_domain("acme.com")
+        assert {r["id"] for r in result} == {"c1", "c2"}
+
 
 # ===================================================================
 # TestDetectAllDuplicates
@@ -310,6 +318,28 @@ class TestDetectAllDuplicates:
         groups = detect_all_duplicates()
         assert groups == []
 
+    def test_groups_by_normalised_domain(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "c1", "Acme Corp", "https://www.acme.com")
+            _insert_company(conn, "c2", "Acme Sales", "sales.acme.com")
+            _insert_identifier(conn, "c1", "acme.com")
+            _insert_company(conn, "c3", "Beta Inc", "beta.com")
+        groups = detect_all_duplicates()
+        assert len(groups) == 1
+        assert groups[0]["domain"] == "acme.com"
+        assert [c["id"] for c in groups[0]["companies"]] == ["c1", "c2"]
+        assert groups[0]["companies"][0]["domain"] == "https://www.acme.com"
+
+    def test_largest_group_first(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "c1", "Beta 1", "beta.com")
+            _insert_company(conn, "c2", "Beta 2", "beta.com")
+            _insert_company(conn, "c3", "Acme 1", "acme.com")
+            _insert_company(conn, "c4", "Acme 2", "acme.com")
+            _insert_company(conn, "c5", "Acme 3", "acme.com")
+        groups = detect_all_duplicates()
+        assert [g["domain"] for g in groups] == ["acme.com", "beta.com"]
+
 
 # ===================================================================
 # TestMergePreview
@@ -780,6 +810,20 @@ class TestSyncDuplicateDetection:
 
         assert result == "c1"
 
+    @pytest.mark.parametrize("existing, email", [
+        ("acme.com.ar", "b@globex.com.ar"),
+        ("alice.github.io", "bob@bob.github.io"),
+    ])
+    def test_shared_suffix_gets_own_company(self, tmp_db, existing, email):
+        """Domains sharing only a public suffix are separate companies."""
+        from poc.sync import _resolve_company_id
+
+        with get_connection() as conn:
+            _insert_company(conn, "c1", "Existing", existing)
+            result = _resolve_company_id(conn, email, _NOW)
+
+        assert result not in (None, "c1")
+
     def test_auto_create_with_domain_name(self, tmp_db):
         """No matching company — creates one named after the domain."""
         from poc.sync import _resolve_company_id
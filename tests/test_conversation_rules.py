@@ -18,7 +18,15 @@ import pytest
 
 from poc.database import get_connection, init_db
 from poc.models import KnownContact, ParsedEmail, _now_iso
-from poc.sync import _is_blocked_sender, _should_create_conversation, _store_thread
+from poc.sync import (
+    _is_blocked_sender,
+    _should_create_conversation,
+    _store_thread,
+    _store_threads,
+    iter_conversations_for_display,
+    load_conversations_for_display,
+)
+from poc.triage import AUTOMATED_SENDER_PATTERNS, _sender_verdict
 
 _NOW = datetime.now(timezone.utc).isoformat()
 CUST_ID = "cust-test"
@@ -185,6 +193,24 @@ class TestIsBlockedSender:
     def test_invoice(self):
         assert _is_blocked_sender("invoice@company.com") is True
 
+    def test_agrees_with_pattern_list(self):
+        addrs = [
+            "noreply-alerts@x.com", "do-not-reply@x.com", "postmaster@x.com",
+            "notificationsonly@x.com", "account_security@x.com", "receipt@x.com",
+            "invoice+statements@x.com", "bounce@x.com", "renewal@x.com",
+            "alice@x.com", "bob.noreply@x.com", "billing.team@x.com",
+        ]
+        for addr in addrs:
+            expected = any(pat.search(addr) for pat in AUTOMATED_SENDER_PATTERNS)
+            assert _is_blocked_sender(addr) is expected, addr
+
+    def test_verdicts_memoized(self):
+        _sender_verdict.cache_clear()
+        _is_blocked_sender("  NoReply@Company.com")
+        _is_blocked_sender("noreply@company.com")
+        info = _sender_verdict.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
 
 # ===================================================================
 # _should_create_conversation tests (unit-level, no DB)
@@ -629,3 +655,171 @@ class TestStoreThreadEdgeCases:
                 "SELECT COUNT(*) as cnt FROM communication_participants"
             ).fetchone()["cnt"]
             assert parts >= 1
+
+
+# ===================================================================
+# Batch ingestion: _store_threads
+# ===================================================================
+
+class TestStoreThreadsBatch:
+    """A whole page of threads is stored with set-based inserts."""
+
+    def test_mixed_page(self, tmp_db):
+        _create_contact("Alice", "alice@acme.com")
+        idx = _build_contact_index()
+        threads = [
+            [_make_email("t-known", "alice@acme.com", [ACCOUNT_EMAIL], message_id="b-1"),
+             _make_email("t-known", ACCOUNT_EMAIL, ["alice@acme.com", "bob@acme.com"],
+                         message_id="b-2")],
+            [_make_email("t-stranger", "stranger@unknown.com", [ACCOUNT_EMAIL],
+                         message_id="b-3")],
+        ]
+
+        with get_connection() as conn:
+            result = _store_threads(
+                conn, ACCOUNT_ID, ACCOUNT_EMAIL, threads, idx,
+                customer_id=CUST_ID, created_by=USER_ID,
+            )
+            assert result["created_threads"] == {"t-known"}
+            assert result["updated_threads"] == set()
+            assert result["messages_stored"] == 3
+            assert result["messages_skipped"] == 0
+            assert _count_communications(conn) == 3
+            assert _count_conversations(conn) == 1
+
+            conv = conn.execute("SELECT * FROM conversations").fetchone()
+            assert conv["communication_count"] == 2
+            assert conv["participant_count"] == 3
+
+            parts = {
+                r["address"]: dict(r) for r in conn.execute(
+                    "SELECT * FROM conversation_participants WHERE conversation_id = ?",
+                    (conv["id"],),
+                )
+            }
+            assert set(parts) == {"alice@acme.com", ACCOUNT_EMAIL, "bob@acme.com"}
+            assert parts["alice@acme.com"]["communication_count"] == 1
+            assert parts["alice@acme.com"]["contact_id"] is not None
+            assert parts["bob@acme.com"]["communication_count"] == 0
+            assert parts["bob@acme.com"]["first_seen_at"] is None
+
+    def test_rerun_skips_stored_messages(self, tmp_db):
+        _create_contact("Alice", "alice@acme.com")
+        idx = _build_contact_index()
+        page = [[_make_email("t-re", "alice@acme.com", [ACCOUNT_EMAIL], message_id="r-1")]]
+
+        with get_connection() as conn:
+            _store_threads(conn, ACCOUNT_ID, ACCOUNT_EMAIL, page, idx,
+                           customer_id=CUST_ID, created_by=USER_ID)
+            result = _store_threads(conn, ACCOUNT_ID, ACCOUNT_EMAIL, page, idx,
+                                    customer_id=CUST_ID, created_by=USER_ID)
+            assert result["messages_stored"] == 0
+            assert result["messages_skipped"] == 1
+            assert result["created_threads"] == set()
+            assert result["updated_threads"] == set()
+            assert _count_communications(conn) == 1
+
+    def test_new_message_updates_counters(self, tmp_db):
+        _create_contact("Alice", "alice@acme.com")
+        idx = _build_contact_index()
+
+        with get_connection() as conn:
+            _store_threads(conn, ACCOUNT_ID, ACCOUNT_EMAIL,
+                           [[_make_email("t-up", "alice@acme.com", [ACCOUNT_EMAIL],
+                                         message_id="u-1")]],
+                           idx, customer_id=CUST_ID, created_by=USER_ID)
+            result = _store_threads(conn, ACCOUNT_ID, ACCOUNT_EMAIL,
+                                    [[_make_email("t-up", "alice@acme.com", [ACCOUNT_EMAIL],
+                                                  message_id="u-2")]],
+                                    idx, customer_id=CUST_ID, created_by=USER_ID)
+            assert result["updated_threads"] == {"t-up"}
+            conv = conn.execute("SELECT * FROM conversations").fetchone()
+            assert conv["communication_count"] == 2
+            assert conv["ai_summarized_at"] is None
+            alice = conn.execute(
+                "SELECT communication_count FROM conversation_participants "
+                "WHERE address = 'alice@acme.com'"
+            ).fetchone()
+            assert alice["communication_count"] == 2
+
+    def test_empty_page(self, tmp_db):
+        with get_connection() as conn:
+            result = _store_threads(conn, ACCOUNT_ID, ACCOUNT_EMAIL, [[], []], {})
+            assert result["messages_stored"] == 0
+            assert _count_communications(conn) == 0
+
+
+
+# ===================================================================
+# load_conversations_for_display
+# ===================================================================
+
+class TestLoadConversationsForDisplay:
+    """Display loading assembles conversations from batched queries."""
+
+    def _seed(self):
+        _create_contact("Alice", "alice@acme.com")
+        _create_contact("Bob", "bob@beta.com")
+        idx = _build_contact_index()
+        threads = [
+            [_make_email("t-a", "alice@acme.com", [ACCOUNT_EMAIL], message_id="d-1"),
+             _make_email("t-a", ACCOUNT_EMAIL, ["alice@acme.com", "carol@acme.com"],
+                         message_id="d-2")],
+            [_make_email("t-b", "bob@beta.com", [ACCOUNT_EMAIL], message_id="d-3")],
+            [_make_email("t-c", "alice@acme.com", [ACCOUNT_EMAIL], message_id="d-4")],
+        ]
+        with get_connection() as conn:
+            _store_threads(conn, ACCOUNT_ID, ACCOUNT_EMAIL, threads, idx,
+                           customer_id=CUST_ID, created_by=USER_ID)
+            rows = conn.execute(
+                "SELECT conv.id, comm.provider_thread_id FROM conversations conv "
+                "JOIN conversation_communications cc ON cc.conversation_id = conv.id "
+                "JOIN communications comm ON comm.id = cc.communication_id"
+            ).fetchall()
+            ids = {r["provider_thread_id"]: r["id"] for r in rows}
+            for i, thread in enumerate(("t-a", "t-b", "t-c")):
+                conn.execute(
+                    "UPDATE conversations SET last_activity_at = ? WHERE id = ?",
+                    (f"2024-01-0{3 - i}T00:00:00+00:00", ids[thread]),
+                )
+            conn.execute(
+                "UPDATE conversations SET triage_result = 'automated_sender' "
+                "WHERE id = ?", (ids["t-c"],),
+            )
+        return ids
+
+    def test_assembles_conversations(self, tmp_db):
+        ids = self._seed()
+        conversations, _, triaged = load_conversations_for_display(
+            account_ids=[ACCOUNT_ID],
+        )
+        assert [c.thread_id for c in conversations] == [ids["t-a"], ids["t-b"]]
+        conv = conversations[0]
+        assert conv.account_email == ACCOUNT_EMAIL
+        assert [e.message_id for e in conv.emails] == ["d-1", "d-2"]
+        assert sorted(conv.emails[1].recipients) == ["alice@acme.com", "carol@acme.com"]
+        assert set(conv.participants) == {"alice@acme.com", ACCOUNT_EMAIL, "carol@acme.com"}
+        assert conv.matched_contacts["alice@acme.com"].name == "Alice"
+        assert "carol@acme.com" not in conv.matched_contacts
+        assert [t.thread_id for t in triaged] == [ids["t-c"]]
+
+    def test_include_triaged(self, tmp_db):
+        ids = self._seed()
+        conversations, _, triaged = load_conversations_for_display(include_triaged=True)
+        assert len(conversations) == 2
+        assert [t.thread_id for t in triaged] == [ids["t-c"]]
+
+    def test_pages(self, tmp_db):
+        ids = self._seed()
+        pages = list(iter_conversations_for_display(
+            account_ids=[ACCOUNT_ID], page_size=1,
+        ))
+        assert [[c.thread_id for c in p[0]] for p in pages] == [
+            [ids["t-a"]], [ids["t-b"]], [],
+        ]
+        assert [t.thread_id for t in pages[-1][2]] == [ids["t-c"]]
+
+    def test_limit_and_offset(self, tmp_db):
+        ids = self._seed()
+        conversations, _, _ = load_conversations_for_display(limit=1, offset=1)
+        assert [c.thread_id for c in conversations] == [ids["t-b"]]
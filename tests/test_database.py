@@ -0,0 +1,213 @@
+"""Tests for the pooled, request-scoped database connections."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from poc import database
+from poc.database import close_pool, connection_scope, get_connection, init_db
+
+
+@pytest.fixture()
+def tmp_db(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setattr("poc.config.DB_PATH", db_file)
+    init_db(db_file)
+    with get_connection() as conn:
+        conn.execute("CREATE TABLE items (name TEXT PRIMARY KEY)")
+    yield db_file
+    close_pool()
+
+
+def _names() -> list[str]:
+    with get_connection() as conn:
+        return [r["name"] for r in conn.execute("SELECT name FROM items ORDER BY name")]
+
+
+class TestPool:
+
+    def test_connection_reused(self, tmp_db):
+        with get_connection() as first:
+            pass
+        with get_connection() as second:
+            pass
+        assert first is second
+
+    def test_pragmas_applied(self, tmp_db, monkeypatch):
+        monkeypatch.setattr("poc.config.DB_CACHE_SIZE_KB", 2048)
+        close_pool()
+        with get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+
+    def test_pool_disabled(self, tmp_db, monkeypatch):
+        monkeypatch.setattr("poc.config.DB_POOL_SIZE", 0)
+        close_pool()
+        with get_connection() as first:
+            pass
+        with get_connection() as second:
+            pass
+        assert first is not second
+
+    def test_nested_calls_use_separate_connections(self, tmp_db):
+        with get_connection() as outer:
+            with get_connection() as inner:
+                assert inner is not outer
+
+    def test_rollback_on_exception(self, tmp_db):
+        with pytest.raises(RuntimeError):
+            with get_connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('a')")
+                raise RuntimeError("boom")
+        assert _names() == []
+
+
+class TestConnectionScope:
+
+    def test_calls_share_one_connection(self, tmp_db):
+        with connection_scope():
+            with get_connection() as first:
+                with get_connection() as nested:
+                    assert nested is first
+            with get_connection() as second:
+                assert second is first
+
+    def test_each_block_commits(self, tmp_db):
+        with connection_scope():
+            with get_connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('a')")
+            with get_connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('b')")
+        assert _names() == ["a", "b"]
+
+    def test_nested_failure_rolls_back_only_nested_work(self, tmp_db):
+        with connection_scope():
+            with get_connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('outer')")
+                with pytest.raises(RuntimeError):
+                    with get_connection() as inner:
+                        inner.execute("INSERT INTO items VALUES ('inner')")
+                        raise RuntimeError("boom")
+        assert _names() == ["outer"]
+
+    def test_explicit_commit_inside_nested_block(self, tmp_db):
+        with connection_scope():
+            with get_connection():
+                with get_connection() as inner:
+                    inner.execute("INSERT INTO items VALUES ('a')")
+                    inner.commit()
+                    inner.execute("INSERT INTO items VALUES ('b')")
+        assert _names() == ["a", "b"]
+
+    def test_connection_returned_to_pool(self, tmp_db):
+        with connection_scope():
+            with get_connection() as scoped:
+                pass
+        with get_connection() as conn:
+            assert conn is scoped
+
+
+class TestRequestConnection:
+
+    def test_request_opens_one_connection(self, tmp_db, monkeypatch):
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO customers (id, name, slug, is_active, created_at, updated_at) "
+                "VALUES ('cust-test', 'Test Org', 'test', 1, 'now', 'now')"
+            )
+            conn.execute(
+                "INSERT INTO users "
+                "(id, customer_id, email, name, role, is_active, created_at, updated_at) "
+                "VALUES ('user-test', 'cust-test', 'test@example.com', 'Test User', "
+                "'admin', 1, 'now', 'now')"
+            )
+        monkeypatch.setattr("poc.config.CRM_AUTH_ENABLED", False)
+        from poc.web.app import create_app
+        client = TestClient(create_app())
+
+        with patch("poc.database._acquire", wraps=database._acquire) as acquire:
+            resp = client.get("/contacts")
+
+        assert resp.status_code == 200
+        assert acquire.call_count == 1
+
+
+class TestContactPrimaryColumns:
+    """Trigger-maintained primary_email / primary_phone / primary_address."""
+
+    @pytest.fixture()
+    def contact(self, tmp_db):
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO contacts (id, name, created_at, updated_at) "
+                "VALUES ('c1', 'Alice', '2024-01-01', '2024-01-01')"
+            )
+        return "c1"
+
+    def _primary(self, column):
+        with get_connection() as conn:
+            return conn.execute(f"SELECT {column} FROM contacts WHERE id = 'c1'").fetchone()[0]
+
+    def _add_email(self, ident_id, value, *, is_primary=0, created_at="2024-01-01"):
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO contact_identifiers "
+                "(id, contact_id, type, value, is_primary, created_at, updated_at) "
+                "VALUES (?, 'c1', 'email', ?, ?, ?, ?)",
+                (ident_id, value, is_primary, created_at, created_at),
+            )
+
+    def test_email_follows_primary_flag(self, contact):
+        self._add_email("e1", "first@example.com")
+        assert self._primary("primary_email") == "first@example.com"
+        self._add_email("e2", "second@example.com", created_at="2024-02-01")
+        assert self._primary("primary_email") == "first@example.com"
+        with get_connection() as conn:
+            conn.execute("UPDATE contact_identifiers SET is_primary = 1 WHERE id = 'e2'")
+        assert self._primary("primary_email") == "second@example.com"
+        with get_connection() as conn:
+            conn.execute("DELETE FROM contact_identifiers WHERE id = 'e2'")
+        assert self._primary("primary_email") == "first@example.com"
+
+    def test_identifier_moved_between_contacts(self, contact):
+        self._add_email("e1", "a@example.com")
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO contacts (id, name, created_at, updated_at) "
+                "VALUES ('c2', 'Bob', '2024-01-01', '2024-01-01')"
+            )
+            conn.execute("UPDATE contact_identifiers SET contact_id = 'c2' WHERE id = 'e1'")
+            rows = dict(conn.execute("SELECT id, primary_email FROM contacts").fetchall())
+        assert rows == {"c1": None, "c2": "a@example.com"}
+
+    def test_phone_and_address(self, contact):
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO phone_numbers "
+                "(id, entity_type, entity_id, number, created_at, updated_at) "
+                "VALUES ('p1', 'contact', 'c1', '+15550100', '2024-01-01', '2024-01-01')"
+            )
+            conn.execute(
+                "INSERT INTO addresses "
+                "(id, entity_type, entity_id, street, created_at, updated_at) "
+                "VALUES ('a1', 'contact', 'c1', '1 Main St', '2024-01-01', '2024-01-01')"
+            )
+        assert self._primary("primary_phone") == "+15550100"
+        assert self._primary("primary_address") == "1 Main St"
+        with get_connection() as conn:
+            conn.execute("UPDATE phone_numbers SET is_current = 0 WHERE id = 'p1'")
+        assert self._primary("primary_phone") is None
+
+    def test_company_rows_ignored(self, contact):
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO phone_numbers "
+                "(id, entity_type, entity_id, number, created_at, updated_at) "
+                "VALUES ('p1', 'company', 'c1', '+15550199', '2024-01-01', '2024-01-01')"
+            )
+        assert self._primary("primary_phone") is None
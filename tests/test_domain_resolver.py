@@ -12,6 +12,7 @@ from poc.database import get_connection, init_db
 from poc.domain_resolver import (
     PUBLIC_DOMAINS,
     DomainResolveResult,
+    backfill_normalized_domains,
     ensure_domain_identifier,
     extract_domain,
     is_public_domain,
@@ -146,6 +147,80 @@ class TestResolveCompanyByDomain:
             result = resolve_company_by_domain(conn, "dead.com")
         assert result is None
 
+    def test_case_insensitive(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="Acme.COM")
+            _insert_company(conn, "co-2", "Beta Corp", domain=None)
+            _insert_company_identifier(conn, "co-2", "Beta.IO")
+            assert resolve_company_by_domain(conn, "ACME.com")["id"] == "co-1"
+            assert resolve_company_by_domain(conn, "beta.io")["id"] == "co-2"
+
+    @pytest.mark.parametrize("existing, lookup", [
+        ("acme.com.ar", "globex.com.ar"),
+        ("alice.github.io", "bob.github.io"),
+        ("acme.co.uk", "mail.acme.co.uk"),
+    ])
+    def test_no_root_domain_match(self, tmp_db, existing, lookup):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Existing", domain=existing)
+            assert resolve_company_by_domain(conn, lookup) is None
+
+    def test_does_not_write(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com")
+        with get_connection() as conn:
+            before = conn.total_changes
+            assert resolve_company_by_domain(conn, "acme.com")["id"] == "co-1"
+            assert conn.total_changes == before
+
+    def test_lookups_use_indexes(self, tmp_db):
+        with get_connection() as conn:
+            plans = [
+                " ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("x",)))
+                for sql in (
+                    "SELECT * FROM companies WHERE LOWER(domain) = ?",
+                    "SELECT * FROM company_identifiers "
+                    "WHERE type = 'domain' AND LOWER(value) = ?",
+                )
+            ]
+        assert "idx_companies_domain_lower" in plans[0]
+        assert "idx_coid_value_lower" in plans[1]
+
+    def test_follows_raw_domain_update(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com")
+            assert resolve_company_by_domain(conn, "acme.com")["id"] == "co-1"
+            conn.execute("UPDATE companies SET domain = 'acme.io' WHERE id = 'co-1'")
+            assert resolve_company_by_domain(conn, "acme.com") is None
+            assert resolve_company_by_domain(conn, "acme.io")["id"] == "co-1"
+
+
+class TestBackfillNormalizedDomains:
+    def test_fills_rows_written_without_it(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="https://www.Acme.com/")
+            _insert_company(conn, "co-2", "No Domain", domain=None)
+            _insert_company_identifier(conn, "co-1", "mail.acme.com")
+            assert backfill_normalized_domains(conn) == 3
+            assert backfill_normalized_domains(conn) == 0
+            rows = dict(conn.execute(
+                "SELECT id, normalized_domain FROM companies"
+            ).fetchall())
+            ci = conn.execute(
+                "SELECT normalized_domain FROM company_identifiers"
+            ).fetchone()[0]
+        assert rows == {"co-1": "acme.com", "co-2": ""}
+        assert ci == "acme.com"
+
+    def test_trigger_invalidates_on_identifier_change(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp")
+            ensure_domain_identifier(conn, "co-1", "acme.com")
+            conn.execute("UPDATE company_identifiers SET value = 'beta.com'")
+            assert conn.execute(
+                "SELECT normalized_domain FROM company_identifiers"
+            ).fetchone()[0] is None
+
 
 # ---------------------------------------------------------------------------
 # ensure_domain_identifier
@@ -274,6 +349,123 @@ class TestResolveUnlinkedContacts:
         assert result.contacts_skipped_no_match == 1
 
 
+    def test_matches_company_identifier(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com")
+            _insert_company_identifier(conn, "co-1", "acme.io")
+            _insert_contact(conn, "ct-1", "Alice", "alice@acme.io")
+
+        result = resolve_unlinked_contacts()
+
+        assert result.details[0]["company_id"] == "co-1"
+
+    def test_matches_case_insensitively(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="Acme.COM")
+            _insert_contact(conn, "ct-1", "Alice", "alice@acme.com")
+
+        result = resolve_unlinked_contacts()
+
+        assert result.details[0]["company_id"] == "co-1"
+
+    @pytest.mark.parametrize("company_domain, email", [
+        ("acme.com.ar", "bob@globex.com.ar"),
+        ("alice.github.io", "bob@bob.github.io"),
+        ("acme.com", "alice@mail.acme.com"),
+    ])
+    def test_shared_suffix_not_linked(self, tmp_db, company_domain, email):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain=company_domain)
+            _insert_contact(conn, "ct-1", "Bob", email)
+
+        result = resolve_unlinked_contacts()
+
+        assert result.contacts_linked == 0
+        assert result.contacts_skipped_no_match == 1
+
+    def test_dry_run_leaves_database_untouched(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com")
+            _insert_contact(conn, "ct-1", "Alice", "alice@acme.com")
+
+        resolve_unlinked_contacts(dry_run=True)
+
+        with get_connection() as conn:
+            # Not even the lazily filled normalized_domain is written
+            assert conn.execute(
+                "SELECT normalized_domain FROM companies WHERE id = 'co-1'"
+            ).fetchone()[0] is None
+
+    def test_inactive_company_ignored(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com", status="archived")
+            _insert_contact(conn, "ct-1", "Alice", "alice@acme.com")
+
+        result = resolve_unlinked_contacts()
+
+        assert result.contacts_skipped_no_match == 1
+
+    def test_two_emails_one_affiliation(self, tmp_db):
+        with get_connection() as conn:
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com")
+            _insert_contact(conn, "ct-1", "Alice", "alice@acme.com")
+            conn.execute(
+                "INSERT INTO contact_identifiers (id, contact_id, type, value, "
+                "is_primary, created_at, updated_at) "
+                "VALUES ('ci-2', 'ct-1', 'email', 'a.smith@acme.com', 0, ?, ?)",
+                (_now_iso(), _now_iso()),
+            )
+
+        result = resolve_unlinked_contacts()
+
+        assert result.contacts_linked == 2
+        with get_connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM contact_companies WHERE contact_id = 'ct-1'"
+            ).fetchone()[0]
+        assert count == 1
+
+    def test_uses_customer_employee_role(self, tmp_db):
+        now = _now_iso()
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO customers (id, name, slug, is_active, created_at, updated_at) "
+                "VALUES ('cust-1', 'Org', 'org', 1, ?, ?)", (now, now),
+            )
+            conn.execute(
+                "INSERT INTO contact_company_roles "
+                "(id, customer_id, name, is_system, created_at, updated_at) "
+                "VALUES ('role-emp', 'cust-1', 'Employee', 1, ?, ?)", (now, now),
+            )
+            _insert_company(conn, "co-1", "Acme Corp", domain="acme.com")
+            _insert_contact(conn, "ct-1", "Alice", "alice@acme.com")
+            conn.execute("UPDATE contacts SET customer_id = 'cust-1' WHERE id = 'ct-1'")
+
+        resolve_unlinked_contacts()
+
+        with get_connection() as conn:
+            row = conn.execute(
+                "SELECT role_id, source FROM contact_companies WHERE contact_id = 'ct-1'"
+            ).fetchone()
+        assert row["role_id"] == "role-emp"
+        assert row["source"] == "domain_resolver"
+
+    def test_many_contacts(self, tmp_db):
+        with get_connection() as conn:
+            for i in range(50):
+                _insert_company(conn, f"co-{i}", f"Company {i}", domain=f"company{i}.com")
+            for i in range(2000):
+                _insert_contact(conn, f"ct-{i}", f"Person {i}", f"p{i}@company{i % 60}.com")
+
+        result = resolve_unlinked_contacts()
+
+        assert result.contacts_checked == 2000
+        assert result.contacts_linked + result.contacts_skipped_no_match == 2000
+        with get_connection() as conn:
+            linked = conn.execute("SELECT COUNT(*) FROM contact_companies").fetchone()[0]
+        assert linked == result.contacts_linked
+
+
 # ---------------------------------------------------------------------------
 # Web route
 # ---------------------------------------------------------------------------
@@ -1,8 +1,10 @@
 """Tests for email quote stripping functionality."""
 
+from unittest.mock import patch
+
 import pytest
 
-from poc.email_parser import strip_quotes
+from poc.email_parser import clean_pool, strip_quotes, strip_quotes_many
 
 
 class TestExistingFunctionality:
@@ -634,3 +636,33 @@ Email:sharon.rose@scorevolunteer.org"""
         assert "Sharon Rose" not in result
         assert "SCORE Cleveland" not in result
         assert "--" not in result
+
+
+class TestStripQuotesMany:
+    """Bulk cleaning inline and through the process pool."""
+
+    BODIES = [
+        ("Thanks!\n\nOn Mon, Jan 1, 2024 at 10:00 AM Bob <bob@acme.com> wrote:\n> Hi", None),
+        ("Plain message.", ""),
+        ("", None),
+        ("See below.\n\n-- Forwarded message --\nFrom: a@b.com\n\nOld text", None),
+    ]
+
+    def test_inline_matches_strip_quotes(self):
+        expected = [strip_quotes(body, html or None) for body, html in self.BODIES]
+        assert strip_quotes_many(self.BODIES) == expected
+
+    def test_pool_preserves_order(self):
+        items = self.BODIES * 5
+        expected = [strip_quotes(body, html or None) for body, html in items]
+        with clean_pool(workers=2) as pool:
+            assert pool is not None
+            assert strip_quotes_many(items, pool=pool, chunk_size=3) == expected
+
+    def test_single_worker_runs_inline(self):
+        with clean_pool(workers=1) as pool:
+            assert pool is None
+
+    def test_failure_returns_original_body(self):
+        with patch("poc.email_parser.strip_quotes", side_effect=RuntimeError("boom")):
+            assert strip_quotes_many([("keep me", None)]) == ["keep me"]
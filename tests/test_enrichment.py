@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
@@ -497,6 +498,7 @@ class TestWebsiteScraper:
         robots_resp = MagicMock()
         robots_resp.status_code = 200
         robots_resp.text = "User-agent: *\nAllow: /"
+        robots_resp.headers = {}
 
         # Homepage response
         homepage_resp = MagicMock()
@@ -547,6 +549,7 @@ class TestWebsiteScraper:
         mock_session = MagicMock()
         robots_resp = MagicMock()
         robots_resp.status_code = 404
+        robots_resp.headers = {}
         page_resp = MagicMock()
         page_resp.status_code = 200
         page_resp.content = b'<html><head><meta name="description" content="Hello"></head></html>'
@@ -563,6 +566,102 @@ class TestWebsiteScraper:
         assert any(fv.field_name == "description" for fv in results)
 
 
+# ===========================================================================
+# Website scraper HTTP cache
+# ===========================================================================
+
+class TestWebsiteScraperCache:
+    """Re-enrichment goes through the on-disk HTTP cache."""
+
+    _HOME = b'<html><head><meta name="description" content="Widgets"></head></html>'
+
+    def _provider(self):
+        from poc.website_scraper import WebsiteScraperProvider
+        provider = WebsiteScraperProvider()
+        provider._rate_limiter = MagicMock()
+        return provider
+
+    def _session(self, page_status=200):
+        robots_resp = MagicMock(status_code=404, headers={})
+        page_resp = MagicMock(status_code=page_status, content=self._HOME,
+                              headers={"ETag": '"v1"'})
+        session = MagicMock(headers={})
+        session.get = MagicMock(
+            side_effect=lambda url, **kw: robots_resp if "robots" in url else page_resp,
+        )
+        session.head = MagicMock(return_value=MagicMock(status_code=404))
+        return session
+
+    def _enrich(self, provider, session):
+        with patch("poc.website_scraper.requests.Session", return_value=session):
+            provider._session = None
+            return provider.enrich({"domain": "acme.com"})
+
+    def _age_cache(self, provider, seconds):
+        cache = provider._get_cache()
+        with cache._lock:
+            cache._conn.execute(
+                "UPDATE http_cache SET fetched_at = fetched_at - ?", (seconds,),
+            )
+            cache._conn.commit()
+
+    def test_fresh_cache_makes_no_requests(self, tmp_db):
+        provider = self._provider()
+        first = self._enrich(provider, self._session())
+        assert any(fv.field_value == "Widgets" for fv in first)
+
+        session = self._session()
+        second = self._enrich(provider, session)
+
+        assert second == first
+        session.get.assert_not_called()
+        session.head.assert_not_called()
+
+    def test_cache_hits_use_no_rate_limit_budget(self, tmp_db):
+        provider = self._provider()
+        self._enrich(provider, self._session())
+        assert provider._rate_limiter.acquire.called
+
+        provider._rate_limiter.acquire.reset_mock()
+        self._enrich(provider, self._session())
+        provider._rate_limiter.acquire.assert_not_called()
+
+    def test_stale_page_revalidated_with_304(self, tmp_db):
+        provider = self._provider()
+        first = self._enrich(provider, self._session())
+        self._age_cache(provider, provider.refresh_cadence_days * 86400 + 1)
+
+        session = self._session(page_status=304)
+        with patch("poc.website_scraper.BeautifulSoup") as soup:
+            second = self._enrich(provider, session)
+
+        assert second == first
+        soup.assert_not_called()
+        page_calls = [c for c in session.get.call_args_list if "robots" not in c.args[0]]
+        assert page_calls[0].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+    def test_missing_probe_paths_negatively_cached(self, tmp_db):
+        from poc.website_scraper import _ABOUT_PATHS, _CONTACT_PATHS
+        provider = self._provider()
+        session = self._session()
+        self._enrich(provider, session)
+        assert session.head.call_count == len(_ABOUT_PATHS) + len(_CONTACT_PATHS)
+
+        cache = provider._get_cache()
+        assert cache.get("https://acme.com/about").status == 404
+
+    def test_robots_revalidated_after_ttl(self, tmp_db):
+        from poc.website_scraper import _ROBOTS_TTL_SECONDS
+        provider = self._provider()
+        self._enrich(provider, self._session())
+        self._age_cache(provider, _ROBOTS_TTL_SECONDS + 1)
+
+        session = self._session()
+        self._enrich(provider, session)
+        urls = [c.args[0] for c in session.get.call_args_list]
+        assert urls == ["https://acme.com/robots.txt"]
+
+
 # ===========================================================================
 # Web tests (enrich button)
 # ===========================================================================
@@ -681,16 +780,13 @@ class TestEnrichNewCompanies:
         company = create_company("example.com", domain="example.com",
                                  customer_id="cust-test")
 
-        with patch("poc.enrichment_pipeline.execute_enrichment") as mock_exec:
-            mock_exec.return_value = {
-                "run_id": "r1", "status": "completed",
-                "fields_discovered": 1, "fields_applied": 1, "error": None,
-            }
+        provider = MockProvider(field_values=[FieldValue("industry", "Widgets", 0.9)])
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[provider]):
             stats = enrich_new_companies()
 
         assert stats["found"] >= 1
         assert stats["enriched"] >= 1
-        mock_exec.assert_called()
+        assert get_company(company["id"])["industry"] == "Widgets"
 
     def test_skips_completed(self, tmp_db):
         """Companies with a completed enrichment run are skipped."""
@@ -705,12 +801,13 @@ class TestEnrichNewCompanies:
         _update_run_status(run["id"], "running")
         _update_run_status(run["id"], "completed")
 
-        with patch("poc.enrichment_pipeline.execute_enrichment") as mock_exec:
+        provider = MagicMock(entity_types=["company"])
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[provider]):
             stats = enrich_new_companies()
 
-        # Should not call execute_enrichment for this company
+        # Should not enrich this company
         assert stats["found"] == 0
-        mock_exec.assert_not_called()
+        provider.enrich.assert_not_called()
 
     def test_retries_failed(self, tmp_db):
         """Companies with only failed enrichment runs get retried."""
@@ -725,12 +822,156 @@ class TestEnrichNewCompanies:
         _update_run_status(run["id"], "running")
         _update_run_status(run["id"], "failed", "timeout")
 
-        with patch("poc.enrichment_pipeline.execute_enrichment") as mock_exec:
-            mock_exec.return_value = {
-                "run_id": "r2", "status": "completed",
-                "fields_discovered": 1, "fields_applied": 1, "error": None,
-            }
+        provider = MockProvider()
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[provider]):
             stats = enrich_new_companies()
 
         assert stats["found"] >= 1
-        mock_exec.assert_called()
+        assert stats["enriched"] == 1
+
+    def test_provider_failure_counted(self, tmp_db):
+        from poc.enrichment_pipeline import enrich_new_companies
+
+        company = create_company("example.com", domain="example.com",
+                                 customer_id="cust-test")
+
+        with patch("poc.enrichment_pipeline.list_providers",
+                   return_value=[MockProvider(should_fail=True)]):
+            stats = enrich_new_companies()
+
+        assert stats == {"found": 1, "enriched": 0, "failed": 1}
+        runs = get_enrichment_runs("company", company["id"])
+        assert [r["status"] for r in runs] == ["failed"]
+        assert runs[0]["error_message"] == "Provider error"
+
+    def test_runs_companies_concurrently(self, tmp_db):
+        import threading
+        import time
+
+        from poc.enrichment_pipeline import enrich_new_companies
+
+        for i in range(6):
+            create_company(f"co{i}.com", domain=f"co{i}.com", customer_id="cust-test")
+
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        class SlowProvider(MockProvider):
+            def enrich(self, entity):
+                with lock:
+                    active["now"] += 1
+                    active["max"] = max(active["max"], active["now"])
+                time.sleep(0.05)
+                with lock:
+                    active["now"] -= 1
+                return []
+
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[SlowProvider()]):
+            stats = enrich_new_companies(workers=3)
+
+        assert stats == {"found": 6, "enriched": 6, "failed": 0}
+        assert active["max"] > 1
+
+    def test_one_company_per_host_in_flight(self, tmp_db):
+        import threading
+        import time
+
+        from poc.enrichment_pipeline import enrich_new_companies
+
+        create_company("Acme", domain="acme.com", customer_id="cust-test")
+        eu = create_company("Acme EU", domain="acme.eu", customer_id="cust-test")
+        update_company(eu["id"], website="https://www.acme.com")
+
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        class SlowProvider(MockProvider):
+            def enrich(self, entity):
+                with lock:
+                    active["now"] += 1
+                    active["max"] = max(active["max"], active["now"])
+                time.sleep(0.05)
+                with lock:
+                    active["now"] -= 1
+                return []
+
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[SlowProvider()]):
+            stats = enrich_new_companies(workers=4)
+
+        assert stats["enriched"] == 2
+        assert active["max"] == 1
+
+    def test_resumes_after_interrupted_batch(self, tmp_db):
+        """Stale running runs are failed and their companies enriched again."""
+        from poc.enrichment_pipeline import _update_run_status, enrich_new_companies
+
+        company = create_company("example.com", domain="example.com",
+                                 customer_id="cust-test")
+        run = create_enrichment_run("company", company["id"], "mock_provider")
+        _update_run_status(run["id"], "running")
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE enrichment_runs SET created_at = '2000-01-01T00:00:00+00:00' "
+                "WHERE id = ?", (run["id"],),
+            )
+
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[MockProvider()]):
+            stats = enrich_new_companies()
+
+        assert stats["enriched"] == 1
+        assert get_enrichment_run(run["id"])["status"] == "failed"
+        assert get_enrichment_run(run["id"])["error_message"] == "Interrupted"
+
+    def test_skips_company_in_progress_elsewhere(self, tmp_db):
+        """A fresh running run (another batch) keeps the company out."""
+        from poc.enrichment_pipeline import _update_run_status, enrich_new_companies
+
+        company = create_company("example.com", domain="example.com",
+                                 customer_id="cust-test")
+        run = create_enrichment_run("company", company["id"], "mock_provider")
+        _update_run_status(run["id"], "running")
+
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[MockProvider()]):
+            stats = enrich_new_companies()
+
+        assert stats["found"] == 0
+        assert get_enrichment_run(run["id"])["status"] == "running"
+
+    def test_failed_finish_fails_remaining_runs(self, tmp_db):
+        """A store error fails that company's runs and the batch carries on."""
+        from poc import enrichment_pipeline
+        from poc.enrichment_pipeline import enrich_new_companies
+
+        broken = create_company("broken.com", domain="broken.com", customer_id="cust-test")
+        create_company("fine.com", domain="fine.com", customer_id="cust-test")
+        real_finish = enrichment_pipeline._finish_run
+
+        def finish(run_id, entity_type, entity_id, *args):
+            if entity_id == broken["id"]:
+                raise sqlite3.OperationalError("disk I/O error")
+            return real_finish(run_id, entity_type, entity_id, *args)
+
+        with patch("poc.enrichment_pipeline.list_providers",
+                   return_value=[MockProvider(), MockProvider()]), \
+             patch("poc.enrichment_pipeline._finish_run", side_effect=finish):
+            stats = enrich_new_companies()
+
+        assert stats == {"found": 2, "enriched": 1, "failed": 1}
+        runs = get_enrichment_runs("company", broken["id"])
+        assert [r["status"] for r in runs] == ["failed", "failed"]
+        assert {r["error_message"] for r in runs} == {"disk I/O error"}
+
+    def test_many_companies_on_one_host(self, tmp_db):
+        """Same-host companies queue behind each other without starving others."""
+        from poc.enrichment_pipeline import enrich_new_companies
+
+        for i in range(30):
+            company = create_company(f"Shared {i}", domain=f"shared{i}.example",
+                                     customer_id="cust-test")
+            update_company(company["id"], website="https://host.example")
+        create_company("Solo", domain="solo.com", customer_id="cust-test")
+
+        with patch("poc.enrichment_pipeline.list_providers", return_value=[MockProvider()]):
+            stats = enrich_new_companies(workers=4)
+
+        assert stats == {"found": 31, "enriched": 31, "failed": 0}
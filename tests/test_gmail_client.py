@@ -0,0 +1,341 @@
+"""Tests for batched Gmail thread/message retrieval in gmail_client."""
+
+from __future__ import annotations
+
+import base64
+from unittest.mock import patch
+
+import pytest
+
+from poc import gmail_client
+from poc.gmail_client import (
+    _execute_batched,
+    fetch_history,
+    fetch_history_changes,
+    fetch_message_labels,
+    fetch_messages,
+    fetch_threads,
+)
+
+
+# ---------------------------------------------------------------------------
+# Fake Gmail service supporting HTTP batch requests
+# ---------------------------------------------------------------------------
+
+def _message(mid: str, thread_id: str, date: str, sender: str = "alice@example.com") -> dict:
+    body = base64.urlsafe_b64encode(f"Body of {mid}".encode()).decode()
+    return {
+        "id": mid,
+        "threadId": thread_id,
+        "snippet": f"snippet {mid}",
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "From", "value": f"Alice <{sender}>"},
+                {"name": "To", "value": "me@example.com"},
+                {"name": "Subject", "value": f"Subject {thread_id}"},
+                {"name": "Date", "value": date},
+            ],
+            "body": {"data": body},
+        },
+    }
+
+
+class _FakeRequest:
+    def __init__(self, kind: str, resource_id: str):
+        self.kind = kind
+        self.resource_id = resource_id
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._items: list[tuple[str, _FakeRequest]] = []
+
+    def add(self, request, request_id=None):
+        self._items.append((request_id, request))
+
+    def execute(self):
+        self._service.batch_sizes.append(len(self._items))
+        for request_id, request in self._items:
+            store = self._service.threads if request.kind == "thread" else self._service.messages
+            if request.resource_id in store:
+                self._callback(request_id, store[request.resource_id], None)
+            else:
+                self._callback(request_id, None, RuntimeError("404 not found"))
+
+
+class _FakeGmailService:
+    def __init__(
+        self,
+        threads: dict | None = None,
+        messages: dict | None = None,
+        listed_ids: list[str] | None = None,
+        history_pages: list[dict] | None = None,
+    ):
+        self.threads = threads or {}
+        self.messages = messages or {}
+        self.listed_ids = listed_ids
+        self.history_pages = history_pages or [{}]
+        self.history_calls: list[dict] = []
+        self.batch_sizes: list[int] = []
+
+    def threads_api(self):
+        svc = self
+
+        class _Threads:
+            def list(self, **kwargs):
+                ids = svc.listed_ids if svc.listed_ids is not None else list(svc.threads)
+
+                class _Exec:
+                    def execute(_self):
+                        return {"threads": [{"id": tid} for tid in ids]}
+                return _Exec()
+
+            def get(self, userId, id, format):
+                return _FakeRequest("thread", id)
+
+        return _Threads()
+
+    def messages_api(self):
+        class _Messages:
+            def get(self, userId, id, format):
+                return _FakeRequest("message", id)
+
+        return _Messages()
+
+    def history_api(self):
+        svc = self
+
+        class _History:
+            def list(self, **kwargs):
+                svc.history_calls.append(kwargs)
+                page = svc.history_pages[len(svc.history_calls) - 1]
+
+                class _Exec:
+                    def execute(_self):
+                        return page
+                return _Exec()
+
+        return _History()
+
+    def new_batch_http_request(self, callback=None):
+        return _FakeBatch(self, callback)
+
+
+class _ServiceProxy:
+    """Expose ``users().threads()`` / ``users().messages()`` over the fake."""
+
+    def __init__(self, fake: _FakeGmailService):
+        self.fake = fake
+
+    def users(self):
+        fake = self.fake
+
+        class _Users:
+            def threads(self):
+                return fake.threads_api()
+
+            def messages(self):
+                return fake.messages_api()
+
+            def history(self):
+                return fake.history_api()
+
+        return _Users()
+
+    def new_batch_http_request(self, callback=None):
+        return self.fake.new_batch_http_request(callback=callback)
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.calls = 0
+
+    def acquire(self):
+        self.calls += 1
+
+
+# ---------------------------------------------------------------------------
+# _execute_batched
+# ---------------------------------------------------------------------------
+
+class TestExecuteBatched:
+
+    def test_splits_into_batches(self):
+        fake = _FakeGmailService(messages={f"m{i}": {"id": f"m{i}"} for i in range(7)})
+        proxy = _ServiceProxy(fake)
+        reqs = [(f"m{i}", _FakeRequest("message", f"m{i}")) for i in range(7)]
+
+        results = _execute_batched(proxy, reqs, batch_size=3)
+
+        assert fake.batch_sizes == [3, 3, 1]
+        assert set(results) == {f"m{i}" for i in range(7)}
+
+    def test_failed_subrequests_omitted(self):
+        fake = _FakeGmailService(messages={"m1": {"id": "m1"}})
+        proxy = _ServiceProxy(fake)
+        reqs = [("m1", _FakeRequest("message", "m1")),
+                ("missing", _FakeRequest("message", "missing"))]
+
+        results = _execute_batched(proxy, reqs)
+
+        assert list(results) == ["m1"]
+
+    def test_duplicate_keys_fetched_once(self):
+        fake = _FakeGmailService(messages={"m1": {"id": "m1"}})
+        proxy = _ServiceProxy(fake)
+        reqs = [("m1", _FakeRequest("message", "m1"))] * 3
+
+        _execute_batched(proxy, reqs)
+
+        assert fake.batch_sizes == [1]
+
+    def test_rate_limiter_charged_per_subrequest(self):
+        fake = _FakeGmailService(messages={f"m{i}": {"id": f"m{i}"} for i in range(5)})
+        proxy = _ServiceProxy(fake)
+        limiter = _CountingLimiter()
+        reqs = [(f"m{i}", _FakeRequest("message", f"m{i}")) for i in range(5)]
+
+        _execute_batched(proxy, reqs, rate_limiter=limiter, batch_size=2)
+
+        assert limiter.calls == 5
+
+    def test_whole_batch_failure_is_logged_not_raised(self):
+        class _BrokenBatch:
+            def add(self, request, request_id=None):
+                pass
+
+            def execute(self):
+                raise RuntimeError("connection reset")
+
+        class _Svc:
+            def new_batch_http_request(self, callback=None):
+                return _BrokenBatch()
+
+        results = _execute_batched(_Svc(), [("m1", object())])
+        assert results == {}
+
+
+# ---------------------------------------------------------------------------
+# fetch_threads / fetch_messages
+# ---------------------------------------------------------------------------
+
+class TestFetchThreadsBatched:
+
+    def test_fetches_and_parses_threads_in_order(self):
+        fake = _FakeGmailService(threads={
+            "t1": {"id": "t1", "messages": [
+                _message("m2", "t1", "Tue, 02 Jan 2024 10:00:00 +0000"),
+                _message("m1", "t1", "Mon, 01 Jan 2024 10:00:00 +0000"),
+            ]},
+            "t2": {"id": "t2", "messages": [
+                _message("m3", "t2", "Wed, 03 Jan 2024 10:00:00 +0000"),
+            ]},
+        })
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            threads, token = fetch_threads(object(), query="x", max_threads=10)
+
+        assert token is None
+        assert [[e.message_id for e in t] for t in threads] == [["m1", "m2"], ["m3"]]
+        assert threads[0][0].body_plain == "Body of m1"
+        # Both threads retrieved in a single batch round trip
+        assert fake.batch_sizes == [2]
+
+    def test_failed_thread_skipped(self):
+        fake = _FakeGmailService(
+            threads={
+                "t1": {"id": "t1", "messages": [
+                    _message("m1", "t1", "Mon, 01 Jan 2024 10:00:00 +0000"),
+                ]},
+            },
+            listed_ids=["t1", "gone"],
+        )
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            threads, _ = fetch_threads(object(), query="x", max_threads=10)
+
+        assert len(threads) == 1
+        assert threads[0][0].message_id == "m1"
+
+
+class TestFetchMessagesBatched:
+
+    def test_preserves_input_order_and_skips_failures(self):
+        fake = _FakeGmailService(messages={
+            "m1": _message("m1", "t1", "Mon, 01 Jan 2024 10:00:00 +0000"),
+            "m2": _message("m2", "t1", "Tue, 02 Jan 2024 10:00:00 +0000"),
+        })
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            emails = fetch_messages(object(), ["m2", "missing", "m1"])
+
+        assert [e.message_id for e in emails] == ["m2", "m1"]
+
+    @pytest.mark.parametrize("count,batch,expected", [(5, 2, [2, 2, 1]), (3, 50, [3])])
+    def test_uses_configured_batch_size(self, monkeypatch, count, batch, expected):
+        monkeypatch.setattr("poc.config.GMAIL_BATCH_SIZE", batch)
+        fake = _FakeGmailService(messages={
+            f"m{i}": _message(f"m{i}", "t1", "Mon, 01 Jan 2024 10:00:00 +0000")
+            for i in range(count)
+        })
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            fetch_messages(object(), [f"m{i}" for i in range(count)])
+
+        assert fake.batch_sizes == expected
+
+
+# ---------------------------------------------------------------------------
+# fetch_history_changes / fetch_message_labels
+# ---------------------------------------------------------------------------
+
+def _changed(mid: str, labels: list[str] | None = None) -> dict:
+    msg = {"id": mid, "threadId": f"t-{mid}"}
+    if labels is not None:
+        msg["labelIds"] = labels
+    return {"message": msg}
+
+
+class TestFetchHistoryChanges:
+
+    def test_folds_records_into_net_changes(self):
+        fake = _FakeGmailService(history_pages=[
+            {"history": [
+                {"messagesAdded": [_changed("m1", ["INBOX", "UNREAD"])]},
+                {"messagesAdded": [_changed("m2", ["DRAFT"])]},
+                {"messagesAdded": [_changed("m1", ["INBOX", "UNREAD"])]},
+            ], "nextPageToken": "p2"},
+            {"history": [
+                {"messagesDeleted": [_changed("m2")]},
+                {"labelsRemoved": [dict(_changed("m1", ["INBOX"]), labelIds=["UNREAD"])]},
+                {"labelsAdded": [dict(_changed("m9", ["INBOX", "STARRED"]), labelIds=["STARRED"])]},
+            ]},
+        ])
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            changes = fetch_history_changes(object(), "h-1")
+
+        assert changes.added == ["m1"]
+        assert changes.deleted == ["m2"]
+        assert changes.labels == {"m1": ["INBOX"], "m9": ["INBOX", "STARRED"]}
+        assert fake.history_calls[1]["pageToken"] == "p2"
+        assert "labelAdded" in fake.history_calls[0]["historyTypes"]
+
+    def test_fetch_history_skips_label_records(self):
+        fake = _FakeGmailService(history_pages=[
+            {"history": [{"messagesAdded": [_changed("m1")]},
+                         {"messagesDeleted": [_changed("m0")]}]},
+        ])
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            added, deleted = fetch_history(object(), "h-1")
+
+        assert (added, deleted) == (["m1"], ["m0"])
+        assert fake.history_calls[0]["historyTypes"] == ["messageAdded", "messageDeleted"]
+
+    def test_message_labels_from_minimal_fetch(self):
+        fake = _FakeGmailService(messages={
+            "m1": {"id": "m1", "labelIds": ["SPAM"]},
+            "m2": {"id": "m2"},
+        })
+        with patch.object(gmail_client, "get_service", return_value=_ServiceProxy(fake)):
+            labels = fetch_message_labels(object(), ["m1", "m2", "gone"])
+
+        assert labels == {"m1": ["SPAM"], "m2": []}
@@ -0,0 +1,179 @@
+"""Tests for the cached Google API services and OAuth credentials."""
+
+from __future__ import annotations
+
+import gc
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from poc import auth, config, google_clients
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _write_token(path, expires_in: float = 3600.0) -> None:
+    creds = Credentials(
+        token="access-token",
+        refresh_token="refresh-token",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="client-id",
+        client_secret="client-secret",
+        scopes=config.GOOGLE_SCOPES,
+        expiry=_utcnow() + timedelta(seconds=expires_in),
+    )
+    path.write_text(creds.to_json())
+
+
+def _fake_refresh(creds, request):
+    creds.token = "refreshed-token"
+    creds.expiry = _utcnow() + timedelta(hours=1)
+
+
+@pytest.fixture(autouse=True)
+def _clean_caches():
+    auth.clear_credential_cache()
+    google_clients.clear()
+    yield
+    auth.clear_credential_cache()
+    google_clients.clear()
+
+
+# ---------------------------------------------------------------------------
+# Service registry
+# ---------------------------------------------------------------------------
+
+class TestGetService:
+    def test_builds_once_per_credentials_and_api(self):
+        creds = Credentials(token="t")
+        with patch.object(google_clients, "build", side_effect=lambda *a, **k: object()) as build:
+            gmail = google_clients.get_service("gmail", "v1", creds)
+            assert google_clients.get_service("gmail", "v1", creds) is gmail
+            people = google_clients.get_service("people", "v1", creds)
+        assert people is not gmail
+        assert build.call_count == 2
+        assert build.call_args.kwargs["static_discovery"] is True
+
+    def test_accounts_share_the_thread_http_pool(self):
+        a, b = Credentials(token="a"), Credentials(token="b")
+        with patch.object(google_clients, "build", side_effect=lambda *a, **k: k["http"]):
+            http_a = google_clients.get_service("gmail", "v1", a)
+            http_b = google_clients.get_service("gmail", "v1", b)
+        assert http_a is not http_b
+        assert http_a.credentials.token == "a" and http_b.credentials.token == "b"
+        assert http_a.http is http_b.http
+
+    def test_dropped_credentials_release_their_services(self):
+        creds = Credentials(token="t")
+        with patch.object(google_clients, "build", side_effect=lambda *a, **k: k["http"]):
+            google_clients.get_service("gmail", "v1", creds)
+        registry = google_clients._registry()
+        assert len(registry) == 1
+        del creds
+        gc.collect()
+        assert len(registry) == 0
+
+    def test_reauthorized_account_releases_old_services(self, tmp_path):
+        token = tmp_path / "token_a.json"
+        _write_token(token)
+        with patch.object(google_clients, "build", side_effect=lambda *a, **k: k["http"]):
+            google_clients.get_service("gmail", "v1", auth.get_credentials_for_account(token))
+            _write_token(token)
+            st = token.stat()
+            os.utime(token, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            google_clients.get_service("gmail", "v1", auth.get_credentials_for_account(token))
+        gc.collect()
+        assert len(google_clients._registry()) == 1
+
+    def test_threads_get_their_own_services(self):
+        creds = Credentials(token="t")
+        seen = []
+        with patch.object(google_clients, "build", side_effect=lambda *a, **k: object()):
+            seen.append(google_clients.get_service("gmail", "v1", creds))
+            worker = threading.Thread(
+                target=lambda: seen.append(google_clients.get_service("gmail", "v1", creds)),
+            )
+            worker.start()
+            worker.join()
+        assert seen[0] is not seen[1]
+
+    def test_static_discovery_builds_without_network(self):
+        service = google_clients.get_service("calendar", "v3", Credentials(token="t"))
+        assert hasattr(service, "events")
+
+
+# ---------------------------------------------------------------------------
+# Credential cache
+# ---------------------------------------------------------------------------
+
+class TestCredentialCache:
+    def test_token_file_read_once(self, tmp_path):
+        token = tmp_path / "token_a.json"
+        _write_token(token)
+        with patch.object(
+            Credentials, "from_authorized_user_file",
+            wraps=Credentials.from_authorized_user_file,
+        ) as load:
+            first = auth.get_credentials_for_account(token)
+            second = auth.get_credentials_for_account(token)
+        assert first is second
+        assert load.call_count == 1
+
+    def test_reloads_when_token_file_changes(self, tmp_path):
+        token = tmp_path / "token_a.json"
+        _write_token(token)
+        first = auth.get_credentials_for_account(token)
+        _write_token(token)
+        st = token.stat()
+        os.utime(token, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert auth.get_credentials_for_account(token) is not first
+
+    def test_refreshes_inside_margin_without_rewriting_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "GOOGLE_TOKEN_REFRESH_MARGIN", 300)
+        token = tmp_path / "token_a.json"
+        _write_token(token, expires_in=60)
+        before = token.read_text()
+        with patch.object(Credentials, "refresh", autospec=True, side_effect=_fake_refresh) as refresh:
+            creds = auth.get_credentials_for_account(token)
+            assert auth.get_credentials_for_account(token) is creds
+        assert refresh.call_count == 1
+        assert creds.token == "refreshed-token"
+        assert token.read_text() == before
+
+    def test_failed_refresh_keeps_still_valid_token(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "GOOGLE_TOKEN_REFRESH_MARGIN", 600)
+        token = tmp_path / "token_a.json"
+        _write_token(token, expires_in=450)
+        with patch.object(Credentials, "refresh", side_effect=RuntimeError("offline")):
+            creds = auth.get_credentials_for_account(token)
+        assert creds.token == "access-token"
+
+
+class TestBackgroundRefresh:
+    def test_refreshes_only_expiring_credentials(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "GOOGLE_TOKEN_REFRESH_MARGIN", 300)
+        fresh, stale = tmp_path / "token_fresh.json", tmp_path / "token_stale.json"
+        _write_token(fresh)
+        _write_token(stale)
+        fresh_creds = auth.get_credentials_for_account(fresh)
+        stale_creds = auth.get_credentials_for_account(stale)
+        stale_creds.expiry = _utcnow() + timedelta(seconds=30)
+
+        with patch.object(Credentials, "refresh", autospec=True, side_effect=_fake_refresh):
+            assert auth.refresh_cached_credentials() == 1
+        assert stale_creds.token == "refreshed-token"
+        assert fresh_creds.token == "access-token"
+
+    def test_refresher_starts_once_and_stops(self):
+        auth.start_credential_refresher()
+        thread = auth._refresher
+        auth.start_credential_refresher()
+        assert auth._refresher is thread and thread.is_alive()
+        auth.stop_credential_refresher()
+        assert not thread.is_alive()
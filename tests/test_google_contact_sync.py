@@ -6,6 +6,7 @@ Covers:
 - Full extraction of new fields from mock API responses
 - Sync of phones, addresses, titles, biographies, labels into DB
 - Migration v13→v14 (contact_tags table)
+- Incremental sync via People API sync tokens and batched apply
 """
 
 from __future__ import annotations
@@ -19,19 +20,20 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from poc.contacts_client import (
+    SyncTokenExpiredError,
     _extract_addresses,
     _extract_labels,
     _extract_phones,
     _map_google_address_type,
     _map_google_phone_type,
+    fetch_contact_changes,
     fetch_contact_groups,
     fetch_contacts,
 )
 from poc.database import get_connection, init_db
 from poc.models import KnownContact, _now_iso
 from poc.sync import (
-    _add_address_if_new,
-    _store_contact_labels,
+    _apply_contact_sync,
     sync_contacts,
 )
 
@@ -244,7 +246,7 @@ class TestFetchContactGroups:
             ],
         }
 
-        with patch("poc.contacts_client.build", return_value=mock_service):
+        with patch("poc.contacts_client.get_service", return_value=mock_service):
             groups = fetch_contact_groups(MagicMock())
 
         assert groups == {
@@ -257,7 +259,7 @@ class TestFetchContactGroups:
         mock_service.contactGroups.return_value.list.return_value.execute.return_value = {
             "contactGroups": [],
         }
-        with patch("poc.contacts_client.build", return_value=mock_service):
+        with patch("poc.contacts_client.get_service", return_value=mock_service):
             groups = fetch_contact_groups(MagicMock())
         assert groups == {}
 
@@ -307,7 +309,7 @@ class TestFetchContactsEnhanced:
 
         group_map = {"contactGroups/abc": "VIP Clients"}
 
-        with patch("poc.contacts_client.build", return_value=mock_service):
+        with patch("poc.contacts_client.get_service", return_value=mock_service):
             contacts = fetch_contacts(MagicMock(), group_map=group_map)
 
         assert len(contacts) == 1
@@ -337,7 +339,7 @@ class TestFetchContactsEnhanced:
             ],
         }
 
-        with patch("poc.contacts_client.build", return_value=mock_service):
+        with patch("poc.contacts_client.get_service", return_value=mock_service):
             contacts = fetch_contacts(MagicMock())
 
         assert len(contacts) == 1
@@ -677,52 +679,63 @@ class TestSyncContactsLabels:
 
 
 # ===========================================================================
-# TestAddAddressIfNew
+# TestApplyContactSyncAddresses
 # ===========================================================================
 
-class TestAddAddressIfNew:
-    """Direct tests for the _add_address_if_new helper."""
+_OAK_LANE = {
+    "type": "home",
+    "street": "50 Oak Lane",
+    "city": "Austin",
+    "state": "TX",
+    "postal_code": "78701",
+    "country": "US",
+}
+
+
+def _apply(*contacts: KnownContact) -> int:
+    with get_connection() as conn:
+        return _apply_contact_sync(conn, list(contacts), customer_id=CUST_ID)
+
+
+class TestApplyContactSyncAddresses:
+    """Address dedup in _apply_contact_sync."""
 
     def test_new_address_added(self, tmp_db):
         cid = _create_contact("Test", "test@example.com")
-        result = _add_address_if_new(cid, {
-            "type": "home",
-            "street": "50 Oak Lane",
-            "city": "Austin",
-            "state": "TX",
-            "postal_code": "78701",
-            "country": "US",
-        })
-        assert result is not None
-        assert result["street"] == "50 Oak Lane"
+        _apply(KnownContact(email="test@example.com", name="Test",
+                            addresses=[_OAK_LANE]))
+
+        with get_connection() as conn:
+            rows = conn.execute(
+                "SELECT street, address_type FROM addresses WHERE entity_id = ?", (cid,)
+            ).fetchall()
+        assert [tuple(r) for r in rows] == [("50 Oak Lane", "home")]
 
     def test_duplicate_address_skipped(self, tmp_db):
         cid = _create_contact("Test2", "test2@example.com")
-        addr = {
-            "type": "home",
-            "street": "50 Oak Lane",
-            "city": "Austin",
-            "state": "TX",
-            "postal_code": "78701",
-            "country": "US",
-        }
-        first = _add_address_if_new(cid, addr)
-        second = _add_address_if_new(cid, addr)
-        assert first is not None
-        assert second is None
+        kc = KnownContact(email="test2@example.com", name="Test2",
+                          addresses=[_OAK_LANE, dict(_OAK_LANE, type="work")])
+        _apply(kc)
+        _apply(kc)
+
+        with get_connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM addresses WHERE entity_id = ?", (cid,)
+            ).fetchone()[0]
+        assert count == 1
 
 
 # ===========================================================================
-# TestStoreContactLabels
+# TestApplyContactSyncLabels
 # ===========================================================================
 
-class TestStoreContactLabels:
-    """Direct tests for the _store_contact_labels helper."""
+class TestApplyContactSyncLabels:
+    """Label → tag handling in _apply_contact_sync."""
 
     def test_creates_tags_and_links(self, tmp_db):
         cid = _create_contact("Label Test", "lt@example.com")
-        count = _store_contact_labels(cid, ["Alpha", "Beta"], customer_id=CUST_ID)
-        assert count == 2
+        _apply(KnownContact(email="lt@example.com", name="Label Test",
+                            labels=["Alpha", "Beta"]))
 
         with get_connection() as conn:
             ct = conn.execute(
@@ -731,17 +744,23 @@ class TestStoreContactLabels:
         assert len(ct) == 2
 
     def test_empty_labels_ignored(self, tmp_db):
-        cid = _create_contact("Empty", "empty@example.com")
-        count = _store_contact_labels(cid, ["", "  "], customer_id=CUST_ID)
-        assert count == 0
+        _create_contact("Empty", "empty@example.com")
+        _apply(KnownContact(email="empty@example.com", name="Empty",
+                            labels=["", "  "]))
+
+        with get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM tags").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM contact_tags").fetchone()[0] == 0
 
     def test_source_set_to_google(self, tmp_db):
-        cid = _create_contact("Source", "source@example.com")
-        _store_contact_labels(cid, ["MyGroup"], customer_id=CUST_ID)
+        _create_contact("Source", "source@example.com")
+        _apply(KnownContact(email="source@example.com", name="Source",
+                            labels=["MyGroup"]))
 
         with get_connection() as conn:
-            tag = conn.execute("SELECT source FROM tags").fetchone()
+            tag = conn.execute("SELECT name, source FROM tags").fetchone()
             ct = conn.execute("SELECT source FROM contact_tags").fetchone()
+        assert tag["name"] == "mygroup"
         assert tag["source"] == "google_contacts"
         assert ct["source"] == "google_contacts"
 
@@ -904,3 +923,143 @@ class TestSyncContactsIntegration:
             tag_names = [t["name"] for t in tags]
             assert "remote" in tag_names
             assert "team lead" in tag_names
+
+
+# ===========================================================================
+# TestFetchContactChanges
+# ===========================================================================
+
+class TestFetchContactChanges:
+    """Sync-token aware fetching from the People API."""
+
+    def _service(self, *responses):
+        mock_service = MagicMock()
+        list_call = mock_service.people.return_value.connections.return_value.list
+        list_call.return_value.execute.side_effect = list(responses)
+        return mock_service, list_call
+
+    def test_returns_next_sync_token(self):
+        service, _ = self._service({
+            "connections": [{
+                "resourceName": "people/1",
+                "names": [{"displayName": "Ann"}],
+                "emailAddresses": [{"value": "Ann@Example.com"}],
+            }],
+            "nextSyncToken": "tok-1",
+        })
+        with patch("poc.contacts_client.get_service", return_value=service):
+            contacts, token = fetch_contact_changes(MagicMock())
+
+        assert [kc.email for kc in contacts] == ["ann@example.com"]
+        assert token == "tok-1"
+
+    def test_sync_token_sent_on_every_page(self):
+        service, list_call = self._service(
+            {"connections": [], "nextPageToken": "p2"},
+            {"connections": [], "nextSyncToken": "tok-2"},
+        )
+        with patch("poc.contacts_client.get_service", return_value=service):
+            _, token = fetch_contact_changes(MagicMock(), sync_token="tok-1")
+
+        assert token == "tok-2"
+        assert [c.kwargs["syncToken"] for c in list_call.call_args_list] == ["tok-1", "tok-1"]
+        assert list_call.call_args_list[1].kwargs["pageToken"] == "p2"
+
+    def test_deleted_people_skipped(self):
+        service, _ = self._service({
+            "connections": [{
+                "resourceName": "people/2",
+                "metadata": {"deleted": True},
+                "emailAddresses": [{"value": "gone@example.com"}],
+            }],
+        })
+        with patch("poc.contacts_client.get_service", return_value=service):
+            contacts, _ = fetch_contact_changes(MagicMock(), sync_token="tok")
+
+        assert contacts == []
+
+    def test_expired_token_raises(self):
+        from googleapiclient.errors import HttpError
+
+        resp = MagicMock(status=400)
+        err = HttpError(resp, b'{"error": {"details": [{"reason": "EXPIRED_SYNC_TOKEN"}]}}')
+        service, _ = self._service(err)
+        with patch("poc.contacts_client.get_service", return_value=service):
+            with pytest.raises(SyncTokenExpiredError):
+                fetch_contact_changes(MagicMock(), sync_token="old")
+
+
+# ===========================================================================
+# TestSyncContactsIncremental
+# ===========================================================================
+
+class TestSyncContactsIncremental:
+    """Sync token persistence and the batched apply."""
+
+    def _sync(self, **fetch_kwargs):
+        with patch("poc.sync.fetch_contact_groups", return_value={}), \
+             patch("poc.sync.fetch_contact_changes", **fetch_kwargs) as fetch:
+            count = sync_contacts(
+                MagicMock(), customer_id=CUST_ID, user_id=USER_ID,
+                account_id="acct-1",
+            )
+        return count, fetch
+
+    def test_token_stored_and_reused(self, tmp_db):
+        from poc.settings import get_setting
+
+        kc = KnownContact(email="ann@example.com", name="Ann")
+        self._sync(return_value=([kc], "tok-1"))
+        assert get_setting(CUST_ID, "contacts_sync_token_acct-1", user_id=USER_ID) == "tok-1"
+
+        _, fetch = self._sync(return_value=([], "tok-2"))
+        assert fetch.call_args.kwargs["sync_token"] == "tok-1"
+        assert get_setting(CUST_ID, "contacts_sync_token_acct-1", user_id=USER_ID) == "tok-2"
+
+    def test_expired_token_falls_back_to_full(self, tmp_db):
+        from poc.settings import set_setting
+
+        set_setting(CUST_ID, "contacts_sync_token_acct-1", "stale",
+                    scope="user", user_id=USER_ID)
+        kc = KnownContact(email="ann@example.com", name="Ann")
+        count, fetch = self._sync(
+            side_effect=[SyncTokenExpiredError("expired"), ([kc], "tok-new")],
+        )
+
+        assert count == 1
+        assert fetch.call_args_list[0].kwargs["sync_token"] == "stale"
+        assert "sync_token" not in fetch.call_args_list[1].kwargs
+
+    def test_repeated_email_in_batch_creates_one_contact(self, tmp_db):
+        contacts = [
+            KnownContact(email="ann@example.com", name="Ann", labels=["VIP"]),
+            KnownContact(email="ann@example.com", name="Ann B", labels=["vip"],
+                         phones=[{"number": "+15550100", "type": "mobile"}] * 2),
+        ]
+        self._sync(return_value=(contacts, None))
+
+        with get_connection() as conn:
+            rows = conn.execute("SELECT name FROM contacts").fetchall()
+            assert [r["name"] for r in rows] == ["Ann B"]
+            assert conn.execute("SELECT COUNT(*) FROM phone_numbers").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM tags").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM contact_tags").fetchone()[0] == 1
+
+    def test_phone_country_from_existing_address(self, tmp_db):
+        cid = _create_contact("Gus", "gus@example.com")
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO addresses (id, entity_type, entity_id, address_type, "
+                "country, is_primary, is_current, created_at, updated_at) "
+                "VALUES ('a1', 'contact', ?, 'home', 'GB', 1, 1, ?, ?)",
+                (cid, _NOW, _NOW),
+            )
+        kc = KnownContact(email="gus@example.com", name="Gus",
+                          phones=[{"number": "020 7946 0018", "type": "work"}])
+        self._sync(return_value=([kc], None))
+
+        with get_connection() as conn:
+            row = conn.execute(
+                "SELECT number FROM phone_numbers WHERE entity_id = ?", (cid,),
+            ).fetchone()
+        assert row["number"] == "+442079460018"
@@ -0,0 +1,105 @@
+"""Tests for the website scraper's on-disk HTTP cache."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from poc.http_cache import HttpCache, default_cache_path
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    c = HttpCache(tmp_path / "cache" / "http_cache.db")
+    yield c
+    c.close()
+
+
+class TestHttpCache:
+    def test_miss_returns_none(self, cache):
+        assert cache.get("https://acme.com/") is None
+
+    def test_put_and_get(self, cache):
+        cache.put("https://acme.com/", 200, etag='"abc"',
+                  last_modified="Wed, 01 Jan 2025 00:00:00 GMT",
+                  kind="home:v1", payload="[]")
+        entry = cache.get("https://acme.com/")
+        assert entry.status == 200
+        assert entry.kind == "home:v1"
+        assert entry.payload == "[]"
+        assert entry.age() < 5
+        assert entry.validators() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+
+    def test_negative_entry_has_no_validators(self, cache):
+        cache.put("https://acme.com/about", 404)
+        entry = cache.get("https://acme.com/about")
+        assert entry.status == 404
+        assert entry.validators() == {}
+
+    def test_put_replaces(self, cache):
+        cache.put("https://acme.com/", 404)
+        cache.put("https://acme.com/", 200, payload="x")
+        assert cache.get("https://acme.com/").status == 200
+
+    def test_touch_refreshes_age(self, cache):
+        cache.put("https://acme.com/", 200)
+        with cache._lock:
+            cache._conn.execute("UPDATE http_cache SET fetched_at = ?", (time.time() - 1000,))
+        assert cache.get("https://acme.com/").age() > 900
+        cache.touch("https://acme.com/")
+        assert cache.get("https://acme.com/").age() < 5
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "http_cache.db"
+        first = HttpCache(path)
+        first.put("https://acme.com/robots.txt", 200, payload="User-agent: *")
+        first.close()
+        second = HttpCache(path)
+        assert second.get("https://acme.com/robots.txt").payload == "User-agent: *"
+        second.close()
+
+    def test_expired_entries_swept_on_open(self, tmp_path):
+        path = tmp_path / "http_cache.db"
+        first = HttpCache(path)
+        first.put("https://old.com/", 200)
+        first.put("https://new.com/", 200)
+        with first._lock:
+            first._conn.execute(
+                "UPDATE http_cache SET fetched_at = ? WHERE url = 'https://old.com/'",
+                (time.time() - 1000,),
+            )
+            first._conn.commit()
+        first.close()
+
+        second = HttpCache(path, ttl=500)
+        assert second.get("https://old.com/") is None
+        assert second.get("https://new.com/") is not None
+        second.close()
+
+    def test_expired_entries_swept_on_write(self, tmp_path, monkeypatch):
+        cache = HttpCache(tmp_path / "http_cache.db", ttl=500)
+        cache.put("https://old.com/", 200)
+        with cache._lock:
+            cache._conn.execute("UPDATE http_cache SET fetched_at = ?", (time.time() - 1000,))
+        cache.put("https://new.com/", 200)
+        assert cache.get("https://old.com/") is not None  # swept at most hourly
+
+        monkeypatch.setattr("poc.http_cache._SWEEP_INTERVAL", 0)
+        cache.put("https://new.com/", 200)
+        assert cache.get("https://old.com/") is None
+        cache.close()
+
+
+class TestDefaultCachePath:
+    def test_next_to_database(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("poc.config.DB_PATH", tmp_path / "crm.db")
+        monkeypatch.setattr("poc.config.HTTP_CACHE_PATH", "")
+        assert default_cache_path() == tmp_path / "http_cache.db"
+
+    def test_explicit_path(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("poc.config.HTTP_CACHE_PATH", str(tmp_path / "c.db"))
+        assert default_cache_path() == tmp_path / "c.db"
@@ -0,0 +1,91 @@
+"""Tests for the v19 -> v20 migration (denormalized contact identifiers)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from poc.database import init_db
+from poc.migrate_to_v20 import migrate
+
+_NOW = "2024-01-01T00:00:00+00:00"
+_LATER = "2024-02-01T00:00:00+00:00"
+
+
+@pytest.fixture()
+def v19_db(tmp_path):
+    """Create a database without the v20 columns/triggers, with sample data."""
+    db_file = tmp_path / "test.db"
+    init_db(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    for col in ("email", "phone", "address"):
+        for op in ("ins", "del", "upd"):
+            conn.execute(f"DROP TRIGGER trg_primary_{col}_{op}")
+    conn.execute("DROP INDEX idx_contacts_primary_email")
+    conn.execute("DROP INDEX idx_contacts_primary_phone")
+    for col in ("primary_email", "primary_phone", "primary_address"):
+        conn.execute(f"ALTER TABLE contacts DROP COLUMN {col}")
+    conn.execute("PRAGMA user_version = 19")
+
+    conn.execute(
+        "INSERT INTO contacts (id, name, created_at, updated_at) "
+        "VALUES ('c1', 'Alice', ?, ?)", (_NOW, _NOW),
+    )
+    conn.executemany(
+        "INSERT INTO contact_identifiers "
+        "(id, contact_id, type, value, is_primary, created_at, updated_at) "
+        "VALUES (?, 'c1', 'email', ?, ?, ?, ?)",
+        [("ci1", "old@example.com", 0, _NOW, _NOW),
+         ("ci2", "main@example.com", 1, _LATER, _LATER)],
+    )
+    conn.execute(
+        "INSERT INTO phone_numbers "
+        "(id, entity_type, entity_id, number, created_at, updated_at) "
+        "VALUES ('p1', 'contact', 'c1', '+15550100', ?, ?)", (_NOW, _NOW),
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def _connect(db_file):
+    conn = sqlite3.connect(str(db_file))
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class TestMigrationV20:
+    def test_backfills_existing_contacts(self, v19_db):
+        migrate(v19_db)
+        conn = _connect(v19_db)
+        row = conn.execute("SELECT * FROM contacts WHERE id = 'c1'").fetchone()
+        assert row["primary_email"] == "main@example.com"
+        assert row["primary_phone"] == "+15550100"
+        assert row["primary_address"] is None
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 20
+        conn.close()
+
+    def test_triggers_installed(self, v19_db):
+        migrate(v19_db)
+        conn = _connect(v19_db)
+        conn.execute("DELETE FROM contact_identifiers WHERE id = 'ci2'")
+        row = conn.execute("SELECT primary_email FROM contacts WHERE id = 'c1'").fetchone()
+        assert row["primary_email"] == "old@example.com"
+        conn.close()
+
+    def test_idempotent(self, v19_db):
+        migrate(v19_db)
+        migrate(v19_db)
+        conn = _connect(v19_db)
+        row = conn.execute("SELECT primary_email FROM contacts WHERE id = 'c1'").fetchone()
+        assert row["primary_email"] == "main@example.com"
+        conn.close()
+
+    def test_init_db_adds_columns_defensively(self, v19_db):
+        init_db(v19_db)
+        conn = _connect(v19_db)
+        row = conn.execute("SELECT primary_email FROM contacts WHERE id = 'c1'").fetchone()
+        assert row["primary_email"] == "main@example.com"
+        conn.close()
@@ -0,0 +1,132 @@
+"""Tests for the v20 -> v21 migration (materialized conversation visibility)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from poc.database import init_db
+from poc.migrate_to_v21 import migrate
+
+_NOW = "2024-01-01T00:00:00+00:00"
+
+_TRIGGERS = [
+    "trg_cv_cc_ins", "trg_cv_cc_del", "trg_cv_cc_upd", "trg_cv_comm_account",
+    "trg_cv_upa_ins", "trg_cv_upa_del", "trg_cv_upa_upd",
+    "trg_cv_share_ins", "trg_cv_share_del",
+]
+
+
+@pytest.fixture()
+def v20_db(tmp_path):
+    """Create a database without conversation_visibility, with sample data."""
+    db_file = tmp_path / "test.db"
+    init_db(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    for name in _TRIGGERS:
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("DROP TABLE conversation_visibility")
+    conn.execute("DROP INDEX idx_user_contacts_contact_vis")
+    conn.execute("DROP INDEX idx_user_companies_company_vis")
+    conn.execute("PRAGMA user_version = 20")
+
+    conn.execute(
+        "INSERT INTO customers (id, name, slug, is_active, created_at, updated_at) "
+        "VALUES ('cust-1', 'Test Org', 'test', 1, ?, ?)", (_NOW, _NOW),
+    )
+    conn.executemany(
+        "INSERT INTO users "
+        "(id, customer_id, email, name, role, is_active, created_at, updated_at) "
+        "VALUES (?, 'cust-1', ?, ?, 'user', 1, ?, ?)",
+        [("u1", "u1@test.com", "U1", _NOW, _NOW),
+         ("u2", "u2@test.com", "U2", _NOW, _NOW),
+         ("u3", "u3@test.com", "U3", _NOW, _NOW)],
+    )
+    conn.execute(
+        "INSERT INTO provider_accounts "
+        "(id, customer_id, provider, account_type, email_address, created_at, updated_at) "
+        "VALUES ('acct-1', 'cust-1', 'gmail', 'email', 'u1@test.com', ?, ?)",
+        (_NOW, _NOW),
+    )
+    conn.execute(
+        "INSERT INTO user_provider_accounts (id, user_id, account_id, role, created_at) "
+        "VALUES ('upa-1', 'u1', 'acct-1', 'owner', ?)", (_NOW,),
+    )
+    conn.executemany(
+        "INSERT INTO conversations (id, customer_id, title, created_at, updated_at) "
+        "VALUES (?, 'cust-1', ?, ?, ?)",
+        [("conv-1", "One", _NOW, _NOW), ("conv-2", "Two", _NOW, _NOW)],
+    )
+    conn.execute(
+        "INSERT INTO communications "
+        "(id, account_id, channel, timestamp, created_at, updated_at) "
+        "VALUES ('comm-1', 'acct-1', 'email', ?, ?, ?)", (_NOW, _NOW, _NOW),
+    )
+    conn.execute(
+        "INSERT INTO conversation_communications "
+        "(conversation_id, communication_id, created_at) VALUES ('conv-1', 'comm-1', ?)",
+        (_NOW,),
+    )
+    conn.execute(
+        "INSERT INTO conversation_shares (id, conversation_id, user_id, created_at) "
+        "VALUES ('s-1', 'conv-2', 'u2', ?)", (_NOW,),
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def _visibility(db_file) -> set[tuple[str, str]]:
+    conn = sqlite3.connect(str(db_file))
+    try:
+        return {tuple(r) for r in conn.execute(
+            "SELECT user_id, conversation_id FROM conversation_visibility"
+        )}
+    finally:
+        conn.close()
+
+
+class TestMigrationV21:
+    def test_backfills_visibility(self, v20_db):
+        migrate(v20_db)
+        assert _visibility(v20_db) == {("u1", "conv-1"), ("u2", "conv-2")}
+        conn = sqlite3.connect(str(v20_db))
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 21
+        conn.close()
+
+    def test_triggers_installed(self, v20_db):
+        migrate(v20_db)
+        conn = sqlite3.connect(str(v20_db))
+        conn.execute(
+            "INSERT INTO user_provider_accounts (id, user_id, account_id, role, created_at) "
+            "VALUES ('upa-3', 'u3', 'acct-1', 'shared', ?)", (_NOW,),
+        )
+        conn.execute("DELETE FROM conversation_shares WHERE id = 's-1'")
+        conn.commit()
+        conn.close()
+        assert _visibility(v20_db) == {("u1", "conv-1"), ("u3", "conv-1")}
+
+    def test_matches_fresh_schema(self, v20_db, tmp_path):
+        migrate(v20_db)
+        fresh = tmp_path / "fresh.db"
+        init_db(fresh)
+
+        def objects(path):
+            conn = sqlite3.connect(str(path))
+            try:
+                return {tuple(r) for r in conn.execute(
+                    "SELECT type, name FROM sqlite_master "
+                    "WHERE name LIKE 'trg_cv_%' OR name LIKE '%_vis' "
+                    "OR name LIKE '%conversation_visibility%' OR name = 'idx_cv_conversation'"
+                )}
+            finally:
+                conn.close()
+
+        assert objects(v20_db) == objects(fresh)
+
+    def test_idempotent(self, v20_db):
+        migrate(v20_db)
+        migrate(v20_db)
+        assert _visibility(v20_db) == {("u1", "conv-1"), ("u2", "conv-2")}
@@ -0,0 +1,66 @@
+"""Tests for the v21 -> v22 migration (incremental relationship inference)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from poc.database import init_db
+from poc.migrate_to_v22 import migrate
+
+_NOW = "2024-01-01T00:00:00+00:00"
+
+
+@pytest.fixture()
+def v21_db(tmp_path):
+    """Create a database without the v22 tables/triggers, with a conversation."""
+    db_file = tmp_path / "test.db"
+    init_db(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    for op in ("ins", "del", "upd"):
+        conn.execute(f"DROP TRIGGER trg_rel_queue_cp_{op}")
+    conn.execute("DROP TABLE relationship_inference_queue")
+    conn.execute("DROP TABLE relationship_inference_state")
+    conn.execute("PRAGMA user_version = 21")
+
+    conn.execute(
+        "INSERT INTO contacts (id, name, created_at, updated_at) "
+        "VALUES ('c1', 'Alice', ?, ?)", (_NOW, _NOW),
+    )
+    conn.execute(
+        "INSERT INTO conversations (id, title, created_at, updated_at) "
+        "VALUES ('conv-1', 'Hello', ?, ?)", (_NOW, _NOW),
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+class TestMigrationV22:
+    def test_creates_tables_and_version(self, v21_db):
+        migrate(v21_db)
+        conn = sqlite3.connect(str(v21_db))
+        tables = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )}
+        assert {"relationship_inference_queue", "relationship_inference_state"} <= tables
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 22
+        conn.close()
+
+    def test_triggers_queue_participants(self, v21_db):
+        migrate(v21_db)
+        conn = sqlite3.connect(str(v21_db))
+        conn.execute(
+            "INSERT INTO conversation_participants "
+            "(conversation_id, email_address, address, contact_id) "
+            "VALUES ('conv-1', 'a@example.com', 'a@example.com', 'c1')"
+        )
+        queued = [r[0] for r in conn.execute("SELECT contact_id FROM relationship_inference_queue")]
+        assert queued == ["c1"]
+        conn.close()
+
+    def test_idempotent(self, v21_db):
+        migrate(v21_db)
+        migrate(v21_db)
@@ -0,0 +1,60 @@
+"""Tests for the v22 -> v23 migration (canonical map generation counter)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from poc.database import init_db
+from poc.migrate_to_v23 import migrate
+
+_NOW = "2024-01-01T00:00:00+00:00"
+
+
+@pytest.fixture()
+def v22_db(tmp_path):
+    """Create a database without the v23 table/triggers, with one contact."""
+    db_file = tmp_path / "test.db"
+    init_db(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    for name in ("ins", "del", "name"):
+        conn.execute(f"DROP TRIGGER trg_canonical_contact_{name}")
+    conn.execute("DROP TABLE canonical_map_state")
+    conn.execute("PRAGMA user_version = 22")
+    conn.execute(
+        "INSERT INTO contacts (id, name, created_at, updated_at) "
+        "VALUES ('c1', 'Alice', ?, ?)", (_NOW, _NOW),
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def _generation(conn) -> int:
+    return conn.execute("SELECT generation FROM canonical_map_state").fetchone()[0]
+
+
+class TestMigrationV23:
+    def test_creates_table_and_version(self, v22_db):
+        migrate(v22_db)
+        conn = sqlite3.connect(str(v22_db))
+        assert _generation(conn) == 0
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 23
+        conn.close()
+
+    def test_triggers_bump_generation(self, v22_db):
+        migrate(v22_db)
+        conn = sqlite3.connect(str(v22_db))
+        conn.execute("UPDATE contacts SET name = 'Alice Smith' WHERE id = 'c1'")
+        assert _generation(conn) == 1
+        conn.execute("UPDATE contacts SET status = 'archived' WHERE id = 'c1'")
+        assert _generation(conn) == 1
+        conn.execute("DELETE FROM contacts WHERE id = 'c1'")
+        assert _generation(conn) == 2
+        conn.close()
+
+    def test_idempotent(self, v22_db):
+        migrate(v22_db)
+        migrate(v22_db)
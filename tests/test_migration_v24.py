@@ -0,0 +1,73 @@
+"""Tests for the v23 -> v24 migration (normalized company domains)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from poc.database import init_db
+from poc.migrate_to_v24 import migrate
+
+_NOW = "2024-01-01T00:00:00+00:00"
+
+
+@pytest.fixture()
+def v23_db(tmp_path):
+    """Create a database without the v24 columns/indexes/triggers."""
+    db_file = tmp_path / "test.db"
+    init_db(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    conn.execute("DROP TRIGGER trg_companies_domain_changed")
+    conn.execute("DROP TRIGGER trg_coid_value_changed")
+    conn.execute("DROP INDEX idx_companies_norm_domain")
+    conn.execute("DROP INDEX idx_coid_norm_domain")
+    conn.execute("DROP INDEX idx_companies_domain_lower")
+    conn.execute("DROP INDEX idx_coid_value_lower")
+    conn.execute("ALTER TABLE companies DROP COLUMN normalized_domain")
+    conn.execute("ALTER TABLE company_identifiers DROP COLUMN normalized_domain")
+    conn.execute("PRAGMA user_version = 23")
+    conn.execute(
+        "INSERT INTO companies (id, name, domain, status, created_at, updated_at) "
+        "VALUES ('co1', 'Acme', 'www.acme.com', 'active', ?, ?)", (_NOW, _NOW),
+    )
+    conn.execute(
+        "INSERT INTO company_identifiers "
+        "(id, company_id, type, value, created_at, updated_at) "
+        "VALUES ('ci1', 'co1', 'domain', 'mail.acme.co.uk', ?, ?)", (_NOW, _NOW),
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+class TestMigrationV24:
+    def test_backfills_and_sets_version(self, v23_db):
+        migrate(v23_db)
+        conn = sqlite3.connect(str(v23_db))
+        assert conn.execute(
+            "SELECT normalized_domain FROM companies WHERE id = 'co1'"
+        ).fetchone()[0] == "acme.com"
+        assert conn.execute(
+            "SELECT normalized_domain FROM company_identifiers WHERE id = 'ci1'"
+        ).fetchone()[0] == "acme.co.uk"
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 24
+        indexes = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )}
+        assert {"idx_companies_domain_lower", "idx_coid_value_lower"} <= indexes
+        conn.close()
+
+    def test_trigger_invalidates_on_domain_change(self, v23_db):
+        migrate(v23_db)
+        conn = sqlite3.connect(str(v23_db))
+        conn.execute("UPDATE companies SET domain = 'acme.io' WHERE id = 'co1'")
+        assert conn.execute(
+            "SELECT normalized_domain FROM companies WHERE id = 'co1'"
+        ).fetchone()[0] is None
+        conn.close()
+
+    def test_idempotent(self, v23_db):
+        migrate(v23_db)
+        migrate(v23_db)
@@ -0,0 +1,49 @@
+"""Tests for the v24 -> v25 migration (conversation summary hash)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from poc.database import init_db
+from poc.migrate_to_v25 import migrate
+
+
+@pytest.fixture()
+def v24_db(tmp_path):
+    """Create a database without the v25 column."""
+    db_file = tmp_path / "test.db"
+    init_db(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    conn.execute("ALTER TABLE conversations DROP COLUMN ai_summary_hash")
+    conn.execute("PRAGMA user_version = 24")
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def _columns(db_file) -> set[str]:
+    conn = sqlite3.connect(str(db_file))
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(conversations)")}
+    conn.close()
+    return cols
+
+
+class TestMigrationV25:
+    def test_adds_column_and_version(self, v24_db):
+        migrate(v24_db)
+        assert "ai_summary_hash" in _columns(v24_db)
+        conn = sqlite3.connect(str(v24_db))
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 25
+        conn.close()
+
+    def test_idempotent(self, v24_db):
+        migrate(v24_db)
+        migrate(v24_db)
+        assert "ai_summary_hash" in _columns(v24_db)
+
+    def test_init_db_adds_column_defensively(self, v24_db):
+        init_db(v24_db)
+        assert "ai_summary_hash" in _columns(v24_db)
@@ -4,9 +4,11 @@ import json
 import sqlite3
 import uuid
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
 
+from poc import relationship_inference
 from poc.database import init_db, get_connection, _db_path
 from poc.models import Relationship
 from poc.relationship_inference import (
@@ -28,7 +30,8 @@ def tmp_db(tmp_path, monkeypatch):
     db_file = tmp_path / "test.db"
     monkeypatch.setattr("poc.config.DB_PATH", db_file)
     init_db(db_file)
-    return db_file
+    yield db_file
+    relationship_inference.clear_canonical_cache()
 
 
 def _insert_account(conn, account_id="acct-1"):
@@ -399,3 +402,203 @@ class TestInferRelationships:
         assert len(rels) >= 1
         for rel in rels:
             assert rel.from_entity_id == "c-0"
+
+
+# ---------------------------------------------------------------------------
+# Incremental inference
+# ---------------------------------------------------------------------------
+
+def _snapshot() -> dict[tuple[str, str], dict]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT from_entity_id, to_entity_id, properties FROM relationships "
+            "WHERE source = 'inferred'"
+        ).fetchall()
+    return {(r["from_entity_id"], r["to_entity_id"]): json.loads(r["properties"]) for r in rows}
+
+
+def _queued() -> set[str]:
+    with get_connection() as conn:
+        return {r["contact_id"] for r in conn.execute(
+            "SELECT contact_id FROM relationship_inference_queue"
+        )}
+
+
+class TestIncrementalInference:
+
+    def test_first_run_falls_back_to_full(self, tmp_db):
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=3, num_conversations=3)
+
+        assert infer_relationships(incremental=True) == 3
+        assert _queued() == set()
+
+    def test_participant_changes_are_queued(self, tmp_db):
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=2, num_conversations=1)
+        infer_relationships()
+        assert _queued() == set()
+
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE conversation_participants SET communication_count = 5 "
+                "WHERE contact_id = 'c-0'"
+            )
+        assert _queued() == {"c-0"}
+
+    def test_participant_upsert_with_queued_contact(self, tmp_db):
+        """Sync's participant UPSERT must not trip over an already-queued contact."""
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=2, num_conversations=1)
+            conn.execute(
+                "INSERT INTO conversation_participants "
+                "(conversation_id, email_address, address, contact_id, communication_count) "
+                "VALUES ('conv-0', 'person0@example.com', 'person0@example.com', 'c-0', 7) "
+                "ON CONFLICT(conversation_id, email_address) DO UPDATE SET "
+                "communication_count = excluded.communication_count"
+            )
+        assert "c-0" in _queued()
+
+    def test_only_touched_pairs_recomputed(self, tmp_db):
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=4, num_conversations=4)
+        infer_relationships()
+        before = _snapshot()
+
+        with get_connection() as conn:
+            _insert_contact(conn, "c-new", "new@example.com", "Newcomer")
+            _insert_conversation(conn, "conv-new")
+            _insert_participant(conn, "conv-new", "person0@example.com", "c-0", 1)
+            _insert_participant(conn, "conv-new", "new@example.com", "c-new", 1)
+
+        # Every pair of the changed contacts: (c-0,c-1), (c-0,c-3), (c-0,c-new)
+        assert infer_relationships(incremental=True) == 3
+        after = _snapshot()
+        assert ("c-0", "c-new") in after and ("c-new", "c-0") in after
+        # Pairs not involving a changed contact are untouched
+        assert after[("c-1", "c-2")] == before[("c-1", "c-2")]
+        assert _queued() == set()
+
+    def test_matches_full_rebuild(self, tmp_db):
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=4, num_conversations=4)
+        infer_relationships()
+
+        with get_connection() as conn:
+            # Busy new conversation raises the normalization maxima
+            _insert_conversation(conn, "conv-big")
+            for i in range(4):
+                _insert_participant(conn, "conv-big", f"person{i}@example.com", f"c-{i}", 20)
+            conn.execute(
+                "DELETE FROM conversation_participants "
+                "WHERE conversation_id = 'conv-0' AND contact_id = 'c-1'"
+            )
+
+        infer_relationships(incremental=True)
+        incremental = _snapshot()
+        infer_relationships()
+        assert incremental == _snapshot()
+
+    def test_removed_pair_deleted(self, tmp_db):
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=3, num_conversations=3)
+        infer_relationships()
+
+        with get_connection() as conn:
+            conn.execute("DELETE FROM conversations WHERE id = 'conv-0'")  # c-0 & c-1
+
+        infer_relationships(incremental=True)
+        pairs = set(_snapshot())
+        assert ("c-0", "c-1") not in pairs and ("c-1", "c-0") not in pairs
+        assert ("c-1", "c-2") in pairs
+
+    def test_no_changes_is_noop(self, tmp_db):
+        with get_connection() as conn:
+            _seed_scenario(conn, num_contacts=3, num_conversations=3)
+        infer_relationships()
+        before = _snapshot()
+
+        assert infer_relationships(incremental=True) == 0
+        assert _snapshot() == before
+
+
+# ---------------------------------------------------------------------------
+# Canonical map cache
+# ---------------------------------------------------------------------------
+
+class TestCanonicalMapCache:
+
+    def _seed_duplicate(self, conn):
+        """Alice has two addresses; alice@work is the more used one."""
+        _seed_scenario(conn, num_contacts=2, num_conversations=1)
+        _insert_contact(conn, "alice-home", "alice@home.com", "Alice")
+        _insert_contact(conn, "alice-work", "alice@work.com", "Alice")
+        for i in range(2):
+            _insert_conversation(conn, f"conv-a{i}")
+            _insert_participant(conn, f"conv-a{i}", "alice@work.com", "alice-work")
+            _insert_participant(conn, f"conv-a{i}", "person0@example.com", "c-0")
+
+    def test_lookup_reuses_map(self, tmp_db):
+        with get_connection() as conn:
+            self._seed_duplicate(conn)
+        infer_relationships()
+
+        with patch(
+            "poc.relationship_inference._build_canonical_map",
+            wraps=relationship_inference._build_canonical_map,
+        ) as build:
+            first = load_relationships(contact_id="alice-home")
+            second = load_relationships(contact_id="alice-home")
+
+        assert build.call_count == 1
+        assert [r.to_entity_id for r in first] == ["c-0"]
+        assert [r.from_entity_id for r in second] == ["alice-work"]
+
+    def test_cache_keyed_on_connection_database(self, tmp_db, tmp_path):
+        with get_connection() as conn:
+            self._seed_duplicate(conn)
+        infer_relationships()
+        load_relationships(contact_id="alice-home")
+
+        # Same generation, different file: config.DB_PATH still points at tmp_db
+        other = tmp_path / "other.db"
+        init_db(other)
+        with get_connection() as conn:
+            generation = conn.execute(
+                "SELECT generation FROM canonical_map_state WHERE id = 1"
+            ).fetchone()[0]
+        with get_connection(other) as conn:
+            _insert_contact(conn, "alice-home", "alice@home.com", "Alice")
+            conn.execute(
+                "UPDATE canonical_map_state SET generation = ? WHERE id = 1", (generation,),
+            )
+            assert relationship_inference._canonical_map(conn) == {"alice-home": "alice-home"}
+        with get_connection() as conn:
+            assert relationship_inference._canonical_map(conn)["alice-home"] == "alice-work"
+
+    def test_contact_changes_invalidate(self, tmp_db):
+        with get_connection() as conn:
+            self._seed_duplicate(conn)
+        infer_relationships()
+        load_relationships(contact_id="alice-home")
+
+        with get_connection() as conn:
+            conn.execute("UPDATE contacts SET name = 'Alice Home' WHERE id = 'alice-home'")
+        # No longer grouped with alice-work, and has no relationships of its own
+        assert load_relationships(contact_id="alice-home") == []
+
+        with get_connection() as conn:
+            conn.execute("UPDATE contacts SET name = 'Alice' WHERE id = 'alice-home'")
+            conn.execute("UPDATE contacts SET status = 'archived' WHERE id = 'c-1'")
+        assert len(load_relationships(contact_id="alice-home")) == 1
+
+    def test_full_run_invalidates(self, tmp_db):
+        def generation():
+            with get_connection() as conn:
+                return conn.execute(
+                    "SELECT generation FROM canonical_map_state"
+                ).fetchone()[0]
+
+        before = generation()
+        infer_relationships()
+        assert generation() == before + 1
@@ -611,3 +611,58 @@ class TestBatch:
                 (cid,),
             ).fetchone()["cnt"]
         assert count == 1
+
+    def test_batch_matches_single_entity_scores(self, tmp_db):
+        """Grouped batch passes agree with the per-entity compute functions."""
+        with get_connection() as conn:
+            acme = _insert_company(conn, "Acme")
+            globex = _insert_company(conn, "Globex", domain="globex.com")
+            alice = _insert_contact(conn, "Alice", email="Alice@Acme.com")
+            bob = _insert_contact(conn, "Bob", email="bob@acme.com")
+            carol = _insert_contact(conn, "Carol", email="carol@globex.com")
+            _link_contact_to_company(conn, alice, acme)
+            _link_contact_to_company(conn, bob, acme)
+            _link_contact_to_company(conn, carol, globex)
+            aid = _insert_provider_account(conn)
+
+            for i, (sender, to, direction) in enumerate([
+                ("alice@acme.com", "me@example.com", "inbound"),
+                ("me@example.com", "ALICE@acme.com", "outbound"),
+                ("bob@acme.com", "me@example.com", "inbound"),
+                ("me@example.com", "carol@globex.com", "outbound"),
+                ("carol@globex.com", "bob@acme.com", "inbound"),
+            ]):
+                comm = _insert_communication(
+                    conn, aid, direction=direction, sender=sender,
+                    timestamp=_days_ago(i * 60),
+                )
+                _insert_comm_participant(conn, comm, sender, role="from")
+                _insert_comm_participant(conn, comm, to, role="to")
+                conv = _insert_conversation(conn, f"Thread {i}")
+                _link_conversation(conn, conv, comm)
+                for contact_id, addr in ((alice, "alice@acme.com"), (bob, "bob@acme.com"),
+                                         (carol, "carol@globex.com")):
+                    if addr in (sender.lower(), to.lower()):
+                        _insert_conv_participant(conn, conv, addr, contact_id)
+
+            expected = {
+                ("contact", cid): compute_contact_score(conn, cid)
+                for cid in (alice, bob, carol)
+            }
+            expected.update({
+                ("company", cid): compute_company_score(conn, cid)
+                for cid in (acme, globex)
+            })
+
+        assert score_all_contacts()["scored"] == 3
+        assert score_all_companies()["scored"] == 2
+
+        for (entity_type, entity_id), result in expected.items():
+            stored = get_entity_score(entity_type, entity_id)
+            assert stored["score_value"] == result["score"]
+            assert stored["factors"] == result["factors"]
+
+    def test_batch_reports_timing(self, tmp_db):
+        result = score_all_contacts()
+        assert result == {"scored": 0, "skipped": 0, "elapsed_s": result["elapsed_s"]}
+        assert result["elapsed_s"] >= 0
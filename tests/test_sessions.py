@@ -7,8 +7,10 @@ from datetime import datetime, timedelta, timezone
 import pytest
 
 from poc.database import get_connection, init_db
+from poc.hierarchy import update_user
 from poc.session import (
     cleanup_expired_sessions,
+    clear_session_cache,
     create_session,
     delete_session,
     delete_user_sessions,
@@ -44,7 +46,8 @@ def tmp_db(tmp_path, monkeypatch):
             ("user-inactive", "cust-1", "inactive@example.com", "Inactive", _NOW, _NOW),
         )
 
-    return db_file
+    yield db_file
+    clear_session_cache()
 
 
 class TestCreateSession:
@@ -152,3 +155,79 @@ class TestCleanupExpiredSessions:
         assert count == 1
         # s2 should still exist
         assert get_session(s2["id"], db_path=tmp_db) is not None
+
+
+class TestSessionCache:
+    def _count_lookups(self, monkeypatch):
+        import poc.session as session_mod
+        calls = []
+        real = session_mod.get_connection
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(session_mod, "get_connection", counting)
+        return calls
+
+    def test_repeat_lookup_served_from_cache(self, tmp_db, monkeypatch):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        calls = self._count_lookups(monkeypatch)
+        first = get_session(session["id"], db_path=tmp_db)
+        second = get_session(session["id"], db_path=tmp_db)
+        assert first == second
+        assert len(calls) == 1
+
+    def test_cache_returns_copies(self, tmp_db):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        get_session(session["id"], db_path=tmp_db)["role"] = "tampered"
+        assert get_session(session["id"], db_path=tmp_db)["role"] == "admin"
+
+    def test_ttl_zero_disables_cache(self, tmp_db, monkeypatch):
+        monkeypatch.setattr("poc.config.SESSION_CACHE_TTL_SECONDS", 0)
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        calls = self._count_lookups(monkeypatch)
+        get_session(session["id"], db_path=tmp_db)
+        get_session(session["id"], db_path=tmp_db)
+        assert len(calls) == 2
+
+    def test_delete_session_invalidates(self, tmp_db):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db) is not None
+        delete_session(session["id"], db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db) is None
+
+    def test_delete_user_sessions_invalidates(self, tmp_db):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db) is not None
+        delete_user_sessions("user-1", db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db) is None
+
+    def test_user_deactivation_invalidates(self, tmp_db):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db) is not None
+        update_user("user-1", is_active=0)
+        assert get_session(session["id"], db_path=tmp_db) is None
+
+    def test_role_change_visible(self, tmp_db):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db)["role"] == "admin"
+        update_user("user-1", role="user")
+        assert get_session(session["id"], db_path=tmp_db)["role"] == "user"
+
+    def test_cached_session_still_expires(self, tmp_db):
+        session = create_session("user-1", "cust-1", db_path=tmp_db)
+        assert get_session(session["id"], db_path=tmp_db) is not None
+        import poc.session as session_mod
+        key = (str(tmp_db), session["id"])
+        cached_at, _, row = session_mod._cache[key]
+        session_mod._cache[key] = (
+            cached_at, datetime.now(timezone.utc) - timedelta(seconds=1), row,
+        )
+        with get_connection(tmp_db) as conn:
+            conn.execute(
+                "UPDATE sessions SET expires_at = ? WHERE id = ?",
+                ((datetime.now(timezone.utc) - timedelta(hours=1)).isoformat(),
+                 session["id"]),
+            )
+        assert get_session(session["id"], db_path=tmp_db) is None
@@ -0,0 +1,311 @@
+"""Tests for concurrent, cached conversation summarization (offline stub client)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from poc.claude_stub import StubClient
+from poc.database import get_connection, init_db
+from poc.models import Conversation, ConversationStatus, ParsedEmail
+from poc.summarizer import (
+    _digest,
+    build_thread_prompt,
+    content_hash,
+    summarize_all,
+    summarize_batch,
+    summarize_conversation,
+    summarize_many,
+)
+from poc.sync import process_conversations
+
+_NOW = "2024-01-01T00:00:00+00:00"
+
+
+@pytest.fixture()
+def tmp_db(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setattr("poc.config.DB_PATH", db_file)
+    init_db(db_file)
+    return db_file
+
+
+@pytest.fixture()
+def stub(monkeypatch):
+    monkeypatch.setattr("poc.config.CLAUDE_STUB", True)
+    monkeypatch.setattr("poc.config.ANTHROPIC_API_KEY", "")
+    monkeypatch.setattr("poc.config.CLAUDE_BATCH_THRESHOLD", 0)
+
+
+def _conv(thread_id: str, subject: str = "Budget", body: str = "Numbers attached.") -> Conversation:
+    return Conversation(
+        thread_id=thread_id,
+        title=subject,
+        emails=[ParsedEmail(
+            message_id=f"m-{thread_id}", thread_id=thread_id, subject=subject,
+            sender="Alice", sender_email="alice@acme.com", recipients=["me@x.com"],
+            date=datetime(2024, 1, 1, tzinfo=timezone.utc), body_plain=body,
+        )],
+    )
+
+
+def _insert_conversation(conn, conv_id: str, body: str = "Numbers attached.") -> None:
+    conn.execute(
+        "INSERT INTO conversations (id, title, last_activity_at, created_at, updated_at) "
+        "VALUES (?, 'Budget', ?, ?, ?)", (conv_id, _NOW, _NOW, _NOW),
+    )
+    conn.execute(
+        "INSERT INTO communications (id, channel, timestamp, original_text, "
+        "sender_address, sender_name, provider_message_id, created_at, updated_at) "
+        "VALUES (?, 'email', ?, ?, 'alice@acme.com', 'Alice', ?, ?, ?)",
+        (f"comm-{conv_id}", _NOW, body, f"m-{conv_id}", _NOW, _NOW),
+    )
+    conn.execute(
+        "INSERT INTO conversation_communications "
+        "(conversation_id, communication_id, created_at) VALUES (?, ?, ?)",
+        (conv_id, f"comm-{conv_id}", _NOW),
+    )
+
+
+_SIGNATURE = "--\nAlice Smith | Head of Finance | Acme Corp | This e-mail is confidential."
+
+
+def _long_thread(n: int, words: int = 150) -> Conversation:
+    emails = [
+        ParsedEmail(
+            message_id=f"m{i}", thread_id="t", subject="Budget",
+            sender="Alice", sender_email="alice@acme.com", recipients=[],
+            date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            body_plain=f"Message {i} opens here. " + "detail " * words + "\n\n" + _SIGNATURE,
+        )
+        for i in range(n)
+    ]
+    return Conversation(thread_id="t", title="Budget", emails=emails)
+
+
+class TestBuildThreadPrompt:
+    def test_short_thread_kept_in_full(self):
+        text, stats = build_thread_prompt(_conv("t1"), budget=1000)
+        assert "Numbers attached." in text
+        assert (stats.full, stats.digested, stats.omitted) == (1, 0, 0)
+
+    def test_long_thread_fits_budget(self):
+        text, stats = build_thread_prompt(_long_thread(100), budget=1500)
+        assert stats.tokens_used <= 1500
+        assert stats.tokens_saved > 15000
+        assert stats.full >= 1 and stats.digested >= 1
+        assert stats.full + stats.digested + stats.omitted == 100
+        # Newest in full, opener condensed, gap marked
+        assert "Message 99 opens here. " + "detail " * 150 in text
+        assert "Message 0 opens here." in text
+        assert "messages omitted for brevity" in text
+
+    def test_repeated_paragraphs_deduplicated(self):
+        text, stats = build_thread_prompt(_long_thread(3, words=10), budget=5000)
+        assert text.count("Head of Finance") == 1
+        assert stats.duplicate_paragraphs == 2
+
+    def test_oversized_message_truncated(self):
+        text, stats = build_thread_prompt(_long_thread(1, words=5000), budget=200)
+        assert text.endswith("[truncated]")
+        assert stats.tokens_used <= 210
+
+    def test_digests_memoized(self):
+        _digest.cache_clear()
+        build_thread_prompt(_long_thread(100), budget=1500)
+        build_thread_prompt(_long_thread(100), budget=1500)
+        assert _digest.cache_info().hits > 0
+
+
+class TestSummarizeConversation:
+    def test_stub_reply_parsed(self):
+        summary = summarize_conversation(_conv("t1"), StubClient(), "me@x.com")
+        assert summary.error is None
+        assert summary.status is ConversationStatus.UNCERTAIN
+        assert "Budget" in summary.summary
+        assert summary.key_topics == ["budget"]
+
+    def test_client_error_becomes_failed_summary(self):
+        client = StubClient()
+        client.messages.create = lambda **_: (_ for _ in ()).throw(RuntimeError("boom"))
+        summary = summarize_conversation(_conv("t1"), client, "me@x.com")
+        assert summary.error == "boom"
+
+
+class TestContentHash:
+    def test_stable_for_same_content(self):
+        assert content_hash(_conv("a")) == content_hash(_conv("b"))
+
+    def test_changes_with_body(self):
+        assert content_hash(_conv("a")) != content_hash(_conv("a", body="Revised numbers."))
+
+    def test_changes_with_model(self, monkeypatch):
+        before = content_hash(_conv("a"))
+        monkeypatch.setattr("poc.config.CLAUDE_MODEL", "other-model")
+        assert content_hash(_conv("a")) != before
+
+
+class TestSummarizeMany:
+    def test_bounded_in_flight_window(self):
+        client = StubClient()
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        create = client.messages.create
+
+        def slow_create(**params):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return create(**params)
+
+        client.messages.create = slow_create
+        convs = [_conv(f"t{i}") for i in range(12)]
+        results = list(summarize_many(convs, client, "me@x.com", workers=3))
+        assert sorted(s.thread_id for s in results) == sorted(c.thread_id for c in convs)
+        assert 1 < state["peak"] <= 3
+
+    def test_summarize_all_keeps_input_order(self, stub):
+        convs = [_conv(f"t{i}") for i in range(8)]
+        summaries = summarize_all(convs, "me@x.com", workers=4)
+        assert [s.thread_id for s in summaries] == [c.thread_id for c in convs]
+        assert all(s.error is None for s in summaries)
+
+
+class TestSummarizeBatch:
+    def test_results_in_input_order(self):
+        convs = [_conv("t1", subject="One"), _conv("t2", subject="Two")]
+        summaries = summarize_batch(convs, StubClient(), "me@x.com", poll_interval=0)
+        assert [s.thread_id for s in summaries] == ["t1", "t2"]
+        assert summaries[1].key_topics == ["two"]
+
+    def test_errored_request_marked_failed(self):
+        client = StubClient()
+        results = client.messages.batches.results
+
+        def failing_results(batch_id):
+            for entry in results(batch_id):
+                if entry.custom_id == "conv-1":
+                    entry.result.type = "errored"
+                yield entry
+
+        client.messages.batches.results = failing_results
+        summaries = summarize_batch(
+            [_conv("t1"), _conv("t2")], client, "me@x.com", poll_interval=0,
+        )
+        assert summaries[0].error is None
+        assert summaries[1].error == "Batch request errored"
+
+
+class TestProcessConversations:
+    def test_summarizes_and_stores_hash(self, tmp_db, stub):
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1")
+            _insert_conversation(conn, "c2")
+        _, summarized, tags = process_conversations("acct", None, "me@x.com")
+        assert summarized == 2
+        assert tags == 2
+        with get_connection() as conn:
+            rows = conn.execute(
+                "SELECT ai_summary, ai_summarized_at, ai_summary_hash FROM conversations"
+            ).fetchall()
+        assert all(r["ai_summary"] and r["ai_summarized_at"] and r["ai_summary_hash"]
+                   for r in rows)
+
+    def test_unchanged_content_not_resummarized(self, tmp_db, stub):
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1")
+        process_conversations("acct", None, "me@x.com")
+        with get_connection() as conn:
+            conn.execute("UPDATE conversations SET ai_summarized_at = NULL")
+
+        _, summarized, _ = process_conversations("acct", None, "me@x.com")
+        assert summarized == 0
+        with get_connection() as conn:
+            row = conn.execute("SELECT ai_summarized_at FROM conversations").fetchone()
+        assert row["ai_summarized_at"] is not None
+
+    def test_changed_content_resummarized(self, tmp_db, stub):
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1")
+        process_conversations("acct", None, "me@x.com")
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE communications SET original_text = 'Revised numbers.'"
+            )
+            conn.execute("UPDATE conversations SET ai_summarized_at = NULL")
+
+        _, summarized, _ = process_conversations("acct", None, "me@x.com")
+        assert summarized == 1
+
+    def test_backlog_uses_batches_api(self, tmp_db, stub, monkeypatch):
+        monkeypatch.setattr("poc.config.CLAUDE_BATCH_THRESHOLD", 2)
+        calls = []
+        monkeypatch.setattr(
+            "poc.sync.submit_batch",
+            lambda convs, client, user_email, prompts: calls.append(len(convs)) or None,
+        )
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1")
+            _insert_conversation(conn, "c2")
+        process_conversations("acct", None, "me@x.com")
+        assert calls == [2]
+
+    def test_all_pages_submitted_before_polling(self, tmp_db, stub, monkeypatch):
+        from poc import sync
+
+        monkeypatch.setattr("poc.config.CLAUDE_BATCH_THRESHOLD", 2)
+        monkeypatch.setattr(sync, "_CONVERSATION_PAGE", 2)
+        events = []
+        real_submit, real_collect = sync.submit_batch, sync.collect_batch
+
+        def submit(convs, client, user_email, prompts):
+            events.append("submit")
+            return real_submit(convs, client, user_email, prompts=prompts)
+
+        def collect(client, batch):
+            events.append("collect")
+            return real_collect(client, batch, poll_interval=0)
+
+        monkeypatch.setattr(sync, "submit_batch", submit)
+        monkeypatch.setattr(sync, "collect_batch", collect)
+        with get_connection() as conn:
+            for i in range(5):
+                _insert_conversation(conn, f"c{i}")
+
+        _, summarized, _ = process_conversations("acct", None, "me@x.com")
+
+        assert events == ["submit"] * 3 + ["collect"] * 3
+        assert summarized == 5
+
+    def test_prompt_built_once_per_conversation(self, tmp_db, stub, monkeypatch):
+        from poc import summarizer
+
+        calls = []
+        real_build = summarizer.build_thread_prompt
+
+        def build(conv, budget=None):
+            calls.append(conv.thread_id)
+            return real_build(conv, budget)
+
+        monkeypatch.setattr(summarizer, "build_thread_prompt", build)
+        monkeypatch.setattr("poc.sync.build_thread_prompt", build)
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1")
+            _insert_conversation(conn, "c2")
+
+        process_conversations("acct", None, "me@x.com")
+
+        assert sorted(calls) == ["c1", "c2"]
+
+    def test_disabled_without_key_or_stub(self, tmp_db, monkeypatch):
+        monkeypatch.setattr("poc.config.CLAUDE_STUB", False)
+        monkeypatch.setattr("poc.config.ANTHROPIC_API_KEY", "")
+        with get_connection() as conn:
+            _insert_conversation(conn, "c1")
+        assert process_conversations("acct", None, "me@x.com") == (0, 0, 0)
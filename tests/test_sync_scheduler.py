@@ -0,0 +1,321 @@
+"""Tests for the pipelined multi-account sync scheduler."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from poc.database import get_connection, init_db
+from poc.email_parser import strip_quotes
+from poc.gmail_client import HistoryChanges
+from poc.models import ParsedEmail
+from poc.sync import _messages_to_fetch, _store_threads, get_account, incremental_sync
+from poc.sync_scheduler import SyncJob, sync_accounts
+
+_NOW = datetime.now(timezone.utc).isoformat()
+CUST_ID = "cust-test"
+USER_ID = "user-admin"
+
+QUOTED_BODY = (
+    "Sounds good, see you then.\n\n"
+    "On Mon, Jan 1, 2024 at 10:00 AM Bob <bob@acme.com> wrote:\n"
+    "> Are we still on for Tuesday?\n"
+)
+
+
+@pytest.fixture()
+def tmp_db(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setattr("poc.config.DB_PATH", db_file)
+    init_db(db_file)
+
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT INTO customers (id, name, slug, is_active, created_at, updated_at) "
+            "VALUES (?, 'Test Org', 'test', 1, ?, ?)",
+            (CUST_ID, _NOW, _NOW),
+        )
+        conn.execute(
+            "INSERT INTO users "
+            "(id, customer_id, email, name, role, is_active, created_at, updated_at) "
+            "VALUES (?, ?, 'admin@test.com', 'Admin', 'admin', 1, ?, ?)",
+            (USER_ID, CUST_ID, _NOW, _NOW),
+        )
+    return db_file
+
+
+def _insert_account(account_id: str, email: str, *, cursor: str | None = None) -> dict:
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT INTO provider_accounts "
+            "(id, customer_id, provider, account_type, email_address, "
+            " sync_cursor, initial_sync_done, created_at, updated_at) "
+            "VALUES (?, ?, 'gmail', 'email', ?, ?, ?, ?, ?)",
+            (account_id, CUST_ID, email, cursor, 1 if cursor else 0, _NOW, _NOW),
+        )
+    return get_account(account_id)
+
+
+def _email(message_id: str, thread_id: str, sender: str, to: str, body: str = "Hi") -> ParsedEmail:
+    return ParsedEmail(
+        message_id=message_id,
+        thread_id=thread_id,
+        subject=f"Subject {thread_id}",
+        sender=sender,
+        sender_email=sender,
+        recipients=[to],
+        date=datetime.now(timezone.utc),
+        body_plain=body,
+    )
+
+
+def _job(account: dict) -> SyncJob:
+    return SyncJob(account=account, creds=account["email_address"],
+                   customer_id=CUST_ID, user_id=USER_ID)
+
+
+def _sync_log(account_id: str) -> dict:
+    with get_connection() as conn:
+        return dict(conn.execute(
+            "SELECT * FROM sync_log WHERE account_id = ?", (account_id,),
+        ).fetchone())
+
+
+class TestInitialSync:
+
+    def test_accounts_fetch_concurrently(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+        b = _insert_account("acct-b", "b@mine.com")
+        # Both fetchers must be inside fetch_threads at the same time,
+        # otherwise the barrier times out and the accounts fail.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_fetch(creds, **kwargs):
+            barrier.wait()
+            return [[_email(f"m-{creds}", f"t-{creds}", "x@other.com", creds)]], None
+
+        with patch("poc.sync_scheduler.fetch_threads", side_effect=fake_fetch), \
+             patch("poc.sync_scheduler.get_history_id", return_value="h-100"):
+            results = sync_accounts([_job(a), _job(b)])
+
+        for account_id in ("acct-a", "acct-b"):
+            assert "error" not in results[account_id]
+            assert results[account_id]["messages_fetched"] == 1
+            assert results[account_id]["messages_stored"] == 1
+            assert _sync_log(account_id)["status"] == "completed"
+            acct = get_account(account_id)
+            assert acct["initial_sync_done"] == 1
+            assert acct["sync_cursor"] == "h-100"
+
+        with get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM communications").fetchone()[0] == 2
+
+    def test_bodies_cleaned_before_store(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+        page = [[_email("m-1", "t-1", "bob@acme.com", "a@mine.com", body=QUOTED_BODY)]]
+
+        with patch("poc.sync_scheduler.fetch_threads", return_value=(page, None)), \
+             patch("poc.sync_scheduler.get_history_id", return_value="h-1"):
+            sync_accounts([_job(a)])
+
+        with get_connection() as conn:
+            text = conn.execute(
+                "SELECT original_text FROM communications WHERE provider_message_id = 'm-1'"
+            ).fetchone()[0]
+        assert text == strip_quotes(QUOTED_BODY)
+        assert "Are we still on" not in text
+
+    def test_failure_isolated_to_one_account(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+        b = _insert_account("acct-b", "b@mine.com")
+
+        def fake_fetch(creds, **kwargs):
+            if creds == "a@mine.com":
+                raise RuntimeError("quota exceeded")
+            return [[_email("m-b", "t-b", "x@other.com", creds)]], None
+
+        with patch("poc.sync_scheduler.fetch_threads", side_effect=fake_fetch), \
+             patch("poc.sync_scheduler.get_history_id", return_value="h-1"):
+            results = sync_accounts([_job(a), _job(b)])
+
+        assert results["acct-a"]["error"] == "quota exceeded"
+        log_a = _sync_log("acct-a")
+        assert log_a["status"] == "failed"
+        assert log_a["error"] == "quota exceeded"
+        assert get_account("acct-a")["initial_sync_done"] == 0
+
+        assert "error" not in results["acct-b"]
+        assert _sync_log("acct-b")["status"] == "completed"
+
+    def test_multiple_pages(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+        pages = iter([
+            ([[_email("m-1", "t-1", "x@other.com", "a@mine.com")]], "next"),
+            ([[_email("m-2", "t-2", "y@other.com", "a@mine.com")]], None),
+        ])
+
+        with patch("poc.sync_scheduler.fetch_threads",
+                   side_effect=lambda *a, **k: next(pages)), \
+             patch("poc.sync_scheduler.get_history_id", return_value="h-1"):
+            results = sync_accounts([_job(a)], queue_size=1)
+
+        assert results["acct-a"]["messages_fetched"] == 2
+        assert results["acct-a"]["messages_stored"] == 2
+
+
+class TestInterruptedRun:
+
+    def test_interrupted_store_stops_pipeline_and_fails_logs(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+        b = _insert_account("acct-b", "b@mine.com")
+        counter = iter(range(10_000))
+
+        def endless_fetch(creds, **kwargs):
+            n = next(counter)
+            return [[_email(f"m-{n}", f"t-{n}", "x@other.com", creds)]], "next"
+
+        raised = []
+
+        def run():
+            try:
+                sync_accounts([_job(a), _job(b)], queue_size=1)
+            except KeyboardInterrupt:
+                raised.append(True)
+
+        with patch("poc.sync_scheduler.fetch_threads", side_effect=endless_fetch), \
+             patch("poc.sync_scheduler._store_page", side_effect=KeyboardInterrupt):
+            runner = threading.Thread(target=run, daemon=True)
+            runner.start()
+            runner.join(timeout=10)
+
+        assert not runner.is_alive(), "sync_accounts hung after the store loop stopped"
+        assert raised == [True]
+        for account_id in ("acct-a", "acct-b"):
+            assert _sync_log(account_id)["status"] == "failed"
+
+    def test_contact_index_failure_fails_logs(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+
+        with patch("poc.sync_scheduler.load_contact_index",
+                   side_effect=RuntimeError("db locked")), \
+             pytest.raises(RuntimeError):
+            sync_accounts([_job(a)])
+
+        log_row = _sync_log("acct-a")
+        assert log_row["status"] == "failed"
+        assert log_row["error"] == "db locked"
+
+
+class TestIncrementalSync:
+
+    def test_additions_and_deletions(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com", cursor="h-1")
+
+        # Seed a message that upstream will report deleted
+        with get_connection() as conn:
+            _store_threads(conn, "acct-a", "a@mine.com",
+                           [[_email("m-old", "t-old", "x@other.com", "a@mine.com")]], {})
+
+        changes = HistoryChanges(added=["m-new"], deleted=["m-old"],
+                                 labels={"m-new": ["INBOX", "UNREAD"]})
+        with patch("poc.sync_scheduler.fetch_history_changes", return_value=changes), \
+             patch("poc.sync_scheduler.fetch_messages",
+                   return_value=[_email("m-new", "t-new", "x@other.com", "a@mine.com")]), \
+             patch("poc.sync_scheduler.get_history_id", return_value="h-2"):
+            results = sync_accounts([_job(a)])
+
+        result = results["acct-a"]
+        assert result["cursor_before"] == "h-1"
+        assert result["history_id"] == "h-2"
+        assert result["messages_fetched"] == 1
+        assert result["messages_stored"] == 1
+
+        with get_connection() as conn:
+            ids = {r[0] for r in conn.execute(
+                "SELECT provider_message_id FROM communications")}
+        assert ids == {"m-new"}
+        assert get_account("acct-a")["sync_cursor"] == "h-2"
+        assert _sync_log("acct-a")["sync_type"] == "incremental"
+
+    def test_skips_stored_messages_and_applies_labels(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com", cursor="h-1")
+        with get_connection() as conn:
+            _store_threads(conn, "acct-a", "a@mine.com",
+                           [[_email("m-old", "t-old", "x@other.com", "a@mine.com")]], {})
+
+        changes = HistoryChanges(added=["m-old"], labels={"m-old": ["INBOX"]})
+        with patch("poc.sync_scheduler.fetch_history_changes", return_value=changes), \
+             patch("poc.sync_scheduler.fetch_messages") as fetch, \
+             patch("poc.sync_scheduler.get_history_id", return_value="h-2"):
+            results = sync_accounts([_job(a)])
+
+        fetch.assert_not_called()
+        assert results["acct-a"]["messages_fetched"] == 0
+        assert results["acct-a"]["labels_updated"] == 1
+        with get_connection() as conn:
+            assert conn.execute(
+                "SELECT is_read FROM communications WHERE provider_message_id = 'm-old'"
+            ).fetchone()[0] == 1
+
+    def test_missing_cursor_reports_error(self, tmp_db):
+        a = _insert_account("acct-a", "a@mine.com")
+        a["initial_sync_done"] = 1
+
+        results = sync_accounts([_job(a)])
+
+        assert "no sync_cursor" in results["acct-a"]["error"]
+        with get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sync_log").fetchone()[0] == 0
+
+
+class TestHistoryFiltering:
+
+    def test_drops_stored_and_spam_without_lookup(self, tmp_db):
+        _insert_account("acct-a", "a@mine.com", cursor="h-1")
+        with get_connection() as conn:
+            _store_threads(conn, "acct-a", "a@mine.com",
+                           [[_email("m-sent", "t-1", "a@mine.com", "x@other.com")]], {})
+        changes = HistoryChanges(
+            added=["m-sent", "m-spam", "m-new"],
+            labels={"m-sent": ["SENT"], "m-spam": ["SPAM"], "m-new": ["INBOX"]},
+        )
+
+        with patch("poc.sync.fetch_message_labels") as lookup:
+            assert _messages_to_fetch("creds", "acct-a", changes) == ["m-new"]
+        lookup.assert_not_called()
+
+    def test_unknown_labels_looked_up_minimally(self, tmp_db):
+        _insert_account("acct-a", "a@mine.com", cursor="h-1")
+        changes = HistoryChanges(added=["m-1", "m-2"], labels={"m-1": ["INBOX"]})
+
+        with patch("poc.sync.fetch_message_labels",
+                   return_value={"m-2": ["TRASH"]}) as lookup:
+            assert _messages_to_fetch("creds", "acct-a", changes) == ["m-1"]
+        assert lookup.call_args.args[1] == ["m-2"]
+        assert changes.labels["m-2"] == ["TRASH"]
+
+    def test_incremental_sync_label_only_history(self, tmp_db):
+        _insert_account("acct-a", "a@mine.com", cursor="h-1")
+        with get_connection() as conn:
+            _store_threads(conn, "acct-a", "a@mine.com",
+                           [[_email("m-1", "t-1", "x@other.com", "a@mine.com"),
+                             _email("m-2", "t-1", "x@other.com", "a@mine.com")]], {})
+            conn.execute("UPDATE communications SET is_read = 1 "
+                         "WHERE provider_message_id = 'm-2'")
+
+        changes = HistoryChanges(labels={"m-1": ["INBOX"], "m-2": ["INBOX", "UNREAD"]})
+        with patch("poc.sync.fetch_history_changes", return_value=changes), \
+             patch("poc.sync.fetch_messages") as fetch, \
+             patch("poc.sync.get_history_id", return_value="h-2"):
+            result = incremental_sync("acct-a", "creds")
+
+        fetch.assert_not_called()
+        assert result["messages_fetched"] == 0
+        assert result["labels_updated"] == 2
+        with get_connection() as conn:
+            read = dict(conn.execute(
+                "SELECT provider_message_id, is_read FROM communications").fetchall())
+        assert read == {"m-1": 1, "m-2": 0}
@@ -14,6 +14,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import vobject
@@ -902,3 +903,174 @@ END:VCARD
         assert result.contacts_created == 0
         assert result.errors == []
         assert result.imported_contacts == []
+
+
+# ---------------------------------------------------------------------------
+# Bulk import
+# ---------------------------------------------------------------------------
+
+BULK_EXTRA_VCF = """\
+BEGIN:VCARD
+VERSION:3.0
+FN:Carol Wonder
+EMAIL;TYPE=INTERNET:carol@wonder.com
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Alice Again
+EMAIL;TYPE=INTERNET:alice@wonder.com
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Dave Gmail
+ORG:Builder Inc
+TITLE:Foreman
+EMAIL;TYPE=INTERNET:dave@gmail.com
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Phone Person
+TEL;TYPE=CELL:+15550001111
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Phone Person Copy
+TEL;TYPE=HOME:(555) 000-1111
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Name Only
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Name Only
+ADR;TYPE=HOME:;;1 Elm St;Shelbyville;IL;62565;USA
+END:VCARD
+""" + SAMPLE_NO_NAME
+
+
+def _import_snapshot() -> dict:
+    """Everything an import writes, keyed by names rather than generated IDs."""
+    queries = {
+        "contacts": "SELECT name, source, customer_id, created_by FROM contacts",
+        "identifiers": (
+            "SELECT c.name, ci.value, ci.label, ci.is_primary, ci.source "
+            "FROM contact_identifiers ci JOIN contacts c ON c.id = ci.contact_id"
+        ),
+        "user_contacts": (
+            "SELECT c.name, uc.user_id, uc.visibility FROM user_contacts uc "
+            "JOIN contacts c ON c.id = uc.contact_id"
+        ),
+        "companies": "SELECT name, domain, customer_id FROM companies",
+        "affiliations": (
+            "SELECT c.name, co.name, cc.role_id, cc.title FROM contact_companies cc "
+            "JOIN contacts c ON c.id = cc.contact_id JOIN companies co ON co.id = cc.company_id"
+        ),
+        "phones": (
+            "SELECT c.name, p.number, p.phone_type FROM phone_numbers p "
+            "JOIN contacts c ON c.id = p.entity_id"
+        ),
+        "addresses": (
+            "SELECT c.name, a.address_type, a.street, a.city, a.country FROM addresses a "
+            "JOIN contacts c ON c.id = a.entity_id"
+        ),
+    }
+    with get_connection() as conn:
+        return {
+            key: sorted(tuple(r) for r in conn.execute(sql))
+            for key, sql in queries.items()
+        }
+
+
+def _wipe_import():
+    with get_connection() as conn:
+        for table in ("phone_numbers", "addresses", "contacts", "companies"):
+            conn.execute(f"DELETE FROM {table}")
+
+
+def _counters(result: ImportResult) -> dict:
+    counters = dict(vars(result))
+    counters["imported_contacts"] = sorted(c["name"] for c in result.imported_contacts)
+    return counters
+
+
+class TestBulkImport:
+
+    @pytest.fixture()
+    def vcf_dir(self, tmp_path):
+        src = tmp_path / "cards"
+        src.mkdir()
+        _make_vcf(src / "a.vcf", SAMPLE_VCF)
+        _make_vcf(src / "b.vcf", SAMPLE_MULTI_VCF)
+        _make_vcf(src / "c.vcf", BULK_EXTRA_VCF)
+        _make_vcf(src / "d.vcf", "not a vcard")
+        return src
+
+    def test_matches_per_contact_import(self, tmp_db, vcf_dir):
+        expected = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID)
+        expected_rows = _import_snapshot()
+        _wipe_import()
+
+        result = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID, bulk=True)
+
+        # The per-contact path counts a domain-named company once per contact
+        # that resolves to it; bulk counts companies actually created.
+        counters, expected_counters = _counters(result), _counters(expected)
+        assert counters.pop("companies_created") == len(expected_rows["companies"])
+        expected_counters.pop("companies_created")
+        assert counters == expected_counters
+        assert _import_snapshot() == expected_rows
+        assert result.contacts_skipped_duplicate == 3
+
+    def test_reimport_skips_everything(self, tmp_db, vcf_dir):
+        first = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID, bulk=True)
+        second = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID, bulk=True)
+
+        assert second.contacts_created == 0
+        assert second.contacts_skipped_duplicate == (
+            first.contacts_created + first.contacts_skipped_duplicate
+        )
+
+    def test_single_write_connection(self, tmp_db, vcf_dir):
+        from poc import vcard_import
+
+        with patch("poc.vcard_import.get_connection",
+                   wraps=vcard_import.get_connection) as conn_factory:
+            result = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID, bulk=True)
+
+        assert result.contacts_created > 0
+        assert conn_factory.call_count == 1
+
+    def test_parallel_parse_matches_inline(self, vcf_dir, monkeypatch):
+        from poc import vcard_import
+
+        monkeypatch.setattr(vcard_import, "_PARSE_CHUNK_CARDS", 2)
+        files = find_vcf_files(vcf_dir)
+        parallel = vcard_import._parse_files(files, workers=2)
+        assert parallel == vcard_import._parse_files(files, workers=1)
+        assert [len(cards) if cards else None for cards in parallel] == [1, 2, 8, None]
+
+    def test_split_cards(self):
+        from poc.vcard_import import _split_cards
+
+        chunks = _split_cards(BULK_EXTRA_VCF, per_chunk=3)
+        assert "".join(chunks) == BULK_EXTRA_VCF
+        assert [c.count("BEGIN:VCARD") for c in chunks] == [3, 3, 2]
+        assert _split_cards("") == [""]
+
+    def test_constraint_failures_reported_not_raised(self, tmp_db, vcf_dir, monkeypatch):
+        first = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID, bulk=True)
+        # Let every card through so each email collides with UNIQUE(type, value)
+        monkeypatch.setattr("poc.vcard_import._is_duplicate_bulk", lambda *a: False)
+
+        result = import_vcards(vcf_dir, customer_id=CUST_ID, user_id=USER_ID, bulk=True)
+
+        assert result.emails_added == 0
+        assert len(result.errors) == sum(len(c["emails"]) for c in result.imported_contacts)
+        assert all("UNIQUE" in e for e in result.errors)
+        assert result.contacts_created == len(result.imported_contacts) > 0
+        with get_connection() as conn:
+            emails = conn.execute(
+                "SELECT COUNT(*) FROM contact_identifiers WHERE type = 'email'"
+            ).fetchone()[0]
+        assert emails == first.emails_added
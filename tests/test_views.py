@@ -681,6 +681,90 @@ class TestQueryEngine:
         assert rows[0]["name"] == "Contact 2"
 
 
+class TestKeysetPagination:
+    def _walk(self, sort_field, sort_direction, per_page=3):
+        from poc.views.engine import execute_view_keyset
+        ids, cursor, pages = [], None, 0
+        with get_connection() as conn:
+            while True:
+                rows, cursor, _ = execute_view_keyset(
+                    conn, entity_type="contact", columns=[{"field_key": "name"}],
+                    filters=[], sort_field=sort_field, sort_direction=sort_direction,
+                    cursor=cursor, per_page=per_page,
+                    customer_id=CUST_ID, user_id=USER_ID,
+                )
+                ids.extend(r["id"] for r in rows)
+                pages += 1
+                if cursor is None:
+                    return ids, pages
+
+    def _offset_ids(self, sort_field, sort_direction):
+        from poc.views.engine import execute_view
+        with get_connection() as conn:
+            rows, _ = execute_view(
+                conn, entity_type="contact", columns=[{"field_key": "name"}],
+                filters=[], sort_field=sort_field, sort_direction=sort_direction,
+                per_page=100, customer_id=CUST_ID, user_id=USER_ID,
+            )
+        return [r["id"] for r in rows]
+
+    def test_walks_all_pages_in_order(self, tmp_db):
+        _seed_contacts(7)
+        ids, pages = self._walk("name", "asc")
+        assert pages == 3
+        assert ids == self._offset_ids("name", "asc")
+
+    @pytest.mark.parametrize("direction", ["asc", "desc"])
+    def test_ties_and_nulls(self, tmp_db, direction):
+        _seed_contacts(4)
+        # Duplicate sort values and NULLs must neither repeat nor drop rows
+        with get_connection() as conn:
+            for i, source in enumerate(["dup", "dup", "DUP", None, None]):
+                cid = f"tie-{i}"
+                conn.execute(
+                    "INSERT INTO contacts (id, customer_id, name, source, status, created_at, updated_at) "
+                    "VALUES (?, ?, 'Tie', ?, 'active', ?, ?)",
+                    (cid, CUST_ID, source, _NOW, _NOW),
+                )
+                conn.execute(
+                    "INSERT INTO user_contacts (id, user_id, contact_id, visibility, is_owner, created_at, updated_at) "
+                    "VALUES (?, ?, ?, 'public', 1, ?, ?)",
+                    (str(uuid.uuid4()), USER_ID, cid, _NOW, _NOW),
+                )
+        ids, _ = self._walk("source", direction, per_page=2)
+        assert len(ids) == len(set(ids)) == 9
+        assert ids == self._offset_ids("source", direction)
+        # NULLs still sort last
+        assert ids[-2:] in (["tie-3", "tie-4"], ["tie-4", "tie-3"])
+
+    def test_count_only_when_requested(self, tmp_db):
+        _seed_contacts(5)
+        from poc.views.engine import execute_view_keyset
+        with get_connection() as conn:
+            _, _, total = execute_view_keyset(
+                conn, entity_type="contact", columns=[], filters=[],
+                customer_id=CUST_ID, user_id=USER_ID,
+            )
+            assert total is None
+            _, _, total = execute_view_keyset(
+                conn, entity_type="contact", columns=[], filters=[],
+                customer_id=CUST_ID, user_id=USER_ID, with_count=True,
+            )
+            assert total == 5
+
+    def test_cursor_for_other_sort_rejected(self, tmp_db):
+        _seed_contacts(5)
+        from poc.views.engine import execute_view_keyset
+        kwargs = dict(entity_type="contact", columns=[], filters=[], per_page=2,
+                      customer_id=CUST_ID, user_id=USER_ID)
+        with get_connection() as conn:
+            _, cursor, _ = execute_view_keyset(conn, sort_field="name", **kwargs)
+            with pytest.raises(ValueError):
+                execute_view_keyset(conn, sort_field="source", cursor=cursor, **kwargs)
+            with pytest.raises(ValueError):
+                execute_view_keyset(conn, cursor="not-a-cursor", **kwargs)
+
+
 # ===========================================================================
 # Migration Tests
 # ===========================================================================
@@ -1787,9 +1787,10 @@ class TestSync:
             _patch("poc.auth.get_credentials_for_account") as mock_creds,
             _patch("poc.gmail_client.get_user_email", return_value="test@example.com"),
             _patch("poc.sync.sync_contacts", return_value=42),
-            _patch("poc.sync.incremental_sync",
-                   return_value={"messages_fetched": 10, "messages_stored": 8,
-                                 "conversations_created": 3, "conversations_updated": 5}),
+            _patch("poc.sync_scheduler.sync_accounts",
+                   return_value={"acct-1": {
+                       "messages_fetched": 10, "messages_stored": 8,
+                       "conversations_created": 3, "conversations_updated": 5}}),
             _patch("poc.sync.process_conversations",
                    return_value=(4, 2, 6)),
         ):
@@ -1813,16 +1814,19 @@ class TestSync:
                    return_value="fake-creds"),
             _patch("poc.gmail_client.get_user_email", return_value="test@example.com"),
             _patch("poc.sync.sync_contacts", return_value=5),
-            _patch("poc.sync.initial_sync",
-                   return_value={"messages_fetched": 20, "messages_stored": 18,
-                                 "conversations_created": 10}) as mock_initial,
+            _patch("poc.sync_scheduler.sync_accounts",
+                   return_value={"acct-1": {
+                       "messages_fetched": 20, "messages_stored": 18,
+                       "conversations_created": 10}}) as mock_sync,
             _patch("poc.sync.process_conversations",
                    return_value=(0, 0, 0)),
         ):
             resp = client.post("/sync")
 
         assert resp.status_code == 200
-        mock_initial.assert_called_once()
+        mock_sync.assert_called_once()
+        (job,) = mock_sync.call_args[0][0]
+        assert job.account["initial_sync_done"] == 0
         assert "20 emails fetched" in resp.text
 
     def test_sync_partial_failure(self, client, tmp_db):
@@ -1835,9 +1839,10 @@ class TestSync:
             _patch("poc.gmail_client.get_user_email", return_value="test@example.com"),
             _patch("poc.sync.sync_contacts",
                    side_effect=RuntimeError("API error")),
-            _patch("poc.sync.incremental_sync",
-                   return_value={"messages_fetched": 5, "messages_stored": 5,
-                                 "conversations_created": 1, "conversations_updated": 2}),
+            _patch("poc.sync_scheduler.sync_accounts",
+                   return_value={"acct-1": {
+                       "messages_fetched": 5, "messages_stored": 5,
+                       "conversations_created": 1, "conversations_updated": 2}}),
             _patch("poc.sync.process_conversations",
                    return_value=(1, 0, 0)),
         ):
@@ -1858,6 +1863,25 @@ class TestSync:
         assert resp.status_code == 200
         assert "auth failed" in resp.text
 
+    def test_sync_email_failure_reported(self, client, tmp_db):
+        with get_connection() as conn:
+            self._insert_account_with_token(conn)
+
+        with (
+            _patch("poc.auth.get_credentials_for_account",
+                   return_value="fake-creds"),
+            _patch("poc.gmail_client.get_user_email", return_value="test@example.com"),
+            _patch("poc.sync.sync_contacts", return_value=0),
+            _patch("poc.sync_scheduler.sync_accounts",
+                   return_value={"acct-1": {"sync_id": "s1", "error": "quota exceeded"}}),
+            _patch("poc.sync.process_conversations",
+                   return_value=(0, 0, 0)),
+        ):
+            resp = client.post("/sync")
+
+        assert resp.status_code == 200
+        assert "email sync failed (quota exceeded)" in resp.text
+
 
 # ---------------------------------------------------------------------------
 # Date Display